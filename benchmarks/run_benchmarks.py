@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+
+"""
+Throughput benchmarks
+
+Usage:
+run_benchmarks.py [--rows=<rows>]
+                  [--lanes=<lanes>]
+                  [--tso500s]
+                  [--tso500l]
+                  [--cloud]
+                  [--engine=<engine>]
+                  [--repeats=<repeats>]
+                  [--max-stage-seconds=<seconds>]
+                  [--output=<output_json>]
+                  [--compare=<baseline_json>]
+                  [--max-slowdown=<ratio>]
+
+Options:
+
+* --rows:          Comma separated BCLConvert_Data row counts to benchmark, defaults to 10,1000,10000,100000
+* --lanes:         The number of lanes, each sample is placed in every lane, defaults to 2
+* --tso500s:       Add TSO500S sections (one row per sample)
+* --tso500l:       Add TSO500L sections (one row per sample)
+* --cloud:         Add Cloud_Settings, and generate the Cloud_Data section from the BCLConvert urn
+* --engine:        The dataframe engine, one of pandas (default) or columnar
+* --repeats:       The number of times each stage is run, defaults to 3
+* --max-stage-seconds:  Stop repeating a stage once its runs have taken this long in total, defaults to 60
+* --output:        Write the results as json to this path, defaults to stdout
+* --compare:       A results json from a previous run to compare against
+* --max-slowdown:  With --compare, exit with a non-zero code if any stage is this many times slower than the baseline
+
+Example:
+python benchmarks/run_benchmarks.py --output=benchmark-results.json
+python benchmarks/run_benchmarks.py --rows=10,1000 --tso500s --cloud --compare=benchmark-results.json --max-slowdown=1.5
+
+Description:
+Generate synthetic samplesheets with the given number of rows, then time each stage
+(building the SampleSheet, writing and reading the csv, writing the json, checking index collisions,
+and converting to and reading the RunInfo.xml).
+
+The minimum and median time of each stage is reported along with the rows per second (based on the minimum).
+"""
+
+# Standard imports
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from copy import deepcopy
+from datetime import datetime, timezone
+from io import StringIO
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from docopt import docopt
+
+# The cache would skip the parsing we're trying to measure
+os.environ.pop("V2_SAMPLESHEET_MAKER_CACHE_DIR", None)
+
+# Custom imports
+from v2_samplesheet_maker.classes.samplesheet import SampleSheet
+from v2_samplesheet_maker.functions.index_collisions import get_index_collisions
+from v2_samplesheet_maker.functions.run_info_reader import run_info_xml_reader
+from v2_samplesheet_maker.functions.v2_samplesheet_to_run_info import samplesheet_csv_to_run_info_xml
+from v2_samplesheet_maker.utils.cache import get_package_version
+from v2_samplesheet_maker.utils.samplesheet_generator import generate_samplesheet_dict
+
+DEFAULT_ROWS = [10, 1000, 10000, 100000]
+BENCHMARK_RUN_ID = "240229_A01052_0184_AHNVH5DMXY"
+DEFAULT_MAX_STAGE_SECONDS = 60.0
+
+
+def time_stage(
+    stage_function: Callable,
+    repeats: int,
+    max_stage_seconds: float = DEFAULT_MAX_STAGE_SECONDS,
+    setup_function: Optional[Callable] = None,
+) -> List[float]:
+    """
+    Run a stage a number of times
+    :param stage_function: Called with the output of setup_function if given
+    :param repeats:
+    :param max_stage_seconds: Stop repeating once the runs have taken this long in total (the stage is always run once)
+    :param setup_function: Called before each run, outside of the timer
+    :return: The duration of each run in seconds
+    """
+    durations = []
+    for _ in range(repeats):
+        if setup_function is not None:
+            stage_input = setup_function()
+            start_time = time.perf_counter()
+            stage_function(stage_input)
+        else:
+            start_time = time.perf_counter()
+            stage_function()
+        durations.append(time.perf_counter() - start_time)
+        if sum(durations) >= max_stage_seconds:
+            break
+    return durations
+
+
+def run_benchmark(
+    num_rows: int,
+    num_lanes: int,
+    options: Dict,
+    engine: str,
+    repeats: int,
+    max_stage_seconds: float = DEFAULT_MAX_STAGE_SECONDS,
+) -> List[Dict]:
+    """
+    Benchmark each stage for a samplesheet with num_rows BCLConvert_Data rows
+    :param num_rows:
+    :param num_lanes:
+    :param options: The tso500s, tso500l and cloud options for generate_samplesheet_dict
+    :param engine:
+    :param repeats:
+    :param max_stage_seconds:
+    :return: A result dictionary for each stage
+    """
+    num_samples = max(num_rows // num_lanes, 1)
+    samplesheet_dict = generate_samplesheet_dict(num_samples, num_lanes, **options)
+
+    # Build once up front, so that each stage has its inputs
+    samplesheet = SampleSheet(deepcopy(samplesheet_dict), engine=engine)
+    samplesheet_csv = samplesheet.to_csv_string()
+    run_info_xml = samplesheet_csv_to_run_info_xml(StringIO(samplesheet_csv), run_id=BENCHMARK_RUN_ID).getvalue()
+
+    stages = {
+        # SampleSheet mutates its input, so each run gets a fresh copy (copied outside of the timer)
+        "samplesheet_init": lambda samplesheet_dict_copy: SampleSheet(samplesheet_dict_copy, engine=engine),
+        "to_csv": lambda: samplesheet.to_csv(StringIO()),
+        "read_from_samplesheet_csv": lambda: SampleSheet.read_from_samplesheet_csv(StringIO(samplesheet_csv), engine=engine),
+        "to_json": lambda: samplesheet.write_json(StringIO()),
+        "index_collisions": lambda: get_index_collisions(samplesheet),
+        "samplesheet_csv_to_run_info_xml": lambda: samplesheet_csv_to_run_info_xml(
+            StringIO(samplesheet_csv), run_id=BENCHMARK_RUN_ID
+        ),
+        "run_info_xml_reader": lambda: run_info_xml_reader(StringIO(run_info_xml)),
+    }
+
+    results = []
+    for stage_name, stage_function in stages.items():
+        durations = time_stage(
+            stage_function,
+            repeats,
+            max_stage_seconds=max_stage_seconds,
+            setup_function=(lambda: deepcopy(samplesheet_dict)) if stage_name == "samplesheet_init" else None
+        )
+
+        results.append({
+            "stage": stage_name,
+            "rows": num_samples * num_lanes,
+            "samples": num_samples,
+            "lanes": num_lanes,
+            "repeats": len(durations),
+            "min_seconds": min(durations),
+            "median_seconds": statistics.median(durations),
+            "rows_per_second": (num_samples * num_lanes) / min(durations) if min(durations) > 0 else None,
+        })
+
+        print(
+            f"{stage_name:<35} {num_samples * num_lanes:>8} rows  {min(durations) * 1000:>10.2f} ms",
+            file=sys.stderr
+        )
+
+    return results
+
+
+def compare_results(results: List[Dict], baseline_results: List[Dict]) -> List[Dict]:
+    """
+    Compare the minimum time of each stage to a baseline
+    :param results:
+    :param baseline_results:
+    :return: A dictionary for each stage in both results with the keys stage, rows, baseline_seconds,
+      current_seconds and slowdown (current / baseline)
+    """
+    baseline_by_key = {
+        (baseline_iter["stage"], baseline_iter["rows"]): baseline_iter
+        for baseline_iter in baseline_results
+    }
+
+    comparisons = []
+    for result in results:
+        baseline = baseline_by_key.get((result["stage"], result["rows"]), None)
+        if baseline is None or baseline["min_seconds"] == 0:
+            continue
+        comparisons.append({
+            "stage": result["stage"],
+            "rows": result["rows"],
+            "baseline_seconds": baseline["min_seconds"],
+            "current_seconds": result["min_seconds"],
+            "slowdown": result["min_seconds"] / baseline["min_seconds"],
+        })
+
+    return comparisons
+
+
+def main():
+    args = docopt(__doc__)
+
+    rows_list = (
+        list(map(int, args["--rows"].split(",")))
+        if args["--rows"] is not None
+        else DEFAULT_ROWS
+    )
+    num_lanes = int(args["--lanes"] or 2)
+    repeats = int(args["--repeats"] or 3)
+    engine = args["--engine"] or "pandas"
+    max_stage_seconds = (
+        float(args["--max-stage-seconds"])
+        if args["--max-stage-seconds"] is not None
+        else DEFAULT_MAX_STAGE_SECONDS
+    )
+    options = {
+        "tso500s": args["--tso500s"],
+        "tso500l": args["--tso500l"],
+        "cloud": args["--cloud"],
+    }
+
+    results = []
+    for num_rows in rows_list:
+        results.extend(run_benchmark(num_rows, num_lanes, options, engine, repeats, max_stage_seconds))
+
+    benchmark_output = {
+        "metadata": {
+            "package_version": get_package_version(),
+            "python_version": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "engine": engine,
+            "options": options,
+        },
+        "results": results,
+    }
+
+    exit_code = 0
+    if args["--compare"] is not None:
+        with open(args["--compare"], "r") as baseline_h:
+            baseline_output = json.load(baseline_h)
+        benchmark_output["metadata"]["baseline_package_version"] = baseline_output["metadata"]["package_version"]
+        benchmark_output["comparison"] = compare_results(results, baseline_output["results"])
+
+        max_slowdown = float(args["--max-slowdown"]) if args["--max-slowdown"] is not None else None
+        for comparison in benchmark_output["comparison"]:
+            print(
+                f"{comparison['stage']:<35} {comparison['rows']:>8} rows  {comparison['slowdown']:>6.2f}x baseline",
+                file=sys.stderr
+            )
+            if max_slowdown is not None and comparison["slowdown"] > max_slowdown:
+                exit_code = 1
+
+    if args["--output"] is None:
+        print(json.dumps(benchmark_output, indent=2))
+    else:
+        with open(Path(args["--output"]), "w") as output_h:
+            json.dump(benchmark_output, output_h, indent=2)
+            output_h.write("\n")
+
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+
+"""
+A lightweight, pandas-free column store used to render DataFrame sections.
+
+The ColumnarFrame mimics the small subset of pandas behaviour we rely on
+when building a data section (column pruning, row ordering and csv rendering)
+such that the rendered csv is byte-identical to the pandas output.
+"""
+
+# Standard imports
+import csv
+import math
+from io import StringIO
+from typing import Dict, List, Any, Optional, Iterable
+
+
+def is_missing(value: Any) -> bool:
+    """
+    Equivalent of pd.isna for the scalar types found in a section row
+    :param value:
+    :return:
+    """
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def get_column_formatter(values: List[Any]):
+    """
+    Emulate pandas dtype inference for a column of values,
+    and return a function that formats a (non-missing) value in the same way pandas would in to_csv
+
+    * A column of ints with missing values is upcast to float64 (1 -> 1.0)
+    * A column of ints and floats is upcast to float64
+    * Everything else is written out with str()
+    :param values:
+    :return:
+    """
+    non_missing_values = list(filter(lambda value_iter: not is_missing(value_iter), values))
+    has_missing_values = len(non_missing_values) != len(values)
+
+    is_numeric = len(non_missing_values) > 0 and all(
+        map(
+            lambda value_iter: isinstance(value_iter, (int, float)) and not isinstance(value_iter, bool),
+            non_missing_values
+        )
+    )
+
+    if not is_numeric:
+        return str
+
+    has_float_values = any(
+        map(
+            lambda value_iter: isinstance(value_iter, float),
+            non_missing_values
+        )
+    )
+
+    if has_float_values or has_missing_values:
+        return lambda value_iter: repr(float(value_iter))
+
+    return str
+
+
+class ColumnarFrame:
+    """
+    Column oriented table made of plain python lists
+    Missing values are stored as None
+    """
+
+    def __init__(self, columns: Optional[Dict[str, List[Any]]] = None):
+        self._columns: Dict[str, List[Any]] = columns if columns is not None else {}
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict], columns: Optional[List[str]] = None) -> "ColumnarFrame":
+        """
+        Build a frame from a list of dicts
+        Columns are ordered by first appearance (as pandas does when building a DataFrame from a list of Series)
+        :param records:
+        :param columns:
+        :return:
+        """
+        records = list(records)
+
+        if columns is None:
+            columns = list(
+                dict.fromkeys(
+                    key
+                    for record_iter in records
+                    for key in record_iter.keys()
+                )
+            )
+
+        return cls(
+            {
+                column_iter: [
+                    None if is_missing(record_iter.get(column_iter, None)) else record_iter.get(column_iter)
+                    for record_iter in records
+                ]
+                for column_iter in columns
+            }
+        )
+
+    @classmethod
+    def concat(cls, frames: List["ColumnarFrame"]) -> "ColumnarFrame":
+        """
+        Stack the rows of each frame, equivalent of pd.concat(frames)
+        Columns are ordered by first appearance, missing columns are filled with None
+        :param frames:
+        :return:
+        """
+        columns = list(
+            dict.fromkeys(
+                column_iter
+                for frame_iter in frames
+                for column_iter in frame_iter.columns
+            )
+        )
+
+        return cls(
+            {
+                column_iter: [
+                    value
+                    for frame_iter in frames
+                    for value in (
+                        frame_iter[column_iter] if column_iter in frame_iter.columns
+                        else [None] * len(frame_iter)
+                    )
+                ]
+                for column_iter in columns
+            }
+        )
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns.keys())
+
+    def __len__(self) -> int:
+        if len(self._columns) == 0:
+            return 0
+        return len(next(iter(self._columns.values())))
+
+    def __getitem__(self, column: str) -> List[Any]:
+        return self._columns[column]
+
+    def to_records(self) -> List[Dict]:
+        """
+        Return the frame as a list of dicts, one per row
+        :return:
+        """
+        return [
+            {
+                column_iter: column_values[row_index]
+                for column_iter, column_values in self._columns.items()
+            }
+            for row_index in range(len(self))
+        ]
+
+    def take(self, row_indices: List[int]) -> "ColumnarFrame":
+        """
+        Return a new frame with the rows in the order of row_indices
+        :param row_indices:
+        :return:
+        """
+        return ColumnarFrame(
+            {
+                column_iter: [column_values[row_index] for row_index in row_indices]
+                for column_iter, column_values in self._columns.items()
+            }
+        )
+
+    def dropna_columns(self) -> "ColumnarFrame":
+        """
+        Equivalent of df.dropna(how="all", axis="columns")
+        :return:
+        """
+        return ColumnarFrame(
+            dict(
+                filter(
+                    lambda column_iter: not all(map(is_missing, column_iter[1])),
+                    self._columns.items()
+                )
+            )
+        )
+
+    def sort_values(self, by: List[str]) -> "ColumnarFrame":
+        """
+        Stable sort of the rows by the columns in by, missing values are placed last
+        :param by:
+        :return:
+        """
+        sort_columns = list(map(lambda column_iter: self._columns[column_iter], by))
+
+        return self.take(
+            sorted(
+                range(len(self)),
+                key=lambda row_index: tuple(
+                    (column_values[row_index] is None, column_values[row_index])
+                    for column_values in sort_columns
+                )
+            )
+        )
+
+    def to_csv(self, sep: str = ",", lineterminator: str = "\n") -> str:
+        """
+        Render the frame as a csv string with a header and no index
+        :param sep:
+        :param lineterminator:
+        :return:
+        """
+        formatters = list(map(get_column_formatter, self._columns.values()))
+
+        output_h = StringIO()
+        writer = csv.writer(output_h, delimiter=sep, lineterminator=lineterminator, quoting=csv.QUOTE_MINIMAL)
+
+        writer.writerow(self.columns)
+        writer.writerows(
+            [
+                "" if value is None else formatter(value)
+                for value, formatter in zip(row_values, formatters)
+            ]
+            for row_values in zip(*self._columns.values())
+        )
+
+        return output_h.getvalue()
+
+    def to_pandas(self):
+        """
+        Convert to a pandas DataFrame
+        :return:
+        """
+        import pandas as pd
+
+        return pd.DataFrame(self.to_records(), columns=self.columns)
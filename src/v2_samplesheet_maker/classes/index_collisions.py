@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+
+"""
+Index collision detection for the BCLConvert_Data section.
+
+Two samples in the same lane collide when a read could be assigned to either sample
+at the configured barcode mismatches. For a pair of samples with mismatch tolerances m_a and m_b,
+an index read is ambiguous when the hamming distance between the two indexes is at most m_a + m_b
+(which for a shared setting m is the 2m bcl-convert uses).
+
+* Combined check (default), a pair collides when both index reads are ambiguous.
+* Independent check (lanes listed in IndependentIndexCollisionCheck), additionally each index read
+  is checked on its own, two distinct index sequences collide when they are ambiguous.
+  Identical sequences are shared barcodes rather than collisions.
+
+Indexes of different lengths are compared over their common prefix.
+A lane where any sample is missing an index read cannot use that read to tell samples apart.
+
+Indexes are packed into integers (two bits per base) so that the hamming distance of a pair
+is a xor and a popcount.
+Rather than comparing every pair in a lane, candidate pairs are found by the pigeonhole principle:
+split each index into d + 1 segments, any two indexes within a hamming distance of d share at least one segment exactly.
+"""
+
+# Standard imports
+from itertools import combinations
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# Local imports
+from ..enums import IndexCollisionType
+from ..utils.logger import get_logger
+
+# Get logger
+logger = get_logger()
+
+# bcl-convert default for BarcodeMismatchesIndex1 and BarcodeMismatchesIndex2
+DEFAULT_BARCODE_MISMATCHES = 1
+
+# bcl-convert accepts barcode mismatches of 0, 1 or 2
+MAX_BARCODE_MISMATCHES = 2
+
+# Two bits per base, N (or any other non-ACGT base) is tracked in a separate mask
+BASE_TO_BITS = {"A": 0, "C": 1, "G": 2, "T": 3}
+
+# A packed index is a tuple of (value, n_mask, length)
+PackedIndex = Tuple[int, int, int]
+
+EMPTY_PACKED_INDEX: PackedIndex = (0, 0, 0)
+
+
+def pack_index(index_sequence: Optional[str]) -> PackedIndex:
+    """
+    Pack an index sequence into two bits per base, the first base is the most significant.
+    N bases are packed as A and flagged in the n_mask (on the low bit of the base) so that
+    they always count as a mismatch
+    :param index_sequence:
+    :return: A tuple of (value, n_mask, length)
+    """
+    if index_sequence is None:
+        return EMPTY_PACKED_INDEX
+
+    value = 0
+    n_mask = 0
+    for base in index_sequence.upper():
+        value <<= 2
+        n_mask <<= 2
+        base_bits = BASE_TO_BITS.get(base, None)
+        if base_bits is None:
+            if not base == "N":
+                logger.error(f"Index '{index_sequence}' contains a base that is not one of A, C, G, T or N")
+                raise ValueError
+            n_mask |= 1
+        else:
+            value |= base_bits
+
+    return value, n_mask, len(index_sequence)
+
+
+def get_packed_hamming_distance(packed_index_a: PackedIndex, packed_index_b: PackedIndex) -> int:
+    """
+    Get the hamming distance between two packed indexes over their common prefix
+    :param packed_index_a:
+    :param packed_index_b:
+    :return:
+    """
+    value_a, n_mask_a, length_a = packed_index_a
+    value_b, n_mask_b, length_b = packed_index_b
+
+    # Trim to common prefix
+    if length_a > length_b:
+        value_a >>= 2 * (length_a - length_b)
+        n_mask_a >>= 2 * (length_a - length_b)
+        length = length_b
+    else:
+        value_b >>= 2 * (length_b - length_a)
+        n_mask_b >>= 2 * (length_b - length_a)
+        length = length_a
+
+    # Collapse each differing base onto its low bit (01 repeated for each base)
+    low_bits_mask = (4 ** length - 1) // 3
+    xor_value = value_a ^ value_b
+
+    return (((xor_value | (xor_value >> 1)) & low_bits_mask) | n_mask_a | n_mask_b).bit_count()
+
+
+def iter_candidate_pairs(index_keys: List[str], max_distance: int) -> Iterator[Tuple[int, int]]:
+    """
+    Yield pairs of positions in index_keys that could be within max_distance of each other,
+    a pair may be yielded more than once.
+
+    Keys are trimmed to the shortest key length, then split into max_distance + 1 segments,
+    a pair is a candidate if it shares at least one segment
+    :param index_keys:
+    :param max_distance:
+    :return: (i, j) position tuples where i < j
+    """
+    if len(index_keys) < 2:
+        return
+
+    common_length = min(map(len, index_keys))
+    num_segments = max_distance + 1
+
+    # Segments would be empty, every pair is a candidate
+    if common_length < num_segments:
+        yield from combinations(range(len(index_keys)), 2)
+        return
+
+    segment_boundaries = [
+        (segment_index * common_length // num_segments, (segment_index + 1) * common_length // num_segments)
+        for segment_index in range(num_segments)
+    ]
+
+    segment_buckets: Dict[Tuple[int, str], List[int]] = {}
+    for position, index_key in enumerate(index_keys):
+        for segment_index, (segment_start, segment_end) in enumerate(segment_boundaries):
+            segment_buckets.setdefault(
+                (segment_index, index_key[segment_start:segment_end]), []
+            ).append(position)
+
+    for bucket_positions in segment_buckets.values():
+        if len(bucket_positions) > 1:
+            yield from combinations(bucket_positions, 2)
+
+
+def get_candidate_pairs(index_keys: List[str], max_distance: int) -> Set[Tuple[int, int]]:
+    """
+    Get all pairs of positions in index_keys that could be within max_distance of each other
+    :param index_keys:
+    :param max_distance:
+    :return: A set of (i, j) position tuples where i < j
+    """
+    return set(iter_candidate_pairs(index_keys, max_distance))
+
+
+class IndexCollisionChecker:
+    """
+    Find pairs of samples in the same lane whose indexes cannot be told apart at their barcode mismatches
+    """
+
+    def __init__(
+        self,
+        data_rows: Iterable[Dict],
+        barcode_mismatches_index_1: Optional[int] = None,
+        barcode_mismatches_index_2: Optional[int] = None,
+        independent_index_collision_check: Optional[Iterable] = None
+    ):
+        """
+        :param data_rows: BCLConvert_Data rows as (snake case) dictionaries with the keys
+          sample_id, lane, index, index2 and optionally barcode_mismatches_index_1 and barcode_mismatches_index_2
+        :param barcode_mismatches_index_1: Setting for BarcodeMismatchesIndex1, defaults to 1
+        :param barcode_mismatches_index_2: Setting for BarcodeMismatchesIndex2, defaults to 1
+        :param independent_index_collision_check: Lanes where each index read is also checked independently
+        """
+        self.barcode_mismatches_index_1 = (
+            barcode_mismatches_index_1 if barcode_mismatches_index_1 is not None else DEFAULT_BARCODE_MISMATCHES
+        )
+        self.barcode_mismatches_index_2 = (
+            barcode_mismatches_index_2 if barcode_mismatches_index_2 is not None else DEFAULT_BARCODE_MISMATCHES
+        )
+        if isinstance(independent_index_collision_check, str):
+            independent_index_collision_check = independent_index_collision_check.split(";")
+        self.independent_lanes = set(
+            map(int, independent_index_collision_check if independent_index_collision_check is not None else [])
+        )
+
+        # Group rows by lane, keeping the packed indexes and mismatch tolerances of each row
+        self.lane_groups: Dict[Optional[int], Dict[str, List]] = {}
+        for data_row in data_rows:
+            lane_group = self.lane_groups.setdefault(
+                data_row.get("lane", None),
+                {
+                    "sample_ids": [],
+                    "indexes": [],
+                    "index2s": [],
+                    "packed_indexes": [],
+                    "packed_index2s": [],
+                    "barcode_mismatches_index_1": [],
+                    "barcode_mismatches_index_2": [],
+                }
+            )
+            lane_group["sample_ids"].append(data_row.get("sample_id"))
+            lane_group["indexes"].append((data_row.get("index", None) or "").upper())
+            lane_group["index2s"].append((data_row.get("index2", None) or "").upper())
+            lane_group["packed_indexes"].append(pack_index(data_row.get("index", None)))
+            lane_group["packed_index2s"].append(pack_index(data_row.get("index2", None)))
+            lane_group["barcode_mismatches_index_1"].append(
+                data_row.get("barcode_mismatches_index_1", None)
+                if data_row.get("barcode_mismatches_index_1", None) is not None
+                else self.barcode_mismatches_index_1
+            )
+            lane_group["barcode_mismatches_index_2"].append(
+                data_row.get("barcode_mismatches_index_2", None)
+                if data_row.get("barcode_mismatches_index_2", None) is not None
+                else self.barcode_mismatches_index_2
+            )
+
+    def get_lane_collisions(self, lane: Optional[int]) -> List[Dict]:
+        """
+        Find all collisions within a lane
+        :param lane:
+        :return:
+        """
+        lane_group = self.lane_groups[lane]
+        index_keys, index2_keys = lane_group["indexes"], lane_group["index2s"]
+        packed_indexes, packed_index2s = lane_group["packed_indexes"], lane_group["packed_index2s"]
+        mismatches_1, mismatches_2 = lane_group["barcode_mismatches_index_1"], lane_group["barcode_mismatches_index_2"]
+
+        # An index read can only tell samples apart if every sample in the lane has it
+        index_length = min(map(len, index_keys)) if len(index_keys) > 0 else 0
+        index2_length = min(map(len, index2_keys)) if len(index2_keys) > 0 else 0
+        max_distance_1 = 2 * max(mismatches_1) if index_length > 0 else 0
+        max_distance_2 = 2 * max(mismatches_2) if index2_length > 0 else 0
+
+        def get_distances(position_a: int, position_b: int) -> Tuple[int, int]:
+            return (
+                get_packed_hamming_distance(packed_indexes[position_a], packed_indexes[position_b])
+                if index_length > 0 else 0,
+                get_packed_hamming_distance(packed_index2s[position_a], packed_index2s[position_b])
+                if index2_length > 0 else 0
+            )
+
+        def get_collision(position_a: int, position_b: int, distances: Tuple[int, int], collision_type: IndexCollisionType) -> Dict:
+            return {
+                "lane": lane,
+                "sample_id_1": lane_group["sample_ids"][position_a],
+                "sample_id_2": lane_group["sample_ids"][position_b],
+                "collision_type": collision_type.value,
+                "index_distance": distances[0] if index_length > 0 else None,
+                "index2_distance": distances[1] if index2_length > 0 else None,
+            }
+
+        collisions = []
+
+        # Combined check, search on the concatenated (common prefix) indexes
+        for position_a, position_b in sorted(
+            get_candidate_pairs(
+                list(
+                    map(
+                        lambda index_pair_iter: index_pair_iter[0][:index_length] + index_pair_iter[1][:index2_length],
+                        zip(index_keys, index2_keys)
+                    )
+                ),
+                max_distance_1 + max_distance_2
+            )
+        ):
+            distances = get_distances(position_a, position_b)
+            if (
+                distances[0] <= mismatches_1[position_a] + mismatches_1[position_b] and
+                distances[1] <= mismatches_2[position_a] + mismatches_2[position_b]
+            ):
+                collisions.append(get_collision(position_a, position_b, distances, IndexCollisionType.COMBINED))
+
+        if lane not in self.independent_lanes:
+            return collisions
+
+        # Independent check, each index read on its own
+        for collision_type, keys, length, max_distance, mismatches, distance_position in [
+            (IndexCollisionType.INDEX_1, index_keys, index_length, max_distance_1, mismatches_1, 0),
+            (IndexCollisionType.INDEX_2, index2_keys, index2_length, max_distance_2, mismatches_2, 1),
+        ]:
+            if length == 0:
+                continue
+            for position_a, position_b in sorted(
+                get_candidate_pairs(list(map(lambda key_iter: key_iter[:length], keys)), max_distance)
+            ):
+                distances = get_distances(position_a, position_b)
+                if 0 < distances[distance_position] <= mismatches[position_a] + mismatches[position_b]:
+                    collisions.append(get_collision(position_a, position_b, distances, collision_type))
+
+        return collisions
+
+    def find_collisions(self) -> List[Dict]:
+        """
+        Find all collisions, lane by lane
+        :return: A list of dictionaries with the keys lane, sample_id_1, sample_id_2,
+          collision_type (one of combined, index or index2), index_distance and index2_distance
+        """
+        return [
+            collision
+            for lane in self.lane_groups.keys()
+            for collision in self.get_lane_collisions(lane)
+        ]
+
+    def get_lane_index_keys(self, lane: Optional[int]) -> Tuple[List[str], List[str]]:
+        """
+        Get the index and index2 keys of a lane, trimmed to the common prefix of each index read.
+        An index read that is missing from any sample in the lane is trimmed to nothing
+        :param lane:
+        :return:
+        """
+        lane_group = self.lane_groups[lane]
+        index_length = min(map(len, lane_group["indexes"]))
+        index2_length = min(map(len, lane_group["index2s"]))
+
+        return (
+            list(map(lambda key_iter: key_iter[:index_length], lane_group["indexes"])),
+            list(map(lambda key_iter: key_iter[:index2_length], lane_group["index2s"]))
+        )
+
+    def has_lane_collision(self, lane: Optional[int], barcode_mismatches_index_1: int, barcode_mismatches_index_2: int) -> bool:
+        """
+        Check if any samples in a lane would collide (combined check) if every sample used the given barcode mismatches,
+        stops at the first collision found
+        :param lane:
+        :param barcode_mismatches_index_1:
+        :param barcode_mismatches_index_2:
+        :return:
+        """
+        lane_group = self.lane_groups[lane]
+        packed_indexes, packed_index2s = lane_group["packed_indexes"], lane_group["packed_index2s"]
+        index_keys, index2_keys = self.get_lane_index_keys(lane)
+        max_distance_1 = 2 * barcode_mismatches_index_1 if len(index_keys[0]) > 0 else 0
+        max_distance_2 = 2 * barcode_mismatches_index_2 if len(index2_keys[0]) > 0 else 0
+
+        return any(
+            (
+                (len(index_keys[0]) == 0 or get_packed_hamming_distance(packed_indexes[position_a], packed_indexes[position_b]) <= max_distance_1) and
+                (len(index2_keys[0]) == 0 or get_packed_hamming_distance(packed_index2s[position_a], packed_index2s[position_b]) <= max_distance_2)
+            )
+            for position_a, position_b in iter_candidate_pairs(
+                list(map(lambda key_pair_iter: key_pair_iter[0] + key_pair_iter[1], zip(index_keys, index2_keys))),
+                max_distance_1 + max_distance_2
+            )
+        )
+
+    def get_min_distinct_distance(self, lane: Optional[int], packed_key: str, index_keys: List[str], max_distance: int) -> Optional[int]:
+        """
+        Get the smallest non-zero hamming distance between any two indexes of an index read in a lane,
+        searching up to max_distance
+        :param lane:
+        :param packed_key: One of packed_indexes or packed_index2s
+        :param index_keys:
+        :param max_distance:
+        :return: None if no two distinct indexes are within max_distance of each other
+        """
+        packed_indexes = self.lane_groups[lane][packed_key]
+
+        # Search with increasing distances, so the closest pairs are found with the fewest candidates
+        for distance in range(1, max_distance + 1):
+            if any(
+                get_packed_hamming_distance(packed_indexes[position_a], packed_indexes[position_b]) == distance
+                for position_a, position_b in iter_candidate_pairs(index_keys, distance)
+            ):
+                return distance
+
+        return None
+
+    def get_max_safe_barcode_mismatches(self, lane: Optional[int]) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Get the highest barcode mismatches each index read of a lane can use without any collisions.
+
+        The allowed (index 1, index 2) mismatches form a staircase, raising one lowers the highest allowed value of the other.
+        The pair with the highest lowest value is chosen (then the highest total, then the highest index 1 value)
+        :param lane:
+        :return: A tuple of (barcode mismatches index 1, barcode mismatches index 2),
+          None for an index read that is not used by every sample in the lane
+        """
+        index_keys, index2_keys = self.get_lane_index_keys(lane)
+        has_index = len(index_keys) > 0 and len(index_keys[0]) > 0
+        has_index2 = len(index2_keys) > 0 and len(index2_keys[0]) > 0
+
+        # Lanes in the independent check also need distinct indexes of each read to stay apart
+        max_index_1, max_index_2 = MAX_BARCODE_MISMATCHES, MAX_BARCODE_MISMATCHES
+        if lane in self.independent_lanes:
+            for index_position, (packed_key, keys, has_index_read) in enumerate([
+                ("packed_indexes", index_keys, has_index),
+                ("packed_index2s", index2_keys, has_index2),
+            ]):
+                if not has_index_read:
+                    continue
+                min_distance = self.get_min_distinct_distance(lane, packed_key, keys, 2 * MAX_BARCODE_MISMATCHES)
+                if min_distance is None:
+                    continue
+                if index_position == 0:
+                    max_index_1 = min(max_index_1, (min_distance - 1) // 2)
+                else:
+                    max_index_2 = min(max_index_2, (min_distance - 1) // 2)
+
+        # Walk the staircase of allowed pairs, starting from the highest index 2 value
+        allowed_pairs = []
+        mismatches_2 = max_index_2 if has_index2 else 0
+        for mismatches_1 in range(0, max_index_1 + 1 if has_index else 1):
+            while mismatches_2 >= 0 and self.has_lane_collision(lane, mismatches_1, mismatches_2):
+                mismatches_2 -= 1
+            if mismatches_2 < 0:
+                break
+            allowed_pairs.append((mismatches_1, mismatches_2))
+
+        if len(allowed_pairs) == 0:
+            # Collides even without mismatches
+            return (0 if has_index else None), (0 if has_index2 else None)
+
+        mismatches_1, mismatches_2 = max(
+            allowed_pairs,
+            key=lambda pair_iter: (
+                min(pair_iter) if has_index and has_index2 else sum(pair_iter),
+                sum(pair_iter),
+                pair_iter[0]
+            )
+        )
+
+        return (mismatches_1 if has_index else None), (mismatches_2 if has_index2 else None)
@@ -5,16 +5,19 @@ Samplesheet Class
 """
 # Standard Libraries
 import json
+from io import StringIO, TextIOBase
+from itertools import zip_longest
 from pathlib import Path
-from typing import Dict, Optional, List, Union
-import pandas as pd
-from tempfile import NamedTemporaryFile
+from copy import deepcopy
+from typing import Any, Dict, Optional, List, Set, Type, Union, Iterable, Iterator, Tuple, TextIO
 
 # Relative modules
-from ..globals import HEADER_REGEX_MATCH
+from ..globals import HEADER_REGEX_MATCH, SECTION_ENTRY_POINT_GROUP
+from ..enums import DataFrameEngine, SampleSheetSplitKey
 from ..utils.logger import get_logger
-from ..utils import pascal_case_to_snake_case
-from .super_sections import Section, KVSection, DataFrameSection
+from ..utils.profiler import profile_stage
+from ..utils import pascal_case_to_snake_case, convert_pascal_case_to_snake_case
+from .super_sections import Section, KVSection, DataFrameSection, DataFrameSectionRow, SECTION_REGISTRY
 from ..section_classes.run_info_sections import (
     HeaderSection, ReadsSection, SequencingSection
 )
@@ -50,7 +53,7 @@ def get_stripped_section_name(section_name: str) -> str:
     :return:
     """
     return (
-        section_name.lower().lstrip("cloud_") if
+        section_name.lower().removeprefix("cloud_") if
         not section_name.lower() == "cloud_settings" and
         not section_name.lower() == "cloud_data"
         else
@@ -58,6 +61,154 @@ def get_stripped_section_name(section_name: str) -> str:
     )
 
 
+def get_data_row_dict(column_names: List[str], line: str) -> Dict:
+    """
+    Convert a line of a data section into a dict, empty values are set to None
+    Rows shorter than the header are padded with None
+    :param column_names: The snake case column names from the data section header
+    :param line:
+    :return:
+    """
+    row_values = line.split(",")
+
+    # Allow trailing empty values (i.e excel padding) but not additional values
+    if any(row_values[len(column_names):]):
+        logger.error(f"Data row '{line}' has more values than there are columns in the header {column_names}")
+        raise ValueError
+
+    return {
+        column_name: (row_value if not row_value == "" else None)
+        for column_name, row_value in zip_longest(column_names, row_values[:len(column_names)], fillvalue="")
+    }
+
+
+def sanitise_kv_section(section_name: str, section_dict: Dict) -> Dict:
+    """
+    Perform the section specific conversions of a key-value section read from a samplesheet csv
+    :param section_name: The snake case section name
+    :param section_dict: The snake case key-value pairs of the section
+    :return:
+    """
+    # Perform exception to Sequence model library_prep_kits and convert to a list
+    if section_name == "sequencing":
+        if "library_prep_kits" in section_dict.keys():
+            section_dict["library_prep_kits"] = section_dict["library_prep_kits"].split(";")
+
+    # Perform exception to Cloud_Settings, find all keys that end with _pipeline and append to analysis_urns dict
+    if section_name == "cloud_settings":
+        cloud_analysis_urns = {}
+        for key, value in section_dict.items():
+            if key.endswith("_pipeline") and value.startswith("urn:"):
+                cloud_analysis_urns[key] = value
+        section_dict["analysis_urns"] = cloud_analysis_urns
+
+    return section_dict
+
+
+def iter_samplesheet_csv_lines(file_h: Iterable[str]) -> Iterator[Tuple[str, Dict]]:
+    """
+    Walk through the lines of a samplesheet csv
+    and yield (section_name, parsed_section) events.
+
+    Section names are converted to snake case, i.e BCLConvert_Data -> bclconvert_data
+
+    Key-value sections are yielded once as a single snake case dict, once the section is complete.
+    Data sections (sections that end in _data) yield one snake case dict per row as each row is read.
+    :param file_h:
+    :return:
+    """
+    section_name: Optional[str] = None
+    is_data_section = False
+    data_column_names: Optional[List[str]] = None
+    kv_section_dict: Dict = {}
+
+    # Iterate through all lines
+    for line in file_h:
+        # Strip ending of line
+        line = line.strip()
+
+        # Skip empty values
+        if line == "":
+            continue
+
+        # Skip line if it's all commas
+        if set(line) == {","}:
+            continue
+
+        # Check if header
+        header_match = HEADER_REGEX_MATCH.match(line)
+        if header_match:
+            # Yield the previous key-value section
+            if section_name is not None and not is_data_section:
+                yield section_name, sanitise_kv_section(section_name, kv_section_dict)
+
+            # Start the new section
+            section_name = pascal_case_to_snake_case(header_match.group(1))
+            is_data_section = section_name.endswith("_data")
+            data_column_names = None
+            kv_section_dict = {}
+            continue
+
+        # Skip any lines before the first section
+        if section_name is None:
+            continue
+
+        if not is_data_section:
+            # This should be a set of key, value pairs
+            line_split = line.split(",")
+            if len(line_split) < 2:
+                logger.error(f"Line '{line}' of section {section_name} is not a key, value pair")
+                raise ValueError
+            kv_section_dict[pascal_case_to_snake_case(line_split[0])] = line_split[1]
+        elif data_column_names is None:
+            # The first line of a data section is the header
+            data_column_names = list(
+                map(
+                    lambda header_iter: pascal_case_to_snake_case(header_iter),
+                    line.split(",")
+                )
+            )
+        else:
+            yield section_name, get_data_row_dict(data_column_names, line)
+
+    if section_name is None:
+        # Not sure how we got here
+        logger.error(f"Did not get a section name")
+        raise ValueError
+
+    # Yield the last section
+    if not is_data_section:
+        yield section_name, sanitise_kv_section(section_name, kv_section_dict)
+
+
+def iter_samplesheet_csv(samplesheet_csv: Union[Path, TextIO]) -> Iterator[Tuple[str, Dict]]:
+    """
+    Stream a samplesheet csv, yielding (section_name, parsed_section) events,
+    see iter_samplesheet_csv_lines for the event format.
+
+    Callers may stop iterating at any point, the file is closed when the generator is closed.
+    :param samplesheet_csv: Path to the samplesheet csv or a text stream
+    :return:
+    """
+    if isinstance(samplesheet_csv, TextIOBase):
+        yield from iter_samplesheet_csv_lines(samplesheet_csv)
+        return
+
+    if not isinstance(samplesheet_csv, Path):
+        raise ValueError(
+            f"Input csv path or stream is not a valid type, expected one of TextIO or Path"
+            f" but got {type(samplesheet_csv)}"
+        )
+
+    if not samplesheet_csv.is_file():
+        logger.error(f"Samplesheet file {samplesheet_csv} does not exist")
+        raise FileNotFoundError
+
+    # Read in the samplesheet
+    with open(samplesheet_csv, "r") as file_h:
+        yield from iter_samplesheet_csv_lines(file_h)
+
+
 def is_cloud_section_name(section_name: str) -> bool:
     """
     Cloud_TSO500L_Settings -> True
@@ -73,68 +224,128 @@ def is_cloud_section_name(section_name: str) -> bool:
     )
 
 
+# Section plugin entry points that have already been imported
+_loaded_section_entry_points: Set[str] = set()
+
+
+def load_section_entry_points(section_name: str) -> bool:
+    """
+    Import the third-party sections registered under the v2_samplesheet_maker.sections entry point group
+    for a section name, i.e an entry point named DragenGermline_Settings is imported when the samplesheet
+    has a DragenGermline_Settings or Cloud_DragenGermline_Settings section.
+
+    The entry point should point at the section class (or the module that defines it),
+    the section classes register themselves when their module is imported
+    :param section_name:
+    :return: True if any entry points were imported
+    """
+    from importlib.metadata import entry_points
+
+    stripped_section_name = get_stripped_section_name(section_name)
+
+    section_entry_points = list(
+        filter(
+            lambda entry_point_iter: (
+                # Entry point names are class headers, match both the json and csv forms of the section name
+                stripped_section_name in [
+                    get_stripped_section_name(entry_point_iter.name),
+                    get_stripped_section_name(convert_pascal_case_to_snake_case(entry_point_iter.name))
+                ] and
+                entry_point_iter.name not in _loaded_section_entry_points
+            ),
+            entry_points(group=SECTION_ENTRY_POINT_GROUP)
+        )
+    )
+
+    for section_entry_point in section_entry_points:
+        _loaded_section_entry_points.add(section_entry_point.name)
+        section_entry_point.load()
+
+    return len(section_entry_points) > 0
+
+
+def get_section_type(section_name: str) -> Type[Section]:
+    """
+    Get the section class for a section name, i.e Cloud_TSO500L_Settings -> CloudTSO500LSettingsSection
+    Plugin sections are imported the first time their section name is seen
+    :param section_name:
+    :return:
+    """
+    section_key = (get_stripped_section_name(section_name), is_cloud_section_name(section_name))
+
+    section_type = SECTION_REGISTRY.get(section_key, None)
+
+    if section_type is None and load_section_entry_points(section_name):
+        section_type = SECTION_REGISTRY.get(section_key, None)
+
+    if section_type is None:
+        logger.error(f"Did not get a known section name '{section_name}' is not a known section name")
+        raise ValueError
+
+    return section_type
+
+
+def get_section_row_count(section_obj: Section) -> int:
+    """
+    The number of rows of a section, a key-value section counts as a single row
+    :param section_obj:
+    :return:
+    """
+    if isinstance(section_obj, DataFrameSection):
+        return len(section_obj.data_rows)
+    return 1
+
+
+def write_samplesheet_dict_json(samplesheet_dict: Dict, output_file: Union[Path, TextIO]):
+    """
+    Write out a samplesheet dictionary (as returned by SampleSheet.to_dict) in json format
+    :param samplesheet_dict:
+    :param output_file: Path to the output json or a writable text stream
+    :return:
+    """
+    # Check if output file is a valid writable path
+    if isinstance(output_file, Path) and not output_file.parent.is_dir():
+        logger.error(f"Output file cannot be written because parent {output_file.parent} does not exist")
+        raise NotADirectoryError
+
+    # Write out to json file (or stream)
+    if isinstance(output_file, TextIOBase):
+        with profile_stage("json_write"):
+            json.dump(samplesheet_dict, output_file, indent=2)
+        # Write final newline
+        output_file.write("\n")
+        return
+
+    with open(output_file, "w") as file_h:
+        write_samplesheet_dict_json(samplesheet_dict, file_h)
+
+
 class SampleSheet:
     """
     SampleSheet object class
     """
 
-    _all_sections: List[Section] = [
-        # Run Info
-        HeaderSection,
-        ReadsSection,
-        SequencingSection,
-        # BCLConvert
-        BCLConvertSettingsSection,
-        BCLConvertDataSection,
-        # Cloud Settings
-        CloudSettingsSection,
-        CloudDataSection,
-        # TSO500S (Local and Cloud)
-        TSO500SSettingsSection,
-        CloudTSO500SSettingsSection,
-        TSO500SDataSection,
-        CloudTSO500SDataSection,
-        # TSO500L (Local and Cloud)
-        TSO500LSettingsSection,
-        CloudTSO500LSettingsSection,
-        TSO500LDataSection,
-        CloudTSO500LDataSection
-    ]
-
-    # Import Cloud settings last
-    # so we can copy over the urns from each of the settings
-    # Cloud_Data should also be last so we can
-    _import_sections_order = [
-        section_item
-        for section_item in _all_sections
-        if section_item not in [
-            CloudSettingsSection,
-            CloudDataSection
-        ]
-    ] + [
-        CloudSettingsSection,
-        CloudDataSection
-    ]
-
-    def __init__(self, sections_dict: Dict):
+    def __init__(self, sections_dict: Dict, engine: Optional[Union[DataFrameEngine, str]] = None):
         """
 
         :param sections_dict:
+        :param engine: The engine used to build each data section, one of 'pandas' or 'columnar'.
+          Defaults to the global engine (see set_dataframe_engine)
         """
-        # Make as function
-        class_headers_as_list = list(
-            map(lambda y: y._class_header.lower(), self._import_sections_order)
-        )
-        sections_dict_as_list = sorted(
-            map(
-                lambda dict_iter: {
-                    dict_iter[0]: dict_iter[1]
-                },
-                sections_dict.items()
-            ),
-            # Order by _import_sections_order
-            key=lambda x: class_headers_as_list.index(get_stripped_section_name(list(x.keys())[0]))
-        )
+        # Set the dataframe engine for the data sections
+        self.engine: Optional[DataFrameEngine] = DataFrameEngine(engine) if engine is not None else None
+
+        with profile_stage("section_sorting", rows=len(sections_dict)):
+            sections_dict_as_list = sorted(
+                map(
+                    lambda dict_iter: {
+                        dict_iter[0]: dict_iter[1]
+                    },
+                    sections_dict.items()
+                ),
+                # Cloud_Settings and Cloud_Data are read in last
+                key=lambda x: get_section_type(list(x.keys())[0])._import_rank
+            )
 
         # Run Info Section
         self.header_section: Optional[HeaderSection] = None
@@ -157,6 +368,9 @@ class SampleSheet:
         self.tso500l_settings_section: Optional[Union[TSO500LSettingsSection|CloudTSO500LSettingsSection]] = None
         self.tso500l_data_section: Optional[Union[TSO500LDataSection|CloudTSO500LDataSection]] = None
 
+        # The data section the Cloud_Data section was generated from (if generated), kept in sync as rows are edited
+        self._cloud_data_source_section_name: Optional[str] = None
+
         # Initialise the section list
         self.section_list = []  # List of non-empty sections
 
@@ -183,21 +397,20 @@ class SampleSheet:
         for section_dict in sections_dict_as_list:
             # Iterate over single dict
             for section_name, section_dict_or_list in section_dict.items():
-                try:
-                    stripped_section_name = get_stripped_section_name(section_name)
-                    is_cloud_name = is_cloud_section_name(section_name)
-                    # Get section type
-                    section_type: Section = next(
-                        filter(
-                            lambda section_type_iter: (
-                                section_type_iter._class_header.lower() == stripped_section_name and
-                                is_cloud_name == section_type_iter._is_cloud
-                            ),
-                            self._all_sections
-                        )
-                    )
-                except StopIteration:
-                    logger.error(f"Did not get a known section name '{section_name}' is not a known section name")
+                stripped_section_name = get_stripped_section_name(section_name)
+                is_cloud_name = is_cloud_section_name(section_name)
+                # Get section type
+                section_type: Type[Section] = get_section_type(section_name)
+
+                # Check the shape of the section, a key-value section is a dict and a data section is a list of dicts
+                if issubclass(section_type, KVSection) and not isinstance(section_dict_or_list, dict):
+                    logger.error(f"Expected section {section_name} to be an object but got {type(section_dict_or_list).__name__}")
+                    raise ValueError
+                if issubclass(section_type, DataFrameSection) and not (
+                        isinstance(section_dict_or_list, list) and
+                        all(map(lambda row_iter: isinstance(row_iter, dict), section_dict_or_list))
+                ):
+                    logger.error(f"Expected section {section_name} to be a list of objects")
                     raise ValueError
 
                 if section_type == CloudSettingsSection:
@@ -216,9 +429,10 @@ class SampleSheet:
                     )
 
                 if issubclass(section_type, KVSection):
-                    setattr(self, f"{section_type._class_header.lower()}_section", section_type(**section_dict_or_list))
+                    with profile_stage("validation", section=section_type, rows=1):
+                        setattr(self, f"{section_type._class_header.lower()}_section", section_type(**section_dict_or_list))
                 elif issubclass(section_type, DataFrameSection):
-                    setattr(self, f"{section_type._class_header.lower()}_section", section_type(*section_dict_or_list))
+                    setattr(self, f"{section_type._class_header.lower()}_section", section_type(*section_dict_or_list, engine=self.engine))
                 else:
                     logger.error(f"Section Type {section_type._class_header} for section name {section_name} is neither a key-value section nor a data section")
                     raise ValueError
@@ -249,10 +463,27 @@ class SampleSheet:
                         urs_bool_list.get(stripped_section_name, False) and
                         not has_cloud_data_section
                 ):
-                    # Coerce section type
-                    section_type: BCLConvertDataSection
-                    setattr(self, f"cloud_data_section", CloudDataSection(*section_type(*section_dict_or_list).get_cloud_data_list()))
+                    # Coerce section type, the rows of the section object are used as they are
+                    source_data_section: BCLConvertDataSection = section_obj
+                    with profile_stage("cloud_data", section=section_type, rows=len(section_dict_or_list)):
+                        cloud_data_list = source_data_section.get_cloud_data_list()
+                    setattr(
+                        self,
+                        f"cloud_data_section",
+                        CloudDataSection(
+                            *cloud_data_list,
+                            engine=self.engine
+                        )
+                    )
+                    self._cloud_data_source_section_name = f"{section_type._class_header.lower()}_section"
         # Set section list
+        self.set_section_list()
+
+    def set_section_list(self):
+        """
+        Collect the names of the non-empty section attributes, in the order they are written out
+        :return:
+        """
         self.section_list = list(
             map(
                 lambda dict_iter: dict_iter[0],
@@ -261,159 +492,319 @@ class SampleSheet:
                         lambda attribute_item: attribute_item[0].endswith("_section") and not attribute_item[1] is None,
                         self.__dict__.items()
                     ),
-                    # Order by sections list above
-                    key=lambda section_iter: self._all_sections.index(type(section_iter[1]))
+                    # Order by the rank of each section
+                    key=lambda section_iter: section_iter[1]._section_rank
                 )
             )
         )
 
-    def to_csv(self, output_file: Path):
+    @classmethod
+    def from_section_objects(
+        cls,
+        section_objs: Iterable[Section],
+        engine: Optional[Union[DataFrameEngine, str]] = None,
+        cloud_data_source_section_name: Optional[str] = None
+    ) -> "SampleSheet":
+        """
+        Build a samplesheet from section objects that have already been validated (i.e the sections of another samplesheet),
+        the section objects are used as they are
+        :param section_objs:
+        :param engine: The engine used to build each data section, one of 'pandas' or 'columnar'
+        :param cloud_data_source_section_name: The section attribute (i.e bclconvert_data_section)
+          the Cloud_Data section was generated from, if any, so it is kept in sync as rows are edited
+        :return:
+        """
+        samplesheet = cls({}, engine=engine)
+
+        for section_obj in section_objs:
+            setattr(samplesheet, f"{section_obj._class_header.lower()}_section", section_obj)
+
+        if (
+                cloud_data_source_section_name is not None and
+                getattr(samplesheet, cloud_data_source_section_name, None) is not None and
+                samplesheet.cloud_data_section is not None
+        ):
+            samplesheet._cloud_data_source_section_name = cloud_data_source_section_name
+
+        samplesheet.set_section_list()
+
+        return samplesheet
+
+    def get_data_section(self, section_name: str) -> DataFrameSection:
+        """
+        Get a data section of the samplesheet by name, i.e bclconvert_data or Cloud_TSO500S_Data
+        :param section_name:
+        :return:
+        """
+        section_type = get_section_type(section_name)
+        section_obj = getattr(self, f"{section_type._class_header.lower()}_section", None)
+
+        if not issubclass(section_type, DataFrameSection) or not isinstance(section_obj, section_type):
+            logger.error(f"The samplesheet does not have a {section_name} data section")
+            raise ValueError
+
+        return section_obj
+
+    def add_rows(self, section_name: str, *data_row_dicts: Dict) -> List[DataFrameSectionRow]:
+        """
+        Add rows to a data section, only the new rows are validated.
+        If the Cloud_Data section was generated from this section, the Cloud_Data rows of the new rows are added too
+        :param section_name: i.e bclconvert_data
+        :param data_row_dicts: Row dictionaries, in the same form as the json input
+        :return: The new rows
+        """
+        section_obj = self.get_data_section(section_name)
+
+        new_data_rows = section_obj.add_rows(*data_row_dicts)
+
+        # The generated Cloud_Data rows are in the same order as the rows of their source section
+        if self.is_cloud_data_source(section_obj):
+            with profile_stage("cloud_data", section=section_obj, rows=len(new_data_rows)):
+                new_cloud_data_dicts = list(
+                    map(
+                        lambda data_row_iter: data_row_iter.get_cloud_data_row(),
+                        new_data_rows
+                    )
+                )
+            self.cloud_data_section.add_rows(*new_cloud_data_dicts)
+
+        return new_data_rows
+
+    def remove_rows(self, section_name: str, *row_keys: Union[str, Tuple[Optional[int], str]]) -> List[DataFrameSectionRow]:
+        """
+        Remove the rows of a data section with the given keys (and their generated Cloud_Data rows)
+        :param section_name: i.e bclconvert_data
+        :param row_keys: (lane, sample_id) tuples, or just sample ids for sections without a Lane column
+        :return: The removed rows
+        """
+        section_obj = self.get_data_section(section_name)
+
+        removed_positions = section_obj.get_rows_positions(*row_keys)
+        removed_data_rows = section_obj.remove_rows_at(removed_positions)
+
+        if self.is_cloud_data_source(section_obj):
+            self.cloud_data_section.remove_rows_at(removed_positions)
+
+        return removed_data_rows
+
+    def update_row(self, section_name: str, row_key: Union[str, Tuple[Optional[int], str]], **values) -> DataFrameSectionRow:
+        """
+        Update the values of a single row of a data section (and its generated Cloud_Data row)
+        :param section_name: i.e bclconvert_data
+        :param row_key: A (lane, sample_id) tuple, or just the sample_id for sections without a Lane column
+        :param values: The values to update, in the same form as the json input, a value of None removes the value
+        :return: The updated row
+        """
+        section_obj = self.get_data_section(section_name)
+
+        position = section_obj.get_row_position(row_key)
+        updated_data_row = section_obj.update_row_at(position, **values)
+
+        if self.is_cloud_data_source(section_obj):
+            with profile_stage("cloud_data", section=section_obj, rows=1):
+                cloud_data_dict = updated_data_row.get_cloud_data_row()
+            self.cloud_data_section.set_row_at(
+                position,
+                self.cloud_data_section.validate_data_rows([deepcopy(cloud_data_dict)])[0]
+            )
+
+        return updated_data_row
+
+    def is_cloud_data_source(self, section_obj: DataFrameSection) -> bool:
+        """
+        Check if the generated Cloud_Data section of the samplesheet was generated from a data section
+        :param section_obj:
+        :return:
+        """
+        return (
+            self._cloud_data_source_section_name is not None and
+            getattr(self, self._cloud_data_source_section_name) is section_obj
+        )
+
+    def to_csv(self, output_file: Union[Path, TextIO]):
         """
         Write out the samplesheet in csv format (well ini format but with a csv suffix)
+        :param output_file: Path to the output csv or a writable text stream
         :return:
         """
+        # Write directly to streams
+        if isinstance(output_file, TextIOBase):
+            self.write_csv(output_file)
+            return
+
         if isinstance(output_file, Path) and not output_file.parent.is_dir():
             logger.error(f"Output file cannot be written because parent {output_file.parent} does not exist")
             raise NotADirectoryError
 
         with open(output_file, "w") as file_h:
-            for index, section_item in enumerate(self.section_list):
-                add_new_line_after_section: bool = False if index == len(self.section_list) - 1 else True
-                section_obj: Section = getattr(self, section_item)
+            self.write_csv(file_h)
+
+    def write_csv(self, file_h: TextIO):
+        """
+        Write out each section of the samplesheet to a text stream
+        :param file_h:
+        :return:
+        """
+        for index, section_item in enumerate(self.section_list):
+            add_new_line_after_section: bool = False if index == len(self.section_list) - 1 else True
+            section_obj: Section = getattr(self, section_item)
+            with profile_stage("render_csv", section=section_obj, rows=get_section_row_count(section_obj)):
                 section_obj.write_section(file_h, add_new_line_after_section=add_new_line_after_section)
 
-    def to_json(self, output_file: Path):
+    def to_csv_string(self) -> str:
+        """
+        Render the samplesheet in csv format in memory
+        :return:
+        """
+        output_h = StringIO()
+        self.write_csv(output_h)
+        return output_h.getvalue()
+
+    def to_json(self, output_file: Union[Path, TextIO]):
         """
         Write out the samplesheet in json format
         We use this in the samplesheet reader
-        :param output_file:
+        :param output_file: Path to the output json or a writable text stream
         :return:
         """
-        # Check if output file is a valid writable path
-        if isinstance(output_file, Path) and not output_file.parent.is_dir():
-            logger.error(f"Output file cannot be written because parent {output_file.parent} does not exist")
-            raise NotADirectoryError
+        write_samplesheet_dict_json(self.to_dict(), output_file)
+
+    def write_json(self, file_h: TextIO):
+        """
+        Write out the samplesheet in json format to a text stream
+        :param file_h:
+        :return:
+        """
+        write_samplesheet_dict_json(self.to_dict(), file_h)
+
+    def to_dict(self) -> Dict:
+        """
+        Get the samplesheet as a dictionary (the same format as the json input)
+        Key-value sections are dicts, data sections are lists of dicts
+        :return:
+        """
+        samplesheet_dict = {}
+        for section_item in self.section_list:
+            section_obj: Section = getattr(self, section_item)
+            with profile_stage("render_json", section=section_obj, rows=get_section_row_count(section_obj)):
+                if isinstance(section_obj, DataFrameSection):
+                    samplesheet_dict[section_obj.print_class_header_json()] = section_obj.to_json_list()
+                else:
+                    samplesheet_dict[section_obj.print_class_header_json()] = section_obj.to_json_dict()
 
-        # Write sections to jsonlines file
-        temp_jsonl_file = NamedTemporaryFile(suffix=".jsonl")
-        with open(temp_jsonl_file.name, "w") as file_h:
-            for index, section_item in enumerate(self.section_list):
-                section_obj: Section = getattr(self, section_item)
-                section_obj.write_section_json(file_h)
-                file_h.write("\n")
+        return samplesheet_dict
 
-        # Read in jsonlines from temp fileins
+    def to_record_dict(self) -> Dict:
+        """
+        Get the samplesheet as a dictionary of the values written to the csv, the same form as a samplesheet csv read in.
+        Key-value sections are as in to_dict, data sections are the (snake case) rows of the csv,
+        so unlike to_dict every column of a row is kept (i.e the AdapterStringency of a BCLConvert_Data row),
+        and the rows are cleaned as in the csv (i.e the duplicate rows of a generated Cloud_Data section are dropped)
+        :return:
+        """
         samplesheet_dict = {}
-        with open(temp_jsonl_file.name, "r") as file_h:
-            for line in file_h:
-                samplesheet_dict.update(json.loads(line.strip()))
+        for section_item in self.section_list:
+            section_obj: Section = getattr(self, section_item)
+            if isinstance(section_obj, DataFrameSection):
+                samplesheet_dict[section_obj.print_class_header_json()] = section_obj.to_record_list()
+            else:
+                samplesheet_dict[section_obj.print_class_header_json()] = section_obj.to_json_dict()
 
-        # Write out to json file
-        with open(output_file, "w") as file_h:
-            json.dump(
-                samplesheet_dict,
-                file_h,
-                indent=2
+        return samplesheet_dict
+
+    def diff(self, other: Union["SampleSheet", Dict]) -> Dict:
+        """
+        Find the differences between this samplesheet and another, section by section.
+        Data rows are matched on their (lane, sample_id) key and key-value sections on each key,
+        so the order of the rows makes no difference.
+        Samplesheets are compared in their csv form (see to_record_dict)
+        :param other: The revised samplesheet, a SampleSheet object or a samplesheet dictionary (as used by SampleSheet)
+        :return: See get_samplesheet_dict_diff
+        """
+        from .samplesheet_diff import get_samplesheet_dict_diff
+
+        if isinstance(other, Dict):
+            other = SampleSheet(deepcopy(other), engine=self.engine)
+        elif not isinstance(other, SampleSheet):
+            raise ValueError(
+                f"Samplesheet is not a valid type, expected one of SampleSheet or Dict"
+                f" but got {type(other)}"
             )
-            # Write final newline
-            file_h.write("\n")
+
+        return get_samplesheet_dict_diff(self.to_record_dict(), other.to_record_dict())
+
+    def split(self, split_key: Union[SampleSheetSplitKey, str]) -> Dict[Any, "SampleSheet"]:
+        """
+        Split the samplesheet into shards, one for each value of the split key, in a single pass over the data rows,
+        see classes/samplesheet_split.py
+        :param split_key: One of lane, sample_project, override_cycles or index_length
+        :return: A shard samplesheet for each value of the split key, in the order each value is first seen
+        """
+        from .samplesheet_split import split_samplesheet
+
+        return split_samplesheet(self, split_key)
 
     @classmethod
-    def read_from_samplesheet_csv(cls, samplesheet_csv: Path) -> "SampleSheet":
+    def merge(
+        cls,
+        *samplesheets: Union["SampleSheet", Dict],
+        engine: Optional[Union[DataFrameEngine, str]] = None
+    ) -> "SampleSheet":
         """
-        Read in a samplesheet from a csv file
-        :param samplesheet_csv:
+        Merge samplesheets into one, identical data rows are dropped,
+        and the merged samplesheet is only built (and validated) once.
+        A data row key (lane, sample_id) or a key-value setting with different values in two samplesheets
+        raises a ValueError, see classes/samplesheet_merge.py
+        :param samplesheets: SampleSheet objects or samplesheet dictionaries (as used by SampleSheet)
+        :param engine: The engine used to build each data section, one of 'pandas' or 'columnar'
         :return:
         """
-        if not samplesheet_csv.is_file():
-            logger.error(f"Samplesheet file {samplesheet_csv} does not exist")
-            raise FileNotFoundError
-
-        # Read in the samplesheet
-        with open(samplesheet_csv, "r") as file_h:
-            samplesheet_dict = {}
-            section_name = None
-            section_lines = []
-            # Iterate through all lines
-            for line in file_h:
-                # Strip ending of line
-                line = line.strip()
-
-                # Skip empty values
-                if line == "":
-                    continue
-
-                # Skip line if it's all commas
-                if all(list(map(lambda char_iter_: char_iter_ == ",", list(line)))):
-                    continue
-
-                # Check if header
-                if HEADER_REGEX_MATCH.match(line):
-                    if section_name is not None:
-                        samplesheet_dict[section_name] = section_lines
-                    section_name = HEADER_REGEX_MATCH.match(line).group(1)
-                    section_lines = []
-                else:
-                    section_lines.append(line)
-            # Add the last section
-            if section_name is not None:
-                samplesheet_dict[section_name] = section_lines
+        from .samplesheet_merge import SampleSheetMerger
+
+        merger = SampleSheetMerger()
+        for samplesheet in samplesheets:
+            if isinstance(samplesheet, SampleSheet):
+                merger.add_samplesheet(samplesheet)
+            elif isinstance(samplesheet, Dict):
+                merger.add_samplesheet_dict(deepcopy(samplesheet))
             else:
-                # Not sure how we got here
-                logger.error(f"Did not get a section name")
-                raise ValueError
+                raise ValueError(
+                    f"Samplesheet is not a valid type, expected one of SampleSheet or Dict"
+                    f" but got {type(samplesheet)}"
+                )
 
-        # Convert all pascal case to snake case for both section names and values
+        return cls(merger.get_samplesheet_dict(), engine=engine)
+
+    @classmethod
+    def read_from_samplesheet_csv(
+        cls,
+        samplesheet_csv: Union[Path, TextIO],
+        engine: Optional[Union[DataFrameEngine, str]] = None
+    ) -> "SampleSheet":
+        """
+        Read in a samplesheet from a csv file
+        :param samplesheet_csv: Path to the samplesheet csv or a text stream
+        :param engine: The engine used to build each data section, one of 'pandas' or 'columnar'
+        :return:
+        """
         samplesheet_dict_sanitised = {}
-        for section_name, section_lines in samplesheet_dict.items():
-            sanitised_section_name = pascal_case_to_snake_case(section_name)
-
-            if sanitised_section_name.endswith("_data"):
-                # This should be a list of dicts
-                sanitised_section_values = pd.DataFrame(
-                    columns=list(
-                        map(
-                            lambda header_iter: pascal_case_to_snake_case(header_iter),
-                            section_lines[0].split(",")
-                        )
-                    ),
-                    data=list(
-                        map(
-                            lambda row_iter: row_iter.split(","),
-                            section_lines[1:]
-                        )
+        with profile_stage("csv_parse") as stage_counts:
+            for section_name, section_values in iter_samplesheet_csv(samplesheet_csv):
+                if section_name.endswith("_data"):
+                    # Collect each row of the data section
+                    samplesheet_dict_sanitised.setdefault(section_name, []).append(section_values)
+                else:
+                    samplesheet_dict_sanitised[section_name] = section_values
+
+            if stage_counts is not None:
+                stage_counts["rows"] = sum(
+                    map(
+                        lambda section_values_iter: (
+                            len(section_values_iter) if isinstance(section_values_iter, list) else 1
+                        ),
+                        samplesheet_dict_sanitised.values()
                     )
-                ).replace(
-                    # Coerce '' to pd.NA
-                    "", pd.NA
                 )
-                sanitised_section_values = sanitised_section_values.to_dict(orient="records")
-            else:
-                # This should be a set of key, value pairs
-                sanitised_section_values = {
-                    pascal_case_to_snake_case(line_iter.split(",")[0]): line_iter.split(",")[1]
-                    for line_iter in section_lines
-                }
-
-            # Update the new samplesheet dict
-            samplesheet_dict_sanitised[sanitised_section_name] = sanitised_section_values
-
-        # Perform exception to Sequence model library_prep_kits and convert to a list
-        if "sequencing" in samplesheet_dict_sanitised.keys():
-            if "library_prep_kits" in samplesheet_dict_sanitised["sequencing"].keys():
-                samplesheet_dict_sanitised["sequencing"]["library_prep_kits"] = (
-                    samplesheet_dict_sanitised["sequencing"]["library_prep_kits"].split(";")
-                )
-
-        # Perform exception to Cloud_Settings, find all keys that end with _pipeline and append to analysis_urns dict
-        if "cloud_settings" in samplesheet_dict_sanitised.keys():
-            cloud_settings = samplesheet_dict_sanitised["cloud_settings"]
-            cloud_analysis_urns = {}
-            for key, value in cloud_settings.items():
-                if key.endswith("_pipeline") and value.startswith("urn:"):
-                    cloud_analysis_urns[key] = value
-            cloud_settings["analysis_urns"] = cloud_analysis_urns
-            samplesheet_dict_sanitised["cloud_settings"] = cloud_settings
 
         # Return the samplesheet object
-        return cls(samplesheet_dict_sanitised)
+        return cls(samplesheet_dict_sanitised, engine=engine)
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+
+"""
+Find the differences between two samplesheets, section by section.
+
+Samplesheets are compared as samplesheet dictionaries (as returned by SampleSheet.to_dict),
+so the row order and column pruning of the rendered csv make no difference.
+
+* Key-value sections are compared key by key
+* Data rows are hash-joined on their (lane, sample_id) key, then compared field by field.
+  Where a key has more than one row on either side (i.e the generated Cloud_Data section, which has a row per lane),
+  the rows of that key are compared as a multiset of whole rows, so only rows missing from one side are reported
+
+Every section is read once on each side, so a diff takes linear time in the number of rows.
+"""
+
+# Standard imports
+import json
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+# Type of a (lane, sample_id) row key
+RowKey = Tuple[Optional[int], Optional[str]]
+
+
+def get_data_row_key(data_row: Dict) -> RowKey:
+    """
+    Get the (lane, sample_id) key of a data row dictionary, the lane is None for sections without a lane
+    :param data_row:
+    :return:
+    """
+    return data_row.get("lane", None), data_row.get("sample_id", None)
+
+
+def get_row_hash(data_row: Dict) -> str:
+    """
+    Get a hashable representation of a whole data row
+    :param data_row:
+    :return:
+    """
+    return json.dumps(data_row, sort_keys=True, default=str)
+
+
+def get_changed_fields(old_dict: Dict, new_dict: Dict) -> List[Dict]:
+    """
+    Compare two dictionaries key by key, a missing key is treated as None
+    :param old_dict:
+    :param new_dict:
+    :return: A list of dictionaries with the keys field, old and new
+    """
+    return list(
+        map(
+            lambda field_iter: {
+                "field": field_iter,
+                "old": old_dict.get(field_iter, None),
+                "new": new_dict.get(field_iter, None),
+            },
+            filter(
+                lambda field_iter: old_dict.get(field_iter, None) != new_dict.get(field_iter, None),
+                # Keep the field order of the new dict, then any fields only in the old dict
+                dict.fromkeys(list(new_dict.keys()) + list(old_dict.keys()))
+            )
+        )
+    )
+
+
+def group_data_rows(data_rows: List[Dict]) -> Dict[RowKey, List[Dict]]:
+    """
+    Group data rows by their (lane, sample_id) key, keeping the order each key is first seen in
+    :param data_rows:
+    :return:
+    """
+    data_rows_by_key: Dict[RowKey, List[Dict]] = {}
+    for data_row in data_rows:
+        data_rows_by_key.setdefault(get_data_row_key(data_row), []).append(data_row)
+    return data_rows_by_key
+
+
+def get_data_section_diff(old_data_rows: List[Dict], new_data_rows: List[Dict]) -> Dict:
+    """
+    Hash-join the rows of a data section on their (lane, sample_id) key
+    :param old_data_rows:
+    :param new_data_rows:
+    :return: A dictionary with the keys
+      * added_rows: Rows only in the new section
+      * removed_rows: Rows only in the old section
+      * changed_rows: For each key with a single row on both sides whose values differ,
+        a dictionary with the keys lane, sample_id and fields (a list of field / old / new dictionaries)
+    """
+    old_data_rows_by_key = group_data_rows(old_data_rows)
+    new_data_rows_by_key = group_data_rows(new_data_rows)
+
+    added_rows = []
+    removed_rows = []
+    changed_rows = []
+
+    for row_key, new_key_rows in new_data_rows_by_key.items():
+        old_key_rows = old_data_rows_by_key.get(row_key, [])
+
+        # Matched one to one, compare field by field
+        if len(old_key_rows) == 1 and len(new_key_rows) == 1:
+            changed_fields = get_changed_fields(old_key_rows[0], new_key_rows[0])
+            if len(changed_fields) > 0:
+                changed_rows.append({
+                    "lane": row_key[0],
+                    "sample_id": row_key[1],
+                    "fields": changed_fields,
+                })
+            continue
+
+        # Otherwise compare the rows of the key as multisets of whole rows
+        old_row_counts = Counter(map(get_row_hash, old_key_rows))
+        for new_row in new_key_rows:
+            new_row_hash = get_row_hash(new_row)
+            if old_row_counts[new_row_hash] > 0:
+                old_row_counts[new_row_hash] -= 1
+            else:
+                added_rows.append(new_row)
+
+        new_row_counts = Counter(map(get_row_hash, new_key_rows))
+        for old_row in old_key_rows:
+            old_row_hash = get_row_hash(old_row)
+            if new_row_counts[old_row_hash] > 0:
+                new_row_counts[old_row_hash] -= 1
+            else:
+                removed_rows.append(old_row)
+
+    # Keys only in the old section
+    for row_key, old_key_rows in old_data_rows_by_key.items():
+        if row_key not in new_data_rows_by_key:
+            removed_rows.extend(old_key_rows)
+
+    return {
+        "added_rows": added_rows,
+        "removed_rows": removed_rows,
+        "changed_rows": changed_rows,
+    }
+
+
+def get_samplesheet_dict_diff(old_samplesheet_dict: Dict[str, Any], new_samplesheet_dict: Dict[str, Any]) -> Dict:
+    """
+    Find the differences between two samplesheet dictionaries (as returned by SampleSheet.to_dict)
+
+    :param old_samplesheet_dict:
+    :param new_samplesheet_dict:
+    :return: A dictionary with the keys
+      * has_differences: True if any section differs
+      * sections: A dictionary for each section that differs, with the keys
+        * section: The section name, i.e bclconvert_data
+        * status: One of added, removed or changed
+        * For key-value sections, changed_fields: A list of field / old / new dictionaries
+        * For data sections, added_rows, removed_rows and changed_rows (see get_data_section_diff)
+    """
+    section_diffs = []
+
+    for section_name in dict.fromkeys(list(old_samplesheet_dict.keys()) + list(new_samplesheet_dict.keys())):
+        old_section = old_samplesheet_dict.get(section_name, None)
+        new_section = new_samplesheet_dict.get(section_name, None)
+
+        if old_section is None:
+            status = "added"
+        elif new_section is None:
+            status = "removed"
+        else:
+            status = "changed"
+
+        is_data_section = isinstance(old_section if old_section is not None else new_section, list)
+
+        if is_data_section:
+            section_diff = get_data_section_diff(old_section or [], new_section or [])
+            has_differences = any(map(len, section_diff.values()))
+        else:
+            section_diff = {"changed_fields": get_changed_fields(old_section or {}, new_section or {})}
+            has_differences = len(section_diff["changed_fields"]) > 0
+
+        if status == "changed" and not has_differences:
+            continue
+
+        section_diffs.append({
+            "section": section_name,
+            "status": status,
+            **section_diff
+        })
+
+    return {
+        "has_differences": len(section_diffs) > 0,
+        "sections": section_diffs,
+    }
+
+
+def get_row_key_str(lane: Optional[int], sample_id: Optional[str]) -> str:
+    """
+    i.e lane=1 sample_id=MySample, or sample_id=MySample for sections without a lane
+    :param lane:
+    :param sample_id:
+    :return:
+    """
+    if lane is None:
+        return f"sample_id={sample_id}"
+    return f"lane={lane} sample_id={sample_id}"
+
+
+def get_samplesheet_diff_lines(samplesheet_diff: Dict) -> List[str]:
+    """
+    Describe a samplesheet diff (as returned by get_samplesheet_dict_diff) one difference per line
+    :param samplesheet_diff:
+    :return:
+    """
+    diff_lines = []
+
+    for section_diff in samplesheet_diff["sections"]:
+        section_name = section_diff["section"]
+
+        if section_diff["status"] != "changed":
+            diff_lines.append(f"{section_name}: section {section_diff['status']}")
+            continue
+
+        for changed_field in section_diff.get("changed_fields", []):
+            diff_lines.append(
+                f"{section_name}: changed {changed_field['field']}: {changed_field['old']} -> {changed_field['new']}"
+            )
+
+        for added_row in section_diff.get("added_rows", []):
+            diff_lines.append(f"{section_name}: added {get_row_key_str(*get_data_row_key(added_row))}")
+
+        for removed_row in section_diff.get("removed_rows", []):
+            diff_lines.append(f"{section_name}: removed {get_row_key_str(*get_data_row_key(removed_row))}")
+
+        for changed_row in section_diff.get("changed_rows", []):
+            diff_lines.append(
+                f"{section_name}: changed {get_row_key_str(changed_row['lane'], changed_row['sample_id'])} " +
+                ", ".join(
+                    map(
+                        lambda changed_field_iter: (
+                            f"{changed_field_iter['field']}: {changed_field_iter['old']} -> {changed_field_iter['new']}"
+                        ),
+                        changed_row["fields"]
+                    )
+                )
+            )
+
+    return diff_lines
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+
+"""
+Merge many samplesheets into one, i.e a flowcell samplesheet from per-project samplesheet fragments.
+
+Samplesheets are fed to a SampleSheetMerger one section (or one data row) at a time,
+in the same form as the json input (or the events of iter_samplesheet_csv),
+so every input is read in a single pass.
+
+* Key-value sections are merged key by key, a key with different values in two samplesheets is a conflict.
+  Nested dictionaries (i.e the analysis_urns of the Cloud_Settings section) are merged the same way
+* Data rows that are identical to a row already merged are dropped
+* Data rows are keyed on (lane, sample_id), a key may have any number of rows within a samplesheet
+  (i.e a sample with several indexes), but a row for a key that was first seen in another samplesheet
+  must be identical to one of its rows, otherwise it is a conflict
+
+Data rows are validated through the row class of their section, then compared in their csv form,
+so a row of a samplesheet json (barcode_mismatches_index_1 = 1) matches the same row read from a samplesheet csv ('1.0').
+The values that only generate the Cloud_Data section (i.e the kit names of a BCLConvert_Data row) are not part of the csv form,
+a samplesheet that would generate its Cloud_Data section (see SampleSheet.populate_sections)
+has the generated rows merged into the Cloud_Data section instead.
+Key-value values are compared by their string form, so the values of a samplesheet csv ('1')
+match the values of a samplesheet json (1).
+"""
+
+# Standard imports
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Type, Union, TYPE_CHECKING
+
+# Relative imports
+from ..utils.logger import get_logger
+from .samplesheet import get_section_type, get_stripped_section_name, is_cloud_section_name
+from .samplesheet_diff import RowKey, get_row_key_str
+from .super_sections import DataFrameSection, DataFrameSectionRow, Section, get_normalised_row_key
+
+if TYPE_CHECKING:
+    from .samplesheet import SampleSheet
+
+# Get logging
+logger = get_logger()
+
+# Type of a hashable data row
+RowHash = Tuple[Tuple[str, Any], ...]
+
+
+def get_comparable_value(value: Any) -> Any:
+    """
+    Get a hashable form of a value, that compares equal between csv and json inputs, i.e 1 and '1', or False and 'False'
+    :param value:
+    :return:
+    """
+    if isinstance(value, dict):
+        return tuple(
+            sorted(
+                map(
+                    lambda item_iter: (item_iter[0], get_comparable_value(item_iter[1])),
+                    filter(lambda item_iter: item_iter[1] is not None, value.items())
+                )
+            )
+        )
+    if isinstance(value, (list, tuple)):
+        return tuple(map(get_comparable_value, value))
+    # Booleans are written out as True / False but may be read in as true / false
+    if str(value).lower() in ["true", "false"]:
+        return str(value).lower()
+    return str(value)
+
+
+def get_row_hash(data_row: Dict) -> RowHash:
+    """
+    Get a hashable form of a (validated) data row, empty values are ignored
+    :param data_row:
+    :return:
+    """
+    return get_comparable_value(data_row)
+
+
+def get_merge_row_key(data_row: Dict) -> RowKey:
+    """
+    Get the (lane, sample_id) key of a data row, the lane of a csv row is converted to an integer
+    :param data_row:
+    :return:
+    """
+    try:
+        return get_normalised_row_key((data_row.get("lane", None), data_row.get("sample_id", None)))
+    except ValueError:
+        logger.error(f"Could not read the lane of data row {data_row}")
+        raise
+
+
+class SampleSheetMerger:
+    """
+    Merge samplesheets one section (or one data row) at a time
+
+        merger = SampleSheetMerger()
+        merger.add_samplesheet_dict(samplesheet_dict_1, source_name="project_1.json")
+        merger.add_samplesheet_dict(samplesheet_dict_2, source_name="project_2.json")
+        samplesheet = SampleSheet(merger.get_samplesheet_dict())
+    """
+
+    def __init__(self):
+        # The name of each samplesheet added, used in error messages
+        self.source_names: List[str] = []
+
+        # The first name each section class was seen under, and the merged section
+        self.section_names: Dict[Type[Section], str] = {}
+        self.kv_sections: Dict[Type[Section], Dict] = {}
+        self.data_sections: Dict[Type[Section], List[Dict]] = {}
+
+        # The samplesheet (index into source_names) each key-value key or data row key was first seen in
+        self.kv_key_sources: Dict[Tuple[Type[Section], Tuple[str, ...]], int] = {}
+        self.row_key_sources: Dict[Type[Section], Dict[RowKey, int]] = {}
+        self.row_hashes: Dict[Type[Section], Set[RowHash]] = {}
+
+        # The samplesheets with rows in any data section, and with rows in the Cloud_Data section
+        self.sources_with_data_rows: Set[int] = set()
+        self.sources_with_cloud_data: Set[int] = set()
+
+        self.duplicate_row_count = 0
+
+        # The (stripped) section names of the current samplesheet, the data sections whose settings have an urn,
+        # and the rows of each data section that could generate the Cloud_Data section, see finish_samplesheet
+        self.source_section_names: Set[str] = set()
+        self.source_urn_data_section_names: Set[str] = set()
+        self.source_cloud_data_source_rows: Dict[Type[Section], List[DataFrameSectionRow]] = {}
+
+    def start_samplesheet(self, source_name: Optional[str] = None):
+        """
+        Start a new samplesheet, every section or row added until the next samplesheet is started belongs to it
+        :param source_name: i.e the path of the samplesheet, defaults to 'samplesheet <n>'
+        :return:
+        """
+        if len(self.source_names) > 0:
+            self.finish_samplesheet()
+
+        self.source_names.append(
+            source_name if source_name is not None else f"samplesheet {len(self.source_names) + 1}"
+        )
+
+    def finish_samplesheet(self):
+        """
+        Finish the current samplesheet.
+        As in SampleSheet, a samplesheet without a Cloud_Data section generates one
+        from the rows of the last data section whose settings have an urn,
+        the generated rows are merged into the Cloud_Data section
+        :return:
+        """
+        cloud_data_source_section_types = sorted(
+            filter(
+                lambda section_type_iter: (
+                    get_stripped_section_name(section_type_iter._class_header) in self.source_urn_data_section_names
+                ),
+                self.source_cloud_data_source_rows.keys()
+            ),
+            key=lambda section_type_iter: section_type_iter._import_rank
+        )
+
+        if "cloud_data" not in self.source_section_names and len(cloud_data_source_section_types) > 0:
+            cloud_data_section_type = self.get_section_type("cloud_data")
+            for data_row_obj in self.source_cloud_data_source_rows[cloud_data_source_section_types[-1]]:
+                self.add_section_type_data_row(cloud_data_section_type, data_row_obj.get_cloud_data_row())
+
+        self.source_section_names = set()
+        self.source_urn_data_section_names = set()
+        self.source_cloud_data_source_rows = {}
+
+    @property
+    def source_index(self) -> int:
+        if len(self.source_names) == 0:
+            self.start_samplesheet()
+        return len(self.source_names) - 1
+
+    def get_section_type(self, section_name: str) -> Type[Section]:
+        """
+        Get the section class of a section name, keeping the first name each section class was seen under
+        :param section_name:
+        :return:
+        """
+        section_type = get_section_type(section_name)
+
+        # i.e tso500s_settings and cloud_tso500s_settings are different classes that fill the same samplesheet section
+        clashing_section_name = next(
+            filter(
+                lambda section_item_iter: (
+                    section_item_iter[0] is not section_type and
+                    section_item_iter[0]._class_header.lower() == section_type._class_header.lower()
+                ),
+                self.section_names.items()
+            ),
+            (None, None)
+        )[1]
+        if clashing_section_name is not None:
+            logger.error(
+                f"Cannot merge the {section_name} section of {self.source_names[self.source_index]} "
+                f"with the {clashing_section_name} section of another samplesheet"
+            )
+            raise ValueError
+
+        self.section_names.setdefault(section_type, section_name)
+        self.source_section_names.add(get_stripped_section_name(section_type._class_header))
+
+        return section_type
+
+    def merge_kv_dict(
+        self,
+        section_type: Type[Section],
+        merged_dict: Dict,
+        section_dict: Dict,
+        key_path: Tuple[str, ...] = ()
+    ):
+        """
+        Merge a key-value dictionary into the merged dictionary, key by key
+        :param section_type:
+        :param merged_dict:
+        :param section_dict:
+        :param key_path: The keys of the parent dictionaries, i.e ('analysis_urns',)
+        :return:
+        """
+        for key, value in section_dict.items():
+            if value is None:
+                continue
+
+            merged_value = merged_dict.get(key, None)
+
+            if isinstance(value, dict):
+                if merged_value is None:
+                    merged_value = merged_dict[key] = {}
+                self.merge_kv_dict(section_type, merged_value, value, key_path + (key,))
+                continue
+
+            if merged_value is None:
+                merged_dict[key] = value
+                self.kv_key_sources[(section_type, key_path + (key,))] = self.source_index
+                continue
+
+            if get_comparable_value(merged_value) != get_comparable_value(value):
+                logger.error(
+                    f"Conflicting values for '{'.'.join(key_path + (key,))}' in the "
+                    f"{self.section_names[section_type]} section, "
+                    f"'{merged_value}' in {self.source_names[self.kv_key_sources[(section_type, key_path + (key,))]]} "
+                    f"and '{value}' in {self.source_names[self.source_index]}"
+                )
+                raise ValueError
+
+    def add_kv_section(self, section_name: str, section_dict: Dict):
+        """
+        Merge a key-value section
+        :param section_name:
+        :param section_dict:
+        :return:
+        """
+        section_type = self.get_section_type(section_name)
+        self.merge_kv_dict(section_type, self.kv_sections.setdefault(section_type, {}), section_dict)
+
+        # The data section of a settings section with an urn may generate the Cloud_Data section
+        stripped_section_name = get_stripped_section_name(section_type._class_header)
+        if (
+                (is_cloud_section_name(section_type._class_header) or stripped_section_name == "bclconvert_settings") and
+                section_dict.get("urn", None) is not None
+        ):
+            self.source_urn_data_section_names.add(stripped_section_name.replace("_settings", "_data"))
+
+    def add_data_row(self, section_name: str, data_row: Dict):
+        """
+        Merge a data row, identical rows are dropped
+        :param section_name:
+        :param data_row:
+        :return:
+        """
+        section_type = self.get_section_type(section_name)
+        self.add_section_type_data_row(section_type, data_row)
+
+    def add_section_type_data_row(self, section_type: Type[Section], data_row: Dict):
+        """
+        Validate then merge a data row of a section class
+        :param section_type:
+        :param data_row:
+        :return:
+        """
+        try:
+            data_row_obj = section_type._row_obj(**data_row)
+        except ValueError:
+            logger.error(
+                f"Could not validate the row {data_row} of the {self.section_names[section_type]} section "
+                f"in {self.source_names[self.source_index]}"
+            )
+            raise
+
+        self.add_section_type_data_row_obj(section_type, data_row_obj)
+
+    def add_section_type_data_row_obj(self, section_type: Type[Section], data_row_obj: DataFrameSectionRow):
+        """
+        Merge a validated data row of a section class, the row is merged in its csv form
+        :param section_type:
+        :param data_row_obj:
+        :return:
+        """
+        # Rows that could generate the Cloud_Data section of the samplesheet
+        if hasattr(data_row_obj, "get_cloud_data_row"):
+            self.source_cloud_data_source_rows.setdefault(section_type, []).append(data_row_obj)
+
+        data_row = data_row_obj.to_snake_case_record()
+
+        self.sources_with_data_rows.add(self.source_index)
+        if section_type._class_header.lower() == "cloud_data":
+            self.sources_with_cloud_data.add(self.source_index)
+
+        row_hashes = self.row_hashes.setdefault(section_type, set())
+        row_hash = get_row_hash(data_row)
+        if row_hash in row_hashes:
+            self.duplicate_row_count += 1
+            return
+
+        row_key = get_merge_row_key(data_row)
+        row_key_source = self.row_key_sources.setdefault(section_type, {}).setdefault(row_key, self.source_index)
+        if row_key_source != self.source_index:
+            logger.error(
+                f"Conflicting rows for {get_row_key_str(*row_key)} in the {self.section_names[section_type]} section, "
+                f"the row {data_row} in {self.source_names[self.source_index]} "
+                f"does not match any of the rows in {self.source_names[row_key_source]}"
+            )
+            raise ValueError
+
+        row_hashes.add(row_hash)
+        self.data_sections.setdefault(section_type, []).append(data_row)
+
+    def add_section(self, section_name: str, section_dict_or_list: Union[Dict, List[Dict]]):
+        """
+        Merge a key-value section (a dictionary) or a data section (a list of rows)
+        :param section_name:
+        :param section_dict_or_list:
+        :return:
+        """
+        if isinstance(section_dict_or_list, list):
+            section_type = self.get_section_type(section_name)
+            for data_row in section_dict_or_list:
+                self.add_section_type_data_row(section_type, data_row)
+        else:
+            self.add_kv_section(section_name, section_dict_or_list)
+
+    def add_samplesheet_dict(self, samplesheet_dict: Dict, source_name: Optional[str] = None):
+        """
+        Merge a samplesheet dictionary, in the same form as the json input
+        :param samplesheet_dict:
+        :param source_name:
+        :return:
+        """
+        self.add_samplesheet_events(samplesheet_dict.items(), source_name=source_name)
+
+    def add_samplesheet(self, samplesheet: "SampleSheet", source_name: Optional[str] = None):
+        """
+        Merge a SampleSheet object, the data rows are merged from their validated values,
+        as the json dictionary of a row may leave out some of its csv values (i.e the AdapterStringency of a BCLConvert_Data row)
+        :param samplesheet:
+        :param source_name:
+        :return:
+        """
+        self.start_samplesheet(source_name)
+
+        for section_item in samplesheet.section_list:
+            section_obj: Section = getattr(samplesheet, section_item)
+            section_name = section_obj.print_class_header_json()
+            if isinstance(section_obj, DataFrameSection):
+                section_type = self.get_section_type(section_name)
+                for data_row_obj in section_obj.data_rows:
+                    self.add_section_type_data_row_obj(section_type, data_row_obj)
+            else:
+                self.add_kv_section(section_name, section_obj.to_json_dict())
+
+    def add_samplesheet_events(
+        self,
+        samplesheet_events: Iterable[Tuple[str, Union[Dict, List[Dict]]]],
+        source_name: Optional[str] = None
+    ):
+        """
+        Merge a samplesheet from (section_name, section) events,
+        where the section is a key-value dictionary, a list of data rows,
+        or (as yielded by iter_samplesheet_csv) a single data row of a section whose name ends in _data
+        :param samplesheet_events:
+        :param source_name:
+        :return:
+        """
+        self.start_samplesheet(source_name)
+
+        for section_name, section_values in samplesheet_events:
+            if isinstance(section_values, dict) and section_name.endswith("_data"):
+                self.add_data_row(section_name, section_values)
+            else:
+                self.add_section(section_name, section_values)
+
+    def get_samplesheet_dict(self) -> Dict:
+        """
+        Get the merged samplesheet dictionary, in the same form as the json input
+        :return:
+        """
+        self.finish_samplesheet()
+
+        # A samplesheet without a Cloud_Data section would otherwise be missing from the merged Cloud_Data section
+        if len(self.sources_with_cloud_data) > 0:
+            for source_index in sorted(self.sources_with_data_rows - self.sources_with_cloud_data):
+                logger.warning(
+                    f"{self.source_names[source_index]} has no cloud_data section, "
+                    f"its samples will not be in the merged cloud_data section"
+                )
+
+        return {
+            self.section_names[section_type]: (
+                self.kv_sections[section_type] if section_type in self.kv_sections
+                else self.data_sections.get(section_type, [])
+            )
+            for section_type in self.section_names.keys()
+        }
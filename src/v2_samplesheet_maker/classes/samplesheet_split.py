@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+
+"""
+Split a samplesheet into shards, i.e one samplesheet per lane, per sample project,
+per OverrideCycles (which bcl-convert cannot always mix in a single run), or per index length.
+
+The split key of each BCLConvert_Data row is found in a single pass over the rows,
+the rows of every other data section (i.e TSO500S_Data) follow their sample ids into each shard that has the sample,
+and the rows of a generated Cloud_Data section follow the row they were generated from.
+
+Shards are built from the objects of the samplesheet being split, nothing is validated again:
+* The key-value sections (Header, Reads, and every settings section) are shared by every shard
+* Each data section of a shard shares the already validated rows of the samplesheet being split
+"""
+
+# Standard imports
+import re
+from typing import Any, Callable, Dict, List, Union
+
+# Relative imports
+from ..enums import SampleSheetSplitKey
+from ..utils.logger import get_logger
+from .samplesheet import SampleSheet
+from .super_sections import DataFrameSection, DataFrameSectionRow
+
+# Get logging
+logger = get_logger()
+
+
+def get_split_value_function(
+    samplesheet: SampleSheet,
+    split_key: SampleSheetSplitKey
+) -> Callable[[DataFrameSectionRow], Any]:
+    """
+    Get the function that returns the split value of a BCLConvert_Data row
+    * lane: The lane of the row
+    * sample_project: The sample project of the row (None if not set)
+    * override_cycles: The override cycles of the row, or else of the BCLConvert_Settings section (None if neither is set)
+    * index_length: A (index length, index2 length) tuple
+    :param samplesheet:
+    :param split_key:
+    :return:
+    """
+    if split_key == SampleSheetSplitKey.LANE:
+        return lambda data_row: data_row.lane
+
+    if split_key == SampleSheetSplitKey.SAMPLE_PROJECT:
+        return lambda data_row: data_row.sample_project
+
+    if split_key == SampleSheetSplitKey.OVERRIDE_CYCLES:
+        default_override_cycles = (
+            samplesheet.bclconvert_settings_section.override_cycles
+            if samplesheet.bclconvert_settings_section is not None
+            else None
+        )
+        return lambda data_row: (
+            data_row.override_cycles if data_row.override_cycles is not None
+            else default_override_cycles
+        )
+
+    return lambda data_row: (len(data_row.index or ""), len(data_row.index2 or ""))
+
+
+def get_shard_name(split_value: Any) -> str:
+    """
+    Get a file name friendly name for a split value,
+    i.e 1 -> '1', 'Y151;I8N2;I8N2;Y151' -> 'Y151-I8N2-I8N2-Y151', (10, 8) -> '10_8', None -> 'none'
+    :param split_value:
+    :return:
+    """
+    if split_value is None:
+        return "none"
+    if isinstance(split_value, tuple):
+        return "_".join(map(str, split_value))
+    return re.sub(r"[^A-Za-z0-9._-]+", "-", str(split_value))
+
+
+def split_samplesheet(
+    samplesheet: SampleSheet,
+    split_key: Union[SampleSheetSplitKey, str]
+) -> Dict[Any, SampleSheet]:
+    """
+    Split a samplesheet into a shard samplesheet for each value of the split key
+    :param samplesheet:
+    :param split_key: One of lane, sample_project, override_cycles or index_length
+    :return: A shard samplesheet for each split value (see get_split_value_function),
+      in the order each value is first seen in the BCLConvert_Data section
+    """
+    try:
+        split_key = SampleSheetSplitKey(split_key)
+    except ValueError:
+        logger.error(
+            f"Unknown split key '{split_key}', expected one of "
+            f"{', '.join(map(lambda split_key_iter: split_key_iter.value, SampleSheetSplitKey))}"
+        )
+        raise
+
+    split_section: DataFrameSection = samplesheet.bclconvert_data_section
+    if split_section is None:
+        logger.error("Cannot split a samplesheet without a BCLConvert_Data section")
+        raise ValueError
+
+    get_split_value = get_split_value_function(samplesheet, split_key)
+
+    # Single pass over the BCLConvert_Data rows, collect the row positions of each shard
+    # and the shards each sample is in
+    split_positions: Dict[str, Dict[Any, List[int]]] = {"bclconvert_data_section": {}}
+    sample_split_values: Dict[str, Dict[Any, None]] = {}
+    for position, data_row in enumerate(split_section.data_rows):
+        split_value = get_split_value(data_row)
+        split_positions["bclconvert_data_section"].setdefault(split_value, []).append(position)
+        sample_split_values.setdefault(data_row.sample_id, {})[split_value] = None
+
+    # The generated Cloud_Data section is split last, its rows follow the rows they were generated from
+    cloud_data_source_section_name = samplesheet._cloud_data_source_section_name
+    data_section_names = sorted(
+        filter(
+            lambda section_name_iter: (
+                section_name_iter != "bclconvert_data_section" and
+                isinstance(getattr(samplesheet, section_name_iter), DataFrameSection)
+            ),
+            samplesheet.section_list
+        ),
+        key=lambda section_name_iter: (
+            section_name_iter == "cloud_data_section" and cloud_data_source_section_name is not None
+        )
+    )
+
+    for section_name in data_section_names:
+        section_obj: DataFrameSection = getattr(samplesheet, section_name)
+
+        if section_name == "cloud_data_section" and cloud_data_source_section_name is not None:
+            split_positions[section_name] = split_positions[cloud_data_source_section_name]
+            continue
+
+        section_split_positions = split_positions.setdefault(section_name, {})
+        unsplit_sample_ids = []
+        for position, data_row in enumerate(section_obj.data_rows):
+            if data_row.sample_id not in sample_split_values:
+                unsplit_sample_ids.append(data_row.sample_id)
+                continue
+            for split_value in sample_split_values[data_row.sample_id].keys():
+                section_split_positions.setdefault(split_value, []).append(position)
+
+        if len(unsplit_sample_ids) > 0:
+            logger.warning(
+                f"Dropping the {section_obj.print_class_header()} rows of samples that are not in the "
+                f"BCLConvert_Data section: {', '.join(map(str, dict.fromkeys(unsplit_sample_ids)))}"
+            )
+
+    # Key-value sections are shared by every shard
+    kv_section_objs = list(
+        filter(
+            lambda section_obj_iter: not isinstance(section_obj_iter, DataFrameSection),
+            map(lambda section_name_iter: getattr(samplesheet, section_name_iter), samplesheet.section_list)
+        )
+    )
+
+    shards: Dict[Any, SampleSheet] = {}
+    for split_value in split_positions["bclconvert_data_section"].keys():
+        shard_data_section_objs = []
+        for section_name, section_split_positions in split_positions.items():
+            positions = section_split_positions.get(split_value, [])
+            if len(positions) == 0:
+                continue
+            section_obj: DataFrameSection = getattr(samplesheet, section_name)
+            shard_data_section_objs.append(
+                type(section_obj).from_data_rows(
+                    list(map(lambda position_iter: section_obj.data_rows[position_iter], positions)),
+                    engine=section_obj.engine
+                )
+            )
+
+        shards[split_value] = SampleSheet.from_section_objects(
+            kv_section_objs + shard_data_section_objs,
+            engine=samplesheet.engine,
+            cloud_data_source_section_name=cloud_data_source_section_name
+        )
+
+    return shards
@@ -1,17 +1,130 @@
 #!/usr/bin/env python3
 import json
+from bisect import insort
 from copy import deepcopy
-from typing import Dict, Any, Optional, List
-import pandas as pd
+from io import StringIO
+from itertools import count
+from typing import Dict, Any, Optional, List, Set, Tuple, Type, Union, Iterable, TextIO, TYPE_CHECKING
 from pydantic import BaseModel
 import warnings
 
 # Relative subpackges
+from ..enums import DataFrameEngine
+from ..utils import pascal_case_to_snake_case
 from ..utils.logger import get_logger
+from ..utils.profiler import profile_stage
+from .columnar_frame import ColumnarFrame, is_missing
+
+# Pandas is only imported when a section is built with the pandas engine
+if TYPE_CHECKING:
+    import pandas as pd
 
 # Get logger
 logger = get_logger()
 
+# Default engine used to build the dataframe of each DataFrameSection
+_DATAFRAME_ENGINE: DataFrameEngine = DataFrameEngine.PANDAS
+
+
+def set_dataframe_engine(engine: Union[DataFrameEngine, str]):
+    """
+    Set the default engine used to build DataFrame sections
+    :param engine: One of 'pandas' or 'columnar'
+    :return:
+    """
+    global _DATAFRAME_ENGINE
+    _DATAFRAME_ENGINE = DataFrameEngine(engine)
+
+
+def get_dataframe_engine() -> DataFrameEngine:
+    """
+    Get the default engine used to build DataFrame sections
+    :return:
+    """
+    return _DATAFRAME_ENGINE
+
+
+# Every section class, keyed by (lower case section name, is cloud)
+# Populated by Section.__init_subclass__ as each section class is defined
+SECTION_REGISTRY: Dict[Tuple[str, bool], Type["Section"]] = {}
+
+# Rank of the next section class to be registered
+_section_ranks = count()
+
+
+def get_section_registry_keys(section_class: Type["Section"]) -> List[Tuple[str, bool]]:
+    """
+    Get the registry keys of a section class.
+    A section is found by its lower case class header (as used in the json),
+    or by its snake case class header (as read from the csv), i.e DragenGermline_Settings is found by both
+    dragengermline_settings and dragen_germline_settings
+    :param section_class:
+    :return:
+    """
+    from ..utils import convert_pascal_case_to_snake_case
+
+    return list(
+        dict.fromkeys(
+            map(
+                lambda section_name_iter: (section_name_iter, bool(section_class._is_cloud)),
+                [
+                    section_class._class_header.lower(),
+                    convert_pascal_case_to_snake_case(section_class._class_header)
+                ]
+            )
+        )
+    )
+
+
+def register_section(section_class: Type["Section"]):
+    """
+    Add a section class to the registry and give it the next rank.
+    Sections are written out in order of rank, and read in order of rank
+    (except for those with _import_last set, which are read after all other sections)
+    :param section_class:
+    :return:
+    """
+    section_keys = get_section_registry_keys(section_class)
+
+    # A module that is imported again may register the same section again
+    existing_section_class = SECTION_REGISTRY.get(section_keys[0], None)
+    for section_key in section_keys:
+        registered_section_class = SECTION_REGISTRY.get(section_key, None)
+        if registered_section_class is not None and not (
+            registered_section_class.__module__ == section_class.__module__ and
+            registered_section_class.__qualname__ == section_class.__qualname__
+        ):
+            logger.error(
+                f"Section {section_class.__qualname__} has the same header as {registered_section_class.__qualname__} "
+                f"({section_key[0]}, is_cloud={section_key[1]})"
+            )
+            raise ValueError
+
+    section_class._section_rank = (
+        next(_section_ranks) if existing_section_class is None
+        else existing_section_class._section_rank
+    )
+    section_class._import_rank = (section_class._import_last, section_class._section_rank)
+
+    for section_key in section_keys:
+        SECTION_REGISTRY[section_key] = section_class
+
+
+def get_normalised_row_key(row_key: Union[str, Tuple[Optional[Union[int, str]], Optional[str]]]) -> Tuple[Optional[int], Optional[str]]:
+    """
+    Get a (lane, sample_id) key from a (lane, sample_id) tuple or a sample id,
+    ('1', 'SAMPLE1') -> (1, 'SAMPLE1')
+    'SAMPLE1' -> (None, 'SAMPLE1')
+    :param row_key:
+    :return:
+    """
+    if isinstance(row_key, str):
+        return None, row_key
+
+    lane, sample_id = row_key
+    return (int(lane) if lane is not None else None), sample_id
+
+
 """
 SampleSheets are actually ini files, not csvs.
 Here we define the growing list of samplesheet section formats
@@ -23,26 +136,44 @@ class Section:
     Super Class for each section
     """
 
+    # No instance attributes are declared here, so that the rows of a data section can be fully slotted,
+    # every section class (that does not declare its own __slots__) still has a __dict__
+    __slots__ = ()
+
     _model: Optional[BaseModel] = None
     _is_cloud: Optional[bool] = False
     _class_header: Optional[str] = None
 
+    # Sections that must be read in after every other section (i.e Cloud_Settings collects the urns of each section)
+    _import_last: bool = False
+
+    # Set on registration
+    _section_rank: Optional[int] = None
+    _import_rank: Optional[Tuple[bool, int]] = None
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        Register each subclass that defines its own section header (or a cloud variant of an existing one)
+        :param kwargs:
+        :return:
+        """
+        super().__init_subclass__(**kwargs)
+
+        if cls._class_header is not None and ("_class_header" in cls.__dict__ or "_is_cloud" in cls.__dict__):
+            register_section(cls)
+
     def __init__(self, *args, **kwargs):
 
         # Assign both
-        kwargs_dict = deepcopy(kwargs)
         for key in self._model.model_fields.keys():
-            if hasattr(self, key):
+            if key in self.__dict__:
                 # Don't set key if it already exists
                 # This occurs in the rare case of analysis_urns which are set in the subclass
                 # Pop out key so not logged in untouched options
                 _ = kwargs.pop(key, None)
                 continue
-            elif key in kwargs_dict.keys():
-                setattr(self, key, kwargs.pop(key))
-            else:
-                # Set value to None
-                setattr(self, key, None)
+            # Set value to None if not provided
+            setattr(self, key, kwargs.pop(key, None))
 
         # Log any keys that still exist that aren't in the model
         self.log_untouched_options(*args, **kwargs)
@@ -50,19 +181,22 @@ class Section:
     def log_untouched_options(self, *args, **kwargs):
         """
         Show all of the parameters passed that were not used
+        Raised as warnings, which the console scripts route through the logger
         :param args:
         :param kwargs:
         :return:
         """
-        for arg in list(args):
-            logger.warning(f"Postional argument '{arg}' was not used for {self._model}")
+        # Nothing to format in the common case
+        if len(args) == 0 and len(kwargs) == 0:
+            return
+
+        for arg in args:
             warnings.warn(
                 f"Postional argument '{arg}' was not used for {self._model}",
                 UserWarning
             )
 
-        for kwarg_key, kwarg_value in dict(**kwargs).items():
-            logger.warning(f"Keyword argument '{kwarg_key}={kwarg_value}' was not used for {self._model}")
+        for kwarg_key, kwarg_value in kwargs.items():
             warnings.warn(
                 f"Keyword argument '{kwarg_key}={kwarg_value}' was not used for {self._model}",
                 UserWarning,
@@ -116,9 +250,11 @@ class Section:
         """
         self._model.model_validate(self)
 
-    def write_section(self, file_h, add_new_line_after_section=True):
+    def write_section(self, file_h: TextIO, add_new_line_after_section=True):
         """
         Write the section as a string
+        :param file_h: Any writable text stream (file handle, StringIO, sys.stdout)
+        :param add_new_line_after_section:
         :return:
         """
         # Write the class header
@@ -131,6 +267,16 @@ class Section:
             self.to_string() + ("\n" if add_new_line_after_section is True else "")
         )
 
+    def to_csv_string(self, add_new_line_after_section=False) -> str:
+        """
+        Render the section, including its header, as a string
+        :param add_new_line_after_section:
+        :return:
+        """
+        output_h = StringIO()
+        self.write_section(output_h, add_new_line_after_section=add_new_line_after_section)
+        return output_h.getvalue()
+
     def write_section_json(self, file_h):
         """
         Write the section out as a json object
@@ -145,13 +291,18 @@ class KVSection(Section):
     Key Value Pair Section
     :return:
     """
+
+    # See Section
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
-        self._raw_kwargs_dict = deepcopy(kwargs)
         # Set section format
         super().__init__(*args, **kwargs)
         self.section_dict = None
+        self._model_instance: Optional[BaseModel] = None
 
         # Validate model after initialising inputs
+        # This is the only time the model is built, the csv and json dicts are derived from this instance
         self.validate_model()
 
         # Coerce objects
@@ -161,28 +312,46 @@ class KVSection(Section):
         self.build_section_dict()
 
     def _build_section(self):
+        # Re-validate in case attributes have been updated since initialisation
+        self.validate_model()
+        self.coerce_values()
         return self.build_section_dict()
 
-    def coerce_values(self):
-        # Coerce with model dump
-        coerced_dict = self._model(**self.get_dict_object()).model_dump()
+    def validate_model(self):
+        """
+        Validate inputs against pydantic model of class and keep the validated model instance
+        :return:
+        """
+        self._model_instance = self._model.model_validate(self.get_dict_object())
+
+    def get_model_instance(self) -> BaseModel:
+        """
+        Get the validated model instance of the section
+        :return:
+        """
+        return self._model_instance
 
-        for key, value in coerced_dict.items():
-            self.__setattr__(key, value)
+    def coerce_values(self):
+        # Coerce attributes to the validated values
+        for key in self._model.model_fields.keys():
+            self.__setattr__(key, getattr(self._model_instance, key))
 
     def get_dict_object(self):
         return {
-            kv[0]: kv[1]
-            for kv in filter(
-                lambda kv_iter: not kv_iter[0] in ["section_dict", "_raw_kwargs_dict"],
-                self.__dict__.items()
-            )
+            key: getattr(self, key)
+            for key in self._model.model_fields.keys()
         }
 
     def build_section_dict(self):
         # Collect original objects
-        self.section_dict = self._model(**self.get_dict_object()).to_dict()
-        self.section_dict = self.filter_dict(self.section_dict)
+        self.section_dict = self.filter_dict(self.get_model_instance().to_dict())
+
+    def to_json_dict(self) -> Dict:
+        """
+        Get the section as a (snake case) dictionary, with None values removed
+        :return:
+        """
+        return self.filter_dict(self.get_model_instance().to_json())
 
     def filter_dict(self, initial_dict) -> Dict:
         """
@@ -210,33 +379,121 @@ class KVSection(Section):
 
     def to_json(self) -> str:
         # Write out each key value pair with a comma between key and value (and a new line between each pair)
-        return json.dumps({self.print_class_header_json(): self.filter_dict(self._model(**self.get_dict_object()).to_json())})
+        return json.dumps({self.print_class_header_json(): self.to_json_dict()})
 
 
 class DataFrameSectionRow(KVSection):
     """
     Abstract class for a row of a DataFrame section
+
+    A section may have many thousands of rows, so a row only keeps a single copy of itself,
+    the tuple of its validated values (in the order of the model fields), in its only slot.
+    Rows have no __dict__, so each subclass must also set __slots__ = ().
+    Each model field is a read-only property of the row class (i.e data_row.sample_id).
+    The model instance, csv record and json dictionary of the row are derived from the values when needed.
+    Use the update_row method of the section to change a row
     """
 
+    __slots__ = ("_values",)
+
     _model: Optional[BaseModel] = None
 
-    def to_series(self):
-        return pd.Series(
-            dict(
+    def __init_subclass__(cls, **kwargs):
+        """
+        Add a read-only property for each field of the row model
+        :param kwargs:
+        :return:
+        """
+        super().__init_subclass__(**kwargs)
+
+        if cls._model is None:
+            return
+
+        for position, key in enumerate(cls._model.model_fields.keys()):
+            if key in cls.__dict__:
+                continue
+            setattr(cls, key, property(lambda self, position=position: self._values[position]))
+
+    def __init__(self, *args, **kwargs):
+        model_fields = self._model.model_fields
+
+        # Log any keys that aren't in the model
+        self.log_untouched_options(
+            *args,
+            **dict(
                 filter(
-                    lambda kv: kv[1] is not None,
-                    self.section_dict.items()
+                    lambda kv: kv[0] not in model_fields,
+                    kwargs.items()
                 )
             )
         )
 
+        # Validate against the model, fields that are not provided are set to None
+        model_instance = self._model.model_validate(
+            {
+                key: kwargs.get(key, None)
+                for key in model_fields.keys()
+            }
+        )
+
+        # Keep the validated values only, the model instance is not kept
+        self._values = tuple(map(lambda key: getattr(model_instance, key), model_fields.keys()))
+
+    def _build_section(self):
+        return self.section_dict
+
+    def validate_model(self):
+        # Rows are validated on initialisation only
+        raise NotImplementedError
+
+    def coerce_values(self):
+        # Rows are validated on initialisation only
+        raise NotImplementedError
+
+    def get_model_instance(self) -> BaseModel:
+        """
+        Get the model instance of the row, built from the (already validated) values of the row,
+        a new instance is built on each call
+        :return:
+        """
+        return self._model.model_construct(**self.get_dict_object())
+
+    def get_dict_object(self) -> Dict:
+        return dict(zip(self._model.model_fields.keys(), self._values))
+
+    @property
+    def section_dict(self) -> Dict:
+        return self.to_record()
+
+    def to_series(self) -> "pd.Series":
+        import pandas as pd
+
+        return pd.Series(self.to_record())
+
+    def to_record(self) -> Dict:
+        return self.filter_dict(self.get_model_instance().to_dict())
+
+    def to_snake_case_record(self) -> Dict:
+        """
+        Get the csv record of the row with snake case keys, the same form as a row read in from a samplesheet csv.
+        Unlike the json dictionary, every value written to the csv is kept (i.e the AdapterStringency of a BCLConvert_Data row),
+        and values only used to generate the Cloud_Data section (i.e the kit names) are left out
+        :return:
+        """
+        return dict(
+            map(
+                lambda kv_iter: (pascal_case_to_snake_case(kv_iter[0]), kv_iter[1]),
+                self.to_record().items()
+            )
+        )
+
     def to_string(self):
         # Cannot use to-string for SectionRow
         raise NotImplementedError
 
     def to_json(self) -> str:
         # Needed for dataframe object
-        return json.dumps(self.filter_dict(self._model(**self.get_dict_object()).to_json()))
+        return json.dumps(self.to_json_dict())
 
 
 class CloudKVSection(KVSection):
@@ -252,6 +509,9 @@ class DataFrameSection(Section):
     """
     DataFrame Section
     A DataFrame section is able to be imported into pandas
+
+    The data rows are the only copy of the section kept,
+    the section dataframe is built from the data rows the first time it is needed (i.e when the csv is written)
     """
 
     _row_obj: Optional[BaseModel] = None
@@ -260,50 +520,134 @@ class DataFrameSection(Section):
         """
         Section Dataframe
         :param section_df:
+        :param engine: One of 'pandas' or 'columnar', defaults to the global engine (see set_dataframe_engine)
         """
         # Assign args to data_rows
         data_rows = args
-        self._raw_args = deepcopy(args)
+
+        # Set the engine used to build the section dataframe
+        engine = kwargs.pop("engine", None)
+        self.engine: DataFrameEngine = (
+            DataFrameEngine(engine) if engine is not None else get_dataframe_engine()
+        )
 
         # Set section format
         super().__init__()
 
-        # Initialise vars
-        self.section_df: Optional[pd.DataFrame] = None
-        self.data_rows: Optional[List[DataFrameSectionRow]] = list(
-            map(
-                lambda data_row_dict_iter: self._row_obj(**data_row_dict_iter),
-                data_rows
-            )
-        )
+        # Initialise vars, the section dataframe is built when first needed
+        self._section_df: Optional[Union["pd.DataFrame", ColumnarFrame]] = None
+        self._row_key_positions: Optional[Dict[Tuple[Optional[int], Optional[str]], List[int]]] = None
+        self.data_rows: Optional[List[DataFrameSectionRow]] = self.validate_data_rows(data_rows)
+
+    @classmethod
+    def from_data_rows(
+        cls,
+        data_rows: List[DataFrameSectionRow],
+        engine: Optional[Union[DataFrameEngine, str]] = None
+    ) -> "DataFrameSection":
+        """
+        Build a section from rows that have already been validated (i.e the rows of another section),
+        the rows are shared, not copied
+        :param data_rows:
+        :param engine: One of 'pandas' or 'columnar', defaults to the global engine (see set_dataframe_engine)
+        :return:
+        """
+        section_obj = cls.__new__(cls)
+        section_obj.engine = DataFrameEngine(engine) if engine is not None else get_dataframe_engine()
+
+        Section.__init__(section_obj)
 
-        # Build section dataframe
-        self.build_section_df()
+        section_obj._section_df = None
+        section_obj._row_key_positions = None
+        # The rows are edited in place, so the section gets its own list
+        section_obj.data_rows = list(data_rows)
+
+        return section_obj
+
+    @property
+    def section_df(self) -> Union["pd.DataFrame", ColumnarFrame]:
+        """
+        The section dataframe, built from the data rows on first use
+        :return:
+        """
+        if self._section_df is None:
+            self.build_section_df()
+        return self._section_df
+
+    @section_df.setter
+    def section_df(self, section_df: Union["pd.DataFrame", ColumnarFrame]):
+        self._section_df = section_df
 
     def _build_section(self):
         return self.build_section_df()
 
-    def build_section_df(self):
-        # Convert list of
-        self.section_df = pd.DataFrame(
-            map(
-                lambda data_row: data_row.to_series(),
-                self.data_rows
+    def validate_data_rows(self, data_row_dicts: Iterable[Dict]) -> List[DataFrameSectionRow]:
+        """
+        Validate each data row dictionary against the row model of the section
+        :param data_row_dicts:
+        :return:
+        """
+        data_row_dicts = list(data_row_dicts)
+        with profile_stage("validation", section=self, rows=len(data_row_dicts)):
+            return list(
+                map(
+                    lambda data_row_dict_iter: self._row_obj(**data_row_dict_iter),
+                    data_row_dicts
+                )
             )
+
+    def build_rows_df(self, data_rows: List[DataFrameSectionRow]) -> Union["pd.DataFrame", ColumnarFrame]:
+        """
+        Build a dataframe of data rows (in the order given), dropping empty columns
+        :param data_rows:
+        :return:
+        """
+        if self.engine == DataFrameEngine.COLUMNAR:
+            return ColumnarFrame.from_records(
+                map(
+                    lambda data_row: data_row.to_record(),
+                    data_rows
+                )
+            ).dropna_columns()
+
+        import pandas as pd
+
+        # Built from the row records in one go (rather than a series per row),
+        # the types of each column are then inferred as they would be for a dataframe of series
+        return pd.DataFrame(
+            list(
+                map(
+                    lambda data_row: data_row.to_record(),
+                    data_rows
+                )
+            ),
+            dtype=object
         ).dropna(
             how="all", axis="columns"
-        )
+        ).infer_objects()
+
+    def build_section_df(self):
+        # Convert list of
+        with profile_stage("dataframe_build", section=self, rows=len(self.data_rows)):
+            self.section_df = self.build_rows_df(self.data_rows)
 
         try:
-            self.clean_rows()
+            with profile_stage("clean_rows", section=self, rows=len(self.data_rows)):
+                self.clean_rows()
         except NotImplementedError:
             pass
 
-        self.order_rows()
+        with profile_stage("order_rows", section=self, rows=len(self.data_rows)):
+            self.order_rows()
 
     def to_string(self):
         # Write out the dataframe as a dataframe section
         # Termination line already has '\n'
+        if self.engine == DataFrameEngine.COLUMNAR:
+            return self.section_df.to_csv(
+                sep=",",
+                lineterminator="\n"
+            )
         return self.section_df.to_csv(
             sep=",",
             header=True,
@@ -332,7 +676,284 @@ class DataFrameSection(Section):
             return
 
         # Order rows by values in order list
-        self.section_df = self.section_df.sort_values(by=order_list)
+        # Use a stable sort so that rows with equal keys keep their input order
+        if self.engine == DataFrameEngine.COLUMNAR:
+            self.section_df = self.section_df.sort_values(by=order_list)
+        else:
+            self.section_df = self.section_df.sort_values(by=order_list, kind="stable")
+
+    def get_row_key(self, data_row: DataFrameSectionRow) -> Tuple[Optional[int], Optional[str]]:
+        """
+        Get the (lane, sample_id) key of a data row, the lane is None for sections without a Lane column
+        :param data_row:
+        :return:
+        """
+        return getattr(data_row, "lane", None), getattr(data_row, "sample_id", None)
+
+    def get_section_df_touched_positions(self, touched_row_keys: Set[Tuple[Optional[int], Optional[str]]]) -> Set[int]:
+        """
+        Get the positions of the rows of the section dataframe with a touched (lane, sample_id) key.
+        The Sample_ID column is filtered first, so only the rows with a touched sample id are checked in full
+        :param touched_row_keys:
+        :return:
+        """
+        num_rows = len(self.section_df)
+        touched_sample_ids = set(map(lambda row_key_iter: row_key_iter[1], touched_row_keys))
+
+        # Rows without a sample id could have any key, check every row
+        if "Sample_ID" not in self.section_df.columns or None in touched_sample_ids:
+            candidate_positions = list(range(num_rows))
+        elif self.engine == DataFrameEngine.COLUMNAR:
+            candidate_positions = list(
+                filter(
+                    lambda position_iter: self.section_df["Sample_ID"][position_iter] in touched_sample_ids,
+                    range(num_rows)
+                )
+            )
+        else:
+            candidate_positions = self.section_df["Sample_ID"].isin(touched_sample_ids).to_numpy().nonzero()[0].tolist()
+
+        def get_column_values(column_name: str) -> List[Any]:
+            if column_name not in self.section_df.columns:
+                return [None] * len(candidate_positions)
+            column_values = (
+                list(map(lambda position_iter: self.section_df[column_name][position_iter], candidate_positions))
+                if self.engine == DataFrameEngine.COLUMNAR
+                else self.section_df[column_name].iloc[candidate_positions].tolist()
+            )
+            return list(
+                map(
+                    lambda value_iter: None if is_missing(value_iter) else value_iter,
+                    column_values
+                )
+            )
+
+        return set(
+            map(
+                lambda position_key_iter: position_key_iter[0],
+                filter(
+                    lambda position_key_iter: position_key_iter[1] in touched_row_keys,
+                    zip(candidate_positions, zip(get_column_values("Lane"), get_column_values("Sample_ID")))
+                )
+            )
+        )
+
+    def get_row_key_positions(self) -> Dict[Tuple[Optional[int], Optional[str]], List[int]]:
+        """
+        Get the (sorted) positions in data_rows of the rows of each (lane, sample_id) key.
+        The index is built when first needed, then kept up to date by the row edits
+        :return:
+        """
+        if self._row_key_positions is None:
+            row_key_positions: Dict[Tuple[Optional[int], Optional[str]], List[int]] = {}
+            for position, data_row in enumerate(self.data_rows):
+                row_key_positions.setdefault(self.get_row_key(data_row), []).append(position)
+            self._row_key_positions = row_key_positions
+
+        return self._row_key_positions
+
+    def find_row_positions(self, row_key: Union[str, Tuple[Optional[int], Optional[str]]]) -> List[int]:
+        """
+        Get the positions (in data_rows) of the rows with a key
+        :param row_key: A (lane, sample_id) tuple, or just the sample_id for sections without a Lane column
+        :return:
+        """
+        return list(self.get_row_key_positions().get(get_normalised_row_key(row_key), []))
+
+    def get_rows_positions(self, *row_keys: Union[str, Tuple[Optional[int], Optional[str]]]) -> List[int]:
+        """
+        Get the (sorted) positions of every row with one of the keys, every key must have at least one row
+        :param row_keys: (lane, sample_id) tuples, or just sample ids for sections without a Lane column
+        :return:
+        """
+        row_key_positions = self.get_row_key_positions()
+        row_keys = set(map(get_normalised_row_key, row_keys))
+
+        missing_row_keys = set(filter(lambda row_key_iter: row_key_iter not in row_key_positions, row_keys))
+        if len(missing_row_keys) > 0:
+            logger.error(f"Could not find rows with the (lane, sample_id) keys {sorted(missing_row_keys, key=str)} in {self.print_class_header()}")
+            raise ValueError
+
+        return sorted(
+            position_iter
+            for row_key_iter in row_keys
+            for position_iter in row_key_positions[row_key_iter]
+        )
+
+    def get_row_position(self, row_key: Union[str, Tuple[Optional[int], Optional[str]]]) -> int:
+        """
+        Get the position of the single row with a key
+        :param row_key: A (lane, sample_id) tuple, or just the sample_id for sections without a Lane column
+        :return:
+        """
+        row_positions = self.find_row_positions(row_key)
+        if not len(row_positions) == 1:
+            logger.error(f"Expected a single row with the (lane, sample_id) key {row_key} in {self.print_class_header()} but found {len(row_positions)}")
+            raise ValueError
+
+        return row_positions[0]
+
+    def add_rows(self, *data_row_dicts: Dict) -> List[DataFrameSectionRow]:
+        """
+        Add rows to the end of the section, only the new rows are validated
+        :param data_row_dicts: Row dictionaries, in the same form as the rows given to the section
+        :return: The new rows
+        """
+        new_data_rows = self.validate_data_rows(deepcopy(data_row_dicts))
+
+        row_key_positions = self.get_row_key_positions()
+        for data_row in new_data_rows:
+            row_key_positions.setdefault(self.get_row_key(data_row), []).append(len(self.data_rows))
+            self.data_rows.append(data_row)
+
+        self.update_section_df(set(map(self.get_row_key, new_data_rows)))
+
+        return new_data_rows
+
+    def remove_rows(self, *row_keys: Union[str, Tuple[Optional[int], Optional[str]]]) -> List[DataFrameSectionRow]:
+        """
+        Remove every row with one of the keys
+        :param row_keys: (lane, sample_id) tuples, or just sample ids for sections without a Lane column
+        :return: The removed rows
+        """
+        return self.remove_rows_at(self.get_rows_positions(*row_keys))
+
+    def remove_rows_at(self, positions: List[int]) -> List[DataFrameSectionRow]:
+        """
+        Remove the rows at the given positions of data_rows
+        :param positions:
+        :return: The removed rows
+        """
+        positions = sorted(set(positions))
+        removed_data_rows = list(map(lambda position_iter: self.data_rows[position_iter], positions))
+
+        for position in reversed(positions):
+            del self.data_rows[position]
+
+        # The rows after the first removed row have moved, rebuild the index when next needed
+        if len(positions) > 0:
+            self._row_key_positions = None
+
+        self.update_section_df(set(map(self.get_row_key, removed_data_rows)))
+
+        return removed_data_rows
+
+    def update_row(self, row_key: Union[str, Tuple[Optional[int], Optional[str]]], **values) -> DataFrameSectionRow:
+        """
+        Update the values of a single row, the row keeps its place in the section.
+        Only the updated row is validated
+        :param row_key: A (lane, sample_id) tuple, or just the sample_id for sections without a Lane column
+        :param values: The values to update, in the same form as the rows given to the section,
+          a value of None removes the value
+        :return: The updated row
+        """
+        return self.update_row_at(self.get_row_position(row_key), **values)
+
+    def update_row_at(self, position: int, **values) -> DataFrameSectionRow:
+        """
+        Update the values of the row at a position of data_rows, only the updated row is validated
+        :param position:
+        :param values: The values to update, in the same form as the rows given to the section,
+          a value of None removes the value
+        :return: The updated row
+        """
+        # Start from the (validated) values of every model field of the row,
+        # the json dictionary of a row may not have every field (i.e the kit names of a BCLConvert_Data row)
+        updated_data_row_dict = self.data_rows[position].get_dict_object()
+        updated_data_row_dict.update(deepcopy(values))
+        updated_data_row = self.validate_data_rows([updated_data_row_dict])[0]
+
+        self.set_row_at(position, updated_data_row)
+
+        return updated_data_row
+
+    def set_row_at(self, position: int, data_row: DataFrameSectionRow):
+        """
+        Replace the row at a position of data_rows with an (already validated) row
+        :param position:
+        :param data_row:
+        :return:
+        """
+        previous_row_key = self.get_row_key(self.data_rows[position])
+        row_key = self.get_row_key(data_row)
+
+        self.data_rows[position] = data_row
+
+        # Only the position of the replaced row moves between keys
+        if row_key != previous_row_key and self._row_key_positions is not None:
+            previous_row_key_positions = self._row_key_positions[previous_row_key]
+            previous_row_key_positions.remove(position)
+            if len(previous_row_key_positions) == 0:
+                del self._row_key_positions[previous_row_key]
+            insort(self._row_key_positions.setdefault(row_key, []), position)
+
+        self.update_section_df({previous_row_key, row_key})
+
+    def update_section_df(self, touched_row_keys: Set[Tuple[Optional[int], Optional[str]]]):
+        """
+        Bring the section dataframe (if it has been built) up to date after the data rows have been edited.
+
+        Only the rows of the dataframe with a touched (lane, sample_id) key are rebuilt (and cleaned),
+        the remaining rows are kept as they are.
+        The dataframe is already in order, so the stable sort of order_rows only has to merge in the rebuilt rows.
+        :param touched_row_keys: The keys of every row that has been added, removed or updated
+        :return:
+        """
+        # Nothing to update, the dataframe is built from the new rows when first needed
+        if self._section_df is None:
+            return
+
+        touched_positions = self.get_section_df_touched_positions(touched_row_keys)
+        kept_positions = list(
+            filter(
+                lambda position_iter: position_iter not in touched_positions,
+                range(len(self.section_df))
+            )
+        )
+        kept_df = (
+            self.section_df.take(kept_positions) if self.engine == DataFrameEngine.COLUMNAR
+            else self.section_df.iloc[kept_positions]
+        )
+
+        row_key_positions = self.get_row_key_positions()
+        touched_data_rows = list(
+            map(
+                lambda position_iter: self.data_rows[position_iter],
+                sorted(
+                    position_iter
+                    for row_key_iter in touched_row_keys
+                    for position_iter in row_key_positions.get(row_key_iter, [])
+                )
+            )
+        )
+
+        section_dfs = [kept_df]
+        if len(touched_data_rows) > 0:
+            with profile_stage("dataframe_build", section=self, rows=len(touched_data_rows)):
+                self.section_df = self.build_rows_df(touched_data_rows)
+
+            try:
+                with profile_stage("clean_rows", section=self, rows=len(touched_data_rows)):
+                    self.clean_rows()
+            except NotImplementedError:
+                pass
+
+            section_dfs.append(self.section_df)
+
+        # Stack the kept and rebuilt rows
+        section_dfs = list(filter(lambda section_df_iter: len(section_df_iter) > 0, section_dfs))
+        if len(section_dfs) == 0:
+            section_dfs = [kept_df]
+
+        if self.engine == DataFrameEngine.COLUMNAR:
+            self.section_df = ColumnarFrame.concat(section_dfs).dropna_columns()
+        else:
+            import pandas as pd
+
+            self.section_df = pd.concat(section_dfs).dropna(how="all", axis="columns")
+
+        with profile_stage("order_rows", section=self, rows=len(self.data_rows)):
+            self.order_rows()
 
     def clean_rows(self):
         """
@@ -349,19 +970,47 @@ class DataFrameSection(Section):
         # Implemented in subclass
         raise NotImplementedError
 
-    def to_json(self) -> str:
-        # Write out the dataframe as a dataframe section
-        return json.dumps(
-            {
-                self.print_class_header_json(): list(
+    def to_record_list(self) -> List[Dict]:
+        """
+        Get the rows of the section as written to the csv (cleaned and in order) as snake case dictionaries,
+        missing values are removed
+        :return:
+        """
+        section_records = (
+            self.section_df.to_records() if self.engine == DataFrameEngine.COLUMNAR
+            else self.section_df.to_dict(orient="records")
+        )
+        return list(
+            map(
+                lambda record_iter: dict(
                     map(
-                        lambda data_row_iter: json.loads(data_row_iter.to_json()),
-                        self.data_rows
+                        lambda kv_iter: (pascal_case_to_snake_case(kv_iter[0]), kv_iter[1]),
+                        filter(
+                            lambda kv_iter: not is_missing(kv_iter[1]),
+                            record_iter.items()
+                        )
                     )
-                )
-            }
+                ),
+                section_records
+            )
         )
 
+    def to_json_list(self) -> List[Dict]:
+        """
+        Get the section as a list of (snake case) row dictionaries
+        :return:
+        """
+        return list(
+            map(
+                lambda data_row_iter: data_row_iter.to_json_dict(),
+                self.data_rows
+            )
+        )
+
+    def to_json(self) -> str:
+        # Write out the dataframe as a dataframe section
+        return json.dumps({self.print_class_header_json(): self.to_json_list()})
+
 
 class CloudDataFrameSection(DataFrameSection):
     is_cloud = True
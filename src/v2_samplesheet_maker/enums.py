@@ -22,4 +22,29 @@ class TSO500SSampleType(Enum):
 
 
 class TSO500SSampleFeature(Enum):
-    HRD = "HRD"
\ No newline at end of file
+    HRD = "HRD"
+
+class DataFrameEngine(Enum):
+    PANDAS = "pandas"
+    COLUMNAR = "columnar"
+
+
+class BatchConversionType(Enum):
+    V2_SAMPLESHEET_MAKER = "v2-samplesheet-maker"
+    V2_SAMPLESHEET_TO_JSON = "v2-samplesheet-to-json"
+    RUN_INFO_XML_READER = "run-info-xml-reader"
+    RUN_INFO_XML_WRITER = "run-info-xml-writer"
+    V2_SAMPLESHEET_TO_RUN_INFO_XML = "v2-samplesheet-to-run-info-xml"
+
+
+class IndexCollisionType(Enum):
+    COMBINED = "combined"
+    INDEX_1 = "index"
+    INDEX_2 = "index2"
+
+
+class SampleSheetSplitKey(Enum):
+    LANE = "lane"
+    SAMPLE_PROJECT = "sample_project"
+    OVERRIDE_CYCLES = "override_cycles"
+    INDEX_LENGTH = "index_length"
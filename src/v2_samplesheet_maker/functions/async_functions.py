@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+
+"""
+asyncio counterparts of the functions/ entry points, for use from an event loop.
+
+* File reads and writes are run in a thread (asyncio.to_thread), so never block the event loop
+* Parsing, validation and rendering (pydantic, pandas and xml work) are run in an executor,
+  by default the event loop's default executor (a thread pool).
+  Use set_executor (or the executor argument of each function) to run them elsewhere,
+  i.e a ProcessPoolExecutor so conversions do not share the GIL with the event loop.
+  Only strings, bytes and dictionaries are passed to the executor, so any executor may be used
+
+    samplesheet_dict = await v2_samplesheet_reader_async(Path("SampleSheet.csv"))
+
+    results = await convert_many(
+        [("v2-samplesheet-to-json", Path("run_1/SampleSheet.csv"), Path("run_1/SampleSheet.json")), ...],
+        max_concurrency=8
+    )
+"""
+
+# Standard libraries
+import asyncio
+import json
+import time
+from concurrent.futures import Executor
+from functools import partial
+from io import BytesIO, StringIO
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+# Local libraries
+from ..enums import BatchConversionType
+from ..utils.logger import get_logger
+
+# Get logger
+logger = get_logger()
+
+# The executor used to run the cpu-bound work of each conversion, None for the event loop's default executor
+_EXECUTOR: Optional[Executor] = None
+
+
+def set_executor(executor: Optional[Executor]):
+    """
+    Set the executor used to run the cpu-bound work of each conversion
+    :param executor: i.e a ProcessPoolExecutor, or None for the event loop's default executor
+    :return:
+    """
+    global _EXECUTOR
+    _EXECUTOR = executor
+
+
+def get_executor() -> Optional[Executor]:
+    return _EXECUTOR
+
+
+async def run_in_executor(function: Callable, *args, executor: Optional[Executor] = None) -> Any:
+    """
+    Run a function in the given executor, or else the executor set with set_executor
+    :param function: A module level function (so it can be pickled for a process pool)
+    :param args:
+    :param executor:
+    :return:
+    """
+    return await asyncio.get_running_loop().run_in_executor(
+        executor if executor is not None else _EXECUTOR,
+        partial(function, *args)
+    )
+
+
+async def read_text_async(input_path: Path) -> str:
+    """
+    Read a text file without blocking the event loop
+    :param input_path:
+    :return:
+    """
+    if not Path(input_path).is_file():
+        raise FileNotFoundError(f"File {input_path} does not exist")
+    return await asyncio.to_thread(Path(input_path).read_text)
+
+
+async def read_bytes_async(input_path: Path) -> bytes:
+    """
+    Read a binary file without blocking the event loop
+    :param input_path:
+    :return:
+    """
+    if not Path(input_path).is_file():
+        raise FileNotFoundError(f"File {input_path} does not exist")
+    return await asyncio.to_thread(Path(input_path).read_bytes)
+
+
+async def write_text_async(output_path: Path, output_text: str):
+    """
+    Write a text file without blocking the event loop
+    :param output_path:
+    :param output_text:
+    :return:
+    """
+    if not Path(output_path).parent.is_dir():
+        logger.error(f"Output file cannot be written because parent {Path(output_path).parent} does not exist")
+        raise NotADirectoryError
+    await asyncio.to_thread(Path(output_path).write_text, output_text)
+
+
+async def load_json_input_async(json_input: Union[Dict, Path]) -> Union[Dict, str]:
+    """
+    Get a json input, a dictionary is returned as is, a path is read in as text (and parsed in the executor)
+    :param json_input:
+    :return:
+    """
+    if isinstance(json_input, Dict):
+        return json_input
+    if isinstance(json_input, Path):
+        return await read_text_async(json_input)
+    raise ValueError(
+        f"Input path is not a valid type, expected one of Dict or Path"
+        f" but got {type(json_input)}"
+    )
+
+
+# Executor functions
+
+def get_json_input_dict(json_input: Union[Dict, str]) -> Dict:
+    if isinstance(json_input, Dict):
+        return json_input
+    try:
+        return json.loads(json_input)
+    except json.JSONDecodeError:
+        raise ValueError("Input is not a valid JSON object")
+
+
+def render_samplesheet_csv(json_input: Union[Dict, str]) -> str:
+    """
+    Render the samplesheet csv of a samplesheet json input (a dictionary or its json text)
+    :param json_input:
+    :return:
+    """
+    from .v2_samplesheet_writer import v2_samplesheet_writer
+
+    return v2_samplesheet_writer(get_json_input_dict(json_input)).getvalue()
+
+
+def parse_samplesheet_csv(csv_text: str, cache_dir: Optional[Path] = None) -> Dict:
+    """
+    Read the text of a samplesheet csv into its normalised dictionary (as returned by SampleSheet.to_dict)
+    :param csv_text:
+    :param cache_dir:
+    :return:
+    """
+    from .v2_samplesheet_reader import v2_samplesheet_reader
+
+    return v2_samplesheet_reader(StringIO(csv_text), cache_dir=cache_dir)
+
+
+def render_samplesheet_json(samplesheet_dict: Dict) -> str:
+    """
+    Render a samplesheet dictionary as written out by v2_samplesheet_reader
+    :param samplesheet_dict:
+    :return:
+    """
+    return json.dumps(samplesheet_dict, indent=2) + "\n"
+
+
+def parse_run_info_xml(xml_bytes: bytes, keep_flowcell_layout: bool = False) -> Dict:
+    """
+    Read the bytes of a RunInfo.xml into a dictionary
+    :param xml_bytes:
+    :param keep_flowcell_layout:
+    :return:
+    """
+    from .run_info_reader import run_info_xml_reader
+
+    return run_info_xml_reader(BytesIO(xml_bytes), keep_flowcell_layout=keep_flowcell_layout)
+
+
+def render_run_info_json(run_info_dict: Dict) -> str:
+    """
+    Render a run info dictionary as written out by run_info_xml_reader
+    :param run_info_dict:
+    :return:
+    """
+    return json.dumps(run_info_dict, indent=4)
+
+
+def render_run_info_xml(json_input: Union[Dict, str], final_newline: bool = False) -> str:
+    """
+    Render the RunInfo.xml of a run info json input (a dictionary or its json text)
+    :param json_input:
+    :param final_newline: RunInfo.xml files are written out with a final newline, in memory renders are not
+    :return:
+    """
+    from .run_info_writer import run_info_xml_writer
+
+    if not final_newline:
+        return run_info_xml_writer(get_json_input_dict(json_input)).getvalue()
+
+    output_h = StringIO()
+    run_info_xml_writer(get_json_input_dict(json_input), output_h)
+    return output_h.getvalue()
+
+
+def render_samplesheet_run_info_xml(
+    csv_text: str, run_id: str, final_newline: bool = False, cache_dir: Optional[Path] = None
+) -> str:
+    """
+    Render the RunInfo.xml of the text of a samplesheet csv
+    :param csv_text:
+    :param run_id:
+    :param final_newline: RunInfo.xml files are written out with a final newline, in memory renders are not
+    :param cache_dir:
+    :return:
+    """
+    from .v2_samplesheet_to_run_info import samplesheet_to_run_info_json
+
+    return render_run_info_xml(
+        samplesheet_to_run_info_json(parse_samplesheet_csv(csv_text, cache_dir), run_id=run_id),
+        final_newline
+    )
+
+
+# Entry points
+
+async def v2_samplesheet_writer_async(
+    json_input: Union[Dict, Path],
+    output_path: Optional[Path] = None,
+    executor: Optional[Executor] = None,
+) -> Optional[StringIO]:
+    """
+    async counterpart of v2_samplesheet_writer
+    :param json_input: The samplesheet dictionary, or the path to the samplesheet json
+    :param output_path: Path to the output csv
+    :param executor: Run the conversion in this executor, defaults to the executor set with set_executor
+    :return: A StringIO of the samplesheet csv if no output_path is given
+    """
+    samplesheet_csv = await run_in_executor(
+        render_samplesheet_csv, await load_json_input_async(json_input), executor=executor
+    )
+
+    if output_path is None:
+        return StringIO(samplesheet_csv)
+
+    await write_text_async(output_path, samplesheet_csv)
+    return None
+
+
+async def v2_samplesheet_reader_async(
+    csv_input_path: Path,
+    output_path: Optional[Path] = None,
+    cache_dir: Optional[Path] = None,
+    executor: Optional[Executor] = None,
+) -> Optional[Dict]:
+    """
+    async counterpart of v2_samplesheet_reader
+    :param csv_input_path: Path to the samplesheet csv
+    :param output_path: Path to the output json
+    :param cache_dir: Cache directory for parsed samplesheets, defaults to $V2_SAMPLESHEET_MAKER_CACHE_DIR
+    :param executor: Run the conversion in this executor, defaults to the executor set with set_executor
+    :return: The samplesheet dictionary if no output_path is given
+    """
+    samplesheet_dict = await run_in_executor(
+        parse_samplesheet_csv, await read_text_async(csv_input_path), cache_dir, executor=executor
+    )
+
+    if output_path is None:
+        return samplesheet_dict
+
+    await write_text_async(
+        output_path,
+        await run_in_executor(render_samplesheet_json, samplesheet_dict, executor=executor)
+    )
+    return None
+
+
+async def run_info_xml_reader_async(
+    xml_input_path: Path,
+    output_path: Optional[Path] = None,
+    keep_flowcell_layout: bool = False,
+    executor: Optional[Executor] = None,
+) -> Optional[Dict]:
+    """
+    async counterpart of run_info_xml_reader
+    :param xml_input_path: Path to the RunInfo.xml
+    :param output_path: Path to the output json
+    :param keep_flowcell_layout:
+    :param executor: Run the conversion in this executor, defaults to the executor set with set_executor
+    :return: The run info dictionary if no output_path is given
+    """
+    run_info_dict = await run_in_executor(
+        parse_run_info_xml, await read_bytes_async(xml_input_path), keep_flowcell_layout, executor=executor
+    )
+
+    if output_path is None:
+        return run_info_dict
+
+    await write_text_async(
+        output_path,
+        await run_in_executor(render_run_info_json, run_info_dict, executor=executor)
+    )
+    return None
+
+
+async def run_info_xml_writer_async(
+    json_input: Union[Dict, Path],
+    output_path: Optional[Path] = None,
+    executor: Optional[Executor] = None,
+) -> Optional[StringIO]:
+    """
+    async counterpart of run_info_xml_writer
+    :param json_input: The run info dictionary, or the path to the run info json
+    :param output_path: Path to the output xml
+    :param executor: Run the conversion in this executor, defaults to the executor set with set_executor
+    :return: A StringIO of the xml if no output_path is given
+    """
+    run_info_xml = await run_in_executor(
+        render_run_info_xml, await load_json_input_async(json_input), output_path is not None, executor=executor
+    )
+
+    if output_path is None:
+        return StringIO(run_info_xml)
+
+    await write_text_async(output_path, run_info_xml)
+    return None
+
+
+async def v2_samplesheet_to_run_info_xml_async(
+    csv_input_path: Path,
+    run_id: str,
+    output_path: Optional[Path] = None,
+    cache_dir: Optional[Path] = None,
+    executor: Optional[Executor] = None,
+) -> Optional[StringIO]:
+    """
+    async counterpart of samplesheet_csv_to_run_info_xml
+    :param csv_input_path: Path to the samplesheet csv
+    :param run_id: The run id of the RunInfo.xml
+    :param output_path: Path to the output xml
+    :param cache_dir: Cache directory for parsed samplesheets, defaults to $V2_SAMPLESHEET_MAKER_CACHE_DIR
+    :param executor: Run the conversion in this executor, defaults to the executor set with set_executor
+    :return: A StringIO of the xml if no output_path is given
+    """
+    run_info_xml = await run_in_executor(
+        render_samplesheet_run_info_xml,
+        await read_text_async(csv_input_path), run_id, output_path is not None, cache_dir,
+        executor=executor
+    )
+
+    if output_path is None:
+        return StringIO(run_info_xml)
+
+    await write_text_async(output_path, run_info_xml)
+    return None
+
+
+async def convert_file_async(
+    conversion_type: Union[BatchConversionType, str],
+    input_path: Path,
+    output_path: Path,
+    run_id: Optional[str] = None,
+    executor: Optional[Executor] = None,
+) -> Dict:
+    """
+    async counterpart of batch_converter.convert_file,
+    errors are caught so that the rest of a batch may continue
+    :param conversion_type:
+    :param input_path:
+    :param output_path:
+    :param run_id: The run id of the RunInfo.xml, required for v2-samplesheet-to-run-info-xml
+    :param executor:
+    :return: A dictionary with the keys input, output, success, error and duration (seconds)
+    """
+    conversion_type = BatchConversionType(conversion_type)
+    start_time = time.perf_counter()
+
+    try:
+        # Output directories are mirrored from the inputs, so may not exist yet
+        await asyncio.to_thread(Path(output_path).parent.mkdir, parents=True, exist_ok=True)
+
+        if conversion_type == BatchConversionType.V2_SAMPLESHEET_MAKER:
+            await v2_samplesheet_writer_async(Path(input_path), Path(output_path), executor=executor)
+        elif conversion_type == BatchConversionType.V2_SAMPLESHEET_TO_JSON:
+            await v2_samplesheet_reader_async(Path(input_path), Path(output_path), executor=executor)
+        elif conversion_type == BatchConversionType.RUN_INFO_XML_READER:
+            await run_info_xml_reader_async(Path(input_path), Path(output_path), executor=executor)
+        elif conversion_type == BatchConversionType.RUN_INFO_XML_WRITER:
+            await run_info_xml_writer_async(Path(input_path), Path(output_path), executor=executor)
+        elif conversion_type == BatchConversionType.V2_SAMPLESHEET_TO_RUN_INFO_XML:
+            if run_id is None:
+                raise ValueError(f"Expected a run id for {input_path}")
+            await v2_samplesheet_to_run_info_xml_async(
+                Path(input_path), run_id, Path(output_path), executor=executor
+            )
+        error = None
+    except Exception as exception:
+        error = f"{type(exception).__name__}: {exception}"
+
+    return {
+        "input": str(input_path),
+        "output": str(output_path),
+        "success": error is None,
+        "error": error,
+        "duration": round(time.perf_counter() - start_time, 6)
+    }
+
+
+async def convert_many(
+    conversions: Iterable[Tuple],
+    max_concurrency: int = 4,
+    executor: Optional[Executor] = None,
+) -> List[Dict]:
+    """
+    Run many conversions, with at most max_concurrency running at once.
+    A failed conversion does not stop the remaining conversions
+
+    :param conversions: (conversion type, input path, output path) tuples,
+      i.e ('v2-samplesheet-maker', Path('input.json'), Path('SampleSheet.csv')),
+      v2-samplesheet-to-run-info-xml conversions also take the run id as a fourth item
+    :param max_concurrency:
+    :param executor: Run each conversion in this executor, defaults to the executor set with set_executor
+    :return: The summary of each conversion (see convert_file_async), in the order given
+    """
+    if max_concurrency < 1:
+        logger.error(f"Expected max_concurrency to be at least 1 but got {max_concurrency}")
+        raise ValueError
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def bounded_convert_file(conversion_type, input_path, output_path, run_id=None) -> Dict:
+        async with semaphore:
+            return await convert_file_async(
+                conversion_type, input_path, output_path, run_id=run_id, executor=executor
+            )
+
+    return list(
+        await asyncio.gather(
+            *map(
+                lambda conversion_iter: bounded_convert_file(*conversion_iter),
+                conversions
+            )
+        )
+    )
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+
+"""
+Convert many files in a single process pool.
+
+Each conversion maps to one of the single file console scripts,
+i.e v2-samplesheet-maker converts a json input to a samplesheet csv.
+v2-samplesheet-to-run-info-xml also needs the run id of each samplesheet,
+given as a third (input path, output path, run id) value of each conversion pair.
+
+Conversions are fanned out across a pool of worker processes so that interpreter,
+pandas and pydantic start-up is only paid once per worker rather than once per file.
+
+A failed conversion does not abort the remaining conversions, instead the error
+is recorded in the summary returned for each file.
+"""
+
+# Standard libraries
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+import os
+import time
+
+# Local libraries
+from ..enums import BatchConversionType
+from ..utils.logger import get_logger
+
+# Get logger
+logger = get_logger()
+
+# Input and output suffixes for each conversion type
+BATCH_CONVERSION_SUFFIXES: Dict[BatchConversionType, Tuple[str, str]] = {
+    BatchConversionType.V2_SAMPLESHEET_MAKER: (".json", ".csv"),
+    BatchConversionType.V2_SAMPLESHEET_TO_JSON: (".csv", ".json"),
+    BatchConversionType.RUN_INFO_XML_READER: (".xml", ".json"),
+    BatchConversionType.RUN_INFO_XML_WRITER: (".json", ".xml"),
+    BatchConversionType.V2_SAMPLESHEET_TO_RUN_INFO_XML: (".csv", ".xml"),
+}
+
+
+def convert_file(
+    conversion_type: Union[BatchConversionType, str],
+    input_path: Path,
+    output_path: Path,
+    run_id: Optional[str] = None
+) -> Dict:
+    """
+    Run a single conversion, catching any errors so that the rest of the batch may continue
+    :param conversion_type:
+    :param input_path:
+    :param output_path:
+    :param run_id: The run id of the samplesheet, required for v2-samplesheet-to-run-info-xml
+    :return: A dictionary with the keys input, output, success, error and duration (seconds)
+    """
+    conversion_type = BatchConversionType(conversion_type)
+    start_time = time.perf_counter()
+
+    try:
+        # Output directories are mirrored from the inputs, so may not exist yet
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+
+        if conversion_type == BatchConversionType.V2_SAMPLESHEET_MAKER:
+            from .v2_samplesheet_writer import v2_samplesheet_writer
+            v2_samplesheet_writer(Path(input_path), Path(output_path))
+        elif conversion_type == BatchConversionType.V2_SAMPLESHEET_TO_JSON:
+            from .v2_samplesheet_reader import v2_samplesheet_reader
+            v2_samplesheet_reader(Path(input_path), Path(output_path))
+        elif conversion_type == BatchConversionType.RUN_INFO_XML_READER:
+            from .run_info_reader import run_info_xml_reader
+            run_info_xml_reader(Path(input_path), Path(output_path))
+        elif conversion_type == BatchConversionType.RUN_INFO_XML_WRITER:
+            from .run_info_writer import run_info_xml_writer
+            run_info_xml_writer(Path(input_path), Path(output_path))
+        elif conversion_type == BatchConversionType.V2_SAMPLESHEET_TO_RUN_INFO_XML:
+            if run_id is None:
+                raise ValueError(f"Expected a run id for {input_path}")
+            from .v2_samplesheet_to_run_info import samplesheet_csv_to_run_info_xml
+            samplesheet_csv_to_run_info_xml(Path(input_path), run_id=run_id, output_path=Path(output_path))
+        error = None
+    except Exception as exception:
+        error = f"{type(exception).__name__}: {exception}"
+
+    return {
+        "input": str(input_path),
+        "output": str(output_path),
+        "success": error is None,
+        "error": error,
+        "duration": round(time.perf_counter() - start_time, 6)
+    }
+
+
+def get_conversion_pairs_from_paths(
+    conversion_type: Union[BatchConversionType, str],
+    input_paths: List[Path],
+    output_dir: Path
+) -> List[Tuple[Path, Path]]:
+    """
+    Pair each input path with an output path in the output directory,
+    the output file name is the input stem with the output suffix of the conversion type.
+
+    If two inputs share the same stem (i.e runs/*/SampleSheet.csv), the directory structure
+    of the inputs (relative to their common parent) is mirrored in the output directory
+    :param conversion_type:
+    :param input_paths:
+    :param output_dir:
+    :return:
+    """
+    _, output_suffix = BATCH_CONVERSION_SUFFIXES[BatchConversionType(conversion_type)]
+
+    input_stems = list(map(lambda input_path_iter: input_path_iter.stem, input_paths))
+    if len(set(input_stems)) == len(input_stems):
+        return list(
+            map(
+                lambda input_path_iter: (input_path_iter, output_dir / (input_path_iter.stem + output_suffix)),
+                input_paths
+            )
+        )
+
+    common_parent = Path(
+        os.path.commonpath(
+            list(map(lambda input_path_iter: input_path_iter.resolve().parent, input_paths))
+        )
+    )
+
+    return list(
+        map(
+            lambda input_path_iter: (
+                input_path_iter,
+                output_dir / input_path_iter.resolve().parent.relative_to(common_parent) / (input_path_iter.stem + output_suffix)
+            ),
+            input_paths
+        )
+    )
+
+
+def get_conversion_pairs_from_input_dir(
+    conversion_type: Union[BatchConversionType, str],
+    input_dir: Path,
+    output_dir: Path
+) -> List[Tuple[Path, Path]]:
+    """
+    Collect all files in the input directory that have the input suffix of the conversion type
+    :param conversion_type:
+    :param input_dir:
+    :param output_dir:
+    :return:
+    """
+    input_suffix, _ = BATCH_CONVERSION_SUFFIXES[BatchConversionType(conversion_type)]
+
+    return get_conversion_pairs_from_paths(
+        conversion_type,
+        sorted(
+            filter(
+                lambda input_path_iter: input_path_iter.is_file() and input_path_iter.suffix == input_suffix,
+                input_dir.iterdir()
+            )
+        ),
+        output_dir
+    )
+
+
+def get_conversion_pairs_from_manifest(manifest_path: Path) -> List[Union[Tuple[Path, Path], Tuple[Path, Path, str]]]:
+    """
+    Read in a manifest of input / output pairs.
+    Each line has an input path and an output path separated by a tab or a comma,
+    optionally followed by a run id (required for v2-samplesheet-to-run-info-xml).
+    Empty lines and lines starting with '#' are ignored.
+    Relative paths are resolved relative to the manifest directory.
+    :param manifest_path:
+    :return:
+    """
+    conversion_pairs = []
+
+    with open(manifest_path, "r") as manifest_h:
+        for line_number, line in enumerate(manifest_h, start=1):
+            line = line.strip()
+            if line == "" or line.startswith("#"):
+                continue
+
+            line_split = line.split("\t") if "\t" in line else line.split(",")
+            if len(line_split) not in [2, 3]:
+                logger.error(f"Line {line_number} of manifest {manifest_path} does not have two or three columns")
+                raise ValueError
+
+            conversion_pairs.append(
+                tuple(
+                    map(
+                        lambda path_iter: manifest_path.parent / Path(path_iter.strip()),
+                        line_split[:2]
+                    )
+                ) + tuple(
+                    map(
+                        lambda run_id_iter: run_id_iter.strip(),
+                        line_split[2:]
+                    )
+                )
+            )
+
+    return conversion_pairs
+
+
+def batch_convert(
+    conversion_type: Union[BatchConversionType, str],
+    conversion_pairs: List[Union[Tuple[Path, Path], Tuple[Path, Path, str]]],
+    jobs: Optional[int] = None
+) -> List[Dict]:
+    """
+    Run each conversion across a pool of worker processes
+    :param conversion_type: One of v2-samplesheet-maker, v2-samplesheet-to-json, run-info-xml-reader, run-info-xml-writer,
+      v2-samplesheet-to-run-info-xml
+    :param conversion_pairs: A list of (input path, output path) tuples,
+      or (input path, output path, run id) tuples for v2-samplesheet-to-run-info-xml
+    :param jobs: The number of worker processes, defaults to the number of cpus.
+      If set to 1 the conversions run in this process
+    :return: A list of results (see convert_file), in the same order as conversion_pairs
+    """
+    conversion_type = BatchConversionType(conversion_type)
+
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+
+    if jobs < 1:
+        raise ValueError(f"Expected jobs to be a positive integer but got {jobs}")
+
+    # No need for a pool if we're only running one job at a time
+    if jobs == 1 or len(conversion_pairs) <= 1:
+        return list(
+            map(
+                lambda conversion_pair_iter: convert_file(conversion_type, *conversion_pair_iter),
+                conversion_pairs
+            )
+        )
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(conversion_pairs))) as executor:
+        return list(
+            executor.map(
+                convert_file,
+                [conversion_type.value] * len(conversion_pairs),
+                list(map(lambda conversion_pair_iter: conversion_pair_iter[0], conversion_pairs)),
+                list(map(lambda conversion_pair_iter: conversion_pair_iter[1], conversion_pairs)),
+                list(
+                    map(
+                        lambda conversion_pair_iter: conversion_pair_iter[2] if len(conversion_pair_iter) > 2 else None,
+                        conversion_pairs
+                    )
+                ),
+            )
+        )
+
+
+def get_batch_summary(results: List[Dict]) -> Dict:
+    """
+    Summarise the results of a batch conversion
+    :param results:
+    :return:
+    """
+    return {
+        "total": len(results),
+        "succeeded": len(list(filter(lambda result_iter: result_iter["success"], results))),
+        "failed": len(list(filter(lambda result_iter: not result_iter["success"], results))),
+        "results": results
+    }
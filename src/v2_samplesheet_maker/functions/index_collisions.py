@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+
+"""
+Check the indexes of the BCLConvert_Data section for collisions within each lane,
+at the barcode mismatches set in the BCLConvert_Settings section (and any per-sample overrides),
+and recommend the highest barcode mismatches each lane can use without collisions.
+"""
+
+# Standard libraries
+from typing import Dict, List, Optional, Union
+
+# Local libraries
+from ..classes.samplesheet import SampleSheet
+from ..classes.index_collisions import IndexCollisionChecker
+
+
+def get_index_collision_checker(samplesheet: Union[SampleSheet, Dict]) -> IndexCollisionChecker:
+    """
+    Build an index collision checker from the BCLConvert sections of a samplesheet
+    :param samplesheet: A SampleSheet object or a samplesheet dictionary (as used by SampleSheet)
+    :return:
+    """
+    if isinstance(samplesheet, Dict):
+        samplesheet = SampleSheet(samplesheet)
+    elif not isinstance(samplesheet, SampleSheet):
+        raise ValueError(
+            f"Samplesheet is not a valid type, expected one of SampleSheet or Dict"
+            f" but got {type(samplesheet)}"
+        )
+
+    if samplesheet.bclconvert_data_section is None:
+        return IndexCollisionChecker([])
+
+    settings_section = samplesheet.bclconvert_settings_section
+
+    return IndexCollisionChecker(
+        map(
+            lambda data_row_iter: {
+                "sample_id": data_row_iter.sample_id,
+                "lane": data_row_iter.lane,
+                "index": data_row_iter.index,
+                "index2": data_row_iter.index2,
+                "barcode_mismatches_index_1": data_row_iter.barcode_mismatches_index_1,
+                "barcode_mismatches_index_2": data_row_iter.barcode_mismatches_index_2,
+            },
+            samplesheet.bclconvert_data_section.data_rows
+        ),
+        barcode_mismatches_index_1=getattr(settings_section, "barcode_mismatches_index_1", None),
+        barcode_mismatches_index_2=getattr(settings_section, "barcode_mismatches_index_2", None),
+        independent_index_collision_check=getattr(settings_section, "independent_index_collision_check", None),
+    )
+
+
+def get_index_collisions(samplesheet: Union[SampleSheet, Dict]) -> List[Dict]:
+    """
+    Find all pairs of samples in the same lane whose indexes collide
+    :param samplesheet: A SampleSheet object or a samplesheet dictionary (as used by SampleSheet)
+    :return: A list of dictionaries with the keys lane, sample_id_1, sample_id_2,
+      collision_type (one of combined, index or index2), index_distance and index2_distance
+    """
+    return get_index_collision_checker(samplesheet).find_collisions()
+
+
+def get_barcode_mismatch_recommendations(samplesheet: Union[SampleSheet, Dict]) -> Dict:
+    """
+    Recommend the highest barcode mismatches each index read can use in each lane without any index collisions.
+
+    The recommendations are returned three ways
+    * lanes: The recommendation for each lane
+    * bclconvert_settings: A BCLConvert_Settings block that is safe for every lane (the lowest recommendation across lanes)
+    * bclconvert_data_overrides: Per-sample BarcodeMismatchesIndex1 / BarcodeMismatchesIndex2 values,
+      so each lane can use its own recommendation
+    :param samplesheet: A SampleSheet object or a samplesheet dictionary (as used by SampleSheet)
+    :return:
+    """
+    checker = get_index_collision_checker(samplesheet)
+
+    lane_recommendations = {}
+    for lane, lane_group in checker.lane_groups.items():
+        barcode_mismatches_index_1, barcode_mismatches_index_2 = checker.get_max_safe_barcode_mismatches(lane)
+        lane_recommendations[lane] = {
+            "barcode_mismatches_index_1": barcode_mismatches_index_1,
+            "barcode_mismatches_index_2": barcode_mismatches_index_2,
+            # Samples that cannot be told apart even with no mismatches
+            "has_collisions": checker.has_lane_collision(lane, 0, 0),
+        }
+
+    def get_lowest_recommendation(key: str) -> Optional[int]:
+        lane_values = list(
+            filter(
+                lambda value_iter: value_iter is not None,
+                map(lambda lane_recommendation_iter: lane_recommendation_iter[key], lane_recommendations.values())
+            )
+        )
+        return min(lane_values) if len(lane_values) > 0 else None
+
+    return {
+        "lanes": [
+            dict({"lane": lane}, **lane_recommendation)
+            for lane, lane_recommendation in lane_recommendations.items()
+        ],
+        "bclconvert_settings": {
+            "barcode_mismatches_index_1": get_lowest_recommendation("barcode_mismatches_index_1"),
+            "barcode_mismatches_index_2": get_lowest_recommendation("barcode_mismatches_index_2"),
+        },
+        "bclconvert_data_overrides": [
+            {
+                "lane": lane,
+                "sample_id": sample_id,
+                "barcode_mismatches_index_1": lane_recommendations[lane]["barcode_mismatches_index_1"],
+                "barcode_mismatches_index_2": lane_recommendations[lane]["barcode_mismatches_index_2"],
+            }
+            for lane, lane_group in checker.lane_groups.items()
+            for sample_id in lane_group["sample_ids"]
+        ],
+    }
@@ -2,37 +2,63 @@
 
 """
 Read in a runinfo xml file and return a dictionary of the runinfo data
+
+The xml is streamed, the FlowcellLayout (a tile list that can run to many thousands of elements)
+is skipped without being built unless it is requested
 """
 import json
-from io import TextIOBase
 from pathlib import Path
-from typing import Union, TextIO, Optional, Dict
-import xmltodict
+from typing import Union, TextIO, BinaryIO, Optional, Dict, List
+
+from ..utils.xml import parse_xml_stream
+
+# The Run elements read by read_run_info_xml by default
+DEFAULT_RUN_INFO_ELEMENTS = ["Flowcell", "Instrument", "Date", "Reads"]
+
+
+def read_run_info_xml(
+    xml_input_path_or_stream: Union[Path, TextIO, BinaryIO],
+    elements: Optional[List[str]] = None,
+) -> Dict:
+    """
+    Read only the parts of a RunInfo.xml file we need, by default the Run attributes (Id and Number),
+    Flowcell, Instrument, Date and Reads.
+
+    Reading stops once each of the requested elements has been read, so the rest of the file
+    (including the FlowcellLayout) is never parsed.
+    Suitable for collecting the run info of many run folders.
+    :param xml_input_path_or_stream: Path to the RunInfo.xml, or a text or binary stream
+    :param elements: The elements of the Run to read, defaults to Flowcell, Instrument, Date and Reads
+    :return: The RunInfo in the same form as run_info_xml_reader, i.e {"RunInfo": {"@Version": ..., "Run": {...}}}
+    """
+    if elements is None:
+        elements = DEFAULT_RUN_INFO_ELEMENTS
+
+    return parse_xml_stream(
+        xml_input_path_or_stream,
+        keep_element_paths=list(
+            map(
+                lambda element_iter: f"RunInfo/Run/{element_iter}",
+                elements
+            )
+        )
+    )
 
 
 def run_info_xml_reader(
-    xml_input_path_or_stream: Union[TextIO, Path],
+    xml_input_path_or_stream: Union[TextIO, BinaryIO, Path],
     output_path: Optional[Path] = None,
     keep_flowcell_layout: bool = False,
 ) -> Optional[Dict]:
 
-    # Read in SampleSheet csv
-    if isinstance(xml_input_path_or_stream, TextIOBase):
-        run_info_dict = xmltodict.parse(xml_input_path_or_stream.read())
-    elif isinstance(xml_input_path_or_stream, Path):
-        with open(xml_input_path_or_stream, "r") as xml_h:
-            run_info_dict = xmltodict.parse(xml_h.read())
-    else:
-        raise ValueError(
-            f"Input xml path or stream is not a valid type, expected one of TextIO or Path"
-            f" but got {type(xml_input_path_or_stream)}"
-        )
-
-    # Remove the FlowcellLayout attribute from the run_info_dict
-    # The FlowcellLayout is a huge dictionary that is not needed for the run_info_dict
-    if not keep_flowcell_layout:
-        # Remove the FlowcellLayout attribute from the run_info_dict
-        del run_info_dict['RunInfo']['Run']["FlowcellLayout"]
+    # Read in RunInfo xml
+    # The FlowcellLayout is a huge dictionary that is not needed for the run_info_dict,
+    # so is skipped while reading unless requested
+    # RunInfo.xml files generated by run_info_xml_writer do not have a FlowcellLayout
+    run_info_dict = parse_xml_stream(
+        xml_input_path_or_stream,
+        skip_element_paths=[] if keep_flowcell_layout else ["RunInfo/Run/FlowcellLayout"]
+    )
 
     # Check output path
     if output_path is not None:
@@ -43,4 +69,3 @@ def run_info_xml_reader(
         return None
     else:
         return run_info_dict
-
@@ -77,33 +77,58 @@ generate an xml file with the following format:
 """
 
 # Standard libraries
-from io import StringIO, TextIOBase
+from io import StringIO, TextIOBase, RawIOBase, BufferedIOBase
 from pathlib import Path
-from typing import Union, TextIO, Optional, Dict
+from typing import Union, TextIO, BinaryIO, Optional, Dict
 import json
-import xmltodict
 import re
 from datetime import datetime
 
+# Local libraries
+from ..utils.xml import write_xml_stream
+from ..utils.profiler import profile_stage
+
+# The order Illumina writes the elements of a RunInfo.xml in
+RUN_INFO_ELEMENT_ORDER = {
+    "Run": [
+        "Flowcell",
+        "Instrument",
+        "Date",
+        "Reads",
+        "FlowcellLayout",
+        "AlignToPhiX",
+        "ImageDimensions",
+        "ImageChannels",
+    ]
+}
+
 
 def run_info_xml_writer(
     json_input_path_or_stream: Union[Dict, TextIO, Path],
-    output_path: Optional[Path] = None
+    output_path: Optional[Union[Path, TextIO, BinaryIO]] = None
 ) -> Optional[TextIO]:
+    """
+    Write out a RunInfo.xml, elements are written straight to the output as they're generated
+    (so a large FlowcellLayout is never held as a single string)
+    :param json_input_path_or_stream: The run info as a dictionary, or a path / text stream of the run info json
+    :param output_path: Path to the output xml, or a writable text or binary stream (i.e BytesIO)
+    :return: A StringIO of the xml if no output_path is given
+    """
 
     # Read in SampleSheet object
     if isinstance(json_input_path_or_stream, Dict):
         pass
     elif isinstance(json_input_path_or_stream, TextIOBase):
         try:
-            json_input_path_or_stream = json.load(json_input_path_or_stream)
+            with profile_stage("json_load"):
+                json_input_path_or_stream = json.load(json_input_path_or_stream)
         except json.JSONDecodeError:
             raise ValueError("Input stream is not a valid JSON object")
     elif isinstance(json_input_path_or_stream, Path):
         # Check path exists
         if not json_input_path_or_stream.exists():
             raise FileNotFoundError(f"File {json_input_path_or_stream} does not exist")
-        with open(json_input_path_or_stream, "r") as input_path_h:
+        with open(json_input_path_or_stream, "r") as input_path_h, profile_stage("json_load"):
             json_input_path_or_stream = json.load(input_path_h)
     else:
         raise ValueError(
@@ -117,16 +142,24 @@ def run_info_xml_writer(
 
     # Generate XML
     if output_path is None:
-        return StringIO(xmltodict.unparse(run_info_dict, pretty=True))
+        output_h = StringIO()
+        write_xml_stream(run_info_dict, output_h, element_order=RUN_INFO_ELEMENT_ORDER, final_newline=False)
+        output_h.seek(0)
+        return output_h
+    elif isinstance(output_path, (TextIOBase, RawIOBase, BufferedIOBase)):
+        write_xml_stream(run_info_dict, output_path, element_order=RUN_INFO_ELEMENT_ORDER)
     else:
         with open(output_path, "w") as output_path_h:
-            output_path_h.write(xmltodict.unparse(run_info_dict, pretty=True))
-            output_path_h.write("\n")
+            write_xml_stream(run_info_dict, output_path_h, element_order=RUN_INFO_ELEMENT_ORDER)
 
 
 def generate_run_info_xml_from_minimal_inputs(
     input_dict: Dict,
 ):
+    # Check Run object
+    if not isinstance(input_dict.get("Run", None), Dict):
+        raise ValueError("Expected to have a Run object")
+
     # Check Run ID Number
     if input_dict["Run"].get("@Id") is None:
         raise ValueError("Expected to have a Run.@ID attribute")
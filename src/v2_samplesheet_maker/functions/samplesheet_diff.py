@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+"""
+Find the differences between two samplesheets, each of which may be a SampleSheet object,
+a samplesheet dictionary, a samplesheet csv or a samplesheet json.
+
+Data rows are matched on their (lane, sample_id) key and key-value sections on each key,
+see classes/samplesheet_diff.py
+"""
+
+# Standard libraries
+import json
+from copy import deepcopy
+from io import TextIOBase
+from pathlib import Path
+from typing import Dict, Optional, TextIO, Union
+
+# Local libraries
+from ..classes.samplesheet import SampleSheet
+from ..classes.samplesheet_diff import get_samplesheet_dict_diff
+
+
+def get_normalised_samplesheet_dict(samplesheet: Union[SampleSheet, Dict, Path, TextIO]) -> Dict:
+    """
+    Get the samplesheet dictionary of the csv values (as returned by SampleSheet.to_record_dict) of a samplesheet.
+    Samplesheet csvs are not read through the samplesheet cache,
+    as cache entries are in the to_dict form, which leaves out some of the csv values of a row
+    :param samplesheet: A SampleSheet object, a samplesheet dictionary (as used by SampleSheet),
+      a path to a samplesheet csv or json (files ending in .json are read as json), or a text stream of a samplesheet csv
+    :return:
+    """
+    if isinstance(samplesheet, SampleSheet):
+        return samplesheet.to_record_dict()
+    if isinstance(samplesheet, Dict):
+        return SampleSheet(deepcopy(samplesheet)).to_record_dict()
+    if isinstance(samplesheet, Path) and samplesheet.suffix == ".json":
+        if not samplesheet.is_file():
+            raise FileNotFoundError(f"File {samplesheet} does not exist")
+        with open(samplesheet, "r") as samplesheet_h:
+            return SampleSheet(json.load(samplesheet_h)).to_record_dict()
+    if isinstance(samplesheet, (Path, TextIOBase)):
+        return SampleSheet.read_from_samplesheet_csv(samplesheet).to_record_dict()
+
+    raise ValueError(
+        f"Samplesheet is not a valid type, expected one of SampleSheet, Dict, TextIO or Path"
+        f" but got {type(samplesheet)}"
+    )
+
+
+def samplesheet_diff(
+    old_samplesheet: Union[SampleSheet, Dict, Path, TextIO],
+    new_samplesheet: Union[SampleSheet, Dict, Path, TextIO],
+    output_path: Optional[Union[Path, TextIO]] = None,
+) -> Optional[Dict]:
+    """
+    Find the added, removed and changed rows and fields of each section between two samplesheets
+    :param old_samplesheet: See get_normalised_samplesheet_dict
+    :param new_samplesheet: See get_normalised_samplesheet_dict
+    :param output_path: Write the diff as json to this path or text stream rather than returning it
+    :return: See get_samplesheet_dict_diff
+    """
+    diff_dict = get_samplesheet_dict_diff(
+        get_normalised_samplesheet_dict(old_samplesheet),
+        get_normalised_samplesheet_dict(new_samplesheet)
+    )
+
+    if output_path is None:
+        return diff_dict
+
+    if isinstance(output_path, TextIOBase):
+        json.dump(diff_dict, output_path, indent=2)
+        output_path.write("\n")
+        return None
+
+    with open(output_path, "w") as output_h:
+        json.dump(diff_dict, output_h, indent=2)
+        output_h.write("\n")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+"""
+Merge many samplesheets into one, each input may be a SampleSheet object, a samplesheet dictionary,
+a samplesheet csv or a samplesheet json.
+
+Samplesheet csvs are streamed into the merge a row at a time, and the merged samplesheet is built (and validated) once,
+see classes/samplesheet_merge.py
+"""
+
+# Standard libraries
+import json
+from io import TextIOBase
+from pathlib import Path
+from typing import Dict, Iterable, Optional, TextIO, Union
+
+# Local libraries
+from ..classes.samplesheet import SampleSheet, iter_samplesheet_csv, write_samplesheet_dict_json
+from ..classes.samplesheet_merge import SampleSheetMerger
+from ..enums import DataFrameEngine
+from ..utils.logger import get_logger
+from ..utils.profiler import profile_stage
+
+# Get logging
+logger = get_logger()
+
+
+def add_samplesheet_to_merger(merger: SampleSheetMerger, samplesheet: Union[SampleSheet, Dict, Path, TextIO]):
+    """
+    Add a samplesheet to a merge
+    :param merger:
+    :param samplesheet: A SampleSheet object, a samplesheet dictionary (as used by SampleSheet),
+      a path to a samplesheet csv or json (files ending in .json are read as json), or a text stream of a samplesheet csv
+    :return:
+    """
+    if isinstance(samplesheet, SampleSheet):
+        merger.add_samplesheet(samplesheet)
+    elif isinstance(samplesheet, Dict):
+        merger.add_samplesheet_dict(samplesheet)
+    elif isinstance(samplesheet, Path) and samplesheet.suffix == ".json":
+        if not samplesheet.is_file():
+            raise FileNotFoundError(f"File {samplesheet} does not exist")
+        with open(samplesheet, "r") as samplesheet_h, profile_stage("json_load"):
+            samplesheet_dict = json.load(samplesheet_h)
+        merger.add_samplesheet_dict(samplesheet_dict, source_name=str(samplesheet))
+    elif isinstance(samplesheet, (Path, TextIOBase)):
+        merger.add_samplesheet_events(
+            iter_samplesheet_csv(samplesheet),
+            source_name=str(samplesheet) if isinstance(samplesheet, Path) else None
+        )
+    else:
+        raise ValueError(
+            f"Samplesheet is not a valid type, expected one of SampleSheet, Dict, TextIO or Path"
+            f" but got {type(samplesheet)}"
+        )
+
+
+def merge_samplesheets(samplesheets: Iterable[Union[SampleSheet, Dict, Path, TextIO]]) -> Dict:
+    """
+    Merge samplesheets into a single samplesheet dictionary (in the same form as the json input),
+    identical data rows are dropped, conflicting rows or settings raise a ValueError
+    :param samplesheets: See add_samplesheet_to_merger
+    :return:
+    """
+    merger = SampleSheetMerger()
+
+    for samplesheet in samplesheets:
+        add_samplesheet_to_merger(merger, samplesheet)
+
+    if merger.duplicate_row_count > 0:
+        logger.info(f"Dropped {merger.duplicate_row_count} duplicate data rows")
+
+    return merger.get_samplesheet_dict()
+
+
+def samplesheet_merge(
+    samplesheets: Iterable[Union[SampleSheet, Dict, Path, TextIO]],
+    output_path: Optional[Union[Path, TextIO]] = None,
+    output_format: Optional[str] = None,
+    engine: Optional[Union[DataFrameEngine, str]] = None,
+) -> Optional[SampleSheet]:
+    """
+    Merge samplesheets, then build the merged samplesheet
+    :param samplesheets: See add_samplesheet_to_merger
+    :param output_path: Write the merged samplesheet to this path or text stream rather than returning it
+    :param output_format: One of csv or json, defaults to json for output paths ending in .json and csv otherwise
+    :param engine: The engine used to build each data section, one of 'pandas' or 'columnar'
+    :return:
+    """
+    samplesheet = SampleSheet(merge_samplesheets(samplesheets), engine=engine)
+
+    if output_path is None:
+        return samplesheet
+
+    if output_format is None:
+        output_format = "json" if isinstance(output_path, Path) and output_path.suffix == ".json" else "csv"
+
+    if output_format == "json":
+        write_samplesheet_dict_json(samplesheet.to_dict(), output_path)
+    elif output_format == "csv":
+        samplesheet.to_csv(output_path)
+    else:
+        logger.error(f"Expected the output format to be one of csv or json but got '{output_format}'")
+        raise ValueError
+
+    return None
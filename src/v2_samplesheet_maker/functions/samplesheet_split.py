@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+"""
+Split a samplesheet into shards (by lane, sample project, override cycles or index length)
+and write out each shard, see classes/samplesheet_split.py
+"""
+
+# Standard libraries
+import json
+from io import TextIOBase
+from pathlib import Path
+from typing import Any, Dict, Optional, TextIO, Union
+
+# Local libraries
+from ..classes.samplesheet import SampleSheet, write_samplesheet_dict_json
+from ..classes.samplesheet_split import get_shard_name, split_samplesheet
+from ..enums import SampleSheetSplitKey
+from ..utils.logger import get_logger
+from ..utils.profiler import profile_stage
+
+# Get logging
+logger = get_logger()
+
+
+def read_samplesheet(samplesheet: Union[SampleSheet, Dict, Path, TextIO]) -> SampleSheet:
+    """
+    Read in a samplesheet
+    :param samplesheet: A SampleSheet object, a samplesheet dictionary (as used by SampleSheet),
+      a path to a samplesheet csv or json (files ending in .json are read as json), or a text stream of a samplesheet csv
+    :return:
+    """
+    if isinstance(samplesheet, SampleSheet):
+        return samplesheet
+    if isinstance(samplesheet, Dict):
+        return SampleSheet(samplesheet)
+    if isinstance(samplesheet, Path) and samplesheet.suffix == ".json":
+        if not samplesheet.is_file():
+            raise FileNotFoundError(f"File {samplesheet} does not exist")
+        with open(samplesheet, "r") as samplesheet_h, profile_stage("json_load"):
+            samplesheet_dict = json.load(samplesheet_h)
+        return SampleSheet(samplesheet_dict)
+    if isinstance(samplesheet, (Path, TextIOBase)):
+        return SampleSheet.read_from_samplesheet_csv(samplesheet)
+
+    raise ValueError(
+        f"Samplesheet is not a valid type, expected one of SampleSheet, Dict, TextIO or Path"
+        f" but got {type(samplesheet)}"
+    )
+
+
+def samplesheet_split(
+    samplesheet: Union[SampleSheet, Dict, Path, TextIO],
+    split_key: Union[SampleSheetSplitKey, str],
+    output_dir: Optional[Path] = None,
+    output_format: str = "csv",
+    prefix: str = "SampleSheet",
+) -> Union[Dict[Any, SampleSheet], Dict[Any, Path]]:
+    """
+    Split a samplesheet into shards, and write out each shard
+    :param samplesheet: See read_samplesheet
+    :param split_key: One of lane, sample_project, override_cycles or index_length
+    :param output_dir: Write each shard to <output_dir>/<prefix>.<split_key>_<shard_name>.<csv|json>
+      rather than returning the shards, i.e SampleSheet.lane_1.csv
+    :param output_format: One of csv or json
+    :param prefix:
+    :return: The shard samplesheet of each split value, or the path each shard was written to if output_dir is set
+    """
+    if output_format not in ["csv", "json"]:
+        logger.error(f"Expected the output format to be one of csv or json but got '{output_format}'")
+        raise ValueError
+
+    shards = split_samplesheet(read_samplesheet(samplesheet), split_key)
+
+    if output_dir is None:
+        return shards
+
+    if not output_dir.is_dir():
+        logger.error(f"Could not find output directory '{output_dir}'")
+        raise NotADirectoryError
+
+    split_key = SampleSheetSplitKey(split_key)
+
+    shard_paths = dict(
+        map(
+            lambda split_value_iter: (
+                split_value_iter,
+                output_dir / f"{prefix}.{split_key.value}_{get_shard_name(split_value_iter)}.{output_format}"
+            ),
+            shards.keys()
+        )
+    )
+
+    # i.e the override cycles 'Y151;I8;I8;Y151' and 'Y151-I8-I8-Y151'
+    if len(set(shard_paths.values())) < len(shard_paths):
+        logger.error(f"The shards of split values {list(shard_paths.keys())} do not have unique file names")
+        raise ValueError
+
+    for split_value, shard in shards.items():
+        if output_format == "json":
+            write_samplesheet_dict_json(shard.to_dict(), shard_paths[split_value])
+        else:
+            shard.to_csv(shard_paths[split_value])
+
+    return shard_paths
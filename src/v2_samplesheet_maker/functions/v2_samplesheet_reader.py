@@ -13,50 +13,40 @@ otherwise it should write the json object to the output path and return None.
 from io import TextIOBase
 from pathlib import Path
 from typing import Union, TextIO, Optional, Dict
-import json
-from tempfile import NamedTemporaryFile
 
 # Local libraries
-from ..classes.samplesheet import SampleSheet
+from ..classes.samplesheet import write_samplesheet_dict_json
+from ..utils.cache import read_samplesheet_dict
 
 
 def v2_samplesheet_reader(
     csv_input_path_or_stream: Union[TextIO, Path],
-    output_path: Optional[Path] = None
+    output_path: Optional[Path] = None,
+    cache_dir: Optional[Path] = None,
 ) -> Optional[Dict]:
+    """
+    Read in a v2 samplesheet csv and return (or write out) the samplesheet as json
+    :param csv_input_path_or_stream: Path to the samplesheet csv or a text stream
+    :param output_path: Path to the output json or a writable text stream
+    :param cache_dir: Cache directory for parsed samplesheets, defaults to $V2_SAMPLESHEET_MAKER_CACHE_DIR.
+      If neither is set, the samplesheet is not cached
+    :return:
+    """
 
     # Read in SampleSheet csv
-    if isinstance(csv_input_path_or_stream, TextIOBase):
-        # Write text to temp file and get samplesheet to read csv from there
-        with NamedTemporaryFile(suffix='.csv') as tempfile_obj_h:
-            # Write output to temp file
-            tempfile_obj_h.write(csv_input_path_or_stream.read().encode())
-            # Use flush to make sure all output is written
-            tempfile_obj_h.flush()
-
-            # Now read in samplesheet from temp file
-            samplesheet = SampleSheet.read_from_samplesheet_csv(Path(tempfile_obj_h.name))
-
-    # Write out samplesheet to json and then stream back in
-    elif isinstance(csv_input_path_or_stream, Path):
-        samplesheet = SampleSheet.read_from_samplesheet_csv(csv_input_path_or_stream)
+    # Streams are read directly, no need to write to a temp file first
+    if isinstance(csv_input_path_or_stream, (TextIOBase, Path)):
+        samplesheet_dict = read_samplesheet_dict(csv_input_path_or_stream, cache_dir=cache_dir)
     else:
         raise ValueError(
             f"Input csv path or stream is not a valid type, expected one of TextIO or Path"
             f" but got {type(csv_input_path_or_stream)}"
         )
 
-    # Write out samplesheet to csv and then stream back in
+    # Return the samplesheet as a dict
     if output_path is None:
-        with NamedTemporaryFile(suffix='.json') as tempfile_obj_h:
+        return samplesheet_dict
 
-            # Write out samplesheet to file first
-            samplesheet.to_json(Path(tempfile_obj_h.name))
-
-            # Then read in the file and return it as a json object
-            with open(tempfile_obj_h.name, "r") as csv_h:
-                return json.load(csv_h)
-
-    # Write out samplesheet to regular csv
+    # Write out samplesheet to regular json
     else:
-        samplesheet.to_json(output_path)
+        write_samplesheet_dict_json(samplesheet_dict, output_path)
@@ -10,7 +10,6 @@ but we let the other functions to the rest of the work on that front.
 
 # Standard libraries
 from io import TextIOBase
-from tempfile import NamedTemporaryFile
 from pathlib import Path
 from typing import Optional, Dict, Union, TextIO
 from datetime import datetime
@@ -18,10 +17,11 @@ from datetime import datetime
 # Local libraries
 from ..section_classes.run_info_sections import ReadsSection
 from ..classes.samplesheet import SampleSheet
+from ..utils.cache import read_samplesheet_dict
 
 
 def samplesheet_to_run_info_json(
-    samplesheet: SampleSheet,
+    samplesheet: Union[SampleSheet, Dict],
     run_id: str,
     number: Optional[int] = None,
     flowcell: Optional[int] = None,
@@ -32,14 +32,22 @@ def samplesheet_to_run_info_json(
     image_channels: Optional[Dict] = None,
 ) -> Optional[Dict]:
 
-    # From a SampleSheet object - we need to collect the reads
-    reads_section: ReadsSection = samplesheet.reads_section
+    # From a SampleSheet object (or a samplesheet dictionary, as returned by SampleSheet.to_dict)
+    # we need to collect the reads
+    if isinstance(samplesheet, Dict):
+        if not isinstance(samplesheet.get("reads", None), Dict):
+            raise ValueError("Expected the samplesheet to have a Reads section")
+        reads_section: Dict = samplesheet["reads"]
+        get_reads_value = reads_section.get
+    else:
+        reads_section: ReadsSection = samplesheet.reads_section
+        get_reads_value = lambda key: getattr(reads_section, key, None)
 
     # Collect index cycles
-    read_1_cycles = getattr(reads_section, "read_1_cycles")
-    read_2_cycles = getattr(reads_section, "read_2_cycles", None)
-    index_1_cycles = getattr(reads_section, "index_1_cycles")
-    index_2_cycles = getattr(reads_section, "index_2_cycles", None)
+    read_1_cycles = get_reads_value("read_1_cycles")
+    read_2_cycles = get_reads_value("read_2_cycles")
+    index_1_cycles = get_reads_value("index_1_cycles")
+    index_2_cycles = get_reads_value("index_2_cycles")
 
     # Generate xml json
     reads_list = []
@@ -98,26 +106,17 @@ def samplesheet_csv_to_run_info_xml(
     date: Optional[datetime] = None,
     align_to_phix: Optional[bool] = None,
     image_dimensions: Optional[Dict] = None,
-    image_channels: Optional[Dict] = None
+    image_channels: Optional[Dict] = None,
+    cache_dir: Optional[Path] = None,
 ) -> Optional[Dict]:
     # Convert run info json to xml
     from .run_info_writer import run_info_xml_writer
 
     # Read in SampleSheet csv
-    if isinstance(csv_input_path_or_stream, TextIOBase):
-        # Write text to temp file and get samplesheet to read csv from there
-        with NamedTemporaryFile(suffix='.csv') as tempfile_obj_h:
-            # Write output to temp file
-            tempfile_obj_h.write(csv_input_path_or_stream.read().encode())
-            # Use flush to make sure all output is written
-            tempfile_obj_h.flush()
-
-            # Now read in samplesheet from temp file
-            samplesheet = SampleSheet.read_from_samplesheet_csv(Path(tempfile_obj_h.name))
-
-    # Write out samplesheet to json and then stream back in
-    elif isinstance(csv_input_path_or_stream, Path):
-        samplesheet = SampleSheet.read_from_samplesheet_csv(csv_input_path_or_stream)
+    # Streams are read directly, no need to write to a temp file first
+    # Parsed samplesheets are cached if $V2_SAMPLESHEET_MAKER_CACHE_DIR (or cache_dir) is set
+    if isinstance(csv_input_path_or_stream, (TextIOBase, Path)):
+        samplesheet = read_samplesheet_dict(csv_input_path_or_stream, cache_dir=cache_dir)
     else:
         raise ValueError(
             f"Input csv path or stream is not a valid type, expected one of TextIO or Path"
@@ -11,15 +11,15 @@ from io import StringIO, TextIOBase
 from pathlib import Path
 from typing import Union, TextIO, Optional, Dict
 import json
-from tempfile import NamedTemporaryFile
 
 # Local libraries
 from ..classes.samplesheet import SampleSheet
+from ..utils.profiler import profile_stage
 
 
 def v2_samplesheet_writer(
     json_input_path_or_stream: Union[Dict, TextIO, Path],
-    output_path: Optional[Path] = None
+    output_path: Optional[Union[Path, TextIO]] = None
 ) -> Optional[TextIO]:
 
     # Read in SampleSheet object
@@ -27,7 +27,8 @@ def v2_samplesheet_writer(
         samplesheet = SampleSheet(json_input_path_or_stream)
     elif isinstance(json_input_path_or_stream, TextIOBase):
         try:
-            json_input_path_or_stream = json.load(json_input_path_or_stream)
+            with profile_stage("json_load"):
+                json_input_path_or_stream = json.load(json_input_path_or_stream)
         except json.JSONDecodeError:
             raise ValueError("Input stream is not a valid JSON object")
         samplesheet = SampleSheet(json_input_path_or_stream)
@@ -35,25 +36,19 @@ def v2_samplesheet_writer(
         # Check path exists
         if not json_input_path_or_stream.exists():
             raise FileNotFoundError(f"File {json_input_path_or_stream} does not exist")
-        with open(json_input_path_or_stream, "r") as input_path_h:
-            samplesheet = SampleSheet(json.load(input_path_h))
+        with open(json_input_path_or_stream, "r") as input_path_h, profile_stage("json_load"):
+            json_input_path_or_stream = json.load(input_path_h)
+        samplesheet = SampleSheet(json_input_path_or_stream)
     else:
         raise ValueError(
             f"Input path or stream is not a valid type, expected one of Dict, TextIO or Path"
             f" but got {type(json_input_path_or_stream)}"
         )
 
-    # Write out samplesheet to csv and then stream back in
+    # Render samplesheet in memory
     if output_path is None:
-        with NamedTemporaryFile(suffix='.csv') as tempfile_obj_h:
-
-            # Write out samplesheet to file first
-            samplesheet.to_csv(Path(tempfile_obj_h.name))
-
-            # Then read in the file and return it as a string
-            with open(tempfile_obj_h.name, "r") as csv_h:
-                return StringIO(csv_h.read())
+        return StringIO(samplesheet.to_csv_string())
 
-    # Write out samplesheet to regular csv
+    # Write out samplesheet to regular csv (or stream)
     else:
         samplesheet.to_csv(output_path)
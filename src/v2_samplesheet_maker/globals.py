@@ -6,3 +6,6 @@ import re
 HEADER_REGEX_MATCH = re.compile(
     r"\[([a-zA-Z0-9_]+)](?:,*)?"
 )
+
+# Entry point group for third-party section classes
+SECTION_ENTRY_POINT_GROUP = "v2_samplesheet_maker.sections"
@@ -34,7 +34,7 @@ class BCLConvertSettingsSectionModel(BaseModel):
     software_version: Optional[str]
     urn: Optional[str]
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
     def to_dict(self):
         return {
@@ -103,7 +103,7 @@ class BCLConvertDataRowModel(BaseModel):
     library_prep_kit_name: Optional[str]
     index_adapter_kit_name: Optional[str]
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
     def to_dict(self):
         return {
@@ -176,4 +176,4 @@ class BCLConvertDataSectionModel(BaseModel):
 
     # Set row order columns
     row_order_columns: ClassVar[List] = ["Lane", "Sample_ID"]
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
@@ -19,7 +19,7 @@ class CloudSettingsSectionModel(BaseModel):
     # Analysis urns
     analysis_urns: Optional[Dict]
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
     def to_dict(self):
         initial_dict = {
@@ -63,7 +63,7 @@ class CloudDataSectionRowModel(BaseModel):
     library_prep_kit_name: Optional[str]
     index_adapter_kit_name: Optional[str]
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
     def to_dict(self):
         return {
@@ -91,4 +91,4 @@ class CloudDataSectionModel(BaseModel):
     # Set row order columns
     row_order_columns: ClassVar[List] = ["ProjectName", "Sample_ID", "LibraryName"]
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
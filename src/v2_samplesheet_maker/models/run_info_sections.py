@@ -16,7 +16,7 @@ class HeaderSectionModel(BaseModel):
     instrument_type: Optional[str]
     index_orientation: Optional[str]
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
     def to_dict(self):
         return {
@@ -45,7 +45,7 @@ class ReadsSectionModel(BaseModel):
     index_1_cycles: Optional[int]
     index_2_cycles: Optional[int]
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
     def to_dict(self):
         return {
@@ -71,7 +71,7 @@ class SequencingSectionModel(BaseModel):
     custom_read_2_primer: Optional[bool]
     library_prep_kits: Optional[List[str]]
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
     def to_dict(self):
         return {
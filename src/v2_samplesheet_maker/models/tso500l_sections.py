@@ -25,7 +25,7 @@ class TSO500LSettingsSectionModel(BaseModel):
     software_version: Optional[str]
     urn: Optional[str]
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
     def to_dict(self):
         return {
@@ -72,7 +72,7 @@ class TSO500LDataRowModel(BaseModel):
     library_prep_kit_name: Optional[str]
     index_adapter_kit_name: Optional[str]
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
     def to_dict(self):
         return {
@@ -136,4 +136,4 @@ class TSO500LDataSectionModel(BaseModel):
     # Set row order columns
     row_order_columns: ClassVar[List] = ["Sample_Type", "Sample_ID", "Index_ID"]
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
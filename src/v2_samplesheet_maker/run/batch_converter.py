@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+"""
+Convert many files across a pool of worker processes
+"""
+
+# Standard imports
+import json
+import sys
+from docopt import docopt
+
+# Custom imports
+from v2_samplesheet_maker.utils.cli import check_batch_converter_args
+from v2_samplesheet_maker.utils.logger import set_basic_logger
+from v2_samplesheet_maker.utils.docopt_docs import get_batch_converter_doc_opt
+
+def run_batch_converter():
+    """
+    Convert many files and report a summary of each conversion
+    :return:
+    """
+
+    # Read in batch args
+    args = docopt(get_batch_converter_doc_opt())
+
+    # Check args
+    args = check_batch_converter_args(args)
+
+    # Import conversion functions only after the args are parsed, so --help stays fast
+    from v2_samplesheet_maker.functions.batch_converter import batch_convert, get_batch_summary
+
+    # Run conversions
+    results = batch_convert(
+        args.get("conversion"),
+        args.get("conversion-pairs"),
+        jobs=args.get("jobs")
+    )
+
+    # Report each conversion
+    for result in results:
+        if result["success"]:
+            print(f"OK      {result['input']} -> {result['output']}", file=sys.stderr)
+        else:
+            print(f"FAILED  {result['input']}: {result['error']}", file=sys.stderr)
+
+    summary = get_batch_summary(results)
+    print(
+        f"{summary['succeeded']} of {summary['total']} conversions succeeded, {summary['failed']} failed",
+        file=sys.stderr
+    )
+
+    # Write out summary
+    if args.get("summary-json") is not None:
+        with open(args.get("summary-json"), "w") as summary_h:
+            json.dump(summary, summary_h, indent=2)
+            summary_h.write("\n")
+
+    if summary["failed"] > 0:
+        sys.exit(1)
+
+
+def main():
+    set_basic_logger()
+    run_batch_converter()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+
+"""
+Start, stop or check on the warm daemon used by the console scripts
+"""
+
+# Standard imports
+import sys
+from docopt import docopt
+
+# Custom imports
+from v2_samplesheet_maker.utils.cli import check_daemon_args
+from v2_samplesheet_maker.utils.logger import set_basic_logger
+from v2_samplesheet_maker.utils.docopt_docs import get_daemon_doc_opt
+from v2_samplesheet_maker.utils.daemon import serve_daemon, stop_daemon, ping_daemon
+
+
+def run_daemon():
+    """
+    Start, stop or check on the daemon
+    :return:
+    """
+
+    # Read in daemon args
+    args = docopt(get_daemon_doc_opt())
+
+    # Check args
+    args = check_daemon_args(args)
+
+    if args.get("action") == "start":
+        serve_daemon(args.get("socket-path"))
+    elif args.get("action") == "stop":
+        if not stop_daemon(args.get("socket-path")):
+            print(f"No daemon is listening on {args.get('socket-path')}", file=sys.stderr)
+            sys.exit(1)
+    else:
+        daemon_info = ping_daemon(args.get("socket-path"))
+        if daemon_info is None:
+            print(f"No daemon is listening on {args.get('socket-path')}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Daemon (pid {daemon_info['pid']}) is listening on {args.get('socket-path')}")
+
+
+def main():
+    set_basic_logger()
+    run_daemon()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+
+"""
+Run a local http conversion service
+"""
+
+# Standard imports
+from docopt import docopt
+
+# Custom imports
+from v2_samplesheet_maker.utils.cli import check_http_service_args
+from v2_samplesheet_maker.utils.logger import set_basic_logger
+from v2_samplesheet_maker.utils.docopt_docs import get_http_service_doc_opt
+
+
+def run_http_service():
+    """
+    Serve the conversion functions over http
+    :return:
+    """
+
+    # Read in http service args
+    args = docopt(get_http_service_doc_opt())
+
+    # Check args
+    args = check_http_service_args(args)
+
+    # Import the service only after the args are parsed, so --help stays fast
+    from v2_samplesheet_maker.utils.http_service import serve_http_service
+
+    serve_http_service(
+        host=args.get("host"),
+        port=args.get("port"),
+        workers=args.get("workers"),
+        queue_size=args.get("queue-size"),
+        use_processes=args.get("processes")
+    )
+
+
+def main():
+    set_basic_logger()
+    run_http_service()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+"""
+Check the indexes of a v2 samplesheet for collisions, or recommend barcode mismatches
+"""
+
+# Standard imports
+import json
+import sys
+from typing import Dict, List
+
+from docopt import docopt
+
+# Custom imports
+from v2_samplesheet_maker.utils.cli import check_index_tools_args
+from v2_samplesheet_maker.utils.logger import set_basic_logger
+from v2_samplesheet_maker.utils.docopt_docs import get_index_tools_doc_opt
+
+
+def get_settings_block(recommendations: Dict) -> List[str]:
+    """
+    Get the recommended BCLConvert_Settings block as a list of samplesheet lines
+    :param recommendations:
+    :return:
+    """
+    settings_lines = ["[BCLConvert_Settings]"]
+
+    for key, value in [
+        ("BarcodeMismatchesIndex1", recommendations["bclconvert_settings"]["barcode_mismatches_index_1"]),
+        ("BarcodeMismatchesIndex2", recommendations["bclconvert_settings"]["barcode_mismatches_index_2"]),
+    ]:
+        if value is not None:
+            settings_lines.append(f"{key},{value}")
+
+    return settings_lines
+
+
+def get_overrides_block(recommendations: Dict) -> List[str]:
+    """
+    Get the recommended per-sample overrides as a list of csv lines
+    :param recommendations:
+    :return:
+    """
+    return ["Lane,Sample_ID,BarcodeMismatchesIndex1,BarcodeMismatchesIndex2"] + list(
+        map(
+            lambda override_iter: ",".join(
+                map(
+                    lambda value_iter: "" if value_iter is None else str(value_iter),
+                    [
+                        override_iter["lane"],
+                        override_iter["sample_id"],
+                        override_iter["barcode_mismatches_index_1"],
+                        override_iter["barcode_mismatches_index_2"],
+                    ]
+                )
+            ),
+            recommendations["bclconvert_data_overrides"]
+        )
+    )
+
+
+def run_index_tools():
+    """
+    Check the indexes of a samplesheet or recommend barcode mismatches
+    :return:
+    """
+
+    # Read in index tools args
+    args = docopt(get_index_tools_doc_opt())
+
+    # Check args
+    args = check_index_tools_args(args)
+
+    # Import functions only after the args are parsed, so --help stays fast
+    from v2_samplesheet_maker.classes.samplesheet import SampleSheet
+    from v2_samplesheet_maker.functions.index_collisions import (
+        get_index_collisions, get_barcode_mismatch_recommendations
+    )
+
+    # Read in samplesheet
+    if isinstance(args.get("input-samplesheet"), Dict):
+        samplesheet = SampleSheet(args.get("input-samplesheet"))
+    else:
+        samplesheet = SampleSheet.read_from_samplesheet_csv(args.get("input-samplesheet"))
+
+    if args.get("action") == "check":
+        collisions = get_index_collisions(samplesheet)
+        for collision in collisions:
+            print(
+                f"Lane {collision['lane']}: {collision['sample_id_1']} and {collision['sample_id_2']} "
+                f"collide on {collision['collision_type']} "
+                f"(index distance {collision['index_distance']}, index2 distance {collision['index2_distance']})"
+            )
+        if len(collisions) > 0:
+            sys.exit(1)
+        return
+
+    recommendations = get_barcode_mismatch_recommendations(samplesheet)
+
+    if args.get("format") == "json":
+        print(json.dumps(recommendations, indent=2))
+    elif args.get("format") == "overrides":
+        print("\n".join(get_overrides_block(recommendations)))
+    else:
+        print("\n".join(get_settings_block(recommendations)))
+
+    # Let the user know about lanes that cannot be made safe
+    for lane_recommendation in recommendations["lanes"]:
+        if lane_recommendation["has_collisions"]:
+            print(
+                f"Lane {lane_recommendation['lane']} has samples that collide even with no barcode mismatches",
+                file=sys.stderr
+            )
+
+
+def main():
+    set_basic_logger()
+    run_index_tools()
+
+
+if __name__ == "__main__":
+    main()
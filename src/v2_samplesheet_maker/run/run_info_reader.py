@@ -9,8 +9,10 @@ from docopt import docopt
 
 # Custom imports
 from v2_samplesheet_maker.utils.cli import check_run_info_reader_args
+from v2_samplesheet_maker.utils.logger import set_basic_logger
+from v2_samplesheet_maker.utils.profiler import profile_cli
+from v2_samplesheet_maker.utils.daemon import forward_to_daemon
 from v2_samplesheet_maker.utils.docopt_docs import get_run_info_xml_reader_doc_opt
-from v2_samplesheet_maker.functions.run_info_reader import run_info_xml_reader
 
 
 def run_run_info_reader():
@@ -22,17 +24,27 @@ def run_run_info_reader():
     # Read in v2 samplesheet args
     args = docopt(get_run_info_xml_reader_doc_opt())
 
-    # Check args
-    args = check_run_info_reader_args(args)
+    # Profile the conversion if --profile or --cprofile are set
+    with profile_cli(args, "run-info-xml-reader"):
+        # Check args
+        args = check_run_info_reader_args(args)
 
-    # Read in samplesheet and validate
-    run_info_xml_reader(
-        args.get("input-xml"),
-        args.get("output-json")
-    )
+        # Import conversion functions only after the args are parsed, so --help stays fast
+        from v2_samplesheet_maker.functions.run_info_reader import run_info_xml_reader
+
+        # Read in samplesheet and validate
+        run_info_xml_reader(
+            args.get("input-xml"),
+            args.get("output-json")
+        )
 
 
 def main():
+    # Hand over to the warm daemon if it is running
+    if forward_to_daemon("run-info-xml-reader"):
+        return
+
+    set_basic_logger()
     run_run_info_reader()
 
 
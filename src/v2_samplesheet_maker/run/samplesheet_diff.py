@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+
+"""
+List the differences between two samplesheets
+"""
+
+# Standard imports
+import json
+import sys
+
+from docopt import docopt
+
+# Custom imports
+from v2_samplesheet_maker.utils.cli import check_samplesheet_diff_args
+from v2_samplesheet_maker.utils.logger import set_basic_logger
+from v2_samplesheet_maker.utils.docopt_docs import get_samplesheet_diff_doc_opt
+
+
+def run_samplesheet_diff():
+    """
+    Print the differences between two samplesheets
+    :return:
+    """
+
+    # Read in diff args
+    args = docopt(get_samplesheet_diff_doc_opt())
+
+    # Check args
+    args = check_samplesheet_diff_args(args)
+
+    # Import functions only after the args are parsed, so --help stays fast
+    from v2_samplesheet_maker.classes.samplesheet_diff import get_samplesheet_diff_lines
+    from v2_samplesheet_maker.functions.samplesheet_diff import samplesheet_diff
+
+    diff_dict = samplesheet_diff(args.get("old-samplesheet"), args.get("new-samplesheet"))
+
+    if args.get("format") == "json":
+        print(json.dumps(diff_dict, indent=2))
+    else:
+        for diff_line in get_samplesheet_diff_lines(diff_dict):
+            print(diff_line)
+
+    if diff_dict["has_differences"]:
+        sys.exit(1)
+
+
+def main():
+    set_basic_logger()
+    run_samplesheet_diff()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+
+"""
+Merge samplesheets into one
+"""
+
+# Standard imports
+from docopt import docopt
+
+# Custom imports
+from v2_samplesheet_maker.utils.cli import check_samplesheet_merge_args
+from v2_samplesheet_maker.utils.logger import set_basic_logger
+from v2_samplesheet_maker.utils.docopt_docs import get_samplesheet_merge_doc_opt
+
+
+def run_samplesheet_merge():
+    """
+    Merge the input samplesheets and write out the merged samplesheet
+    :return:
+    """
+
+    # Read in merge args
+    args = docopt(get_samplesheet_merge_doc_opt())
+
+    # Check args
+    args = check_samplesheet_merge_args(args)
+
+    # Import functions only after the args are parsed, so --help stays fast
+    from v2_samplesheet_maker.functions.samplesheet_merge import samplesheet_merge
+
+    samplesheet_merge(
+        args.get("input-samplesheets"),
+        output_path=args.get("output-samplesheet"),
+        output_format=args.get("format"),
+    )
+
+
+def main():
+    set_basic_logger()
+    run_samplesheet_merge()
+
+
+if __name__ == "__main__":
+    main()
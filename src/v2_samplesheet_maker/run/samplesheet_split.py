@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+
+"""
+Split a samplesheet into shards
+"""
+
+# Standard imports
+from docopt import docopt
+
+# Custom imports
+from v2_samplesheet_maker.utils.cli import check_samplesheet_split_args
+from v2_samplesheet_maker.utils.logger import set_basic_logger
+from v2_samplesheet_maker.utils.docopt_docs import get_samplesheet_split_doc_opt
+
+
+def run_samplesheet_split():
+    """
+    Split the input samplesheet and write out each shard
+    :return:
+    """
+
+    # Read in split args
+    args = docopt(get_samplesheet_split_doc_opt())
+
+    # Check args
+    args = check_samplesheet_split_args(args)
+
+    # Import functions only after the args are parsed, so --help stays fast
+    from v2_samplesheet_maker.functions.samplesheet_split import samplesheet_split
+
+    samplesheet_split(
+        args.get("input-samplesheet"),
+        args.get("split-key"),
+        output_dir=args.get("output-dir"),
+        output_format=args.get("format"),
+        prefix=args.get("prefix"),
+    )
+
+
+def main():
+    set_basic_logger()
+    run_samplesheet_split()
+
+
+if __name__ == "__main__":
+    main()
@@ -9,8 +9,10 @@ from docopt import docopt
 
 # Custom imports
 from v2_samplesheet_maker.utils.cli import check_v2_samplesheet_reader_args
+from v2_samplesheet_maker.utils.logger import set_basic_logger
+from v2_samplesheet_maker.utils.profiler import profile_cli
+from v2_samplesheet_maker.utils.daemon import forward_to_daemon
 from v2_samplesheet_maker.utils.docopt_docs import get_v2_samplesheet_reader_doc_opt
-from v2_samplesheet_maker.functions.v2_samplesheet_reader import v2_samplesheet_reader
 
 
 def read_v2_samplesheet():
@@ -22,17 +24,27 @@ def read_v2_samplesheet():
     # Read in v2 samplesheet args
     args = docopt(get_v2_samplesheet_reader_doc_opt())
 
-    # Check args
-    args = check_v2_samplesheet_reader_args(args)
+    # Profile the conversion if --profile or --cprofile are set
+    with profile_cli(args, "v2-samplesheet-to-json"):
+        # Check args
+        args = check_v2_samplesheet_reader_args(args)
 
-    # Read in samplesheet and validate
-    v2_samplesheet_reader(
-        args.get("input-csv"),
-        args.get("output-json")
-    )
+        # Import conversion functions only after the args are parsed, so --help stays fast
+        from v2_samplesheet_maker.functions.v2_samplesheet_reader import v2_samplesheet_reader
+
+        # Read in samplesheet and validate
+        v2_samplesheet_reader(
+            args.get("input-csv"),
+            args.get("output-json")
+        )
 
 
 def main():
+    # Hand over to the warm daemon if it is running
+    if forward_to_daemon("v2-samplesheet-to-json"):
+        return
+
+    set_basic_logger()
     read_v2_samplesheet()
 
 
@@ -9,8 +9,10 @@ from docopt import docopt
 
 # Custom imports
 from v2_samplesheet_maker.utils.cli import check_v2_samplesheet_to_run_info_xml
+from v2_samplesheet_maker.utils.logger import set_basic_logger
+from v2_samplesheet_maker.utils.profiler import profile_cli
+from v2_samplesheet_maker.utils.daemon import forward_to_daemon
 from v2_samplesheet_maker.utils.docopt_docs import get_samplesheet_csv_to_run_info_xml_doc_opt
-from v2_samplesheet_maker.functions.v2_samplesheet_to_run_info import samplesheet_csv_to_run_info_xml
 
 
 def v2_samplesheet_to_run_info_xml():
@@ -22,25 +24,35 @@ def v2_samplesheet_to_run_info_xml():
     # Read in v2 samplesheet args
     args = docopt(get_samplesheet_csv_to_run_info_xml_doc_opt())
 
-    # Check args
-    args = check_v2_samplesheet_to_run_info_xml(args)
-
-    # Read in samplesheet and validate
-    samplesheet_csv_to_run_info_xml(
-        args.get("input-csv"),
-        run_id=args.get("run-id"),
-        output_path=args.get("output-xml"),
-        number=args.get('number'),
-        flowcell=args.get('flowcell'),
-        instrument=args.get('instrument'),
-        date=args.get('date'),
-        align_to_phix=args.get('align-to-phix'),
-        image_dimensions=args.get('image-dimensions'),
-        image_channels=args.get('image-channels')
-    )
+    # Profile the conversion if --profile or --cprofile are set
+    with profile_cli(args, "v2-samplesheet-to-run-info-xml"):
+        # Check args
+        args = check_v2_samplesheet_to_run_info_xml(args)
+
+        # Import conversion functions only after the args are parsed, so --help stays fast
+        from v2_samplesheet_maker.functions.v2_samplesheet_to_run_info import samplesheet_csv_to_run_info_xml
+
+        # Read in samplesheet and validate
+        samplesheet_csv_to_run_info_xml(
+            args.get("input-csv"),
+            run_id=args.get("run-id"),
+            output_path=args.get("output-xml"),
+            number=args.get('number'),
+            flowcell=args.get('flowcell'),
+            instrument=args.get('instrument'),
+            date=args.get('date'),
+            align_to_phix=args.get('align-to-phix'),
+            image_dimensions=args.get('image-dimensions'),
+            image_channels=args.get('image-channels')
+        )
 
 
 def main():
+    # Hand over to the warm daemon if it is running
+    if forward_to_daemon("v2-samplesheet-to-run-info-xml"):
+        return
+
+    set_basic_logger()
     v2_samplesheet_to_run_info_xml()
 
 
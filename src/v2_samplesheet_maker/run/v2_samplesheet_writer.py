@@ -6,8 +6,10 @@ from docopt import docopt
 # For __main__ must use absolute imports
 # https://docs.python.org/3/tutorial/modules.html#intra-package-references
 from v2_samplesheet_maker.utils.cli import check_v2_samplesheet_writer_args
+from v2_samplesheet_maker.utils.logger import set_basic_logger
+from v2_samplesheet_maker.utils.profiler import profile_cli
+from v2_samplesheet_maker.utils.daemon import forward_to_daemon
 from v2_samplesheet_maker.utils.docopt_docs import get_v2_samplesheet_writer_doc_opt
-from v2_samplesheet_maker.functions.v2_samplesheet_writer import v2_samplesheet_writer
 
 
 def run_v2_samplesheet_writer():
@@ -19,17 +21,27 @@ def run_v2_samplesheet_writer():
     # Read in v2 samplesheet args
     args = docopt(get_v2_samplesheet_writer_doc_opt())
 
-    # Check args
-    args = check_v2_samplesheet_writer_args(args)
+    # Profile the conversion if --profile or --cprofile are set
+    with profile_cli(args, "v2-samplesheet-maker"):
+        # Check args
+        args = check_v2_samplesheet_writer_args(args)
 
-    # Read in samplesheet and validate
-    v2_samplesheet_writer(
-        args.get("input-json"),
-        args.get("output-csv")
-    )
+        # Import conversion functions only after the args are parsed, so --help stays fast
+        from v2_samplesheet_maker.functions.v2_samplesheet_writer import v2_samplesheet_writer
+
+        # Read in samplesheet and validate
+        v2_samplesheet_writer(
+            args.get("input-json"),
+            args.get("output-csv")
+        )
 
 
 def main():
+    # Hand over to the warm daemon if it is running
+    if forward_to_daemon("v2-samplesheet-maker"):
+        return
+
+    set_basic_logger()
     run_v2_samplesheet_writer()
 
 
@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+
+"""
+The built-in section classes.
+
+Each section class registers itself when its module is imported,
+sections are written out in the order they are registered, so the modules are always imported in this order
+"""
+
+from . import (  # noqa: F401
+    run_info_sections,
+    bcl_convert_sections,
+    cloud_sections,
+    tso500s_sections,
+    tso500l_sections,
+)
@@ -35,12 +35,15 @@ class BCLConvertDataRow(DataFrameSectionRow):
     A BCLConvert DataRow
     """
 
+    # Rows are fully slotted, see DataFrameSectionRow
+    __slots__ = ()
+
     # Set model
     _model = BCLConvertDataRowModel
 
     def get_cloud_data_row(self):
-        # Collect original objects
-        return self._model(**self.get_dict_object()).get_cloud_data_section_row()
+        # Collect from the validated model
+        return self.get_model_instance().get_cloud_data_section_row()
 
 
 class BCLConvertDataSection(DataFrameSection):
@@ -56,9 +59,10 @@ class BCLConvertDataSection(DataFrameSection):
     _class_header = "BCLConvert_Data"
 
     def get_cloud_data_list(self):
+        # Generated from the already validated rows
         return list(
             map(
-                lambda row_iter: self._row_obj(**row_iter).get_cloud_data_row(),
-                self._raw_args
+                lambda data_row_iter: data_row_iter.get_cloud_data_row(),
+                self.data_rows
             )
         )
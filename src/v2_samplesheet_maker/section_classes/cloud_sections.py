@@ -5,10 +5,10 @@ Define each of the available section_classes
 """
 from copy import deepcopy
 
-import pandas as pd
-
 # Relative modules
+from ..enums import DataFrameEngine
 from ..utils import snake_case_to_upper_snake_case
+from ..classes.columnar_frame import ColumnarFrame
 from ..classes.super_sections import KVSection, DataFrameSection, DataFrameSectionRow
 from ..models.cloud_section import (
     CloudSettingsSectionModel,
@@ -23,6 +23,8 @@ class CloudSettingsSection(KVSection):
     """
     _model = CloudSettingsSectionModel
     _class_header = "Cloud_Settings"
+    # Read in after the other sections, so the urns / data of each section can be collected
+    _import_last = True
 
     def __init__(self, *args, **kwargs):
         # Initialise set
@@ -72,6 +74,9 @@ class CloudDataSectionRow(DataFrameSectionRow):
     A BCLConvert DataRow
     """
 
+    # Rows are fully slotted, see DataFrameSectionRow
+    __slots__ = ()
+
     # Set model
     _model = CloudDataSectionRowModel
 
@@ -85,6 +90,8 @@ class CloudDataSection(DataFrameSection):
     _model = CloudDataSectionModel
     _row_obj = CloudDataSectionRow
     _class_header = "Cloud_Data"
+    # Read in after the other sections, so the urns / data of each section can be collected
+    _import_last = True
 
     def clean_rows(self):
         """
@@ -92,6 +99,12 @@ class CloudDataSection(DataFrameSection):
         urn in BCLConvert_Settings is defined
         :return:
         """
+        if self.engine == DataFrameEngine.COLUMNAR:
+            self.clean_rows_columnar()
+            return
+
+        import pandas as pd
+
         # Fillna based on sample_id
         mini_sample_dfs = []
         column_names_to_fill = ["LibraryPrepKitName", "IndexAdapterKitName"]
@@ -123,3 +136,58 @@ class CloudDataSection(DataFrameSection):
 
         # Reset df
         self.section_df = cloud_data_list_df
+
+    def clean_rows_columnar(self):
+        """
+        Columnar equivalent of clean_rows, rows are grouped by (sorted) Sample_ID,
+        within a group, missing values in columns that are not entirely empty are set to 'ffill'
+        and duplicate rows are dropped
+        :return:
+        """
+        # Group row indices by sample id, rows without a sample id are dropped
+        sample_groups = {}
+        for row_index, sample_id in enumerate(self.section_df["Sample_ID"]):
+            if sample_id is None:
+                continue
+            sample_groups.setdefault(sample_id, []).append(row_index)
+
+        cloud_data_list_columns_og = self.section_df.columns
+        cloud_data_records = self.section_df.to_records()
+        cloud_data_records_cleaned = []
+        for sample_id in sorted(sample_groups.keys()):
+            sample_records = list(map(lambda row_index: cloud_data_records[row_index], sample_groups[sample_id]))
+
+            # Columns that are entirely empty for this sample are left as is
+            filled_columns = list(
+                filter(
+                    lambda column_iter: any(
+                        map(
+                            lambda sample_record_iter: sample_record_iter[column_iter] is not None,
+                            sample_records
+                        )
+                    ),
+                    cloud_data_list_columns_og
+                )
+            )
+
+            seen_rows = set()
+            for sample_record in sample_records:
+                sample_record = {
+                    column_iter: (
+                        "ffill"
+                        if column_iter in filled_columns and sample_record[column_iter] is None
+                        else sample_record[column_iter]
+                    )
+                    for column_iter in cloud_data_list_columns_og
+                }
+                row_key = tuple(sample_record.values())
+                if row_key in seen_rows:
+                    continue
+                seen_rows.add(row_key)
+                cloud_data_records_cleaned.append(sample_record)
+
+        # Reset df
+        self.section_df = ColumnarFrame.from_records(
+            cloud_data_records_cleaned,
+            columns=cloud_data_list_columns_og
+        )
@@ -39,12 +39,15 @@ class TSO500LDataRowSection(DataFrameSectionRow):
     A BCLConvert DataRow
     """
 
+    # Rows are fully slotted, see DataFrameSectionRow
+    __slots__ = ()
+
     # Set model
     _model = TSO500LDataRowModel
 
     def get_cloud_data_row(self):
-        # Collect original objects
-        return self._model(**self.get_dict_object()).get_cloud_data_section_row()
+        # Collect from the validated model
+        return self.get_model_instance().get_cloud_data_section_row()
 
 
 class TSO500LDataSection(DataFrameSection):
@@ -64,10 +67,11 @@ class CloudTSO500LDataSection(TSO500LDataSection):
     _is_cloud = True
 
     def get_cloud_data_list(self):
+        # Generated from the already validated rows
         return list(
             map(
-                lambda row_iter: self._row_obj(**row_iter).get_cloud_data_row(),
-                self._raw_args
+                lambda data_row_iter: data_row_iter.get_cloud_data_row(),
+                self.data_rows
             )
         )
 
@@ -1,6 +1,152 @@
 #!/usr/bin/env python3
 
+# Standard imports
+from functools import lru_cache
+from typing import Dict, Tuple
+
+# Number of keys outside of the section models to remember the conversion of
+KEY_CONVERSION_CACHE_SIZE = 4096
+
+
+class ModelKeyMarker(list):
+    """
+    A non-None placeholder for a model field that survives the value conversions made in to_dict / to_json
+    (i.e enum.value and ';'.join(list))
+    """
+    value = "_"
+
+    def __init__(self):
+        super().__init__(["_"])
+
+
+def get_model_key_pairs(model) -> Dict[str, str]:
+    """
+    Find the PascalCase (to_dict) key and snake_case (to_json) key of each field in a section model.
+
+    Each field in turn is set to a placeholder (with every other field set to None),
+    the keys that are no longer None in to_dict and to_json belong to that field.
+    Fields that cannot be traced back to exactly one key are skipped.
+    :param model:
+    :return: A dictionary of PascalCase keys to snake_case keys
+    """
+    def get_non_null_keys(dict_object: Dict) -> set:
+        return set(
+            map(
+                lambda kv: kv[0],
+                filter(lambda kv: kv[1] is not None, dict_object.items())
+            )
+        )
+
+    null_fields = dict.fromkeys(model.model_fields.keys())
+    null_instance = model.model_construct(**null_fields)
+    null_dict_keys = get_non_null_keys(null_instance.to_dict())
+    null_json_keys = get_non_null_keys(null_instance.to_json())
+
+    key_pairs = {}
+    for field_name in model.model_fields.keys():
+        marked_instance = model.model_construct(**dict(null_fields, **{field_name: ModelKeyMarker()}))
+        try:
+            dict_keys = get_non_null_keys(marked_instance.to_dict()) - null_dict_keys
+            json_keys = get_non_null_keys(marked_instance.to_json()) - null_json_keys
+        except (AttributeError, TypeError, ValueError):
+            # Field is not a simple value (i.e the analysis_urns dict)
+            continue
+
+        if not len(dict_keys) == 1:
+            continue
+
+        # Some fields (i.e adapter_behavior in BCLConvert_Data) are written out to the csv but not to json
+        key_pairs[dict_keys.pop()] = json_keys.pop() if len(json_keys) == 1 else field_name
+
+    return key_pairs
+
+
+@lru_cache(maxsize=None)
+def get_key_conversion_maps() -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    Generate the PascalCase -> snake_case and snake_case -> PascalCase maps for every field of every section model.
+    Keys that are used by more than one model with conflicting conversions are left out of the maps
+    :return: A tuple of (pascal case to snake case map, snake case to pascal case map)
+    """
+    from pydantic import BaseModel
+    from ..models import (
+        bcl_convert_sections, cloud_section, run_info_sections, tso500l_sections, tso500s_sections
+    )
+
+    # Collect all models with both a to_dict and to_json method
+    models = list(
+        filter(
+            lambda model_iter: (
+                isinstance(model_iter, type) and
+                issubclass(model_iter, BaseModel) and
+                hasattr(model_iter, "to_dict") and
+                hasattr(model_iter, "to_json")
+            ),
+            [
+                model_iter
+                for models_module in [
+                    bcl_convert_sections, cloud_section, run_info_sections, tso500l_sections, tso500s_sections
+                ]
+                for model_iter in vars(models_module).values()
+            ]
+        )
+    )
+
+    pascal_to_snake_map: Dict[str, str] = {}
+    snake_to_pascal_map: Dict[str, str] = {}
+    conflicting_pascal_keys = set()
+    conflicting_snake_keys = set()
+
+    for model in models:
+        for pascal_key, snake_key in get_model_key_pairs(model).items():
+            if pascal_to_snake_map.setdefault(pascal_key, snake_key) != snake_key:
+                conflicting_pascal_keys.add(pascal_key)
+            if snake_to_pascal_map.setdefault(snake_key, pascal_key) != pascal_key:
+                conflicting_snake_keys.add(snake_key)
+
+    for pascal_key in conflicting_pascal_keys:
+        del pascal_to_snake_map[pascal_key]
+    for snake_key in conflicting_snake_keys:
+        del snake_to_pascal_map[snake_key]
+
+    return pascal_to_snake_map, snake_to_pascal_map
+
+
 def pascal_case_to_snake_case(pascal_case_string: str) -> str:
+    """
+    Convert a string from PascalCase to snake_case.
+
+    Keys of the section models are looked up in a table generated from the models themselves
+    (so are guaranteed to round-trip back to the model field), anything else is converted by
+    convert_pascal_case_to_snake_case
+    :param pascal_case_string:
+    :return:
+    """
+    snake_case_string = get_key_conversion_maps()[0].get(pascal_case_string, None)
+
+    if snake_case_string is not None:
+        return snake_case_string
+
+    return convert_pascal_case_to_snake_case(pascal_case_string)
+
+
+def snake_case_to_pascal_case(snake_case_string: str) -> str:
+    """
+    Convert a section model key from snake_case back to the PascalCase key used in the samplesheet csv,
+    i.e barcode_mismatches_index_1 -> BarcodeMismatchesIndex1
+    :param snake_case_string:
+    :return:
+    """
+    pascal_case_string = get_key_conversion_maps()[1].get(snake_case_string, None)
+
+    if pascal_case_string is None:
+        raise KeyError(f"'{snake_case_string}' is not a key of any samplesheet section")
+
+    return pascal_case_string
+
+
+@lru_cache(maxsize=KEY_CONVERSION_CACHE_SIZE)
+def convert_pascal_case_to_snake_case(pascal_case_string: str) -> str:
     """
     Convert a string from PascalCase to snake_case
     We make the following exceptions
@@ -60,6 +206,7 @@ def pascal_case_to_snake_case(pascal_case_string: str) -> str:
     return snake_case_string
 
 
+@lru_cache(maxsize=KEY_CONVERSION_CACHE_SIZE)
 def snake_case_to_upper_snake_case(snake_case_str: str) -> str:
     """
     Convert cloud_tso500l_pipeline to Cloud_TSO500L_Pipeline
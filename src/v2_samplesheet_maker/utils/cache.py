@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+
+"""
+An opt-in on-disk cache of parsed samplesheets.
+
+Each entry is the validated, normalised samplesheet (as returned by SampleSheet.to_dict),
+keyed by a sha256 hash of the package version and the bytes of the samplesheet csv.
+A samplesheet that has been read before is loaded straight from its json entry,
+without parsing the csv or validating it again.
+
+The cache is enabled by setting V2_SAMPLESHEET_MAKER_CACHE_DIR (or passing cache_dir to the functions that support it).
+Once the cache is larger than V2_SAMPLESHEET_MAKER_CACHE_MAX_SIZE bytes (default 256 MiB),
+the least recently used entries are removed.
+
+Any number of processes may share a cache directory
+* Entries are written to a temporary file and moved into place, so are never read half written
+* Reading an entry updates its modification time, which is used as its last access time
+* Eviction is serialised with a lock file, removing an entry another process has already removed is not an error
+"""
+
+# Standard imports
+import hashlib
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from .logger import get_logger
+
+logger = get_logger()
+
+# Environment variables
+CACHE_DIR_ENV_VAR = "V2_SAMPLESHEET_MAKER_CACHE_DIR"
+CACHE_MAX_SIZE_ENV_VAR = "V2_SAMPLESHEET_MAKER_CACHE_MAX_SIZE"
+
+DEFAULT_CACHE_MAX_SIZE = 256 * 1024 * 1024
+
+CACHE_ENTRY_SUFFIX = ".json"
+CACHE_LOCK_FILE_NAME = ".lock"
+
+
+def get_package_version() -> str:
+    """
+    Get the installed version of the package, part of each cache key
+    so that entries are not shared between versions
+    :return:
+    """
+    from importlib.metadata import version, PackageNotFoundError
+
+    try:
+        return version("v2_samplesheet_maker")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+@contextmanager
+def cache_lock(lock_path: Path):
+    """
+    Hold an exclusive lock on a lock file, shared between processes
+    :param lock_path:
+    :return:
+    """
+    try:
+        import fcntl
+    except ImportError:
+        # No file locking on this platform, eviction tolerates entries that have already gone
+        yield
+        return
+
+    with open(lock_path, "a") as lock_h:
+        fcntl.flock(lock_h, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_h, fcntl.LOCK_UN)
+
+
+class SampleSheetCache:
+    """
+    A content addressed cache of normalised samplesheet dictionaries
+    """
+
+    def __init__(self, cache_dir: Union[Path, str], max_size: int = DEFAULT_CACHE_MAX_SIZE):
+        """
+        :param cache_dir: The cache directory, created if it does not exist
+        :param max_size: The maximum size of the cache in bytes
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_size = max_size
+        self.package_version = get_package_version()
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+
+    def get_key(self, input_bytes: bytes) -> str:
+        """
+        Get the cache key of a samplesheet
+        :param input_bytes: The bytes of the samplesheet csv
+        :return:
+        """
+        hasher = hashlib.sha256()
+        hasher.update(self.package_version.encode())
+        hasher.update(b"\0")
+        hasher.update(input_bytes)
+        return hasher.hexdigest()
+
+    def get_entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{CACHE_ENTRY_SUFFIX}"
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Get a samplesheet from the cache
+        :param key:
+        :return: The samplesheet dictionary, or None if the samplesheet is not in the cache
+        """
+        entry_path = self.get_entry_path(key)
+
+        try:
+            with open(entry_path, "r") as entry_h:
+                samplesheet_dict = json.load(entry_h)
+        except FileNotFoundError:
+            return None
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            # Shouldn't happen as entries are moved into place once complete, but don't trust a bad entry
+            logger.warning("Removing unreadable cache entry %s", entry_path)
+            entry_path.unlink(missing_ok=True)
+            return None
+
+        # Mark as recently used
+        try:
+            os.utime(entry_path)
+        except FileNotFoundError:
+            # Evicted by another process since we read it
+            pass
+
+        return samplesheet_dict
+
+    def put(self, key: str, samplesheet_dict: Dict):
+        """
+        Add a samplesheet to the cache, then evict the least recently used entries if the cache is too large
+        :param key:
+        :param samplesheet_dict:
+        :return:
+        """
+        import tempfile
+
+        # Write to a temporary file in the same directory, then move into place
+        temp_fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=f".{key}.", suffix=".tmp")
+        try:
+            with os.fdopen(temp_fd, "w") as temp_h:
+                json.dump(samplesheet_dict, temp_h, separators=(",", ":"))
+            os.replace(temp_path, self.get_entry_path(key))
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+        self.evict()
+
+    def get_size(self) -> int:
+        """
+        Get the total size of the cache entries in bytes
+        :return:
+        """
+        return sum(
+            map(
+                lambda entry_iter: entry_iter[1],
+                self.list_entries()
+            )
+        )
+
+    def list_entries(self):
+        """
+        List the cache entries as (path, size, last access time) tuples
+        :return:
+        """
+        entries = []
+        for dir_entry in os.scandir(self.cache_dir):
+            if not dir_entry.name.endswith(CACHE_ENTRY_SUFFIX) or dir_entry.name.startswith("."):
+                continue
+            try:
+                entry_stat = dir_entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((Path(dir_entry.path), entry_stat.st_size, entry_stat.st_mtime))
+
+        return entries
+
+    def evict(self):
+        """
+        Remove the least recently used entries until the cache is no larger than max_size
+        :return:
+        """
+        with self.lock():
+            entries = self.list_entries()
+            cache_size = sum(map(lambda entry_iter: entry_iter[1], entries))
+
+            if cache_size <= self.max_size:
+                return
+
+            for entry_path, entry_size, _ in sorted(entries, key=lambda entry_iter: entry_iter[2]):
+                if cache_size <= self.max_size:
+                    break
+                entry_path.unlink(missing_ok=True)
+                cache_size -= entry_size
+
+    def lock(self):
+        """
+        An exclusive lock on the cache directory, shared between processes
+        :return:
+        """
+        return cache_lock(self.cache_dir / CACHE_LOCK_FILE_NAME)
+
+    def clear(self):
+        """
+        Remove every entry from the cache
+        :return:
+        """
+        with self.lock():
+            for entry_path, _, _ in self.list_entries():
+                entry_path.unlink(missing_ok=True)
+
+
+def get_samplesheet_cache(cache_dir: Optional[Union[Path, str]] = None) -> Optional[SampleSheetCache]:
+    """
+    Get the samplesheet cache, if it has been enabled
+    :param cache_dir: The cache directory, defaults to $V2_SAMPLESHEET_MAKER_CACHE_DIR
+    :return: None if no cache directory is given and V2_SAMPLESHEET_MAKER_CACHE_DIR is not set
+    """
+    if cache_dir is None:
+        cache_dir = os.environ.get(CACHE_DIR_ENV_VAR, None) or None
+
+    if cache_dir is None:
+        return None
+
+    max_size_env = os.environ.get(CACHE_MAX_SIZE_ENV_VAR, None)
+    if max_size_env is None or max_size_env == "":
+        max_size = DEFAULT_CACHE_MAX_SIZE
+    elif not max_size_env.isdigit():
+        logger.error(f"Expected {CACHE_MAX_SIZE_ENV_VAR} to be a size in bytes but got '{max_size_env}'")
+        raise ValueError
+    else:
+        max_size = int(max_size_env)
+
+    return SampleSheetCache(cache_dir, max_size=max_size)
+
+
+def read_samplesheet_dict(
+    csv_input_path_or_stream,
+    cache_dir: Optional[Union[Path, str]] = None,
+) -> Dict:
+    """
+    Read a samplesheet csv into its normalised dictionary (as returned by SampleSheet.to_dict),
+    using the samplesheet cache if it is enabled
+    :param csv_input_path_or_stream: Path to the samplesheet csv or a text stream
+    :param cache_dir: The cache directory, defaults to $V2_SAMPLESHEET_MAKER_CACHE_DIR
+    :return:
+    """
+    from io import StringIO, TextIOBase
+    from ..classes.samplesheet import SampleSheet
+
+    samplesheet_cache = get_samplesheet_cache(cache_dir)
+
+    if samplesheet_cache is None:
+        return SampleSheet.read_from_samplesheet_csv(csv_input_path_or_stream).to_dict()
+
+    # Read in the samplesheet bytes to get the key
+    if isinstance(csv_input_path_or_stream, TextIOBase):
+        input_bytes = csv_input_path_or_stream.read().encode()
+    elif isinstance(csv_input_path_or_stream, Path):
+        if not csv_input_path_or_stream.is_file():
+            logger.error(f"Samplesheet file {csv_input_path_or_stream} does not exist")
+            raise FileNotFoundError
+        input_bytes = csv_input_path_or_stream.read_bytes()
+    else:
+        raise ValueError(
+            f"Input csv path or stream is not a valid type, expected one of TextIO or Path"
+            f" but got {type(csv_input_path_or_stream)}"
+        )
+
+    key = samplesheet_cache.get_key(input_bytes)
+
+    samplesheet_dict = samplesheet_cache.get(key)
+    if samplesheet_dict is not None:
+        return samplesheet_dict
+
+    samplesheet_dict = SampleSheet.read_from_samplesheet_csv(StringIO(input_bytes.decode())).to_dict()
+    samplesheet_cache.put(key, samplesheet_dict)
+
+    return samplesheet_dict
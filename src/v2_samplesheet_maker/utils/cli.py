@@ -2,12 +2,12 @@
 import json
 import sys
 from copy import deepcopy
+from glob import glob
 from pathlib import Path
 from typing import Dict
 
-from .logger import set_basic_logger, get_logger
-
-set_basic_logger()
+from .logger import get_logger
+from .profiler import profile_stage
 
 logger = get_logger()
 
@@ -40,7 +40,8 @@ def check_v2_samplesheet_writer_args(args) -> Dict:
     with open(input_json, 'r') as input_json_h:
         # Read input
         try:
-            input_json_dict = json.loads(input_json_h.read())
+            with profile_stage("json_load"):
+                input_json_dict = json.loads(input_json_h.read())
         except json.JSONDecodeError:
             logger.error(f"Could not read {input_json_arg} as valid json")
             raise json.JSONDecodeError
@@ -183,7 +184,8 @@ def check_run_info_xml_writer_args(args) -> Dict:
     with open(input_json, 'r') as input_json_h:
         # Read input
         try:
-            input_json_dict = json.loads(input_json_h.read())
+            with profile_stage("json_load"):
+                input_json_dict = json.loads(input_json_h.read())
         except json.JSONDecodeError:
             logger.error(f"Could not read {input_json_arg} as valid json")
             raise json.JSONDecodeError
@@ -271,3 +273,408 @@ def check_v2_samplesheet_to_run_info_xml(args) -> Dict:
             args[optional_input] = args[f"--{optional_input}"]
 
     return args
+
+
+def check_batch_converter_args(args) -> Dict:
+    """
+    Check the batch converter args are legit
+    :param args: A dictionary with the following keys:
+      * <conversion> (The conversion type)
+      * --input-dir / --input-glob / --manifest (One of)
+      * --output-dir (Required if --input-dir or --input-glob is set)
+      * --jobs
+      * --summary-json
+    :return: A dictionary with the following keys
+      * conversion (A BatchConversionType)
+      * conversion-pairs (A list of (input path, output path) tuples,
+        or (input path, output path, run id) tuples for v2-samplesheet-to-run-info-xml)
+      * jobs (int or None)
+      * summary-json (Path to the summary json, a file-handle if '-' is specified, or None)
+    """
+    from ..enums import BatchConversionType
+    from ..functions.batch_converter import (
+        get_conversion_pairs_from_paths,
+        get_conversion_pairs_from_input_dir,
+        get_conversion_pairs_from_manifest
+    )
+
+    # Always clone before editing
+    args = deepcopy(args)
+
+    # Check conversion
+    try:
+        conversion = BatchConversionType(args.get("<conversion>"))
+    except ValueError:
+        logger.error(
+            f"Unknown conversion '{args.get('<conversion>')}', expected one of "
+            f"{', '.join(map(lambda conversion_iter: conversion_iter.value, BatchConversionType))}"
+        )
+        raise
+    args["conversion"] = conversion
+
+    # Check output dir
+    output_dir_arg = args.get("--output-dir", None)
+    if output_dir_arg is None and args.get("--manifest", None) is None:
+        logger.error("Please specify --output-dir when using --input-dir or --input-glob")
+        raise ValueError
+    if output_dir_arg is not None and not Path(output_dir_arg).is_dir():
+        logger.error(f"Could not find output directory '{output_dir_arg}'. Please create it and try again")
+        raise NotADirectoryError
+
+    # Get conversion pairs
+    if args.get("--input-dir", None) is not None:
+        if not Path(args.get("--input-dir")).is_dir():
+            logger.error(f"Could not find input directory '{args.get('--input-dir')}'")
+            raise NotADirectoryError
+        conversion_pairs = get_conversion_pairs_from_input_dir(
+            conversion, Path(args.get("--input-dir")), Path(output_dir_arg)
+        )
+    elif args.get("--input-glob", None) is not None:
+        conversion_pairs = get_conversion_pairs_from_paths(
+            conversion,
+            sorted(
+                filter(
+                    lambda path_iter: path_iter.is_file(),
+                    map(Path, glob(args.get("--input-glob"), recursive=True))
+                )
+            ),
+            Path(output_dir_arg)
+        )
+    else:
+        if not Path(args.get("--manifest")).is_file():
+            logger.error(f"Could not read manifest {args.get('--manifest')}")
+            raise FileNotFoundError
+        conversion_pairs = get_conversion_pairs_from_manifest(Path(args.get("--manifest")))
+
+    # Run ids can only be given in a manifest
+    if (
+            conversion == BatchConversionType.V2_SAMPLESHEET_TO_RUN_INFO_XML and
+            not all(map(lambda conversion_pair_iter: len(conversion_pair_iter) == 3, conversion_pairs))
+    ):
+        logger.error(
+            "v2-samplesheet-to-run-info-xml needs the run id of each samplesheet, "
+            "please use a --manifest with the run id as the third column of each line"
+        )
+        raise ValueError
+
+    args["conversion-pairs"] = conversion_pairs
+
+    # Check jobs
+    jobs_arg = args.get("--jobs", None)
+    if jobs_arg is None:
+        args["jobs"] = None
+    elif not jobs_arg.isdigit() or int(jobs_arg) < 1:
+        logger.error(f"Expected --jobs to be a positive integer but got '{jobs_arg}'")
+        raise ValueError
+    else:
+        args["jobs"] = int(jobs_arg)
+
+    # Check summary json
+    summary_json_arg = args.get("--summary-json", None)
+    if summary_json_arg is None:
+        summary_json = None
+    elif summary_json_arg == "-":
+        summary_json = sys.stdout.fileno()
+    elif not Path(summary_json_arg).parent.is_dir():
+        logger.error(f"Could not find parent directory '{Path(summary_json_arg).parent}'"
+                     f"for '{summary_json_arg}', cannot create file. Please create parent and try again")
+        raise NotADirectoryError
+    else:
+        summary_json = Path(summary_json_arg)
+
+    args["summary-json"] = summary_json
+
+    return args
+
+
+def check_daemon_args(args) -> Dict:
+    """
+    Check the daemon args are legit
+    :param args: A dictionary with the following keys:
+      * start / stop / status (One of)
+      * --socket (Path to the unix socket)
+    :return: A dictionary with the following keys
+      * action (One of start, stop or status)
+      * socket-path (Path to the unix socket)
+    """
+    from .daemon import get_daemon_socket_path, get_private_socket_dir
+
+    # Always clone before editing
+    args = deepcopy(args)
+
+    # Get action
+    args["action"] = next(
+        filter(
+            lambda action_iter: args.get(action_iter, False),
+            ["start", "stop", "status"]
+        )
+    )
+
+    # Check socket path
+    socket_path_arg = args.get("--socket", None)
+    if socket_path_arg is None:
+        socket_path = get_daemon_socket_path()
+    else:
+        socket_path = Path(socket_path_arg)
+
+    # The private socket directory in $TMPDIR (or /tmp) is created when the daemon starts
+    if not socket_path.parent.is_dir() and not socket_path.parent == get_private_socket_dir():
+        logger.error(f"Could not find parent directory '{socket_path.parent}' for socket '{socket_path}'")
+        raise NotADirectoryError
+
+    args["socket-path"] = socket_path
+
+    return args
+
+
+def check_http_service_args(args) -> Dict:
+    """
+    Check the http service args are legit
+    :param args: A dictionary with the following keys:
+      * --host
+      * --port
+      * --workers
+      * --queue-size
+      * --processes
+    :return: A dictionary with the following keys
+      * host (str)
+      * port (int)
+      * workers (int)
+      * queue-size (int)
+      * processes (bool)
+    """
+    # Always clone before editing
+    args = deepcopy(args)
+
+    args["host"] = args.get("--host", None) or "127.0.0.1"
+
+    # Check integer args
+    for int_arg, default_value, minimum_value in [
+        ("port", 8000, 0),
+        ("workers", 4, 1),
+        ("queue-size", 16, 0),
+    ]:
+        int_arg_value = args.get(f"--{int_arg}", None)
+        if int_arg_value is None:
+            args[int_arg] = default_value
+        elif not int_arg_value.isdigit() or int(int_arg_value) < minimum_value:
+            logger.error(f"Expected --{int_arg} to be an integer of at least {minimum_value} but got '{int_arg_value}'")
+            raise ValueError
+        else:
+            args[int_arg] = int(int_arg_value)
+
+    args["processes"] = bool(args.get("--processes", False))
+
+    return args
+
+
+def check_index_tools_args(args) -> Dict:
+    """
+    Check the index tools args are legit
+    :param args: A dictionary with the following keys:
+      * check / recommend (One of)
+      * <input-samplesheet> (Either '-' for a samplesheet csv on /dev/stdin, a samplesheet csv or a samplesheet json)
+      * --format
+    :return: A dictionary with the following keys
+      * action (One of check or recommend)
+      * input-samplesheet (A samplesheet dictionary, or a path / file-handle to a samplesheet csv)
+      * format (One of settings, overrides or json)
+    """
+    # Always clone before editing
+    args = deepcopy(args)
+
+    # Get action
+    args["action"] = next(
+        filter(
+            lambda action_iter: args.get(action_iter, False),
+            ["check", "recommend"]
+        )
+    )
+
+    # Check input samplesheet
+    input_samplesheet_arg = args.get("<input-samplesheet>")
+
+    if input_samplesheet_arg == "-":
+        input_samplesheet = sys.stdin
+    elif not Path(input_samplesheet_arg).is_file():
+        logger.error(f"Could not read {input_samplesheet_arg}")
+        raise FileNotFoundError
+    elif Path(input_samplesheet_arg).suffix == ".json":
+        with open(input_samplesheet_arg, "r") as input_json_h:
+            input_samplesheet = json.load(input_json_h)
+    else:
+        input_samplesheet = Path(input_samplesheet_arg)
+
+    args["input-samplesheet"] = input_samplesheet
+
+    # Check format
+    output_format = args.get("--format", None) or "settings"
+    if output_format not in ["settings", "overrides", "json"]:
+        logger.error(f"Expected --format to be one of settings, overrides or json but got '{output_format}'")
+        raise ValueError
+
+    args["format"] = output_format
+
+    return args
+
+
+def check_samplesheet_diff_args(args) -> Dict:
+    """
+    Check the samplesheet diff args are legit
+    :param args: A dictionary with the following keys:
+      * <old-samplesheet> (A samplesheet csv or json, or '-' for a samplesheet csv on /dev/stdin)
+      * <new-samplesheet> (A samplesheet csv or json, or '-' for a samplesheet csv on /dev/stdin)
+      * --format
+    :return: A dictionary with the following keys
+      * old-samplesheet (A path or file-handle)
+      * new-samplesheet (A path or file-handle)
+      * format (One of text or json)
+    """
+    # Always clone before editing
+    args = deepcopy(args)
+
+    if args.get("<old-samplesheet>") == "-" and args.get("<new-samplesheet>") == "-":
+        logger.error("Only one of the samplesheets can be read from stdin")
+        raise ValueError
+
+    for samplesheet_arg_name in ["old-samplesheet", "new-samplesheet"]:
+        samplesheet_arg = args.get(f"<{samplesheet_arg_name}>")
+
+        if samplesheet_arg == "-":
+            args[samplesheet_arg_name] = sys.stdin
+        elif not Path(samplesheet_arg).is_file():
+            logger.error(f"Could not read {samplesheet_arg}")
+            raise FileNotFoundError
+        else:
+            args[samplesheet_arg_name] = Path(samplesheet_arg)
+
+    # Check format
+    output_format = args.get("--format", None) or "text"
+    if output_format not in ["text", "json"]:
+        logger.error(f"Expected --format to be one of text or json but got '{output_format}'")
+        raise ValueError
+
+    args["format"] = output_format
+
+    return args
+
+
+def check_samplesheet_merge_args(args) -> Dict:
+    """
+    Check the samplesheet merge args are legit
+    :param args: A dictionary with the following keys:
+      * <output-samplesheet> (Path to the merged samplesheet, or '-' for /dev/stdout)
+      * <input-samplesheet> (A list of samplesheet csvs or jsons, '-' for a samplesheet csv on /dev/stdin)
+      * --format
+    :return: A dictionary with the following keys
+      * output-samplesheet (A path or file-handle)
+      * input-samplesheets (A list of paths or file-handles)
+      * format (One of csv or json)
+    """
+    # Always clone before editing
+    args = deepcopy(args)
+
+    # Check input samplesheets
+    input_samplesheet_args = args.get("<input-samplesheet>")
+
+    if input_samplesheet_args.count("-") > 1:
+        logger.error("Only one of the samplesheets can be read from stdin")
+        raise ValueError
+
+    input_samplesheets = []
+    for input_samplesheet_arg in input_samplesheet_args:
+        if input_samplesheet_arg == "-":
+            input_samplesheets.append(sys.stdin)
+        elif not Path(input_samplesheet_arg).is_file():
+            logger.error(f"Could not read {input_samplesheet_arg}")
+            raise FileNotFoundError
+        else:
+            input_samplesheets.append(Path(input_samplesheet_arg))
+
+    args["input-samplesheets"] = input_samplesheets
+
+    # Check output samplesheet
+    output_samplesheet_arg = args.get("<output-samplesheet>")
+
+    if output_samplesheet_arg == "-":
+        output_samplesheet = sys.stdout
+    elif not Path(output_samplesheet_arg).parent.is_dir():
+        logger.error(f"Could not find parent directory '{Path(output_samplesheet_arg).parent}'"
+                     f"for '{output_samplesheet_arg}', cannot create file. Please create parent and try again")
+        raise NotADirectoryError
+    else:
+        output_samplesheet = Path(output_samplesheet_arg)
+
+    args["output-samplesheet"] = output_samplesheet
+
+    # Check format
+    output_format = args.get("--format", None)
+    if output_format is None:
+        output_format = "json" if str(output_samplesheet_arg).endswith(".json") else "csv"
+    if output_format not in ["csv", "json"]:
+        logger.error(f"Expected --format to be one of csv or json but got '{output_format}'")
+        raise ValueError
+
+    args["format"] = output_format
+
+    return args
+
+
+def check_samplesheet_split_args(args) -> Dict:
+    """
+    Check the samplesheet split args are legit
+    :param args: A dictionary with the following keys:
+      * <input-samplesheet> (A samplesheet csv or json, or '-' for a samplesheet csv on /dev/stdin)
+      * <output-dir>
+      * --by
+      * --format
+      * --prefix
+    :return: A dictionary with the following keys
+      * input-samplesheet (A path or file-handle)
+      * output-dir (Path to the output directory)
+      * split-key (A SampleSheetSplitKey)
+      * format (One of csv or json)
+      * prefix
+    """
+    from ..enums import SampleSheetSplitKey
+
+    # Always clone before editing
+    args = deepcopy(args)
+
+    # Check input samplesheet
+    input_samplesheet_arg = args.get("<input-samplesheet>")
+
+    if input_samplesheet_arg == "-":
+        args["input-samplesheet"] = sys.stdin
+    elif not Path(input_samplesheet_arg).is_file():
+        logger.error(f"Could not read {input_samplesheet_arg}")
+        raise FileNotFoundError
+    else:
+        args["input-samplesheet"] = Path(input_samplesheet_arg)
+
+    # Check output dir
+    if not Path(args.get("<output-dir>")).is_dir():
+        logger.error(f"Could not find output directory '{args.get('<output-dir>')}'. Please create it and try again")
+        raise NotADirectoryError
+    args["output-dir"] = Path(args.get("<output-dir>"))
+
+    # Check split key
+    try:
+        args["split-key"] = SampleSheetSplitKey(args.get("--by"))
+    except ValueError:
+        logger.error(
+            f"Unknown split key '{args.get('--by')}', expected one of "
+            f"{', '.join(map(lambda split_key_iter: split_key_iter.value, SampleSheetSplitKey))}"
+        )
+        raise
+
+    # Check format
+    output_format = args.get("--format", None) or "csv"
+    if output_format not in ["csv", "json"]:
+        logger.error(f"Expected --format to be one of csv or json but got '{output_format}'")
+        raise ValueError
+    args["format"] = output_format
+
+    args["prefix"] = args.get("--prefix", None) or "SampleSheet"
+
+    return args
@@ -0,0 +1,525 @@
+#!/usr/bin/env python3
+
+"""
+A warm daemon for the console scripts.
+
+The daemon imports the package (along with pandas and pydantic) once, then listens on a local unix socket.
+The console scripts check for the daemon before doing any work,
+if it is running they hand over their arguments, working directory and stdin / stdout / stderr file descriptors
+and wait for the exit code.
+
+Each request is run in a process forked from the daemon, so requests are isolated from one another
+and behave exactly as they would in-process (relative paths, '-' for stdin / stdout, logging to stderr and exit codes).
+
+If the daemon is not running, the console scripts run in-process as usual.
+
+This module is imported by every console script, so must only import from the standard library at the top level.
+"""
+
+# Standard imports
+import json
+import os
+import stat
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Environment variables
+DAEMON_SOCKET_ENV_VAR = "V2_SAMPLESHEET_MAKER_DAEMON_SOCKET"
+DISABLE_DAEMON_ENV_VAR = "V2_SAMPLESHEET_MAKER_NO_DAEMON"
+
+# Environment variables of the client that are applied to each request (i.e V2_SAMPLESHEET_MAKER_CACHE_DIR)
+FORWARDED_ENV_VAR_PREFIX = "V2_SAMPLESHEET_MAKER_"
+
+# Console scripts the daemon can run, and the module that holds the main function of each
+DAEMON_CONSOLE_SCRIPTS: Dict[str, str] = {
+    "v2-samplesheet-maker": "v2_samplesheet_maker.run.v2_samplesheet_writer",
+    "v2-samplesheet-to-json": "v2_samplesheet_maker.run.v2_samplesheet_reader",
+    "run-info-xml-reader": "v2_samplesheet_maker.run.run_info_reader",
+    "run-info-xml-writer": "v2_samplesheet_maker.run.run_info_writer",
+    "v2-samplesheet-to-run-info-xml": "v2_samplesheet_maker.run.v2_samplesheet_to_run_info_xml",
+}
+
+# Control commands
+PING_COMMAND = "ping"
+
+# Maximum size of a request header
+MAX_MESSAGE_SIZE = 1024 * 1024
+
+
+def get_daemon_socket_path() -> Path:
+    """
+    Get the path to the daemon socket.
+    Defaults to v2-samplesheet-maker-<uid>.sock in $XDG_RUNTIME_DIR (which is private to the user),
+    otherwise to daemon.sock in the private directory v2-samplesheet-maker-<uid> of $TMPDIR (or /tmp).
+    Can be overridden with the V2_SAMPLESHEET_MAKER_DAEMON_SOCKET environment variable
+    :return:
+    """
+    if os.environ.get(DAEMON_SOCKET_ENV_VAR, None):
+        return Path(os.environ[DAEMON_SOCKET_ENV_VAR])
+
+    if os.environ.get("XDG_RUNTIME_DIR", None):
+        return Path(os.environ["XDG_RUNTIME_DIR"]) / f"v2-samplesheet-maker-{os.getuid()}.sock"
+
+    return get_private_socket_dir() / "daemon.sock"
+
+
+def get_private_socket_dir() -> Path:
+    """
+    Get the private directory of the daemon socket when $XDG_RUNTIME_DIR is not set,
+    v2-samplesheet-maker-<uid> in $TMPDIR (or /tmp)
+    :return:
+    """
+    tmp_dir = os.environ.get("TMPDIR", None) or "/tmp"
+
+    return Path(tmp_dir) / f"v2-samplesheet-maker-{os.getuid()}"
+
+
+def make_private_socket_dir(socket_dir: Path):
+    """
+    Create the directory of the daemon socket (if it does not exist) so that only the current user can access it.
+    An existing directory must be a directory (not a symlink), owned by the current user and not accessible by anyone else
+    :param socket_dir:
+    :return:
+    """
+    try:
+        socket_dir.mkdir(mode=0o700)
+    except FileExistsError:
+        pass
+
+    socket_dir_stat = os.lstat(socket_dir)
+    if (
+            not stat.S_ISDIR(socket_dir_stat.st_mode) or
+            not socket_dir_stat.st_uid == os.getuid() or
+            not stat.S_IMODE(socket_dir_stat.st_mode) & 0o077 == 0
+    ):
+        raise PermissionError(
+            f"The daemon socket directory {socket_dir} must be a directory owned by the current user, "
+            f"and only accessible by the current user"
+        )
+
+
+def is_own_socket(socket_path: Path) -> bool:
+    """
+    Check that a path is a unix socket owned by the current user
+    (so that another local user cannot pose as the daemon)
+    :param socket_path:
+    :return:
+    """
+    try:
+        socket_stat = os.lstat(socket_path)
+    except OSError:
+        return False
+
+    return stat.S_ISSOCK(socket_stat.st_mode) and socket_stat.st_uid == os.getuid()
+
+
+def get_peer_uid(connection) -> Optional[int]:
+    """
+    Get the user id of the process at the other end of a unix socket connection,
+    None if the platform does not support SO_PEERCRED
+    :param connection:
+    :return:
+    """
+    import socket
+    import struct
+
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+
+    # struct ucred is pid, uid, gid
+    credentials_format = "3i"
+    _, peer_uid, _ = struct.unpack(
+        credentials_format,
+        connection.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize(credentials_format))
+    )
+
+    return peer_uid
+
+
+def is_own_peer(connection) -> bool:
+    """
+    Check that the process at the other end of a unix socket connection is run by the current user.
+    On platforms without SO_PEERCRED we rely on the ownership of the socket (see is_own_socket)
+    :param connection:
+    :return:
+    """
+    peer_uid = get_peer_uid(connection)
+
+    return peer_uid is None or peer_uid == os.getuid()
+
+
+def read_message(connection) -> Dict:
+    """
+    Read a single new-line terminated json message from a connection
+    :param connection:
+    :return:
+    """
+    message = b""
+    while not message.endswith(b"\n"):
+        chunk = connection.recv(4096)
+        if not chunk:
+            raise ConnectionError("Connection closed before a complete message was received")
+        message += chunk
+        if len(message) > MAX_MESSAGE_SIZE:
+            raise ValueError("Message is too large")
+
+    return json.loads(message.decode())
+
+
+def send_message(connection, message: Dict, fds: Optional[List[int]] = None):
+    """
+    Send a single new-line terminated json message, optionally along with a list of file descriptors
+    :param connection:
+    :param message:
+    :param fds:
+    :return:
+    """
+    import socket
+
+    message_bytes = (json.dumps(message) + "\n").encode()
+
+    if fds:
+        # File descriptors are attached to the first chunk of the message
+        bytes_sent = socket.send_fds(connection, [message_bytes], fds)
+        message_bytes = message_bytes[bytes_sent:]
+
+    connection.sendall(message_bytes)
+
+
+def connect_to_daemon(socket_path: Optional[Path] = None):
+    """
+    Connect to the daemon, returns None if the daemon is not running.
+
+    Nothing is sent to a socket that is not owned by the current user,
+    or to a daemon that is run by another user
+    :param socket_path:
+    :return:
+    """
+    if socket_path is None:
+        socket_path = get_daemon_socket_path()
+
+    # Quick check before importing socket
+    if not socket_path.exists():
+        return None
+
+    if not is_own_socket(socket_path):
+        print(
+            f"Ignoring the v2-samplesheet-maker daemon socket {socket_path}, it is not a socket owned by the current user",
+            file=sys.stderr
+        )
+        return None
+
+    import socket
+
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(str(socket_path))
+    except (FileNotFoundError, ConnectionRefusedError):
+        # Stale socket, daemon is no longer running
+        connection.close()
+        return None
+
+    if not is_own_peer(connection):
+        print(
+            f"Ignoring the v2-samplesheet-maker daemon on {socket_path}, it is not run by the current user",
+            file=sys.stderr
+        )
+        connection.close()
+        return None
+
+    return connection
+
+
+def ping_daemon(socket_path: Optional[Path] = None) -> Optional[Dict]:
+    """
+    Check if the daemon is running
+    :param socket_path:
+    :return: A dictionary with the pid of the daemon, or None if the daemon is not running
+    """
+    connection = connect_to_daemon(socket_path)
+
+    if connection is None:
+        return None
+
+    with connection:
+        send_message(connection, {"command": PING_COMMAND})
+        try:
+            return read_message(connection)
+        except ConnectionError:
+            return None
+
+
+def forward_to_daemon(command: str) -> bool:
+    """
+    Forward the current console script invocation to the daemon if it is running.
+
+    The arguments, working directory, V2_SAMPLESHEET_MAKER_* environment variables
+    and the stdin / stdout / stderr file descriptors are passed to the daemon,
+    which runs the console script on our behalf.
+
+    Set V2_SAMPLESHEET_MAKER_NO_DAEMON=1 to always run in-process.
+    :param command: The name of the console script, i.e v2-samplesheet-maker
+    :return: False if the daemon is not running (and the command should be run in-process),
+      otherwise True once the daemon has completed successfully. Exits with the daemon's exit code on failure.
+    """
+    if os.environ.get(DISABLE_DAEMON_ENV_VAR, "") not in ["", "0"]:
+        return False
+
+    try:
+        connection = connect_to_daemon()
+    except OSError:
+        return False
+
+    if connection is None:
+        return False
+
+    with connection:
+        # Flush anything we've already written before the daemon writes to the same file descriptors
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+        try:
+            send_message(
+                connection,
+                {
+                    "command": command,
+                    "argv": sys.argv[1:],
+                    "cwd": os.getcwd(),
+                    "env": get_forwarded_env(),
+                },
+                fds=[sys.stdin.fileno(), sys.stdout.fileno(), sys.stderr.fileno()]
+            )
+        except OSError:
+            # Daemon went away before accepting our request, run in-process instead
+            return False
+
+        try:
+            response = read_message(connection)
+        except ConnectionError:
+            print("Lost connection to the v2-samplesheet-maker daemon", file=sys.stderr)
+            sys.exit(1)
+
+    if response.get("returncode", 1) != 0:
+        sys.exit(response.get("returncode", 1))
+
+    return True
+
+
+def get_forwarded_env() -> Dict[str, str]:
+    """
+    Get the environment variables of the package (i.e V2_SAMPLESHEET_MAKER_CACHE_DIR) to send with a request
+    :return:
+    """
+    return dict(
+        filter(
+            lambda env_item_iter: env_item_iter[0].startswith(FORWARDED_ENV_VAR_PREFIX),
+            os.environ.items()
+        )
+    )
+
+
+def apply_forwarded_env(forwarded_env: Dict[str, str]):
+    """
+    Replace the V2_SAMPLESHEET_MAKER_* environment variables of this (forked) process with those of the client.
+    The console scripts run by the daemon must still not try to forward back to the daemon
+    :param forwarded_env:
+    :return:
+    """
+    for env_key in list(os.environ.keys()):
+        if env_key.startswith(FORWARDED_ENV_VAR_PREFIX):
+            del os.environ[env_key]
+
+    os.environ.update(
+        dict(
+            filter(
+                lambda env_item_iter: (
+                    env_item_iter[0].startswith(FORWARDED_ENV_VAR_PREFIX) and
+                    isinstance(env_item_iter[1], str)
+                ),
+                forwarded_env.items()
+            )
+        )
+    )
+    os.environ[DISABLE_DAEMON_ENV_VAR] = "1"
+
+
+def warm_up():
+    """
+    Import every console script (and the functions they run),
+    along with pandas, then build each pydantic model so that forked requests start warm
+    :return:
+    """
+    import importlib
+    from pydantic import BaseModel
+
+    for module_name in DAEMON_CONSOLE_SCRIPTS.values():
+        importlib.import_module(module_name)
+
+    # Import the conversion functions that the console scripts only import on demand
+    for function_module_name in [
+        "v2_samplesheet_writer", "v2_samplesheet_reader", "run_info_reader",
+        "run_info_writer", "v2_samplesheet_to_run_info",
+    ]:
+        importlib.import_module(f"v2_samplesheet_maker.functions.{function_module_name}")
+
+    importlib.import_module("pandas")
+
+    # Build the deferred model schemas
+    model_classes = [BaseModel]
+    while len(model_classes) > 0:
+        model_class = model_classes.pop()
+        model_classes.extend(model_class.__subclasses__())
+        if model_class.__module__.startswith("v2_samplesheet_maker."):
+            model_class.model_rebuild()
+
+
+def run_request(message: Dict, fds: List[int]) -> int:
+    """
+    Run a console script in this (forked) process, on behalf of a client
+    :param message: The request, with the keys command, argv, cwd and env
+    :param fds: The stdin, stdout and stderr file descriptors of the client
+    :return: The exit code of the console script
+    """
+    import importlib
+    import traceback
+
+    # Take over the client's stdin, stdout and stderr
+    for target_fd, client_fd in enumerate(fds):
+        os.dup2(client_fd, target_fd)
+        os.close(client_fd)
+
+    os.chdir(message["cwd"])
+    apply_forwarded_env(message.get("env", {}))
+    sys.argv = [message["command"]] + list(message["argv"])
+
+    try:
+        importlib.import_module(DAEMON_CONSOLE_SCRIPTS[message["command"]]).main()
+        returncode = 0
+    except SystemExit as system_exit:
+        if system_exit.code is None:
+            returncode = 0
+        elif isinstance(system_exit.code, int):
+            returncode = system_exit.code
+        else:
+            # docopt exits with the usage string
+            print(system_exit.code, file=sys.stderr)
+            returncode = 1
+    except Exception:
+        traceback.print_exc()
+        returncode = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+    return returncode
+
+
+def serve_daemon(socket_path: Optional[Path] = None):
+    """
+    Run the daemon in the foreground until it receives SIGTERM or SIGINT
+    :param socket_path:
+    :return:
+    """
+    import signal
+    import socket
+    import socketserver
+
+    from .logger import get_logger
+
+    logger = get_logger()
+
+    if socket_path is None:
+        socket_path = get_daemon_socket_path()
+
+    # The default socket directory in $TMPDIR (or /tmp) is private to the current user
+    if socket_path.parent == get_private_socket_dir():
+        make_private_socket_dir(socket_path.parent)
+
+    # Check we're not already running
+    if socket_path.exists():
+        if ping_daemon(socket_path) is not None:
+            logger.error(f"A daemon is already listening on {socket_path}")
+            raise FileExistsError
+        # Remove stale socket
+        socket_path.unlink()
+
+    # The console scripts run by the daemon must not try to forward back to the daemon
+    os.environ[DISABLE_DAEMON_ENV_VAR] = "1"
+
+    warm_up()
+
+    class DaemonRequestHandler(socketserver.BaseRequestHandler):
+        def handle(self):
+            # Runs in a forked child
+            message_bytes, fds, _, _ = socket.recv_fds(self.request, MAX_MESSAGE_SIZE, 3)
+            if not message_bytes:
+                return
+
+            # Only serve the current user
+            if not is_own_peer(self.request):
+                for fd in fds:
+                    os.close(fd)
+                return
+
+            while not message_bytes.endswith(b"\n"):
+                chunk = self.request.recv(4096)
+                if not chunk:
+                    return
+                message_bytes += chunk
+
+            message = json.loads(message_bytes.decode())
+
+            if message.get("command") == PING_COMMAND:
+                send_message(self.request, {"pid": os.getppid()})
+                return
+
+            if message.get("command") not in DAEMON_CONSOLE_SCRIPTS or not len(fds) == 3:
+                send_message(self.request, {"returncode": 2})
+                return
+
+            send_message(self.request, {"returncode": run_request(message, fds)})
+
+    class DaemonServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+        block_on_close = False
+
+    def handle_sigterm(signum, frame):
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, handle_sigterm)
+
+    # Only the current user may connect
+    previous_umask = os.umask(0o077)
+    try:
+        server = DaemonServer(str(socket_path), DaemonRequestHandler)
+    finally:
+        os.umask(previous_umask)
+
+    logger.info("Listening on %s", socket_path)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if socket_path.exists():
+            socket_path.unlink()
+
+
+def stop_daemon(socket_path: Optional[Path] = None) -> bool:
+    """
+    Stop the daemon if it is running
+    :param socket_path:
+    :return: True if a daemon was stopped
+    """
+    import signal
+
+    daemon_info = ping_daemon(socket_path)
+
+    if daemon_info is None:
+        return False
+
+    os.kill(daemon_info["pid"], signal.SIGTERM)
+
+    return True
@@ -3,12 +3,15 @@
 def get_v2_samplesheet_writer_doc_opt():
     return """
 Usage:
-v2-samplesheet-maker <input-json> <output-csv>
+v2-samplesheet-maker <input-json> <output-csv> [--profile=<profile_json>] [--cprofile=<cprofile_path>]
 
 Options:
 
 * input-json: Path to the input json you wish to convert to the samplesheet csv. Use '-' for stdin.
 * output-csv: Path to the output-csv. Use '-' to write to stdout
+* --profile:     Write a json report of the wall time, rows and allocated memory blocks
+                 of each stage (and each section) to this path, use '-' for stderr
+* --cprofile:    Also dump cProfile stats to this path (for use with python -m pstats or snakeviz)
 
 Example:
 v2-samplesheet-maker /path/to/input.json SampleSheet.csv
@@ -103,12 +106,15 @@ Lane,Sample_ID,index,index2,Sample_Project
 def get_v2_samplesheet_reader_doc_opt():
     return """
 Usage:
-v2-samplesheet-to-json <input-csv> <output-json>
+v2-samplesheet-to-json <input-csv> <output-json> [--profile=<profile_json>] [--cprofile=<cprofile_path>]
 
 Options:
 
 * input-csv:  Path to the input csv you wish to convert to json. Use '-' for stdin.
 * output-json: Path to the output-json. Use '-' to write to stdout
+* --profile:     Write a json report of the wall time, rows and allocated memory blocks
+                 of each stage (and each section) to this path, use '-' for stderr
+* --cprofile:    Also dump cProfile stats to this path (for use with python -m pstats or snakeviz)
 
 Example:
 v2-samplesheet-maker SampleSheet.csv /path/to/output.json
@@ -121,12 +127,15 @@ Given a samplesheet, write out the samplesheet in json format.
 def get_run_info_xml_reader_doc_opt():
     return """
 Usage:
-run-info-xml-to-json <input-xml> <output-json>
+run-info-xml-to-json <input-xml> <output-json> [--profile=<profile_json>] [--cprofile=<cprofile_path>]
 
 Options:
 
 * input-xml:  Path to the input xml you wish to convert to json. Use '-' for stdin.
 * output-json: Path to the output-json. Use '-' to write to stdout
+* --profile:     Write a json report of the wall time, rows and allocated memory blocks
+                 of each stage (and each section) to this path, use '-' for stderr
+* --cprofile:    Also dump cProfile stats to this path (for use with python -m pstats or snakeviz)
 
 
 Description:
@@ -199,12 +208,15 @@ run-info-xml-to-json RunInfo.xml /path/to/output.json
 def get_run_info_xml_writer_doc_opt():
     return """
 Usage:
-run-info-json-to-xml <input-json> <output-xml>
+run-info-json-to-xml <input-json> <output-xml> [--profile=<profile_json>] [--cprofile=<cprofile_path>]
 
 Options:
 
 * input-json:  Path to the input json you wish to convert to xml. Use '-' for stdin.
 * output-xml: Path to the output-xml. Use '-' to write to stdout
+* --profile:     Write a json report of the wall time, rows and allocated memory blocks
+                 of each stage (and each section) to this path, use '-' for stderr
+* --cprofile:    Also dump cProfile stats to this path (for use with python -m pstats or snakeviz)
 
 Example:
 
@@ -222,6 +234,8 @@ samplesheet-csv-to-run-info-xml <input-csv> <output-xml>
                                 [--flowcell=<flowcell>]
                                 [--instrument=<instrument>]
                                 [--date=<date>]
+                                [--profile=<profile_json>]
+                                [--cprofile=<cprofile_path>]
                                 
                                 
 Options:
@@ -234,6 +248,9 @@ Options:
 * --flowcell:   The flowcell id to use in the RunInfo.xml file
 * --instrument: The instrument id to use in the RunInfo.xml file
 * --date:       The date to use in the RunInfo.xml file (YYYYMMDD)
+* --profile:    Write a json report of the wall time, rows and allocated memory blocks
+                of each stage (and each section) to this path, use '-' for stderr
+* --cprofile:   Also dump cProfile stats to this path (for use with python -m pstats or snakeviz)
 
 Example:
 
@@ -241,3 +258,241 @@ samplesheet-csv-to-run-info-xml SampleSheet.csv RunInfo.xml --run-id=240220_A010
 """
 
 
+
+
+def get_batch_converter_doc_opt():
+    return """
+Usage:
+v2-samplesheet-batch <conversion> (--input-dir=<input_dir> | --input-glob=<input_glob> | --manifest=<manifest>)
+                                  [--output-dir=<output_dir>]
+                                  [--jobs=<jobs>]
+                                  [--summary-json=<summary_json>]
+
+Options:
+
+* conversion:      One of v2-samplesheet-maker, v2-samplesheet-to-json, run-info-xml-reader, run-info-xml-writer,
+                   v2-samplesheet-to-run-info-xml
+* --input-dir:     Convert every file in this directory with the input suffix of the conversion
+                   (.json for v2-samplesheet-maker and run-info-xml-writer, .csv for v2-samplesheet-to-json,
+                   .xml for run-info-xml-reader)
+* --input-glob:    Convert every file matching this glob, i.e 'runs/*/SampleSheet.csv'
+* --manifest:      A file of input / output pairs, one pair per line separated by a tab or a comma.
+                   v2-samplesheet-to-run-info-xml needs the run id of each samplesheet as a third column,
+                   so can only be run from a manifest
+* --output-dir:    The directory to write outputs to, required for --input-dir and --input-glob.
+                   Outputs are named after the input file with the output suffix of the conversion
+* --jobs:          The number of worker processes to use, defaults to the number of cpus
+* --summary-json:  Write the per-file summary as json to this path, use '-' for stdout
+
+Example:
+v2-samplesheet-batch v2-samplesheet-maker --input-dir=inputs/ --output-dir=samplesheets/ --jobs=8
+v2-samplesheet-batch v2-samplesheet-to-run-info-xml --manifest=manifest.tsv
+
+Description:
+Convert many files in one go, conversions are spread across a pool of worker processes.
+A file that fails to convert does not stop the remaining conversions,
+the exit code is non-zero if any conversion failed.
+"""
+
+
+def get_daemon_doc_opt():
+    return """
+Usage:
+v2-samplesheet-daemon start [--socket=<socket_path>]
+v2-samplesheet-daemon stop [--socket=<socket_path>]
+v2-samplesheet-daemon status [--socket=<socket_path>]
+
+Options:
+
+* --socket:  Path to the unix socket the daemon listens on.
+             Defaults to $V2_SAMPLESHEET_MAKER_DAEMON_SOCKET if set,
+             otherwise v2-samplesheet-maker-<uid>.sock in $XDG_RUNTIME_DIR (or $TMPDIR, or /tmp)
+
+Example:
+v2-samplesheet-daemon start &
+v2-samplesheet-maker input.json SampleSheet.csv
+v2-samplesheet-daemon stop
+
+Description:
+Keep the package (along with pandas and pydantic) imported in a persistent worker process.
+
+While the daemon is running, v2-samplesheet-maker, v2-samplesheet-to-json, run-info-xml-reader,
+run-info-xml-writer and v2-samplesheet-to-run-info-xml hand their arguments over to the daemon
+rather than importing the package themselves.
+Each request is run in a process forked from the daemon, with the caller's working directory,
+stdin, stdout and stderr.
+
+When the daemon is not running, the console scripts run in-process as usual.
+Set V2_SAMPLESHEET_MAKER_NO_DAEMON=1 to always run in-process.
+
+'start' runs the daemon in the foreground until it is stopped with 'stop', SIGTERM or Ctrl-C.
+"""
+
+
+def get_http_service_doc_opt():
+    return """
+Usage:
+v2-samplesheet-server [--host=<host>]
+                      [--port=<port>]
+                      [--workers=<workers>]
+                      [--queue-size=<queue_size>]
+                      [--processes]
+
+Options:
+
+* --host:        The address to listen on, defaults to 127.0.0.1
+* --port:        The port to listen on, defaults to 8000
+* --workers:     The number of conversions to run at once, defaults to 4
+* --queue-size:  The number of conversions that may wait for a free worker
+                 before further requests are rejected with a 503, defaults to 16
+* --processes:   Run conversions in a pool of worker processes rather than threads
+
+Example:
+v2-samplesheet-server --port=8000 --workers=8
+
+curl --data-binary @input.json http://127.0.0.1:8000/v2-samplesheet-maker > SampleSheet.csv
+
+Description:
+Run a local http conversion service.
+
+Each conversion takes the input file as the request body and returns the output file as the response body.
+
+POST /v2-samplesheet-maker              json -> samplesheet csv
+POST /v2-samplesheet-to-json            samplesheet csv -> json
+POST /run-info-xml-reader               RunInfo.xml -> json
+                                        (add ?keep_flowcell_layout=true to keep the FlowcellLayout)
+POST /run-info-xml-writer               json -> RunInfo.xml
+POST /v2-samplesheet-to-run-info-xml    samplesheet csv -> RunInfo.xml
+                                        (?run_id=<run_id>, optionally &number=, &flowcell=, &instrument=,
+                                        &date=YYYYMMDD and &align_to_phix=true)
+
+GET /health                             Liveness, along with the number of running and queued conversions
+GET /stats                              Request counts, error counts, latency percentiles and throughput per endpoint
+
+Invalid inputs return a 400 with a json body of the form {"error": "..."}.
+"""
+
+
+def get_index_tools_doc_opt():
+    return """
+Usage:
+v2-samplesheet-index-tools check <input-samplesheet>
+v2-samplesheet-index-tools recommend <input-samplesheet> [--format=<format>]
+
+Options:
+
+* input-samplesheet:  Either a v2 samplesheet csv, or a samplesheet json (as used by v2-samplesheet-maker).
+                      Files ending in .json are read as json, use '-' to read a samplesheet csv from stdin
+* --format:           One of settings (default), overrides or json.
+
+Example:
+v2-samplesheet-index-tools check SampleSheet.csv
+v2-samplesheet-index-tools recommend SampleSheet.csv --format=overrides
+
+Description:
+Check the indexes of the BCLConvert_Data section, lane by lane.
+
+'check' lists every pair of samples in the same lane whose indexes collide at the barcode mismatches
+set in the BCLConvert_Settings section (or the per-sample overrides), and exits with a non-zero code if any are found.
+
+'recommend' finds the highest BarcodeMismatchesIndex1 / BarcodeMismatchesIndex2 (0 to 2)
+each lane can use without any collisions.
+  * settings:   A [BCLConvert_Settings] block that is safe for every lane
+  * overrides:  Per-sample Lane,Sample_ID,BarcodeMismatchesIndex1,BarcodeMismatchesIndex2 values for the BCLConvert_Data section
+  * json:       The recommendation for each lane, along with both of the above
+"""
+
+
+def get_samplesheet_diff_doc_opt():
+    return """
+Usage:
+v2-samplesheet-diff <old-samplesheet> <new-samplesheet> [--format=<format>]
+
+Options:
+
+* old-samplesheet:  The original samplesheet, either a v2 samplesheet csv or a samplesheet json
+                    (as used by v2-samplesheet-maker). Files ending in .json are read as json,
+                    use '-' to read a samplesheet csv from stdin
+* new-samplesheet:  The revised samplesheet
+* --format:         One of text (default) or json
+
+Example:
+v2-samplesheet-diff SampleSheet.csv SampleSheet.revised.csv
+
+Description:
+List the differences between two samplesheets, section by section.
+
+Data rows are matched on their lane and sample id, and key-value sections on each key,
+so the order of the rows (and the columns that are written out) makes no difference.
+
+Each difference is printed on its own line, i.e
+  bclconvert_settings: changed barcode_mismatches_index_1: 1 -> 0
+  bclconvert_data: added lane=1 sample_id=MyThirdSample
+  bclconvert_data: removed lane=2 sample_id=MySecondSample
+  bclconvert_data: changed lane=1 sample_id=MyFirstSample index: AAAAAAAAAA -> CCCCCCCCCC
+
+With --format=json, the added, removed and changed rows of each section are written out in full.
+
+The exit code is 1 if the samplesheets differ, 0 otherwise.
+"""
+
+
+def get_samplesheet_merge_doc_opt():
+    return """
+Usage:
+v2-samplesheet-merge <output-samplesheet> <input-samplesheet>... [--format=<format>]
+
+Options:
+
+* output-samplesheet:  Path to the merged samplesheet, use '-' for stdout
+* input-samplesheet:   The samplesheets to merge, each either a v2 samplesheet csv or a samplesheet json
+                       (as used by v2-samplesheet-maker). Files ending in .json are read as json,
+                       use '-' to read a samplesheet csv from stdin
+* --format:            One of csv or json,
+                       defaults to json if the output samplesheet ends in .json and csv otherwise
+
+Example:
+v2-samplesheet-merge SampleSheet.csv project_1.json project_2.json SampleSheet.lane_8.csv
+
+Description:
+Merge samplesheets into one, i.e a flowcell samplesheet from per-project samplesheet fragments.
+
+Data rows that are identical to a row of an earlier samplesheet are dropped.
+A sample (lane and sample id) may only have rows in one samplesheet, unless the rows are identical.
+Settings are merged key by key (including the analysis urns of the Cloud_Settings section),
+a setting with different values in two samplesheets is an error.
+
+The merged samplesheet is only validated once all of the inputs have been read.
+"""
+
+
+def get_samplesheet_split_doc_opt():
+    return """
+Usage:
+v2-samplesheet-split <input-samplesheet> <output-dir> (--by=<split_key>) [--format=<format>] [--prefix=<prefix>]
+
+Options:
+
+* input-samplesheet:  A v2 samplesheet csv or a samplesheet json (as used by v2-samplesheet-maker).
+                      Files ending in .json are read as json, use '-' to read a samplesheet csv from stdin
+* output-dir:         The directory to write each shard to
+* --by:               One of lane, sample_project, override_cycles or index_length
+* --format:           One of csv (default) or json
+* --prefix:           The prefix of each shard file name, defaults to SampleSheet
+
+Example:
+v2-samplesheet-split SampleSheet.csv shards/ --by=lane
+
+Description:
+Split a samplesheet into one samplesheet for each value of the split key,
+shards are written to <output-dir>/<prefix>.<split_key>_<value>.<format>, i.e shards/SampleSheet.lane_1.csv
+
+The BCLConvert_Data rows are split on
+* lane:             The lane of each row
+* sample_project:   The sample project of each row (rows without a project are written to the 'none' shard)
+* override_cycles:  The OverrideCycles of each row, or else of the BCLConvert_Settings section
+* index_length:     The lengths of the index and index2 of each row, i.e SampleSheet.index_length_10_10.csv
+
+The rows of the other data sections follow their samples into each shard,
+and every shard has the Header, Reads and settings sections of the input samplesheet.
+"""
@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+
+"""
+A local http conversion service.
+
+Each conversion function is exposed as a POST endpoint, the request body is the input file
+and the response body is the output file.
+
+* POST /v2-samplesheet-maker            json -> samplesheet csv
+* POST /v2-samplesheet-to-json          samplesheet csv -> json
+* POST /run-info-xml-reader             RunInfo.xml -> json (?keep_flowcell_layout=true to keep the FlowcellLayout)
+* POST /run-info-xml-writer             json -> RunInfo.xml
+* POST /v2-samplesheet-to-run-info-xml  samplesheet csv -> RunInfo.xml
+                                        (?run_id=<run_id>[&number=][&flowcell=][&instrument=][&date=YYYYMMDD][&align_to_phix=true])
+
+* GET /health                           Liveness, along with the number of busy and queued conversions
+* GET /stats                            Request counts, latency percentiles and throughput per endpoint
+
+Conversions are run on a bounded pool of worker threads (or processes).
+Requests beyond the number of workers wait in a queue of bounded length,
+once the queue is full, requests are rejected with a 503 so that callers can back off and retry.
+"""
+
+# Standard imports
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from xml.parsers.expat import ExpatError
+
+# Local imports
+from .logger import get_logger
+
+# Get logger
+logger = get_logger()
+
+# Content types
+CSV_CONTENT_TYPE = "text/csv; charset=utf-8"
+JSON_CONTENT_TYPE = "application/json"
+XML_CONTENT_TYPE = "application/xml"
+
+# Largest request body we accept
+MAX_REQUEST_BODY_SIZE = 64 * 1024 * 1024
+
+# Seconds a connection may sit idle (i.e a slow client sending the request body) before it is closed
+REQUEST_TIMEOUT_SECONDS = 30
+
+# Number of latencies kept per endpoint for the percentiles in /stats
+LATENCY_WINDOW_SIZE = 1000
+
+
+def get_query_param(params: Dict[str, List[str]], key: str, required: bool = False) -> Optional[str]:
+    """
+    Get the last value of a query parameter
+    :param params:
+    :param key:
+    :param required:
+    :return:
+    """
+    values = params.get(key, [])
+    if len(values) == 0:
+        if required:
+            raise ValueError(f"Missing required query parameter '{key}'")
+        return None
+    return values[-1]
+
+
+def get_bool_query_param(params: Dict[str, List[str]], key: str) -> Optional[bool]:
+    """
+    Get a true / false query parameter
+    :param params:
+    :param key:
+    :return:
+    """
+    value = get_query_param(params, key)
+    if value is None:
+        return None
+    if value.lower() not in ["true", "false", "1", "0", "y", "n"]:
+        raise ValueError(f"Expected query parameter '{key}' to be one of true or false but got '{value}'")
+    return value.lower() in ["true", "1", "y"]
+
+
+def convert_v2_samplesheet_maker(body: str, params: Dict[str, List[str]]) -> Tuple[str, str]:
+    from ..functions.v2_samplesheet_writer import v2_samplesheet_writer
+
+    try:
+        input_dict = json.loads(body)
+    except json.JSONDecodeError as json_error:
+        raise ValueError(f"Request body is not valid json: {json_error}")
+
+    return CSV_CONTENT_TYPE, v2_samplesheet_writer(input_dict).getvalue()
+
+
+def convert_v2_samplesheet_to_json(body: str, params: Dict[str, List[str]]) -> Tuple[str, str]:
+    from ..functions.v2_samplesheet_reader import v2_samplesheet_reader
+
+    return JSON_CONTENT_TYPE, json.dumps(v2_samplesheet_reader(StringIO(body)), indent=2) + "\n"
+
+
+def convert_run_info_xml_reader(body: str, params: Dict[str, List[str]]) -> Tuple[str, str]:
+    from ..functions.run_info_reader import run_info_xml_reader
+
+    run_info_dict = run_info_xml_reader(
+        StringIO(body),
+        keep_flowcell_layout=get_bool_query_param(params, "keep_flowcell_layout") or False
+    )
+
+    return JSON_CONTENT_TYPE, json.dumps(run_info_dict, indent=4) + "\n"
+
+
+def convert_run_info_xml_writer(body: str, params: Dict[str, List[str]]) -> Tuple[str, str]:
+    from ..functions.run_info_writer import run_info_xml_writer
+
+    try:
+        input_dict = json.loads(body)
+    except json.JSONDecodeError as json_error:
+        raise ValueError(f"Request body is not valid json: {json_error}")
+
+    return XML_CONTENT_TYPE, run_info_xml_writer(input_dict).getvalue() + "\n"
+
+
+def convert_v2_samplesheet_to_run_info_xml(body: str, params: Dict[str, List[str]]) -> Tuple[str, str]:
+    from ..functions.v2_samplesheet_to_run_info import samplesheet_csv_to_run_info_xml
+
+    date = get_query_param(params, "date")
+    if date is not None:
+        try:
+            date = datetime.strptime(date, "%Y%m%d")
+        except ValueError:
+            raise ValueError(f"Expected query parameter 'date' to be in the format YYYYMMDD but got '{date}'")
+
+    run_info_xml = samplesheet_csv_to_run_info_xml(
+        StringIO(body),
+        run_id=get_query_param(params, "run_id", required=True),
+        number=get_query_param(params, "number"),
+        flowcell=get_query_param(params, "flowcell"),
+        instrument=get_query_param(params, "instrument"),
+        date=date,
+        align_to_phix=get_bool_query_param(params, "align_to_phix"),
+    )
+
+    return XML_CONTENT_TYPE, run_info_xml.getvalue() + "\n"
+
+
+# Each endpoint, and the function that runs the conversion
+HTTP_SERVICE_ENDPOINTS: Dict[str, Callable[[str, Dict[str, List[str]]], Tuple[str, str]]] = {
+    "/v2-samplesheet-maker": convert_v2_samplesheet_maker,
+    "/v2-samplesheet-to-json": convert_v2_samplesheet_to_json,
+    "/run-info-xml-reader": convert_run_info_xml_reader,
+    "/run-info-xml-writer": convert_run_info_xml_writer,
+    "/v2-samplesheet-to-run-info-xml": convert_v2_samplesheet_to_run_info_xml,
+}
+
+
+def run_conversion(endpoint: str, body: str, params: Dict[str, List[str]]) -> Tuple[int, str, str]:
+    """
+    Run the conversion for an endpoint, this is the function submitted to the worker pool
+    so must be importable (and picklable) at the module level
+    :param endpoint:
+    :param body:
+    :param params:
+    :return: A tuple of (http status, content type, response body)
+    """
+    try:
+        content_type, response_body = HTTP_SERVICE_ENDPOINTS[endpoint](body, params)
+    except (ValueError, ExpatError) as input_error:
+        # Pydantic validation errors and json decode errors are subclasses of ValueError,
+        # any other error is a bug in the conversion rather than a problem with the input
+        return HTTPStatus.BAD_REQUEST, JSON_CONTENT_TYPE, json.dumps(
+            {"error": f"{type(input_error).__name__}: {input_error}"}
+        )
+    except Exception as error:
+        return HTTPStatus.INTERNAL_SERVER_ERROR, JSON_CONTENT_TYPE, json.dumps(
+            {"error": f"{type(error).__name__}: {error}"}
+        )
+
+    return HTTPStatus.OK, content_type, response_body
+
+
+class ServiceStats:
+    """
+    Thread-safe request counts and latencies for each endpoint
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.start_time = time.monotonic()
+        self.endpoint_stats: Dict[str, Dict] = {}
+
+    def record(self, endpoint: str, status: int, latency: float):
+        """
+        Record a completed request
+        :param endpoint:
+        :param status:
+        :param latency: Seconds taken to respond
+        :return:
+        """
+        with self._lock:
+            endpoint_stats = self.endpoint_stats.setdefault(
+                endpoint,
+                {
+                    "requests": 0,
+                    "errors": 0,
+                    "rejected": 0,
+                    "latencies": deque(maxlen=LATENCY_WINDOW_SIZE),
+                }
+            )
+            endpoint_stats["requests"] += 1
+            if status == HTTPStatus.SERVICE_UNAVAILABLE:
+                endpoint_stats["rejected"] += 1
+            elif status >= 400:
+                endpoint_stats["errors"] += 1
+            else:
+                endpoint_stats["latencies"].append(latency)
+
+    def to_dict(self) -> Dict:
+        """
+        Summarise the stats
+        :return:
+        """
+        with self._lock:
+            uptime = time.monotonic() - self.start_time
+            return {
+                "uptime_seconds": round(uptime, 3),
+                "endpoints": {
+                    endpoint: {
+                        "requests": endpoint_stats["requests"],
+                        "errors": endpoint_stats["errors"],
+                        "rejected": endpoint_stats["rejected"],
+                        "requests_per_second": round(endpoint_stats["requests"] / uptime, 3) if uptime > 0 else None,
+                        "latency_ms": get_latency_summary(endpoint_stats["latencies"]),
+                    }
+                    for endpoint, endpoint_stats in self.endpoint_stats.items()
+                }
+            }
+
+
+def get_latency_summary(latencies: Deque[float]) -> Optional[Dict]:
+    """
+    Get the mean, p50, p95, p99 and max of a list of latencies (in milliseconds)
+    :param latencies: Latencies in seconds
+    :return:
+    """
+    if len(latencies) == 0:
+        return None
+
+    sorted_latencies = sorted(latencies)
+
+    def get_percentile(percentile: float) -> float:
+        return round(
+            sorted_latencies[min(len(sorted_latencies) - 1, int(percentile / 100 * len(sorted_latencies)))] * 1000,
+            3
+        )
+
+    return {
+        "count": len(sorted_latencies),
+        "mean": round(sum(sorted_latencies) / len(sorted_latencies) * 1000, 3),
+        "p50": get_percentile(50),
+        "p95": get_percentile(95),
+        "p99": get_percentile(99),
+        "max": round(sorted_latencies[-1] * 1000, 3),
+    }
+
+
+class ConversionRequestHandler(BaseHTTPRequestHandler):
+    """
+    Handle a single http request, conversions are handed to the worker pool of the server
+    """
+
+    server: "ConversionHTTPServer"
+
+    # Socket timeout, so that slow clients cannot hold on to a thread (or a conversion slot)
+    timeout = REQUEST_TIMEOUT_SECONDS
+
+    def send_body(self, status: int, content_type: str, body: str, headers: Optional[Dict[str, str]] = None):
+        body_bytes = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body_bytes)))
+        for header_key, header_value in (headers or {}).items():
+            self.send_header(header_key, header_value)
+        self.end_headers()
+        self.wfile.write(body_bytes)
+
+    def send_json(self, status: int, body: Dict, headers: Optional[Dict[str, str]] = None):
+        self.send_body(status, JSON_CONTENT_TYPE, json.dumps(body) + "\n", headers=headers)
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+
+        if path == "/health":
+            self.send_json(
+                HTTPStatus.OK,
+                {
+                    "status": "ok",
+                    "workers": self.server.workers,
+                    "queue_size": self.server.queue_size,
+                    "in_flight": self.server.get_in_flight(),
+                }
+            )
+        elif path == "/stats":
+            self.send_json(HTTPStatus.OK, self.server.stats.to_dict())
+        else:
+            self.send_json(HTTPStatus.NOT_FOUND, {"error": f"Unknown path '{path}'"})
+
+    def do_POST(self):
+        start_time = time.perf_counter()
+        url = urlsplit(self.path)
+
+        if url.path not in HTTP_SERVICE_ENDPOINTS:
+            self.send_json(HTTPStatus.NOT_FOUND, {"error": f"Unknown endpoint '{url.path}'"})
+            return
+
+        status = self.handle_conversion(url.path, parse_qs(url.query))
+        self.server.stats.record(url.path, status, time.perf_counter() - start_time)
+
+    def handle_conversion(self, endpoint: str, params: Dict[str, List[str]]) -> int:
+        """
+        Reserve a conversion slot, read the request body, run the conversion on the worker pool and send the response.
+        The slot is reserved before the body is read, so the bodies held in memory are bounded by the workers and the queue
+        :param endpoint:
+        :param params:
+        :return: The http status of the response
+        """
+        # Read request body
+        content_length = self.headers.get("Content-Length", None)
+        if content_length is None or not content_length.isdigit():
+            self.send_json(HTTPStatus.LENGTH_REQUIRED, {"error": "Content-Length header is required"})
+            return HTTPStatus.LENGTH_REQUIRED
+        if int(content_length) > MAX_REQUEST_BODY_SIZE:
+            self.send_json(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Request body is too large"})
+            self.close_connection = True
+            return HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+
+        # Reject if both the workers and the queue are full, the body is not read
+        if not self.server.acquire_slot():
+            self.send_json(
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                {"error": "Conversion queue is full, please retry later"},
+                headers={"Retry-After": "1"}
+            )
+            self.close_connection = True
+            return HTTPStatus.SERVICE_UNAVAILABLE
+
+        try:
+            try:
+                body_bytes = self.rfile.read(int(content_length))
+            except TimeoutError:
+                self.send_json(HTTPStatus.REQUEST_TIMEOUT, {"error": "Timed out reading the request body"})
+                self.close_connection = True
+                return HTTPStatus.REQUEST_TIMEOUT
+
+            if len(body_bytes) < int(content_length):
+                self.send_json(HTTPStatus.BAD_REQUEST, {"error": "Request body is shorter than the Content-Length"})
+                self.close_connection = True
+                return HTTPStatus.BAD_REQUEST
+
+            try:
+                body = body_bytes.decode("utf-8-sig")
+            except UnicodeDecodeError:
+                self.send_json(HTTPStatus.BAD_REQUEST, {"error": "Request body is not valid utf-8"})
+                return HTTPStatus.BAD_REQUEST
+
+            # Drop our reference to the raw body before waiting on the worker
+            del body_bytes
+
+            status, content_type, response_body = self.server.executor.submit(
+                run_conversion, endpoint, body, params
+            ).result()
+        finally:
+            self.server.release_slot()
+
+        self.send_body(status, content_type, response_body)
+
+        return status
+
+    def log_message(self, format, *args):
+        # Formatted lazily, so costs nothing unless info logging is enabled
+        logger.info("%s - " + format, self.address_string(), *args)
+
+
+class ConversionHTTPServer(ThreadingHTTPServer):
+    """
+    Threaded http server, with conversions run on a bounded worker pool
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        server_address: Tuple[str, int],
+        workers: int = 4,
+        queue_size: int = 16,
+        use_processes: bool = False
+    ):
+        if workers < 1:
+            raise ValueError(f"Expected workers to be a positive integer but got {workers}")
+        if queue_size < 0:
+            raise ValueError(f"Expected queue size to be zero or a positive integer but got {queue_size}")
+
+        self.workers = workers
+        self.queue_size = queue_size
+        self.executor: Executor = (
+            ProcessPoolExecutor(max_workers=workers) if use_processes else ThreadPoolExecutor(max_workers=workers)
+        )
+
+        # One slot per worker, and one per queued request
+        self._max_in_flight = workers + queue_size
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+        self.stats = ServiceStats()
+
+        super().__init__(server_address, ConversionRequestHandler)
+
+    def acquire_slot(self) -> bool:
+        """
+        Reserve a slot for a conversion
+        :return: False if both the workers and the queue are full
+        """
+        with self._in_flight_lock:
+            if self._in_flight >= self._max_in_flight:
+                return False
+            self._in_flight += 1
+            return True
+
+    def release_slot(self):
+        with self._in_flight_lock:
+            self._in_flight -= 1
+
+    def get_in_flight(self) -> int:
+        """
+        Number of conversions either running or waiting for a worker
+        :return:
+        """
+        with self._in_flight_lock:
+            return self._in_flight
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=True)
+
+
+def serve_http_service(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    workers: int = 4,
+    queue_size: int = 16,
+    use_processes: bool = False
+):
+    """
+    Run the http service in the foreground until interrupted
+    :param host:
+    :param port:
+    :param workers: Number of conversions run at once
+    :param queue_size: Number of conversions that may wait for a worker before requests are rejected
+    :param use_processes: Run conversions in a pool of processes rather than threads
+    :return:
+    """
+    server = ConversionHTTPServer(
+        (host, port), workers=workers, queue_size=queue_size, use_processes=use_processes
+    )
+
+    logger.info("Listening on http://%s:%s", host, server.server_address[1])
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -1,59 +1,41 @@
 #!/usr/bin/env python3
 
 """
-Collect logger through verboselogs package
-"""
-
-import verboselogs
-import logging
-
-logging.captureWarnings(True)
+Logging helpers
 
-logger = verboselogs.VerboseLogger(__name__)
-stream_handler = logging.StreamHandler()
-logger.addHandler(stream_handler)
+Each module collects its logger with get_logger() at import time,
+this is a plain logging.getLogger lookup on the name of the calling module.
 
-warnings_logger = logging.getLogger("py.warnings")
-warnings_logger.addHandler(stream_handler)
+Importing the package does not attach any handlers or capture warnings,
+the console scripts configure logging by calling set_basic_logger() from main.
+"""
 
-import inspect
+import logging
+import sys
+from typing import Optional
 
 LOGGER_STYLE = "%(asctime)s - %(levelname)-8s - %(module)-25s - %(funcName)-40s : LineNo. %(lineno)-4d - %(message)s"
 
-
-def get_caller_function():
-    """
-    Get the function that was used to call the previous
-    Some loggers report <module>
-    :return:
-    """
-    # Get the inspect stack trace
-    inspect_stack = inspect.stack()
-
-    # Since we're already in a function, we need the third attribute
-    # i.e function of interest -> function that called this one -> this function
-    frame_info = inspect_stack[2]
-
-    # Required attribute is' function
-    function_id = getattr(frame_info, "function", None)
-
-    if function_id is None:
-        # Don't really want to break on this just yet but code is ready to go for it.
-        return None
-    else:
-        return function_id
+# Name of the handler added by set_basic_logger, so that it is only ever added once
+BASIC_HANDLER_NAME = "v2_samplesheet_maker_console"
 
 
 def set_basic_logger():
     """
     Set the basic logger before we then take in the --deploy-env values to see where we write to
+    Warnings (i.e unused section options) are routed through the logger
     :return:
     """
     # Get a basic logger
     logger = logging.getLogger()
 
+    # Don't add a second handler if called more than once in the same process
+    if any(map(lambda handler_iter: handler_iter.get_name() == BASIC_HANDLER_NAME, logger.handlers)):
+        return logger
+
     # Get a stderr handler
     console = logging.StreamHandler()
+    console.set_name(BASIC_HANDLER_NAME)
 
     # Set level
     console.setLevel(logging.INFO)
@@ -64,6 +46,9 @@ def set_basic_logger():
 
     logger.addHandler(console)
 
+    # Log warnings rather than printing them
+    logging.captureWarnings(True)
+
     return logger
 
 
@@ -88,10 +73,14 @@ def set_logger(script_dir, script, deploy_env, log_level=logging.INFO):
     new_logger.addHandler(console_handler)
 
 
-def get_logger():
+def get_logger(name: Optional[str] = None) -> logging.Logger:
     """
-    Return logger object
+    Return logger object for the calling module
+    :param name: The logger name, defaults to the name of the module that called get_logger
     :return:
     """
-    function_that_called_this_one = get_caller_function()
-    return logging.getLogger(function_that_called_this_one)
+    if name is None:
+        # Only looks up the immediate caller's frame, no stack inspection
+        name = sys._getframe(1).f_globals.get("__name__", "v2_samplesheet_maker")
+
+    return logging.getLogger(name)
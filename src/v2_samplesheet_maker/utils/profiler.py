@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+
+"""
+Profile a conversion, stage by stage.
+
+While a profiler is active, each stage of a conversion records its wall time, the number of rows it handled
+and the net number of memory blocks it allocated, both per stage and per section class.
+
+The stages are
+* json_load:        Reading the input json
+* csv_parse:        Reading the samplesheet csv into section dictionaries
+* section_sorting:  Finding the class of each section and putting the sections in import order
+* validation:       Validating a section (or each row of a data section) against its pydantic model
+* cloud_data:       Generating the Cloud_Data rows from a data section
+* dataframe_build:  Building the dataframe of a data section
+* clean_rows:       Cleaning the rows of a data section (i.e dropping duplicate Cloud_Data rows)
+* order_rows:       Sorting the rows of a data section
+* render_csv:       Writing a section of the samplesheet csv
+* render_json:      Converting a section to its json dictionary
+* json_write:       Writing the output json
+* xml_parse:        Reading a RunInfo.xml
+* xml_write:        Writing a RunInfo.xml
+
+When no profiler is active, recording a stage costs a single global lookup.
+
+Usage:
+
+    with profile_conversion("v2-samplesheet-maker", report_path=Path("profile.json")) as profiler:
+        v2_samplesheet_writer(input_json, output_csv)
+
+    profiler.get_report()
+"""
+
+# Standard imports
+import json
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Optional, Union, TextIO, Tuple, List
+
+from .logger import get_logger
+
+logger = get_logger()
+
+# The profiler of the running conversion, if any
+_ACTIVE_PROFILER: Optional["Profiler"] = None
+
+
+class Profiler:
+    """
+    Collect the wall time, rows and allocated memory blocks of each stage of a conversion
+    """
+
+    def __init__(self, command: Optional[str] = None):
+        """
+        :param command: The name of the conversion being profiled, included in the report
+        """
+        self.command = command
+        self.start_time: Optional[float] = None
+        self.end_time: Optional[float] = None
+        self.start_allocated_blocks: Optional[int] = None
+        self.end_allocated_blocks: Optional[int] = None
+
+        # Keyed by (stage, section class name), the section class name is None for stages outside of a section
+        self.records: Dict[Tuple[str, Optional[str]], Dict] = {}
+        self._lock = Lock()
+
+    def start(self):
+        self.start_time = time.perf_counter()
+        self.start_allocated_blocks = sys.getallocatedblocks()
+
+    def stop(self):
+        self.end_time = time.perf_counter()
+        self.end_allocated_blocks = sys.getallocatedblocks()
+
+    def add_record(
+        self,
+        stage: str,
+        section: Optional[str],
+        seconds: float,
+        rows: Optional[int],
+        allocated_blocks: int,
+    ):
+        """
+        Add a run of a stage
+        :param stage:
+        :param section: The section class name
+        :param seconds:
+        :param rows:
+        :param allocated_blocks: The net number of memory blocks allocated by the stage
+        :return:
+        """
+        with self._lock:
+            record = self.records.setdefault(
+                (stage, section),
+                {
+                    "stage": stage,
+                    "section": section,
+                    "calls": 0,
+                    "seconds": 0.0,
+                    "rows": 0,
+                    "allocated_blocks": 0,
+                }
+            )
+            record["calls"] += 1
+            record["seconds"] += seconds
+            record["rows"] += rows if rows is not None else 0
+            record["allocated_blocks"] += allocated_blocks
+
+    def get_stage_summaries(self) -> List[Dict]:
+        """
+        Sum the records of each stage across section classes
+        :return:
+        """
+        stage_summaries: Dict[str, Dict] = {}
+        for record in self.records.values():
+            stage_summary = stage_summaries.setdefault(
+                record["stage"],
+                {
+                    "stage": record["stage"],
+                    "calls": 0,
+                    "seconds": 0.0,
+                    "rows": 0,
+                    "allocated_blocks": 0,
+                }
+            )
+            for key in ["calls", "seconds", "rows", "allocated_blocks"]:
+                stage_summary[key] += record[key]
+
+        return sorted(
+            stage_summaries.values(),
+            key=lambda stage_summary_iter: stage_summary_iter["seconds"],
+            reverse=True
+        )
+
+    def get_report(self) -> Dict:
+        """
+        Get the profile report
+        :return: A dictionary with the keys
+          * command
+          * total_seconds: The wall time of the whole conversion
+          * total_allocated_blocks: The net number of memory blocks allocated over the whole conversion
+          * stages: The calls, seconds, rows and allocated blocks of each stage, slowest first
+          * sections: The same, for each stage of each section class, slowest first
+        """
+        end_time = self.end_time if self.end_time is not None else time.perf_counter()
+        end_allocated_blocks = (
+            self.end_allocated_blocks if self.end_allocated_blocks is not None
+            else sys.getallocatedblocks()
+        )
+
+        return {
+            "command": self.command,
+            "total_seconds": end_time - self.start_time if self.start_time is not None else None,
+            "total_allocated_blocks": (
+                end_allocated_blocks - self.start_allocated_blocks
+                if self.start_allocated_blocks is not None else None
+            ),
+            "stages": self.get_stage_summaries(),
+            "sections": sorted(
+                filter(
+                    lambda record_iter: record_iter["section"] is not None,
+                    map(dict, self.records.values())
+                ),
+                key=lambda record_iter: record_iter["seconds"],
+                reverse=True
+            ),
+        }
+
+    def write_report(self, output_file: Union[Path, TextIO, int]):
+        """
+        Write out the profile report as json
+        :param output_file: Path to the report, a writable text stream or a file descriptor
+        :return:
+        """
+        if isinstance(output_file, (Path, str, int)):
+            with open(output_file, "w", closefd=not isinstance(output_file, int)) as output_h:
+                self.write_report(output_h)
+            return
+
+        json.dump(self.get_report(), output_file, indent=2)
+        output_file.write("\n")
+
+
+def get_active_profiler() -> Optional[Profiler]:
+    return _ACTIVE_PROFILER
+
+
+@contextmanager
+def _record_stage(profiler: Profiler, stage: str, section: Optional[str], rows: Optional[int]):
+    stage_counts = {"rows": rows}
+    start_allocated_blocks = sys.getallocatedblocks()
+    start_time = time.perf_counter()
+    try:
+        yield stage_counts
+    finally:
+        profiler.add_record(
+            stage,
+            section,
+            seconds=time.perf_counter() - start_time,
+            rows=stage_counts["rows"],
+            allocated_blocks=sys.getallocatedblocks() - start_allocated_blocks,
+        )
+
+
+def profile_stage(stage: str, section: Optional[object] = None, rows: Optional[int] = None):
+    """
+    Record a stage with the active profiler, does nothing if there is no active profiler
+
+        with profile_stage("validation", section=self, rows=len(data_rows)):
+            ...
+
+    :param stage: The stage name, i.e validation
+    :param section: The section (or section class) the stage belongs to
+    :param rows: The number of rows handled by the stage,
+      if not known up front set the 'rows' key of the dictionary returned by the context manager
+      (None when there is no active profiler)
+    :return: A context manager
+    """
+    profiler = _ACTIVE_PROFILER
+    if profiler is None:
+        return nullcontext()
+
+    if section is not None and not isinstance(section, str):
+        section = section.__name__ if isinstance(section, type) else type(section).__name__
+
+    return _record_stage(profiler, stage, section, rows)
+
+
+@contextmanager
+def profile_conversion(
+    command: Optional[str] = None,
+    report_path: Optional[Union[Path, TextIO, int]] = None,
+    cprofile_path: Optional[Path] = None,
+):
+    """
+    Profile everything run inside the context
+
+    :param command: The name of the conversion, included in the report
+    :param report_path: Write the report as json to this path (or stream) once the context exits
+    :param cprofile_path: Also run the cProfile profiler, and dump its stats to this path
+      (for use with python -m pstats or snakeviz)
+    :return: The profiler, call get_report() once the context has exited
+    """
+    global _ACTIVE_PROFILER
+
+    if _ACTIVE_PROFILER is not None:
+        logger.error("A conversion is already being profiled")
+        raise ValueError
+
+    profiler = Profiler(command)
+
+    cprofiler = None
+    if cprofile_path is not None:
+        import cProfile
+        cprofiler = cProfile.Profile()
+
+    _ACTIVE_PROFILER = profiler
+    profiler.start()
+    if cprofiler is not None:
+        cprofiler.enable()
+
+    try:
+        yield profiler
+    finally:
+        if cprofiler is not None:
+            cprofiler.disable()
+        profiler.stop()
+        _ACTIVE_PROFILER = None
+
+        if cprofiler is not None:
+            cprofiler.dump_stats(str(cprofile_path))
+        if report_path is not None:
+            profiler.write_report(report_path)
+
+
+def profile_cli(args: Dict, command: str):
+    """
+    Profile a console script if --profile or --cprofile were given
+
+    :param args: The docopt args, with the optional keys --profile (the report path, '-' for stderr)
+      and --cprofile (the cProfile stats path)
+    :param command: The console script name
+    :return: A context manager
+    """
+    report_arg = args.get("--profile", None)
+    cprofile_arg = args.get("--cprofile", None)
+
+    if report_arg is None and cprofile_arg is None:
+        return nullcontext()
+
+    if report_arg == "-":
+        # stdout may be the output of the conversion
+        report_path = sys.stderr
+    elif report_arg is not None:
+        if not Path(report_arg).parent.is_dir():
+            logger.error(f"Could not find parent directory '{Path(report_arg).parent}' for '{report_arg}'")
+            raise NotADirectoryError
+        report_path = Path(report_arg)
+    else:
+        report_path = None
+
+    if cprofile_arg is not None and not Path(cprofile_arg).parent.is_dir():
+        logger.error(f"Could not find parent directory '{Path(cprofile_arg).parent}' for '{cprofile_arg}'")
+        raise NotADirectoryError
+
+    return profile_conversion(
+        command,
+        report_path=report_path,
+        cprofile_path=Path(cprofile_arg) if cprofile_arg is not None else None,
+    )
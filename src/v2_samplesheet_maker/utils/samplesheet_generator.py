@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+
+"""
+Generate synthetic samplesheets, for benchmarks and mock run folders.
+
+Each sample is placed in every lane, so a samplesheet of N samples and L lanes has N x L BCLConvert_Data rows.
+
+Indexes follow the rules used when designing real index kits
+* Unique dual indexes, no two samples share an index / index2 pair (and no two samples share an index while
+  there are enough indexes to go around)
+* GC content between 30% and 70%
+* No homopolymers longer than two bases
+"""
+
+# Standard imports
+import random
+from typing import Dict, List, Optional, Set
+
+# Globals
+INDEX_BASES = "ACGT"
+MIN_INDEX_GC_FRACTION = 0.3
+MAX_INDEX_GC_FRACTION = 0.7
+MAX_INDEX_HOMOPOLYMER_LENGTH = 2
+
+# Attempts at drawing an unused index before we allow an index to be reused by another pair
+MAX_UNUSED_INDEX_ATTEMPTS = 20
+
+SYNTHETIC_BCLCONVERT_URN = "urn:ilmn:ica:pipeline:bf93b5cf-cb27-4dfa-846e-acd6eb081aca#BclConvert_v4_2_7"
+SYNTHETIC_TSO500S_URN = "urn:ilmn:ica:pipeline:a8b7d5b2-8a4b-4b0b-9c3c-4d8b3f5b3b3b#DRAGEN_TSO500_RUO_v2-1-1"
+SYNTHETIC_TSO500L_URN = "urn:ilmn:ica:pipeline:fdef5902-3f50-4ee7-ae17-15d38d4b489c#DRAGEN_TSO500_ctDNA_RUO_v2-1-1"
+
+
+def is_valid_index(index: str) -> bool:
+    """
+    Check an index has a balanced GC content and no long homopolymers
+    :param index:
+    :return:
+    """
+    gc_fraction = (index.count("G") + index.count("C")) / len(index)
+    if not MIN_INDEX_GC_FRACTION <= gc_fraction <= MAX_INDEX_GC_FRACTION:
+        return False
+
+    return not any(
+        map(
+            lambda base_iter: base_iter * (MAX_INDEX_HOMOPOLYMER_LENGTH + 1) in index,
+            INDEX_BASES
+        )
+    )
+
+
+def generate_index(random_generator: random.Random, index_length: int) -> str:
+    """
+    Draw a random index that passes is_valid_index
+    :param random_generator:
+    :param index_length:
+    :return:
+    """
+    while True:
+        index = "".join(random_generator.choices(INDEX_BASES, k=index_length))
+        if is_valid_index(index):
+            return index
+
+
+def generate_index_pairs(
+    num_pairs: int,
+    index_length: int = 10,
+    index2_length: Optional[int] = None,
+    seed: int = 0,
+) -> List[List[str]]:
+    """
+    Generate unique dual index pairs
+    :param num_pairs: The number of index pairs to generate
+    :param index_length: The length of the i7 index
+    :param index2_length: The length of the i5 index, defaults to the length of the i7 index
+    :param seed: The seed of the random generator, the same seed always gives the same pairs
+    :return: A list of [index, index2] pairs
+    """
+    random_generator = random.Random(seed)
+
+    if index2_length is None:
+        index2_length = index_length
+
+    used_indexes: Set[str] = set()
+    used_index2s: Set[str] = set()
+    used_pairs: Set[str] = set()
+    index_pairs = []
+
+    def draw_index(length: int, used_set: Set[str]) -> str:
+        # Prefer indexes that have not been used, fall back to reusing an index once they are hard to find
+        for _ in range(MAX_UNUSED_INDEX_ATTEMPTS):
+            index = generate_index(random_generator, length)
+            if index not in used_set:
+                return index
+        return index
+
+    while len(index_pairs) < num_pairs:
+        index = draw_index(index_length, used_indexes)
+        index2 = draw_index(index2_length, used_index2s)
+
+        if f"{index}+{index2}" in used_pairs:
+            continue
+
+        used_indexes.add(index)
+        used_index2s.add(index2)
+        used_pairs.add(f"{index}+{index2}")
+        index_pairs.append([index, index2])
+
+    return index_pairs
+
+
+def generate_samplesheet_dict(
+    num_samples: int,
+    num_lanes: int = 1,
+    index_length: int = 10,
+    tso500s: bool = False,
+    tso500l: bool = False,
+    cloud: bool = False,
+    seed: int = 0,
+) -> Dict:
+    """
+    Generate a synthetic samplesheet dictionary (as used by SampleSheet)
+
+    :param num_samples: The number of samples, each sample is placed in every lane
+    :param num_lanes: The number of lanes
+    :param index_length: The length of both indexes
+    :param tso500s: Add TSO500S_Settings and TSO500S_Data sections (one row per sample)
+    :param tso500l: Add TSO500L_Settings and TSO500L_Data sections (one row per sample)
+    :param cloud: Add a Cloud_Settings section, along with urns so that the Cloud_Data section is generated,
+      the TSO500 sections become Cloud_TSO500 sections
+    :param seed: The seed of the random generator, the same arguments always give the same samplesheet
+
+    :return:
+    """
+    index_pairs = generate_index_pairs(num_samples, index_length=index_length, seed=seed)
+
+    sample_ids = list(
+        map(
+            lambda sample_index_iter: f"SAMPLE{sample_index_iter:06d}",
+            range(num_samples)
+        )
+    )
+
+    samplesheet_dict = {
+        "header": {
+            "file_format_version": 2,
+            "run_name": f"Synthetic_{num_samples}_Samples_{num_lanes}_Lanes",
+            "instrument_type": "NovaSeqXPlus",
+            "index_orientation": "Forward",
+        },
+        "reads": {
+            "read_1_cycles": 151,
+            "read_2_cycles": 151,
+            "index_1_cycles": index_length,
+            "index_2_cycles": index_length,
+        },
+        "bclconvert_settings": {
+            "software_version": "4.2.7",
+            "adapter_read_1": "AGATCGGAAGAGCACACGTCTGAACTCCAGTCA",
+            "adapter_read_2": "AGATCGGAAGAGCGTCGTGTAGGGAAAGAGTGT",
+            "override_cycles": f"Y151;I{index_length};I{index_length};Y151",
+            "fastq_compression_format": "gzip",
+        },
+        "bclconvert_data": [
+            {
+                "lane": lane,
+                "sample_id": sample_id,
+                "index": index_pair[0],
+                "index2": index_pair[1],
+                "sample_project": f"Project{sample_index // 96:04d}",
+                "library_prep_kit_name": "TruSeqDNAPCRFree",
+                "index_adapter_kit_name": "TruSeqDnaUDIndexes96Indexes",
+            }
+            for lane in range(1, num_lanes + 1)
+            for sample_index, (sample_id, index_pair) in enumerate(zip(sample_ids, index_pairs))
+        ],
+    }
+
+    section_prefix = "cloud_" if cloud else ""
+
+    if tso500s:
+        samplesheet_dict[f"{section_prefix}tso500s_settings"] = {
+            "software_version": "2.1.1",
+            "adapter_read_1": "CTGTCTCTTATACACATCT",
+            "adapter_read_2": "CTGTCTCTTATACACATCT",
+            "override_cycles": f"U7N1Y143;I{index_length};I{index_length};U7N1Y143",
+            "starts_from_fastq": False,
+        }
+        samplesheet_dict[f"{section_prefix}tso500s_data"] = [
+            {
+                "sample_id": sample_id,
+                "sample_type": "DNA" if sample_index % 2 == 0 else "RNA",
+                "pair_id": f"PAIR{sample_index // 2:06d}",
+                "index_id": f"UDP{sample_index % 384 + 1:04d}",
+                "index": index_pair[0],
+                "index2": index_pair[1],
+            }
+            for sample_index, (sample_id, index_pair) in enumerate(zip(sample_ids, index_pairs))
+        ]
+
+    if tso500l:
+        samplesheet_dict[f"{section_prefix}tso500l_settings"] = {
+            "software_version": "2.1.1",
+            "adapter_read_1": "CTGTCTCTTATACACATCT",
+            "adapter_read_2": "CTGTCTCTTATACACATCT",
+            "starts_from_fastq": False,
+        }
+        samplesheet_dict[f"{section_prefix}tso500l_data"] = [
+            {
+                "sample_id": sample_id,
+                "sample_type": "DNA",
+                "index_id": f"UDP{sample_index % 384 + 1:04d}",
+                "index": index_pair[0],
+                "index2": index_pair[1],
+            }
+            for sample_index, (sample_id, index_pair) in enumerate(zip(sample_ids, index_pairs))
+        ]
+
+    if cloud:
+        # The Cloud_Data section is generated from the BCLConvert_Data section
+        samplesheet_dict["bclconvert_settings"]["urn"] = SYNTHETIC_BCLCONVERT_URN
+        if tso500s:
+            samplesheet_dict["cloud_tso500s_settings"]["urn"] = SYNTHETIC_TSO500S_URN
+        if tso500l:
+            samplesheet_dict["cloud_tso500l_settings"]["urn"] = SYNTHETIC_TSO500L_URN
+        samplesheet_dict["cloud_settings"] = {
+            "generated_version": "0.0.0",
+            "cloud_workflow": "ica_workflow_1",
+        }
+
+    return samplesheet_dict
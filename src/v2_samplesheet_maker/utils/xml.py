@@ -2,13 +2,250 @@
 
 """
 Write an xml file to json and vice-versa
+
+parse_xml_stream reads an xml file into the same dictionary as xmltodict.parse,
+but streams the file through expat and never builds the elements it is asked to skip
+
+write_xml_stream writes a dictionary (in the xmltodict format) straight to a text or binary stream, one line at a time
 """
+from io import RawIOBase, BufferedIOBase, TextIOBase
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Any, Dict, BinaryIO, Collection, Iterator, List, TextIO, Union
 
 import xmltodict
 import json
 
+from .profiler import profile_stage
+
+# Size of each chunk read from an xml stream
+XML_CHUNK_SIZE = 64 * 1024
+
+
+class _StopXmlParsing(Exception):
+    """
+    Raised from within the expat handlers once every element we want has been read
+    """
+    pass
+
+
+class XmlStreamBuilder:
+    """
+    Expat handlers that build the xmltodict representation of an xml document
+    * Attributes are prefixed with '@'
+    * Elements with only text are stored as their (stripped) text, empty elements are stored as None
+    * Text alongside attributes or child elements is stored under '#text'
+    * Repeated elements are stored as lists
+
+    Elements are addressed by their path from the root element, i.e RunInfo/Run/FlowcellLayout
+    """
+
+    def __init__(
+        self,
+        skip_element_paths: Collection[str] = (),
+        keep_element_paths: Optional[Collection[str]] = None
+    ):
+        """
+        :param skip_element_paths: Elements (along with everything inside them) that are not built
+        :param keep_element_paths: If set, only these elements (and the elements that contain them) are built,
+          reading stops once each of them has been read and another element begins
+        """
+        self.skip_element_paths = set(skip_element_paths)
+        self.keep_element_paths = set(keep_element_paths) if keep_element_paths is not None else None
+
+        # Paths of the elements that contain a kept element
+        self.keep_parent_paths = set()
+        for keep_element_path in (self.keep_element_paths or []):
+            keep_element_path_split = keep_element_path.split("/")
+            for parent_index in range(1, len(keep_element_path_split)):
+                self.keep_parent_paths.add("/".join(keep_element_path_split[:parent_index]))
+
+        self.seen_keep_element_paths = set()
+
+        # The path to and items of each open element
+        self.path: List[str] = []
+        self.stack: List[List] = []  # [name, item, text_chunks]
+
+        # Depth within a skipped element, or within a kept element
+        self.skip_depth = 0
+        self.keep_depth = 0
+
+        # The expat parser, set by set_handlers
+        self.parser = None
+
+        self.result: Optional[Dict] = None
+
+    def is_skipped(self, element_path: str) -> bool:
+        """
+        Check if an element should not be built
+        :param element_path:
+        :return:
+        """
+        if element_path in self.skip_element_paths:
+            return True
+
+        if self.keep_element_paths is None or self.keep_depth > 0:
+            return False
+
+        return element_path not in self.keep_element_paths and element_path not in self.keep_parent_paths
+
+    def set_handlers(self, parser, skipping: bool = False):
+        """
+        Set the expat handlers, while inside a skipped element only the element depth is tracked
+        and character data is not passed through to python at all
+        :param parser:
+        :param skipping:
+        :return:
+        """
+        self.parser = parser
+        if skipping:
+            parser.StartElementHandler = self.skip_start_element
+            parser.EndElementHandler = self.skip_end_element
+            parser.CharacterDataHandler = None
+        else:
+            parser.StartElementHandler = self.start_element
+            parser.EndElementHandler = self.end_element
+            parser.CharacterDataHandler = self.character_data
+
+    def skip_start_element(self, name: str, attrs: Dict[str, str]):
+        self.skip_depth += 1
+
+    def skip_end_element(self, name: str):
+        self.skip_depth -= 1
+        if self.skip_depth == 0:
+            self.set_handlers(self.parser)
+
+    def start_element(self, name: str, attrs: Dict[str, str]):
+        element_path = "/".join(self.path + [name])
+
+        if self.is_skipped(element_path):
+            # Nothing left that we want
+            if (
+                self.keep_element_paths is not None and
+                self.seen_keep_element_paths == self.keep_element_paths
+            ):
+                raise _StopXmlParsing
+            self.skip_depth = 1
+            self.set_handlers(self.parser, skipping=True)
+            return
+
+        if self.keep_depth > 0 or (self.keep_element_paths is not None and element_path in self.keep_element_paths):
+            self.keep_depth += 1
+
+        self.path.append(name)
+        self.stack.append([
+            name,
+            dict(map(lambda attr_iter: ("@" + attr_iter[0], attr_iter[1]), attrs.items())) if attrs else None,
+            []
+        ])
+
+    def end_element(self, name: str):
+        self.close_element()
+
+    def close_element(self):
+        """
+        Pop the current element and add it to its parent
+        :return:
+        """
+        element_path = "/".join(self.path)
+        if self.keep_depth > 0:
+            self.keep_depth -= 1
+        if self.keep_element_paths is not None and element_path in self.keep_element_paths:
+            self.seen_keep_element_paths.add(element_path)
+
+        self.path.pop()
+        name, item, text_chunks = self.stack.pop()
+
+        text = "".join(text_chunks).strip() or None
+
+        if item is not None:
+            if text is not None:
+                item["#text"] = text
+            value = item
+        else:
+            value = text
+
+        # Root element
+        if len(self.stack) == 0:
+            self.result = {name: value}
+            return
+
+        parent = self.stack[-1]
+        if parent[1] is None:
+            parent[1] = {}
+
+        if name not in parent[1]:
+            parent[1][name] = value
+        elif isinstance(parent[1][name], list):
+            parent[1][name].append(value)
+        else:
+            parent[1][name] = [parent[1][name], value]
+
+    def character_data(self, data: str):
+        if len(self.stack) == 0:
+            return
+        self.stack[-1][2].append(data)
+
+    def get_result(self) -> Dict:
+        """
+        Close any elements left open once we've stopped reading
+        :return:
+        """
+        while len(self.stack) > 0:
+            self.close_element()
+
+        return self.result
+
+
+def parse_xml_stream(
+    xml_input_path_or_stream: Union[Path, TextIO, BinaryIO],
+    skip_element_paths: Collection[str] = (),
+    keep_element_paths: Optional[Collection[str]] = None,
+) -> Dict:
+    """
+    Read an xml file into the same dictionary as xmltodict.parse, one chunk at a time
+
+    :param xml_input_path_or_stream:  Path to the xml file, or a text or binary stream
+    :param skip_element_paths:  Paths of the elements to skip, i.e RunInfo/Run/FlowcellLayout,
+      skipped elements are never built
+    :param keep_element_paths:  If set, paths of the only elements to build (along with the elements that contain them).
+      Reading stops once each of these has been read and an element we don't want begins
+
+    :return: The xml as a dictionary
+    """
+    from xml.parsers import expat
+
+    builder = XmlStreamBuilder(skip_element_paths, keep_element_paths)
+
+    parser = expat.ParserCreate()
+    parser.buffer_text = True
+    builder.set_handlers(parser)
+
+    def parse_chunks(xml_h: Union[TextIO, BinaryIO]):
+        try:
+            while True:
+                chunk = xml_h.read(XML_CHUNK_SIZE)
+                if not chunk:
+                    break
+                parser.Parse(chunk, False)
+            parser.Parse(b"", True)
+        except _StopXmlParsing:
+            pass
+
+    if isinstance(xml_input_path_or_stream, (TextIOBase, RawIOBase, BufferedIOBase)):
+        with profile_stage("xml_parse"):
+            parse_chunks(xml_input_path_or_stream)
+    elif isinstance(xml_input_path_or_stream, Path):
+        # Read as bytes, so expat uses the encoding declared in the file
+        with profile_stage("xml_parse"), open(xml_input_path_or_stream, "rb") as xml_h:
+            parse_chunks(xml_h)
+    else:
+        raise ValueError(
+            f"Input xml path or stream is not a valid type, expected one of TextIO, BinaryIO or Path"
+            f" but got {type(xml_input_path_or_stream)}"
+        )
+
+    return builder.get_result()
+
 
 def xml_to_json(xml_file: Path, output_path: Optional[Path] = None) -> Optional[Dict]:
     """
@@ -66,3 +303,139 @@ def json_to_xml(json_file: Path, output_path: Optional[Path] = None) -> Optional
             xml_h.write('\n')
     else:
         return xml_str
+
+
+XML_DECLARATION = '<?xml version="1.0" encoding="utf-8"?>'
+
+
+def get_xml_value_str(value: Any) -> str:
+    """
+    Convert a text or attribute value to a string, as xmltodict.unparse would
+    :param value:
+    :return:
+    """
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def escape_xml_text(value: Any) -> str:
+    return get_xml_value_str(value).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def escape_xml_attribute(value: Any) -> str:
+    return escape_xml_text(value).replace('"', "&quot;")
+
+
+def iter_xml_lines(
+    name: str,
+    value: Any,
+    depth: int = 0,
+    indent: str = "\t",
+    element_order: Optional[Dict[str, List[str]]] = None,
+) -> Iterator[str]:
+    """
+    Yield the lines of an element (without line endings) from its xmltodict representation
+    * Keys starting with '@' are attributes, '#text' is the text of the element
+    * Lists are written as repeated elements
+    * None (or an element with no text or children) is written as a self-closing element
+
+    :param name:  The element name
+    :param value:  The element value
+    :param depth:  The indentation depth of the element
+    :param indent:  The indentation for each level
+    :param element_order:  For each element name, the order its children are written in,
+      children not listed are written afterwards in the order they were given
+
+    :return:
+    """
+    # Repeated elements
+    if isinstance(value, list):
+        for value_item in value:
+            yield from iter_xml_lines(name, value_item, depth, indent, element_order)
+        return
+
+    prefix = indent * depth
+
+    if not isinstance(value, dict):
+        if value is None:
+            yield f"{prefix}<{name}/>"
+        else:
+            yield f"{prefix}<{name}>{escape_xml_text(value)}</{name}>"
+        return
+
+    attributes_str = "".join(
+        map(
+            lambda attribute_iter: f' {attribute_iter[0][1:]}="{escape_xml_attribute(attribute_iter[1])}"',
+            filter(
+                lambda key_iter: key_iter[0].startswith("@"),
+                value.items()
+            )
+        )
+    )
+    text = value.get("#text", None)
+    child_names = list(
+        filter(
+            lambda key_iter: not key_iter.startswith("@") and not key_iter == "#text",
+            value.keys()
+        )
+    )
+
+    if element_order is not None and name in element_order:
+        child_names = sorted(
+            child_names,
+            key=lambda child_name_iter: (
+                element_order[name].index(child_name_iter) if child_name_iter in element_order[name]
+                else len(element_order[name])
+            )
+        )
+
+    if len(child_names) == 0:
+        if text is None:
+            yield f"{prefix}<{name}{attributes_str}/>"
+        else:
+            yield f"{prefix}<{name}{attributes_str}>{escape_xml_text(text)}</{name}>"
+        return
+
+    yield f"{prefix}<{name}{attributes_str}>" + (escape_xml_text(text) if text is not None else "")
+    for child_name in child_names:
+        yield from iter_xml_lines(child_name, value[child_name], depth + 1, indent, element_order)
+    yield f"{prefix}</{name}>"
+
+
+def write_xml_stream(
+    xml_dict: Dict,
+    output_h: Union[TextIO, BinaryIO],
+    element_order: Optional[Dict[str, List[str]]] = None,
+    final_newline: bool = True,
+):
+    """
+    Write a dictionary (in the xmltodict format, with a single root element) to a text or binary stream,
+    tab indented, one element per line
+
+    :param xml_dict:  The xml as a dictionary, i.e {"RunInfo": {"@Version": "5", "Run": {...}}}
+    :param output_h:  A writable text or binary stream
+    :param element_order:  For each element name, the order its children are written in
+    :param final_newline:  Whether to end the document with a newline
+
+    :return:
+    """
+    if not len(xml_dict) == 1:
+        raise ValueError(f"Expected a single root element but got {list(xml_dict.keys())}")
+
+    # Binary streams are written as utf-8 (as per the declaration)
+    if isinstance(output_h, TextIOBase):
+        write = output_h.write
+    else:
+        write = lambda line_iter: output_h.write(line_iter.encode("utf-8"))
+
+    with profile_stage("xml_write"):
+        write(XML_DECLARATION)
+
+        root_name, root_value = next(iter(xml_dict.items()))
+        for line in iter_xml_lines(root_name, root_value, element_order=element_order):
+            write("\n")
+            write(line)
+
+        if final_newline:
+            write("\n")
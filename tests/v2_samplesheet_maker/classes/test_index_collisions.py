@@ -0,0 +1,218 @@
+import random
+import time
+from itertools import combinations
+
+import pytest
+
+from v2_samplesheet_maker.classes.index_collisions import (
+    IndexCollisionChecker,
+    get_packed_hamming_distance,
+    pack_index,
+)
+from v2_samplesheet_maker.functions.index_collisions import (
+    get_barcode_mismatch_recommendations,
+    get_index_collisions,
+)
+
+
+def get_hamming_distance(index_a: str, index_b: str) -> int:
+    return sum(
+        base_a != base_b or base_a == "N"
+        for base_a, base_b in zip(index_a, index_b)
+    )
+
+
+def get_random_index(random_generator: random.Random, length: int) -> str:
+    return "".join(random_generator.choice("ACGT") for _ in range(length))
+
+
+@pytest.mark.parametrize(
+    "index_a,index_b",
+    [
+        ("ACGTACGT", "ACGTACGT"),
+        ("ACGTACGT", "ACGTACGA"),
+        ("AAAAAAAA", "TTTTTTTT"),
+        ("ACGTACGTAC", "ACGTACGT"),
+        ("ACGNACGT", "ACGTACGT"),
+        ("", "ACGT"),
+    ]
+)
+def test_packed_hamming_distance(index_a, index_b):
+    assert get_packed_hamming_distance(pack_index(index_a), pack_index(index_b)) == get_hamming_distance(index_a, index_b)
+
+
+def test_pack_index_rejects_bad_bases():
+    with pytest.raises(ValueError):
+        pack_index("ACGTX")
+
+
+@pytest.mark.parametrize("independent", [False, True])
+def test_matches_brute_force(independent):
+    random_generator = random.Random(42)
+
+    # Short indexes so that there are plenty of collisions
+    data_rows = [
+        {
+            "sample_id": f"Sample{row_index}",
+            "lane": 1 + row_index % 2,
+            "index": get_random_index(random_generator, 6),
+            "index2": get_random_index(random_generator, 4),
+            "barcode_mismatches_index_1": random_generator.choice([None, 0, 1, 2]),
+        }
+        for row_index in range(200)
+    ]
+
+    collisions = IndexCollisionChecker(
+        data_rows,
+        barcode_mismatches_index_1=1,
+        barcode_mismatches_index_2=0,
+        independent_index_collision_check=[1, 2] if independent else None
+    ).find_collisions()
+
+    expected_collisions = set()
+    for row_a, row_b in combinations(data_rows, 2):
+        if not row_a["lane"] == row_b["lane"]:
+            continue
+        mismatches_1 = sum(
+            row_iter["barcode_mismatches_index_1"] if row_iter["barcode_mismatches_index_1"] is not None else 1
+            for row_iter in [row_a, row_b]
+        )
+        distance_1 = get_hamming_distance(row_a["index"], row_b["index"])
+        distance_2 = get_hamming_distance(row_a["index2"], row_b["index2"])
+        if distance_1 <= mismatches_1 and distance_2 == 0:
+            expected_collisions.add((row_a["sample_id"], row_b["sample_id"], "combined"))
+        if independent and 0 < distance_1 <= mismatches_1:
+            expected_collisions.add((row_a["sample_id"], row_b["sample_id"], "index"))
+
+    assert set(
+        map(
+            lambda collision_iter: (
+                collision_iter["sample_id_1"], collision_iter["sample_id_2"], collision_iter["collision_type"]
+            ),
+            collisions
+        )
+    ) == expected_collisions
+    assert len(expected_collisions) > 0
+
+
+def test_lane_missing_index2_compares_index_only():
+    collisions = IndexCollisionChecker(
+        [
+            {"sample_id": "A", "lane": 1, "index": "AAAAAAAA", "index2": "CCCCCCCC"},
+            {"sample_id": "B", "lane": 1, "index": "AAAAAAAA", "index2": None},
+            {"sample_id": "C", "lane": 2, "index": "AAAAAAAA", "index2": "CCCCCCCC"},
+            {"sample_id": "D", "lane": 2, "index": "AAAAAAAA", "index2": "GGGGGGGG"},
+        ]
+    ).find_collisions()
+
+    assert collisions == [
+        {
+            "lane": 1, "sample_id_1": "A", "sample_id_2": "B", "collision_type": "combined",
+            "index_distance": 0, "index2_distance": None
+        }
+    ]
+
+
+def test_full_flowcell_is_fast():
+    random_generator = random.Random(0)
+    data_rows = [
+        {
+            "sample_id": f"Sample{lane}_{row_index}",
+            "lane": lane,
+            "index": get_random_index(random_generator, 10),
+            "index2": get_random_index(random_generator, 10),
+        }
+        for lane in range(1, 9)
+        for row_index in range(384)
+    ]
+
+    start_time = time.perf_counter()
+    IndexCollisionChecker(data_rows, barcode_mismatches_index_1=1, barcode_mismatches_index_2=1).find_collisions()
+    assert time.perf_counter() - start_time < 1
+
+
+def test_get_index_collisions_from_samplesheet_dict():
+    samplesheet_dict = {
+        "header": {"file_format_version": 2},
+        "reads": {"read_1_cycles": 151, "index_1_cycles": 8, "index_2_cycles": 8},
+        "bclconvert_settings": {"barcode_mismatches_index_1": 0, "barcode_mismatches_index_2": 0},
+        "bclconvert_data": [
+            {"sample_id": "A", "lane": 1, "index": "AAAAAAAA", "index2": "CCCCCCCC"},
+            {"sample_id": "B", "lane": 1, "index": "AAAAAAAT", "index2": "CCCCCCCC"},
+            {"sample_id": "C", "lane": 2, "index": "AAAAAAAA", "index2": "CCCCCCCC"},
+            {"sample_id": "D", "lane": 2, "index": "AAAAAAAA", "index2": "CCCCCCCC"},
+        ]
+    }
+
+    collisions = get_index_collisions(samplesheet_dict)
+
+    assert list(map(lambda collision_iter: collision_iter["sample_id_1"], collisions)) == ["C"]
+
+
+@pytest.mark.parametrize("independent", [False, True])
+def test_max_safe_barcode_mismatches_matches_brute_force(independent):
+    random_generator = random.Random(7)
+
+    for lane_size in [2, 8, 24]:
+        data_rows = [
+            {
+                "sample_id": f"Sample{row_index}",
+                "lane": 1,
+                "index": get_random_index(random_generator, 8),
+                "index2": get_random_index(random_generator, 8),
+            }
+            for row_index in range(lane_size)
+        ]
+        independent_lanes = [1] if independent else None
+
+        # Every uniform barcode mismatch combination that has no collisions
+        safe_barcode_mismatches = [
+            (barcode_mismatches_index_1, barcode_mismatches_index_2)
+            for barcode_mismatches_index_1 in range(3)
+            for barcode_mismatches_index_2 in range(3)
+            if len(
+                IndexCollisionChecker(
+                    data_rows,
+                    barcode_mismatches_index_1=barcode_mismatches_index_1,
+                    barcode_mismatches_index_2=barcode_mismatches_index_2,
+                    independent_index_collision_check=independent_lanes,
+                ).find_collisions()
+            ) == 0
+        ]
+
+        expected = max(
+            safe_barcode_mismatches,
+            key=lambda pair_iter: (min(pair_iter), sum(pair_iter), pair_iter[0]),
+            default=(0, 0)
+        )
+
+        checker = IndexCollisionChecker(data_rows, independent_index_collision_check=independent_lanes)
+        assert checker.get_max_safe_barcode_mismatches(1) == expected
+
+
+def test_get_barcode_mismatch_recommendations():
+    samplesheet_dict = {
+        "header": {"file_format_version": 2},
+        "reads": {"read_1_cycles": 151, "index_1_cycles": 8, "index_2_cycles": 8},
+        "bclconvert_settings": {"barcode_mismatches_index_1": 1, "barcode_mismatches_index_2": 1},
+        "bclconvert_data": [
+            # Lane 1 indexes are three apart on index 1 and identical on index 2,
+            # index 1 alone keeps the samples apart so long as it allows at most one mismatch
+            {"sample_id": "A", "lane": 1, "index": "AAAAAAAA", "index2": "CCCCCCCC"},
+            {"sample_id": "B", "lane": 1, "index": "AAAAATTT", "index2": "CCCCCCCC"},
+            # Lane 2 indexes are far apart
+            {"sample_id": "C", "lane": 2, "index": "AAAAAAAA", "index2": "CCCCCCCC"},
+            {"sample_id": "D", "lane": 2, "index": "TTTTTTTT", "index2": "GGGGGGGG"},
+        ]
+    }
+
+    recommendations = get_barcode_mismatch_recommendations(samplesheet_dict)
+
+    assert recommendations["lanes"] == [
+        {"lane": 1, "barcode_mismatches_index_1": 1, "barcode_mismatches_index_2": 2, "has_collisions": False},
+        {"lane": 2, "barcode_mismatches_index_1": 2, "barcode_mismatches_index_2": 2, "has_collisions": False},
+    ]
+    assert recommendations["bclconvert_settings"] == {"barcode_mismatches_index_1": 1, "barcode_mismatches_index_2": 2}
+    assert recommendations["bclconvert_data_overrides"][-1] == {
+        "lane": 2, "sample_id": "D", "barcode_mismatches_index_1": 2, "barcode_mismatches_index_2": 2,
+    }
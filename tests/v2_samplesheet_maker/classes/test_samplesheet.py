@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
 import json
+from io import StringIO
 from pathlib import Path
 
-from v2_samplesheet_maker.classes.samplesheet import SampleSheet
+from v2_samplesheet_maker.classes.samplesheet import SampleSheet, iter_samplesheet_csv
 
 
 class TestSampleSheetSection:
@@ -65,6 +66,21 @@ class TestSampleSheetSection:
     def test_valid_samplesheet(self):
         SampleSheet(self.valid_samplesheet)
 
+    def test_samplesheet_to_csv_string(self, tmp_path):
+        samplesheet_obj = SampleSheet(self.valid_samplesheet)
+
+        # Write to file
+        samplesheet_obj.to_csv(tmp_path / "SampleSheet.csv")
+
+        # Write to stream
+        samplesheet_h = StringIO()
+        samplesheet_obj.to_csv(samplesheet_h)
+
+        csv_str = samplesheet_obj.to_csv_string()
+        assert csv_str.startswith("[Header]\n")
+        assert csv_str == samplesheet_h.getvalue()
+        assert csv_str == (tmp_path / "SampleSheet.csv").read_text()
+
 
 class TestSampleSheetReader:
     def test_read_samplesheet(self):
@@ -79,4 +95,60 @@ class TestSampleSheetReader:
 
         samplesheet_obj.to_json(
             Path("examples/csv_to_json_outputs/standard-sheet-with-settings.json")
-        )
\ No newline at end of file
+        )
+
+    def test_read_samplesheet_from_stream(self):
+        with open("examples/csv_outputs/standard-sheet-with-settings.csv", "r") as samplesheet_h:
+            samplesheet_obj = SampleSheet.read_from_samplesheet_csv(samplesheet_h)
+
+        assert len(samplesheet_obj.bclconvert_data_section.data_rows) == 2
+
+
+class TestIterSampleSheetCSV:
+    samplesheet_csv_str = (
+        "[Header]\n"
+        "FileFormatVersion,2\n"
+        "RunName,my-illumina-sequencing-run\n"
+        "\n"
+        "[Reads]\n"
+        "Read1Cycles,151\n"
+        "\n"
+        "[BCLConvert_Data]\n"
+        "Lane,Sample_ID,index,Sample_Project\n"
+        "1,MyFirstSample,AAAAAAAAAA,SampleProject\n"
+        "1,MySecondSample,GGGGGGGGGG,\n"
+    )
+
+    def test_iter_samplesheet_csv_events(self):
+        events = list(iter_samplesheet_csv(StringIO(self.samplesheet_csv_str)))
+
+        assert events == [
+            ("header", {"file_format_version": "2", "run_name": "my-illumina-sequencing-run"}),
+            ("reads", {"read_1_cycles": "151"}),
+            ("bclconvert_data", {"lane": "1", "sample_id": "MyFirstSample", "index": "AAAAAAAAAA", "sample_project": "SampleProject"}),
+            ("bclconvert_data", {"lane": "1", "sample_id": "MySecondSample", "index": "GGGGGGGGGG", "sample_project": None}),
+        ]
+
+    def test_iter_samplesheet_csv_stop_early(self):
+        samplesheet_iter = iter_samplesheet_csv(
+            Path("examples/csv_outputs/standard-sheet-with-settings.csv")
+        )
+
+        section_name, section_dict = next(samplesheet_iter)
+        samplesheet_iter.close()
+
+        assert section_name == "header"
+        assert section_dict.get("run_name") is not None
+
+    def test_read_samplesheet_to_dict(self):
+        samplesheet_obj = SampleSheet.read_from_samplesheet_csv(
+            Path("examples/csv_outputs/standard-sheet-with-settings.csv")
+        )
+
+        samplesheet_h = StringIO()
+        samplesheet_obj.to_json(samplesheet_h)
+
+        assert samplesheet_obj.to_dict() == json.loads(samplesheet_h.getvalue())
+        assert samplesheet_obj.to_dict() == json.loads(
+            Path("examples/csv_to_json_outputs/standard-sheet-with-settings.json").read_text()
+        )
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+
+"""
+Test the keyed samplesheet diff
+"""
+
+import json
+import sys
+from copy import deepcopy
+
+import pytest
+
+from v2_samplesheet_maker.classes.samplesheet import SampleSheet
+from v2_samplesheet_maker.classes.samplesheet_diff import get_samplesheet_dict_diff, get_samplesheet_diff_lines
+from v2_samplesheet_maker.utils.samplesheet_generator import generate_samplesheet_dict
+
+
+def get_section_diff(samplesheet_diff, section_name):
+    return next(
+        filter(
+            lambda section_diff_iter: section_diff_iter["section"] == section_name,
+            samplesheet_diff["sections"]
+        ),
+        None
+    )
+
+
+def test_no_differences_when_reordered():
+    samplesheet_dict = generate_samplesheet_dict(10, num_lanes=2, tso500s=True, cloud=True)
+    reordered_samplesheet_dict = deepcopy(samplesheet_dict)
+    reordered_samplesheet_dict["bclconvert_data"].reverse()
+    reordered_samplesheet_dict["cloud_tso500s_data"].reverse()
+
+    samplesheet_diff = SampleSheet(deepcopy(samplesheet_dict)).diff(reordered_samplesheet_dict)
+
+    assert samplesheet_diff == {"has_differences": False, "sections": []}
+
+
+def test_diff():
+    old_samplesheet_dict = generate_samplesheet_dict(10, num_lanes=2, cloud=True)
+    new_samplesheet_dict = deepcopy(old_samplesheet_dict)
+
+    new_samplesheet_dict["bclconvert_settings"]["barcode_mismatches_index_1"] = 0
+    new_samplesheet_dict["header"].pop("run_name")
+    new_samplesheet_dict["bclconvert_data"] = list(
+        filter(
+            lambda row: (row["lane"], row["sample_id"]) != (2, "SAMPLE000001"),
+            new_samplesheet_dict["bclconvert_data"]
+        )
+    )
+    new_samplesheet_dict["bclconvert_data"][0]["index"] = "AACCGGTTAA"
+    new_samplesheet_dict["bclconvert_data"].append(
+        {"lane": 3, "sample_id": "SAMPLE000000", "index": "ACGTACGTAC", "index2": "ACGTACGTAC"}
+    )
+
+    samplesheet_diff = SampleSheet(deepcopy(old_samplesheet_dict)).diff(SampleSheet(new_samplesheet_dict))
+    assert samplesheet_diff["has_differences"]
+
+    # Key value sections
+    assert get_section_diff(samplesheet_diff, "bclconvert_settings")["changed_fields"] == [
+        {"field": "barcode_mismatches_index_1", "old": None, "new": 0}
+    ]
+    assert get_section_diff(samplesheet_diff, "header")["changed_fields"] == [
+        {"field": "run_name", "old": "Synthetic_10_Samples_2_Lanes", "new": None}
+    ]
+    assert get_section_diff(samplesheet_diff, "reads") is None
+
+    # Data sections
+    bclconvert_data_diff = get_section_diff(samplesheet_diff, "bclconvert_data")
+    assert list(map(lambda row: (row["lane"], row["sample_id"]), bclconvert_data_diff["added_rows"])) == [(3, "SAMPLE000000")]
+    assert list(map(lambda row: (row["lane"], row["sample_id"]), bclconvert_data_diff["removed_rows"])) == [(2, "SAMPLE000001")]
+    assert bclconvert_data_diff["changed_rows"] == [
+        {
+            "lane": 1,
+            "sample_id": "SAMPLE000000",
+            "fields": [{"field": "index", "old": old_samplesheet_dict["bclconvert_data"][0]["index"], "new": "AACCGGTTAA"}],
+        }
+    ]
+
+    # Cloud_Data rows are compared as written to the csv, where the rows of a sample in each lane are written once,
+    # so only the whole rows that differ are reported (SAMPLE000000 is still in lane 2 and SAMPLE000001 in lane 1)
+    cloud_data_diff = get_section_diff(samplesheet_diff, "cloud_data")
+    assert list(map(lambda row: row["sample_id"], cloud_data_diff["added_rows"])) == ["SAMPLE000000", "SAMPLE000000"]
+    assert cloud_data_diff["removed_rows"] == []
+    assert cloud_data_diff["changed_rows"] == []
+
+    diff_lines = get_samplesheet_diff_lines(samplesheet_diff)
+    assert "bclconvert_data: removed lane=2 sample_id=SAMPLE000001" in diff_lines
+    assert "bclconvert_settings: changed barcode_mismatches_index_1: None -> 0" in diff_lines
+
+
+def test_added_and_removed_sections():
+    samplesheet_diff = get_samplesheet_dict_diff(
+        {"header": {"file_format_version": 2}, "tso500s_data": [{"sample_id": "A"}]},
+        {"header": {"file_format_version": 2}, "reads": {"read_1_cycles": 151}},
+    )
+
+    assert samplesheet_diff["sections"] == [
+        {"section": "tso500s_data", "status": "removed", "added_rows": [], "removed_rows": [{"sample_id": "A"}], "changed_rows": []},
+        {"section": "reads", "status": "added", "changed_fields": [{"field": "read_1_cycles", "old": None, "new": 151}]},
+    ]
+    assert get_samplesheet_diff_lines(samplesheet_diff) == [
+        "tso500s_data: section removed",
+        "reads: section added",
+    ]
+
+
+def test_duplicate_keys():
+    samplesheet_diff = get_samplesheet_dict_diff(
+        {"cloud_data": [{"sample_id": "A", "library_name": "A_1"}, {"sample_id": "A", "library_name": "A_1"}]},
+        {"cloud_data": [{"sample_id": "A", "library_name": "A_1"}, {"sample_id": "A", "library_name": "A_2"}]},
+    )
+
+    assert samplesheet_diff["sections"] == [
+        {
+            "section": "cloud_data",
+            "status": "changed",
+            "added_rows": [{"sample_id": "A", "library_name": "A_2"}],
+            "removed_rows": [{"sample_id": "A", "library_name": "A_1"}],
+            "changed_rows": [],
+        }
+    ]
+
+
+def test_samplesheet_diff_cli(tmp_path, monkeypatch, capsys):
+    from v2_samplesheet_maker.run.samplesheet_diff import run_samplesheet_diff
+
+    samplesheet_dict = generate_samplesheet_dict(4, num_lanes=1)
+    SampleSheet(deepcopy(samplesheet_dict)).to_csv(tmp_path / "SampleSheet.csv")
+    samplesheet_dict["bclconvert_data"][1]["sample_project"] = "NewProject"
+    with open(tmp_path / "SampleSheet.json", "w") as samplesheet_h:
+        json.dump(samplesheet_dict, samplesheet_h)
+
+    monkeypatch.setattr(
+        sys, "argv",
+        ["v2-samplesheet-diff", str(tmp_path / "SampleSheet.csv"), str(tmp_path / "SampleSheet.json")]
+    )
+    with pytest.raises(SystemExit) as exit_info:
+        run_samplesheet_diff()
+    assert exit_info.value.code == 1
+
+    assert capsys.readouterr().out.splitlines() == [
+        "bclconvert_data: changed lane=1 sample_id=SAMPLE000001 sample_project: Project0000 -> NewProject"
+    ]
+
+    # No differences
+    monkeypatch.setattr(
+        sys, "argv",
+        ["v2-samplesheet-diff", str(tmp_path / "SampleSheet.csv"), str(tmp_path / "SampleSheet.csv"), "--format=json"]
+    )
+    run_samplesheet_diff()
+    assert json.loads(capsys.readouterr().out) == {"has_differences": False, "sections": []}
+
+
+def test_diff_per_row_adapter_settings(tmp_path, monkeypatch, capsys):
+    from v2_samplesheet_maker.run.samplesheet_diff import run_samplesheet_diff
+
+    samplesheet_dict = generate_samplesheet_dict(4, num_lanes=1)
+    samplesheet_dict["bclconvert_data"][1]["adapter_stringency"] = 0.9
+    old_samplesheet = SampleSheet(deepcopy(samplesheet_dict))
+    samplesheet_dict["bclconvert_data"][1]["adapter_stringency"] = 0.6
+    new_samplesheet = SampleSheet(deepcopy(samplesheet_dict))
+
+    assert old_samplesheet.diff(new_samplesheet)["has_differences"] is True
+
+    old_samplesheet.to_csv(tmp_path / "SampleSheet.old.csv")
+    new_samplesheet.to_csv(tmp_path / "SampleSheet.new.csv")
+    monkeypatch.setattr(
+        sys, "argv",
+        ["v2-samplesheet-diff", str(tmp_path / "SampleSheet.old.csv"), str(tmp_path / "SampleSheet.new.csv")]
+    )
+    with pytest.raises(SystemExit) as exit_info:
+        run_samplesheet_diff()
+    assert exit_info.value.code == 1
+
+    assert capsys.readouterr().out.splitlines() == [
+        "bclconvert_data: changed lane=1 sample_id=SAMPLE000001 adapter_stringency: 0.9 -> 0.6"
+    ]
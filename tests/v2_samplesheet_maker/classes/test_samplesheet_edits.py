@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+
+"""
+Test editing the data rows of a samplesheet in place
+"""
+
+from copy import deepcopy
+
+import pytest
+
+from v2_samplesheet_maker.classes.samplesheet import SampleSheet
+from v2_samplesheet_maker.utils.samplesheet_generator import generate_samplesheet_dict
+
+
+def get_edited_samplesheet_dict(samplesheet_dict, section_name, edit_function):
+    """
+    Apply an edit to the rows of the input dictionary, to build the expected samplesheet from scratch
+    """
+    samplesheet_dict = deepcopy(samplesheet_dict)
+    samplesheet_dict[section_name] = edit_function(samplesheet_dict[section_name])
+    return samplesheet_dict
+
+
+def assert_same_samplesheet(samplesheet: SampleSheet, samplesheet_dict, engine):
+    expected_samplesheet = SampleSheet(deepcopy(samplesheet_dict), engine=engine)
+    assert samplesheet.to_csv_string() == expected_samplesheet.to_csv_string()
+    assert samplesheet.to_dict() == expected_samplesheet.to_dict()
+
+
+@pytest.mark.parametrize("engine", ["pandas", "columnar"])
+@pytest.mark.parametrize("cloud", [False, True])
+class TestSampleSheetEdits:
+    def test_add_rows(self, engine, cloud):
+        samplesheet_dict = generate_samplesheet_dict(6, num_lanes=2, cloud=cloud)
+        samplesheet = SampleSheet(deepcopy(samplesheet_dict), engine=engine)
+
+        new_rows = [
+            # Sorts into the middle of lane 1
+            {"lane": 1, "sample_id": "SAMPLE000002A", "index": "ACGTACGTAC", "index2": "GTCAGTCAGT", "sample_project": "Project0000"},
+            # A new lane
+            {"lane": 3, "sample_id": "SAMPLE000000", "index": "TTCCGCTCCG", "index2": "CGTGCACGTT"},
+        ]
+        samplesheet.add_rows("bclconvert_data", *deepcopy(new_rows))
+
+        assert_same_samplesheet(
+            samplesheet,
+            get_edited_samplesheet_dict(samplesheet_dict, "bclconvert_data", lambda rows: rows + new_rows),
+            engine
+        )
+
+    def test_remove_rows(self, engine, cloud):
+        samplesheet_dict = generate_samplesheet_dict(6, num_lanes=2, cloud=cloud)
+        samplesheet = SampleSheet(deepcopy(samplesheet_dict), engine=engine)
+
+        # Sample 1 is removed from both lanes (and so from the Cloud_Data), sample 2 only from lane 2
+        removed_rows = samplesheet.remove_rows(
+            "bclconvert_data", (1, "SAMPLE000001"), (2, "SAMPLE000001"), ("2", "SAMPLE000002")
+        )
+        assert len(removed_rows) == 3
+
+        assert_same_samplesheet(
+            samplesheet,
+            get_edited_samplesheet_dict(
+                samplesheet_dict, "bclconvert_data",
+                lambda rows: list(
+                    filter(
+                        lambda row: not (
+                            row["sample_id"] == "SAMPLE000001" or
+                            (row["sample_id"], row["lane"]) == ("SAMPLE000002", 2)
+                        ),
+                        rows
+                    )
+                )
+            ),
+            engine
+        )
+
+        with pytest.raises(ValueError):
+            samplesheet.remove_rows("bclconvert_data", (1, "SAMPLE000001"))
+
+    def test_update_row(self, engine, cloud):
+        samplesheet_dict = generate_samplesheet_dict(6, num_lanes=2, cloud=cloud)
+        samplesheet = SampleSheet(deepcopy(samplesheet_dict), engine=engine)
+
+        samplesheet.update_row("bclconvert_data", (2, "SAMPLE000003"), index="AACCGGTTAA", sample_project=None)
+        # Updating the sample id moves the row
+        samplesheet.update_row("bclconvert_data", (1, "SAMPLE000004"), sample_id="SAMPLE000000B")
+
+        def edit_rows(rows):
+            for row in rows:
+                if (row["lane"], row["sample_id"]) == (2, "SAMPLE000003"):
+                    row.update({"index": "AACCGGTTAA", "sample_project": None})
+                if (row["lane"], row["sample_id"]) == (1, "SAMPLE000004"):
+                    row.update({"sample_id": "SAMPLE000000B"})
+            return rows
+
+        assert_same_samplesheet(
+            samplesheet,
+            get_edited_samplesheet_dict(samplesheet_dict, "bclconvert_data", edit_rows),
+            engine
+        )
+
+        with pytest.raises(ValueError):
+            samplesheet.update_row("bclconvert_data", (1, "SAMPLE999999"), index="AACCGGTTAA")
+
+
+@pytest.mark.parametrize("engine", ["pandas", "columnar"])
+def test_edit_cloud_tso500s_rows(engine):
+    samplesheet_dict = generate_samplesheet_dict(6, num_lanes=1, tso500s=True, cloud=True)
+    samplesheet = SampleSheet(deepcopy(samplesheet_dict), engine=engine)
+
+    samplesheet.remove_rows("cloud_tso500s_data", "SAMPLE000002")
+    samplesheet.update_row("cloud_tso500s_data", "SAMPLE000004", sample_type="RNA")
+
+    def edit_rows(rows):
+        rows = list(filter(lambda row: row["sample_id"] != "SAMPLE000002", rows))
+        for row in rows:
+            if row["sample_id"] == "SAMPLE000004":
+                row["sample_type"] = "RNA"
+        return rows
+
+    assert_same_samplesheet(
+        samplesheet,
+        get_edited_samplesheet_dict(samplesheet_dict, "cloud_tso500s_data", edit_rows),
+        engine
+    )
+
+
+def test_edit_missing_section():
+    samplesheet = SampleSheet(generate_samplesheet_dict(2))
+
+    with pytest.raises(ValueError):
+        samplesheet.add_rows("tso500s_data", {"sample_id": "SAMPLE1"})
+
+    # Invalid rows are rejected before the section is changed
+    with pytest.raises(ValueError):
+        samplesheet.add_rows("bclconvert_data", {"lane": "not-a-lane", "sample_id": "SAMPLE1"})
+    assert len(samplesheet.bclconvert_data_section.data_rows) == 2
+
+
+@pytest.mark.parametrize("engine", ["pandas", "columnar"])
+def test_edits_keep_the_row_key_index(engine):
+    samplesheet = SampleSheet(generate_samplesheet_dict(6, num_lanes=2, cloud=True), engine=engine)
+    data_section = samplesheet.bclconvert_data_section
+
+    samplesheet.add_rows("bclconvert_data", {"lane": 3, "sample_id": "SAMPLE000000", "index": "TTCCGCTCCG", "index2": "CGTGCACGTT"})
+    samplesheet.update_row("bclconvert_data", (1, "SAMPLE000004"), sample_id="SAMPLE000000B")
+    samplesheet.remove_rows("bclconvert_data", (2, "SAMPLE000001"))
+    samplesheet.update_row("bclconvert_data", (2, "SAMPLE000003"), lane=3)
+
+    for section_obj in [data_section, samplesheet.cloud_data_section]:
+        row_key_positions = section_obj.get_row_key_positions()
+        # Rebuild the index from scratch
+        section_obj._row_key_positions = None
+        assert row_key_positions == section_obj.get_row_key_positions()
+
+    assert data_section.find_row_positions((3, "SAMPLE000003")) == [8]
+    assert data_section.find_row_positions(("2", "SAMPLE000003")) == []
+    # Edits do not build the section dataframes
+    assert data_section._section_df is None
+    assert samplesheet.cloud_data_section._section_df is None
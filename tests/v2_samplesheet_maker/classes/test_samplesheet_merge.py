@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+
+"""
+Test merging samplesheets
+"""
+
+import json
+import sys
+from copy import deepcopy
+from io import StringIO
+
+import pytest
+
+from v2_samplesheet_maker.classes.samplesheet import SampleSheet
+from v2_samplesheet_maker.functions.samplesheet_merge import merge_samplesheets, samplesheet_merge
+from v2_samplesheet_maker.utils.samplesheet_generator import generate_samplesheet_dict
+
+
+def get_fragment(samplesheet_dict, sample_filter):
+    """
+    Keep the data rows of the samples that pass the filter
+    """
+    fragment_dict = deepcopy(samplesheet_dict)
+    for section_name, section_values in fragment_dict.items():
+        if isinstance(section_values, list):
+            fragment_dict[section_name] = list(filter(lambda row: sample_filter(row["sample_id"]), section_values))
+    return fragment_dict
+
+
+@pytest.fixture
+def samplesheet_dict():
+    return SampleSheet(generate_samplesheet_dict(8, num_lanes=2, tso500s=True, cloud=True)).to_dict()
+
+
+def test_merge_fragments(samplesheet_dict):
+    even_fragment = get_fragment(samplesheet_dict, lambda sample_id: int(sample_id[-1]) % 2 == 0)
+    odd_fragment = get_fragment(samplesheet_dict, lambda sample_id: int(sample_id[-1]) % 2 == 1)
+
+    # The odd samples are read from a csv, the even fragment is repeated
+    merged_dict = merge_samplesheets([
+        even_fragment,
+        StringIO(SampleSheet(deepcopy(odd_fragment)).to_csv_string()),
+        even_fragment,
+    ])
+
+    assert len(merged_dict["bclconvert_data"]) == 16
+    assert SampleSheet(merged_dict).diff(samplesheet_dict) == {"has_differences": False, "sections": []}
+
+
+@pytest.mark.parametrize("engine", ["pandas", "columnar"])
+def test_merge_with_rendered_csv(engine):
+    # The kit names of the json rows generate the Cloud_Data section of the csv
+    with open("examples/inputs/novaseq_x_demo.json", "r") as samplesheet_h:
+        samplesheet_dict = json.load(samplesheet_h)
+    # The pandas engine writes a column with missing values as floats, i.e 1.0
+    samplesheet_dict["bclconvert_data"][0]["barcode_mismatches_index_1"] = 1
+
+    samplesheet_csv = SampleSheet(deepcopy(samplesheet_dict), engine=engine).to_csv_string()
+    merged_samplesheet = SampleSheet(
+        merge_samplesheets([deepcopy(samplesheet_dict), StringIO(samplesheet_csv)]),
+        engine=engine
+    )
+
+    assert merged_samplesheet.to_csv_string() == samplesheet_csv
+
+
+def test_merge_keeps_per_row_adapter_settings():
+    samplesheet_dict = generate_samplesheet_dict(4, num_lanes=1, cloud=True)
+    samplesheet_dict["bclconvert_data"][0].update({"adapter_behavior": "mask", "adapter_stringency": 0.6})
+    samplesheet = SampleSheet(deepcopy(samplesheet_dict))
+
+    merged_samplesheet = SampleSheet.merge(samplesheet)
+    assert "AdapterStringency" in merged_samplesheet.to_csv_string()
+    assert merged_samplesheet.to_csv_string() == samplesheet.to_csv_string()
+    assert SampleSheet(merge_samplesheets([samplesheet])).to_csv_string() == samplesheet.to_csv_string()
+
+
+def test_merge_analysis_urns():
+    merged_dict = merge_samplesheets([
+        {"cloud_settings": {"cloud_workflow": "ica_workflow_1", "analysis_urns": {"BCLConvert_Pipeline": "urn:ilmn:ica:pipeline:1"}}},
+        {"cloud_settings": {"cloud_workflow": "ica_workflow_1", "analysis_urns": {"Cloud_TSO500S_Pipeline": "urn:ilmn:ica:pipeline:2"}}},
+        {"cloud_settings": {"generated_version": "0.0.0", "analysis_urns": {"BCLConvert_Pipeline": "urn:ilmn:ica:pipeline:1"}}},
+    ])
+
+    assert merged_dict == {
+        "cloud_settings": {
+            "cloud_workflow": "ica_workflow_1",
+            "analysis_urns": {
+                "BCLConvert_Pipeline": "urn:ilmn:ica:pipeline:1",
+                "Cloud_TSO500S_Pipeline": "urn:ilmn:ica:pipeline:2",
+            },
+            "generated_version": "0.0.0",
+        }
+    }
+
+
+def test_merge_conflicts(samplesheet_dict):
+    # Different settings
+    conflicting_settings_dict = deepcopy(samplesheet_dict)
+    conflicting_settings_dict["bclconvert_settings"]["override_cycles"] = "Y151;I8N2;I8N2;Y151"
+    with pytest.raises(ValueError):
+        merge_samplesheets([samplesheet_dict, conflicting_settings_dict])
+
+    # Different urns
+    conflicting_urn_dict = deepcopy(samplesheet_dict)
+    conflicting_urn_dict["cloud_settings"]["analysis_urns"] = {"BCLConvert_Pipeline": "urn:ilmn:ica:pipeline:other"}
+    with pytest.raises(ValueError):
+        merge_samplesheets([{"cloud_settings": {"analysis_urns": {"BCLConvert_Pipeline": "urn:ilmn:ica:pipeline:1"}}}, conflicting_urn_dict])
+
+    # A sample in the same lane of two samplesheets with a different index
+    conflicting_row_dict = get_fragment(samplesheet_dict, lambda sample_id: sample_id == "SAMPLE000001")
+    conflicting_row_dict["bclconvert_data"][0]["index"] = "AACCGGTTAA"
+    with pytest.raises(ValueError):
+        merge_samplesheets([samplesheet_dict, conflicting_row_dict])
+
+    # A sample may have several rows (i.e several indexes) within a samplesheet
+    merged_dict = merge_samplesheets([
+        {"bclconvert_data": [{"lane": 1, "sample_id": "SAMPLE1", "index": "AAAAAAAA"}, {"lane": 1, "sample_id": "SAMPLE1", "index": "CCCCCCCC"}]},
+        {"bclconvert_data": [{"lane": "1", "sample_id": "SAMPLE1", "index": "CCCCCCCC"}, {"lane": 2, "sample_id": "SAMPLE1", "index": "GGGGGGGG"}]},
+    ])
+    assert len(merged_dict["bclconvert_data"]) == 3
+
+
+def test_merge_clashing_sections(samplesheet_dict):
+    tso500s_dict = {
+        "tso500s_settings": {"adapter_read_1": "AGATCGGAAGAGCACACGTCTGAACTCCAGTCA"},
+    }
+    with pytest.raises(ValueError):
+        merge_samplesheets([samplesheet_dict, tso500s_dict])
+
+
+def test_samplesheet_merge_cli(samplesheet_dict, tmp_path, monkeypatch):
+    from v2_samplesheet_maker.run.samplesheet_merge import run_samplesheet_merge
+
+    with open(tmp_path / "even.json", "w") as even_h:
+        json.dump(get_fragment(samplesheet_dict, lambda sample_id: int(sample_id[-1]) % 2 == 0), even_h)
+    SampleSheet(
+        get_fragment(samplesheet_dict, lambda sample_id: int(sample_id[-1]) % 2 == 1)
+    ).to_csv(tmp_path / "odd.csv")
+
+    monkeypatch.setattr(
+        sys, "argv",
+        ["v2-samplesheet-merge", str(tmp_path / "merged.json"), str(tmp_path / "even.json"), str(tmp_path / "odd.csv")]
+    )
+    run_samplesheet_merge()
+
+    with open(tmp_path / "merged.json") as merged_h:
+        assert SampleSheet(json.load(merged_h)).diff(samplesheet_dict)["has_differences"] is False
+
+    # Write out as csv
+    samplesheet_merge([tmp_path / "merged.json"], output_path=tmp_path / "merged.csv")
+    assert (
+        SampleSheet.read_from_samplesheet_csv(tmp_path / "merged.csv").to_csv_string() ==
+        SampleSheet.read_from_samplesheet_csv(StringIO(SampleSheet(deepcopy(samplesheet_dict)).to_csv_string())).to_csv_string()
+    )
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+
+"""
+Test splitting a samplesheet into shards
+"""
+
+import sys
+from copy import deepcopy
+from io import StringIO
+
+import pytest
+
+from v2_samplesheet_maker.classes.samplesheet import SampleSheet
+from v2_samplesheet_maker.classes.samplesheet_split import get_shard_name
+from v2_samplesheet_maker.functions.samplesheet_merge import merge_samplesheets
+from v2_samplesheet_maker.utils.samplesheet_generator import generate_samplesheet_dict
+
+
+@pytest.mark.parametrize("engine", ["pandas", "columnar"])
+def test_split_by_lane(engine):
+    samplesheet_dict = generate_samplesheet_dict(6, num_lanes=3, tso500s=True, cloud=True)
+    samplesheet = SampleSheet(deepcopy(samplesheet_dict), engine=engine)
+
+    shards = samplesheet.split("lane")
+    assert list(shards.keys()) == [1, 2, 3]
+
+    for lane, shard in shards.items():
+        expected_samplesheet_dict = deepcopy(samplesheet_dict)
+        expected_samplesheet_dict["bclconvert_data"] = list(
+            filter(lambda row: row["lane"] == lane, expected_samplesheet_dict["bclconvert_data"])
+        )
+        assert shard.to_csv_string() == SampleSheet(expected_samplesheet_dict, engine=engine).to_csv_string()
+
+        # The settings sections are shared, not validated again
+        assert shard.header_section is samplesheet.header_section
+        assert shard.tso500s_settings_section is samplesheet.tso500s_settings_section
+
+    # The generated Cloud_Data section of a shard is kept in sync as its rows are edited
+    shards[1].remove_rows("cloud_tso500s_data", "SAMPLE000001")
+    assert "SAMPLE000001" not in map(lambda row: row["sample_id"], shards[1].to_dict()["cloud_data"])
+    assert len(samplesheet.tso500s_data_section.data_rows) == 6
+
+
+@pytest.mark.parametrize("engine", ["pandas", "columnar"])
+def test_split_merge_diff_round_trip(engine):
+    samplesheet_dict = generate_samplesheet_dict(6, num_lanes=2, cloud=True)
+    # Per-row adapter settings are left out of the json dictionary of a row
+    samplesheet_dict["bclconvert_data"][1].update({"adapter_behavior": "mask", "adapter_stringency": 0.6})
+    samplesheet_dict["bclconvert_data"][8].update({"adapter_stringency": 0.75})
+    samplesheet = SampleSheet(deepcopy(samplesheet_dict), engine=engine)
+
+    shards = samplesheet.split("lane")
+
+    # Each shard keeps its per-row settings when rebuilt from its csv values
+    for shard in shards.values():
+        assert SampleSheet(shard.to_record_dict(), engine=engine).to_csv_string() == shard.to_csv_string()
+
+    # Merge the shard objects, and the shards read back in from csv
+    for merged_samplesheet in [
+        SampleSheet.merge(*shards.values(), engine=engine),
+        SampleSheet(
+            merge_samplesheets(map(lambda shard: StringIO(shard.to_csv_string()), shards.values())),
+            engine=engine
+        ),
+    ]:
+        assert merged_samplesheet.diff(samplesheet) == {"has_differences": False, "sections": []}
+        assert merged_samplesheet.to_csv_string() == samplesheet.to_csv_string()
+
+
+def test_split_by_sample_project():
+    samplesheet_dict = generate_samplesheet_dict(6, num_lanes=1, tso500s=True)
+    for row in samplesheet_dict["bclconvert_data"]:
+        row["sample_project"] = "ProjectA" if row["sample_id"] in ["SAMPLE000000", "SAMPLE000003"] else None
+
+    shards = SampleSheet(samplesheet_dict).split("sample_project")
+
+    assert list(shards.keys()) == ["ProjectA", None]
+    assert list(map(lambda row: row["sample_id"], shards["ProjectA"].to_dict()["tso500s_data"])) == [
+        "SAMPLE000000", "SAMPLE000003"
+    ]
+    assert len(shards[None].to_dict()["bclconvert_data"]) == 4
+
+
+def test_split_by_override_cycles_and_index_length():
+    samplesheet_dict = generate_samplesheet_dict(4, num_lanes=1)
+    samplesheet_dict["bclconvert_data"][0].update({"index": "ACGTACGT", "index2": "TGCATGCA", "override_cycles": "Y151;I8N2;I8N2;Y151"})
+
+    samplesheet = SampleSheet(samplesheet_dict)
+
+    override_cycles_shards = samplesheet.split("override_cycles")
+    assert list(override_cycles_shards.keys()) == ["Y151;I8N2;I8N2;Y151", "Y151;I10;I10;Y151"]
+    assert list(map(get_shard_name, override_cycles_shards.keys())) == ["Y151-I8N2-I8N2-Y151", "Y151-I10-I10-Y151"]
+
+    index_length_shards = samplesheet.split("index_length")
+    assert list(index_length_shards.keys()) == [(8, 8), (10, 10)]
+    assert len(index_length_shards[(10, 10)].bclconvert_data_section.data_rows) == 3
+
+    with pytest.raises(ValueError):
+        samplesheet.split("sample_name")
+
+
+def test_samplesheet_split_cli(tmp_path, monkeypatch):
+    from v2_samplesheet_maker.run.samplesheet_split import run_samplesheet_split
+
+    samplesheet = SampleSheet(generate_samplesheet_dict(4, num_lanes=2))
+    samplesheet.to_csv(tmp_path / "SampleSheet.csv")
+    (tmp_path / "shards").mkdir()
+
+    monkeypatch.setattr(
+        sys, "argv",
+        ["v2-samplesheet-split", str(tmp_path / "SampleSheet.csv"), str(tmp_path / "shards"), "--by=lane", "--format=json"]
+    )
+    run_samplesheet_split()
+
+    assert sorted(map(lambda path_iter: path_iter.name, (tmp_path / "shards").iterdir())) == [
+        "SampleSheet.lane_1.json", "SampleSheet.lane_2.json"
+    ]
@@ -0,0 +1,113 @@
+from importlib.metadata import EntryPoint
+from io import StringIO
+from textwrap import dedent
+
+import pytest
+
+from v2_samplesheet_maker.classes import samplesheet as samplesheet_module
+from v2_samplesheet_maker.classes.samplesheet import SampleSheet, get_section_type
+from v2_samplesheet_maker.classes.super_sections import KVSection, SECTION_REGISTRY
+from v2_samplesheet_maker.section_classes.cloud_sections import CloudSettingsSection
+from v2_samplesheet_maker.section_classes.tso500s_sections import TSO500SSettingsSection
+from v2_samplesheet_maker.section_classes.tso500l_sections import (
+    TSO500LSettingsSection, CloudTSO500LSettingsSection
+)
+
+PLUGIN_MODULE = dedent(
+    """
+    from typing import Optional
+    from pydantic import BaseModel, ConfigDict
+
+    from v2_samplesheet_maker.classes.super_sections import KVSection
+
+
+    class DragenGermlineSettingsSectionModel(BaseModel):
+        software_version: Optional[str]
+        urn: Optional[str] = None
+
+        model_config = ConfigDict(from_attributes=True)
+
+        def to_dict(self):
+            return {"SoftwareVersion": self.software_version}
+
+        def to_json(self):
+            return {"software_version": self.software_version}
+
+
+    class DragenGermlineSettingsSection(KVSection):
+        _model = DragenGermlineSettingsSectionModel
+        _class_header = "DragenGermline_Settings"
+
+
+    class CloudDragenGermlineSettingsSection(DragenGermlineSettingsSection):
+        _is_cloud = True
+    """
+)
+
+
+@pytest.fixture
+def clean_registry():
+    registry_copy = dict(SECTION_REGISTRY)
+    loaded_entry_points_copy = set(samplesheet_module._loaded_section_entry_points)
+    yield
+    SECTION_REGISTRY.clear()
+    SECTION_REGISTRY.update(registry_copy)
+    samplesheet_module._loaded_section_entry_points.clear()
+    samplesheet_module._loaded_section_entry_points.update(loaded_entry_points_copy)
+
+
+@pytest.mark.parametrize(
+    "section_name,section_type",
+    [
+        ("TSO500L_Settings", TSO500LSettingsSection),
+        ("Cloud_TSO500L_Settings", CloudTSO500LSettingsSection),
+        ("cloud_tso500l_settings", CloudTSO500LSettingsSection),
+        # As read from a csv header
+        ("tso500_s_settings", TSO500SSettingsSection),
+        ("Cloud_Settings", CloudSettingsSection),
+    ]
+)
+def test_get_section_type(section_name, section_type):
+    assert get_section_type(section_name) is section_type
+
+
+def test_unknown_section_name():
+    with pytest.raises(ValueError):
+        get_section_type("NotASection_Settings")
+
+
+def test_import_rank_reads_cloud_sections_last():
+    assert CloudSettingsSection._import_rank > CloudTSO500LSettingsSection._import_rank
+    assert CloudSettingsSection._section_rank < CloudTSO500LSettingsSection._section_rank
+
+
+def test_duplicate_section_header_raises(clean_registry):
+    with pytest.raises(ValueError):
+        class DuplicateHeaderSection(KVSection):
+            _class_header = "Header"
+
+
+def test_plugin_section_loaded_from_entry_point(clean_registry, tmp_path, monkeypatch):
+    (tmp_path / "dragen_germline_plugin.py").write_text(PLUGIN_MODULE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    entry_point = EntryPoint(
+        name="DragenGermline_Settings",
+        value="dragen_germline_plugin",
+        group="v2_samplesheet_maker.sections"
+    )
+
+    def get_entry_points(group):
+        return [entry_point] if group == "v2_samplesheet_maker.sections" else []
+
+    monkeypatch.setattr("importlib.metadata.entry_points", get_entry_points)
+
+    samplesheet = SampleSheet.read_from_samplesheet_csv(
+        StringIO(
+            "[Header]\nFileFormatVersion,2\n\n"
+            "[Cloud_DragenGermline_Settings]\nSoftwareVersion,4.2.4\n"
+        )
+    )
+
+    assert samplesheet.section_list == ["header_section", "dragengermline_settings_section"]
+    assert samplesheet.to_dict()["cloud_dragengermline_settings"] == {"software_version": "4.2.4"}
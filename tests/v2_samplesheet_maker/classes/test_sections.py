@@ -16,6 +16,14 @@ from v2_samplesheet_maker.section_classes.bcl_convert_sections import (
     BCLConvertDataSection,
 )
 
+from v2_samplesheet_maker.section_classes.cloud_sections import (
+    CloudDataSection
+)
+
+from v2_samplesheet_maker.models.bcl_convert_sections import BCLConvertSettingsSectionModel
+from v2_samplesheet_maker.classes.super_sections import set_dataframe_engine
+from v2_samplesheet_maker.classes.columnar_frame import ColumnarFrame
+
 
 class TestHeaderSection:
     valid_header_section_dict = {
@@ -140,6 +148,24 @@ class TestBCLConvertSettingsSection:
         except (TypeError, ValidationError):
             assert True
 
+    def test_bclconvert_settings_section_validates_once(self, monkeypatch):
+        model_validate = BCLConvertSettingsSectionModel.model_validate
+        validate_calls = []
+
+        def counting_model_validate(*args, **kwargs):
+            validate_calls.append(args)
+            return model_validate(*args, **kwargs)
+
+        monkeypatch.setattr(BCLConvertSettingsSectionModel, "model_validate", counting_model_validate)
+
+        section = BCLConvertSettingsSection(**self.valid_bclconvert_settings_section_dict)
+        section.to_string()
+        section.to_json()
+
+        assert len(validate_calls) == 1
+        assert section.section_dict["AdapterBehavior"] == "trim"
+        assert section.to_json_dict()["adapter_behavior"] == "trim"
+
 
 class TestBCLConvertDataRow:
     valid_bclconvert_data_row = {
@@ -203,6 +229,20 @@ class TestBCLConvertDataRow:
         except (TypeError, ValidationError):
             assert True
 
+    def test_bclconvert_data_row_values(self):
+        data_row = BCLConvertDataRow(**self.valid_bclconvert_data_row_with_settings)
+
+        # A row only keeps its validated values (in its only slot), the record and json dictionary are derived from them
+        assert not hasattr(data_row, "__dict__")
+        assert data_row.adapter_behavior.value == "trim"
+        assert data_row.adapter_stringency == 2.0
+        assert data_row.to_record()["AdapterBehavior"] == "trim"
+        assert data_row.to_json_dict()["override_cycles"] == "Y151;Y10;Y8N2;Y151"
+        assert "sample_name" not in data_row.to_json_dict()
+
+        with pytest.raises(AttributeError):
+            data_row.lane = 2
+
 
 class TestBCLConvertDataSection:
     # Check valid bclconvert data
@@ -259,3 +299,74 @@ class TestBCLConvertDataSection:
         # Get data with invalid settings
         with pytest.warns(UserWarning):
             BCLConvertDataSection(*self.invalid_bclconvert_data_with_settings)
+
+    def test_bclconvert_data_section_df_is_built_on_first_use(self):
+        bclconvert_data_section = BCLConvertDataSection(*self.valid_bclconvert_data)
+
+        # The json output does not need the section dataframe
+        assert len(bclconvert_data_section.to_json_list()) == 2
+        assert bclconvert_data_section._section_df is None
+
+        assert list(bclconvert_data_section.section_df["Sample_ID"]) == ["MyFirstSample", "MySecondSample"]
+        assert bclconvert_data_section._section_df is not None
+
+
+class TestDataFrameSectionEngines:
+    # Rows with missing lanes and per-sample settings to exercise column pruning and dtype coercion
+    bclconvert_data = [
+        {
+          "sample_id": "MySecondSample",
+          "lane": 2,
+          "index": "GGGGGGGGGG",
+          "index2": "TTTTTTTT",
+          "adapter_stringency": 0.9
+        },
+        {
+          "sample_id": "MyFirstSample",
+          "index": "AAAAAAAAAA",
+          "sample_project": "Sample,Project",
+          "barcode_mismatches_index_1": 1
+        },
+        {
+          "sample_id": "MyThirdSample",
+          "lane": 1,
+          "index": "CCCCCCCCCC",
+          "index2": "GGGGGGGG",
+        }
+    ]
+
+    cloud_data = [
+        {
+            "sample_id": "MySecondSample",
+            "library_name": "MySecondSample_GGGGGGGGGG_TTTTTTTT",
+            "library_prep_kit_name": "TruSeqDNAPCRFree"
+        },
+        {
+            "sample_id": "MyFirstSample",
+            "library_name": "MyFirstSample_AAAAAAAAAA",
+        },
+        {
+            "sample_id": "MySecondSample",
+            "library_name": "MySecondSample_GGGGGGGGGG_TTTTTTTT",
+            "library_prep_kit_name": "TruSeqDNAPCRFree"
+        }
+    ]
+
+    def test_bclconvert_data_section_engines_match(self):
+        assert (
+            BCLConvertDataSection(*self.bclconvert_data, engine="pandas").to_string() ==
+            BCLConvertDataSection(*self.bclconvert_data, engine="columnar").to_string()
+        )
+
+    def test_cloud_data_section_engines_match(self):
+        assert (
+            CloudDataSection(*self.cloud_data, engine="pandas").to_string() ==
+            CloudDataSection(*self.cloud_data, engine="columnar").to_string()
+        )
+
+    def test_set_dataframe_engine(self):
+        set_dataframe_engine("columnar")
+        try:
+            assert isinstance(BCLConvertDataSection(*self.bclconvert_data).section_df, ColumnarFrame)
+        finally:
+            set_dataframe_engine("pandas")
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+import asyncio
+import json
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from io import StringIO
+from pathlib import Path
+
+import pytest
+
+from v2_samplesheet_maker.functions.async_functions import (
+    convert_many,
+    run_info_xml_reader_async,
+    run_info_xml_writer_async,
+    v2_samplesheet_reader_async,
+    v2_samplesheet_to_run_info_xml_async,
+    v2_samplesheet_writer_async,
+)
+from v2_samplesheet_maker.functions.run_info_reader import run_info_xml_reader
+from v2_samplesheet_maker.functions.run_info_writer import run_info_xml_writer
+from v2_samplesheet_maker.functions.v2_samplesheet_reader import v2_samplesheet_reader
+from v2_samplesheet_maker.functions.v2_samplesheet_to_run_info import samplesheet_csv_to_run_info_xml
+from v2_samplesheet_maker.functions.v2_samplesheet_writer import v2_samplesheet_writer
+
+RUN_INFO_DICT = {
+    "Run": {
+        "@Id": "240229_A01052_0184_AHNVH5DMXY",
+        "Reads": {
+            "Read": [
+                {"@Number": "1", "@NumCycles": "151", "@IsIndexedRead": "N"},
+                {"@Number": "2", "@NumCycles": "8", "@IsIndexedRead": "Y"},
+            ]
+        }
+    }
+}
+
+
+def test_async_functions_match_sync_functions(tmp_path):
+    json_input_path = Path("examples/json_inputs/standard-sheet-with-settings.json")
+    csv_input_path = Path("examples/csv_outputs/standard-sheet-with-settings.csv")
+
+    async def run_conversions():
+        return await asyncio.gather(
+            v2_samplesheet_writer_async(json_input_path),
+            v2_samplesheet_writer_async(json_input_path, tmp_path / "SampleSheet.csv"),
+            v2_samplesheet_reader_async(csv_input_path),
+            v2_samplesheet_reader_async(csv_input_path, tmp_path / "SampleSheet.json"),
+            run_info_xml_writer_async(RUN_INFO_DICT),
+            run_info_xml_writer_async(RUN_INFO_DICT, tmp_path / "RunInfo.xml"),
+            v2_samplesheet_to_run_info_xml_async(csv_input_path, RUN_INFO_DICT["Run"]["@Id"]),
+        )
+
+    csv_h, _, samplesheet_dict, _, run_info_xml_h, _, samplesheet_run_info_xml_h = asyncio.run(run_conversions())
+
+    assert csv_h.getvalue() == v2_samplesheet_writer(json_input_path).getvalue()
+    assert samplesheet_dict == v2_samplesheet_reader(csv_input_path)
+    assert run_info_xml_h.getvalue() == run_info_xml_writer(RUN_INFO_DICT).getvalue()
+    assert (
+        samplesheet_run_info_xml_h.getvalue() ==
+        samplesheet_csv_to_run_info_xml(csv_input_path, run_id=RUN_INFO_DICT["Run"]["@Id"]).getvalue()
+    )
+
+    # Written outputs match the outputs of the sync functions
+    v2_samplesheet_reader(csv_input_path, tmp_path / "SampleSheet.sync.json")
+    run_info_xml_writer(RUN_INFO_DICT, tmp_path / "RunInfo.sync.xml")
+    assert (tmp_path / "SampleSheet.csv").read_text() == csv_h.getvalue()
+    assert (tmp_path / "SampleSheet.json").read_text() == (tmp_path / "SampleSheet.sync.json").read_text()
+    assert (tmp_path / "RunInfo.xml").read_text() == (tmp_path / "RunInfo.sync.xml").read_text()
+
+    # Read the RunInfo.xml back in
+    assert (
+        asyncio.run(run_info_xml_reader_async(tmp_path / "RunInfo.xml")) ==
+        run_info_xml_reader(StringIO((tmp_path / "RunInfo.xml").read_text()))
+    )
+
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(v2_samplesheet_reader_async(tmp_path / "missing.csv"))
+
+
+def test_convert_many(tmp_path):
+    shutil.copy("examples/json_inputs/standard-sheet-with-settings.json", tmp_path / "good.json")
+    (tmp_path / "bad.json").write_text("{not json")
+    (tmp_path / "RunInfo.json").write_text(json.dumps(RUN_INFO_DICT))
+
+    conversions = [
+        ("v2-samplesheet-maker", tmp_path / "good.json", tmp_path / "outputs" / "good.csv"),
+        ("v2-samplesheet-maker", tmp_path / "bad.json", tmp_path / "outputs" / "bad.csv"),
+        ("run-info-xml-writer", tmp_path / "RunInfo.json", tmp_path / "outputs" / "RunInfo.xml"),
+        ("v2-samplesheet-to-json", tmp_path / "outputs" / "missing.csv", tmp_path / "outputs" / "missing.json"),
+        (
+            "v2-samplesheet-to-run-info-xml", Path("examples/csv_outputs/standard-sheet-with-settings.csv"),
+            tmp_path / "outputs" / "SampleSheet.RunInfo.xml", RUN_INFO_DICT["Run"]["@Id"]
+        ),
+        (
+            "v2-samplesheet-to-run-info-xml", Path("examples/csv_outputs/standard-sheet-with-settings.csv"),
+            tmp_path / "outputs" / "no_run_id.RunInfo.xml"
+        ),
+    ]
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        results = asyncio.run(convert_many(conversions, max_concurrency=2, executor=executor))
+
+    assert list(map(lambda result_iter: result_iter["success"], results)) == [True, False, True, False, True, False]
+    assert results[1]["error"].startswith("ValueError")
+    assert results[3]["error"].startswith("FileNotFoundError")
+    assert results[5]["error"].startswith("ValueError")
+    assert RUN_INFO_DICT["Run"]["@Id"] in (tmp_path / "outputs" / "SampleSheet.RunInfo.xml").read_text()
+    assert (tmp_path / "outputs" / "good.csv").read_text() == v2_samplesheet_writer(tmp_path / "good.json").getvalue()
+
+    with pytest.raises(ValueError):
+        asyncio.run(convert_many(conversions, max_concurrency=0))
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+from pathlib import Path
+import shutil
+
+from v2_samplesheet_maker.functions.v2_samplesheet_writer import v2_samplesheet_writer
+from v2_samplesheet_maker.functions.batch_converter import (
+    batch_convert,
+    get_batch_summary,
+    get_conversion_pairs_from_input_dir,
+    get_conversion_pairs_from_paths,
+    get_conversion_pairs_from_manifest
+)
+
+
+class TestBatchConverter:
+    def test_batch_convert_continues_after_failure(self, tmp_path):
+        input_dir = tmp_path / "inputs"
+        output_dir = tmp_path / "outputs"
+        input_dir.mkdir()
+        output_dir.mkdir()
+
+        shutil.copy("examples/json_inputs/standard-sheet-with-settings.json", input_dir / "good.json")
+        (input_dir / "bad.json").write_text("{not json")
+
+        conversion_pairs = get_conversion_pairs_from_input_dir("v2-samplesheet-maker", input_dir, output_dir)
+
+        results = batch_convert("v2-samplesheet-maker", conversion_pairs, jobs=2)
+        summary = get_batch_summary(results)
+
+        assert [Path(result_iter["input"]).name for result_iter in results] == ["bad.json", "good.json"]
+        assert summary["succeeded"] == 1
+        assert summary["failed"] == 1
+        assert results[0]["error"].startswith("JSONDecodeError")
+        assert (output_dir / "good.csv").read_text() == v2_samplesheet_writer(input_dir / "good.json").read()
+
+    def test_get_conversion_pairs_from_manifest(self, tmp_path):
+        manifest_path = tmp_path / "manifest.tsv"
+        manifest_path.write_text(
+            "# input\toutput\n"
+            "SampleSheet.csv\tSampleSheet.json\n"
+            "\n"
+            "other/SampleSheet.csv,other/SampleSheet.json\n"
+            "SampleSheet.csv\tRunInfo.xml\t240229_A01052_0184_AHNVH5DMXY\n"
+        )
+
+        assert get_conversion_pairs_from_manifest(manifest_path) == [
+            (tmp_path / "SampleSheet.csv", tmp_path / "SampleSheet.json"),
+            (tmp_path / "other" / "SampleSheet.csv", tmp_path / "other" / "SampleSheet.json"),
+            (tmp_path / "SampleSheet.csv", tmp_path / "RunInfo.xml", "240229_A01052_0184_AHNVH5DMXY"),
+        ]
+
+    def test_batch_convert_samplesheet_to_run_info_xml(self, tmp_path):
+        from v2_samplesheet_maker.functions.v2_samplesheet_to_run_info import samplesheet_csv_to_run_info_xml
+
+        input_path = Path("examples/csv_outputs/standard-sheet-with-settings.csv")
+        conversion_pairs = [
+            (input_path, tmp_path / "run_a" / "RunInfo.xml", "240229_A01052_0184_AHNVH5DMXY"),
+            (input_path, tmp_path / "run_b" / "RunInfo.xml", "240301_A01052_0185_BHNVH5DMXY"),
+            # No run id
+            (input_path, tmp_path / "run_c" / "RunInfo.xml"),
+        ]
+
+        results = batch_convert("v2-samplesheet-to-run-info-xml", conversion_pairs, jobs=2)
+
+        assert list(map(lambda result_iter: result_iter["success"], results)) == [True, True, False]
+        samplesheet_csv_to_run_info_xml(
+            input_path, run_id="240301_A01052_0185_BHNVH5DMXY", output_path=tmp_path / "RunInfo.sync.xml"
+        )
+        assert (tmp_path / "run_b" / "RunInfo.xml").read_text() == (tmp_path / "RunInfo.sync.xml").read_text()
+
+    def test_get_conversion_pairs_with_shared_stems(self, tmp_path):
+        input_paths = [
+            tmp_path / "runs" / "run_a" / "SampleSheet.csv",
+            tmp_path / "runs" / "run_b" / "SampleSheet.csv",
+        ]
+
+        assert get_conversion_pairs_from_paths("v2-samplesheet-to-json", input_paths, tmp_path / "outputs") == [
+            (input_paths[0], tmp_path / "outputs" / "run_a" / "SampleSheet.json"),
+            (input_paths[1], tmp_path / "outputs" / "run_b" / "SampleSheet.json"),
+        ]
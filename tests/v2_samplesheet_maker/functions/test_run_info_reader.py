@@ -0,0 +1,95 @@
+from io import BytesIO, StringIO
+from pathlib import Path
+
+import pytest
+import xmltodict
+
+from v2_samplesheet_maker.functions.run_info_reader import read_run_info_xml, run_info_xml_reader
+
+RUN_INFO_XML = """<?xml version="1.0" encoding="utf-8"?>
+<RunInfo Version="6">
+	<Run Id="240229_A01052_0184_AHNVH5DMXY" Number="184">
+		<Flowcell>HNVH5DMXY</Flowcell>
+		<Instrument>A01052</Instrument>
+		<Date>2/29/2024 12:27:04 PM</Date>
+		<Reads>
+			<Read Number="1" NumCycles="151" IsIndexedRead="N" IsReverseComplement="N"/>
+			<Read Number="2" NumCycles="8" IsIndexedRead="Y" IsReverseComplement="N"/>
+			<Read Number="3" NumCycles="151" IsIndexedRead="N" IsReverseComplement="N"/>
+		</Reads>
+		<FlowcellLayout LaneCount="2" SurfaceCount="2" SwathCount="6" TileCount="78">
+			<TileSet TileNamingConvention="FourDigit">
+				<Tiles>
+{tiles}
+				</Tiles>
+			</TileSet>
+		</FlowcellLayout>
+		<AlignToPhiX/>
+		<Comment Author="lab">Re-run <Flag/></Comment>
+		<ImageDimensions Width="3200" Height="3607"/>
+		<ImageChannels>
+			<Name>RED</Name>
+			<Name>GREEN</Name>
+		</ImageChannels>
+	</Run>
+</RunInfo>
+""".replace(
+    "{tiles}",
+    "\n".join(f"\t\t\t\t\t<Tile>1_{tile_index}</Tile>" for tile_index in range(1000))
+)
+
+
+def get_expected_run_info(keep_flowcell_layout: bool):
+    run_info_dict = xmltodict.parse(RUN_INFO_XML)
+    if not keep_flowcell_layout:
+        del run_info_dict["RunInfo"]["Run"]["FlowcellLayout"]
+    return run_info_dict
+
+
+@pytest.mark.parametrize("keep_flowcell_layout", [False, True])
+@pytest.mark.parametrize(
+    "get_input",
+    [
+        lambda tmp_path: StringIO(RUN_INFO_XML),
+        lambda tmp_path: BytesIO(RUN_INFO_XML.encode()),
+        lambda tmp_path: (tmp_path / "RunInfo.xml").write_text(RUN_INFO_XML) and tmp_path / "RunInfo.xml",
+    ]
+)
+def test_run_info_xml_reader_matches_xmltodict(keep_flowcell_layout, get_input, tmp_path):
+    assert (
+        run_info_xml_reader(get_input(tmp_path), keep_flowcell_layout=keep_flowcell_layout) ==
+        get_expected_run_info(keep_flowcell_layout)
+    )
+
+
+def test_read_run_info_xml_reads_run_header_and_reads():
+    expected_run = get_expected_run_info(False)["RunInfo"]["Run"]
+
+    assert read_run_info_xml(StringIO(RUN_INFO_XML)) == {
+        "RunInfo": {
+            "@Version": "6",
+            "Run": {
+                "@Id": expected_run["@Id"],
+                "@Number": expected_run["@Number"],
+                "Flowcell": expected_run["Flowcell"],
+                "Instrument": expected_run["Instrument"],
+                "Date": expected_run["Date"],
+                "Reads": expected_run["Reads"],
+            }
+        }
+    }
+
+
+def test_read_run_info_xml_stops_reading_early():
+    # Everything after the Reads is never read, so may as well be truncated
+    truncated_xml = RUN_INFO_XML[:RUN_INFO_XML.index("<TileSet")]
+
+    run_info_dict = read_run_info_xml(StringIO(truncated_xml), elements=["Reads"])
+
+    assert list(run_info_dict["RunInfo"]["Run"].keys()) == ["@Id", "@Number", "Reads"]
+    assert len(run_info_dict["RunInfo"]["Run"]["Reads"]["Read"]) == 3
+
+
+def test_run_info_xml_reader_invalid_input():
+    with pytest.raises(ValueError):
+        run_info_xml_reader(str(Path("RunInfo.xml")))
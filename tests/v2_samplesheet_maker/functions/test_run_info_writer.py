@@ -0,0 +1,88 @@
+from io import BytesIO, StringIO
+
+import xmltodict
+
+from v2_samplesheet_maker.functions.run_info_reader import run_info_xml_reader
+from v2_samplesheet_maker.functions.run_info_writer import run_info_xml_writer
+
+EXPECTED_RUN_INFO_XML = """<?xml version="1.0" encoding="utf-8"?>
+<RunInfo Version="5">
+	<Run Id="240229_A01052_0184_AHNVH5DMXY" Number="184">
+		<Flowcell>HNVH5DMXY</Flowcell>
+		<Instrument>A01052</Instrument>
+		<Date>02/29/2024 12:00:00 AM</Date>
+		<Reads>
+			<Read Number="1" NumCycles="151" IsIndexedRead="N"/>
+			<Read Number="2" NumCycles="8" IsIndexedRead="Y"/>
+		</Reads>
+		<AlignToPhiX/>
+		<ImageDimensions Width="9999" Height="9999"/>
+		<ImageChannels>
+			<Name>RED</Name>
+			<Name>GREEN</Name>
+		</ImageChannels>
+	</Run>
+</RunInfo>
+"""
+
+
+def get_run_info_dict():
+    return {
+        "Run": {
+            "@Id": "240229_A01052_0184_AHNVH5DMXY",
+            "Reads": {
+                "Read": [
+                    {"@Number": "1", "@NumCycles": "151", "@IsIndexedRead": "N"},
+                    {"@Number": "2", "@NumCycles": "8", "@IsIndexedRead": "Y"},
+                ]
+            }
+        }
+    }
+
+
+def test_run_info_xml_writer_layout():
+    # Returned without the final newline
+    assert run_info_xml_writer(get_run_info_dict()).getvalue() + "\n" == EXPECTED_RUN_INFO_XML
+
+
+def test_run_info_xml_writer_to_streams():
+    text_output_h = StringIO()
+    run_info_xml_writer(get_run_info_dict(), text_output_h)
+
+    bytes_output_h = BytesIO()
+    run_info_xml_writer(get_run_info_dict(), bytes_output_h)
+
+    assert text_output_h.getvalue() == EXPECTED_RUN_INFO_XML
+    assert bytes_output_h.getvalue() == EXPECTED_RUN_INFO_XML.encode()
+
+
+def test_run_info_xml_writer_to_path(tmp_path):
+    run_info_xml_writer(get_run_info_dict(), tmp_path / "RunInfo.xml")
+
+    assert (tmp_path / "RunInfo.xml").read_text() == EXPECTED_RUN_INFO_XML
+
+
+def test_run_info_xml_writer_flowcell_layout_round_trip():
+    run_info_dict = get_run_info_dict()
+    run_info_dict["Run"]["FlowcellLayout"] = {
+        "@LaneCount": "8",
+        "TileSet": {
+            "@TileNamingConvention": "FiveDigit",
+            "Tiles": {
+                "Tile": [f"{lane}_{tile}" for lane in range(1, 9) for tile in range(1101, 1400)]
+            }
+        }
+    }
+    # Values are escaped
+    run_info_dict["Run"]["Comment"] = {"@Author": "\"lab\"", "#text": "A&B <lab>"}
+
+    xml_str = run_info_xml_writer(run_info_dict).getvalue()
+
+    # The FlowcellLayout is written after the Reads
+    assert xml_str.index("<Reads>") < xml_str.index("<FlowcellLayout") < xml_str.index("<AlignToPhiX/>")
+    assert run_info_xml_reader(StringIO(xml_str), keep_flowcell_layout=True) == xmltodict.parse(xml_str)
+    assert (
+        run_info_xml_reader(StringIO(xml_str), keep_flowcell_layout=True)["RunInfo"]["Run"]["FlowcellLayout"] ==
+        run_info_dict["Run"]["FlowcellLayout"]
+    )
+    assert xmltodict.parse(xml_str)["RunInfo"]["Run"]["Comment"] == run_info_dict["Run"]["Comment"]
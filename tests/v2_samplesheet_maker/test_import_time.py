@@ -0,0 +1,53 @@
+import subprocess
+import sys
+
+import pytest
+
+
+def get_imported_modules(module_name: str) -> set:
+    """
+    Import a module in a fresh interpreter and return the names of all loaded modules
+    :param module_name:
+    :return:
+    """
+    return set(
+        subprocess.run(
+            [
+                sys.executable, "-c",
+                f"import sys, {module_name}; print(chr(10).join(sys.modules))"
+            ],
+            capture_output=True, text=True, check=True
+        ).stdout.splitlines()
+    )
+
+
+@pytest.mark.parametrize(
+    "module_name",
+    [
+        "v2_samplesheet_maker.run.run_info_reader",
+        "v2_samplesheet_maker.run.run_info_writer",
+        "v2_samplesheet_maker.run.v2_samplesheet_reader",
+        "v2_samplesheet_maker.run.v2_samplesheet_writer",
+        "v2_samplesheet_maker.run.v2_samplesheet_to_run_info_xml",
+        "v2_samplesheet_maker.run.batch_converter",
+    ]
+)
+def test_entry_points_do_not_import_heavy_dependencies(module_name):
+    imported_modules = get_imported_modules(module_name)
+    for heavy_module in ["pandas", "pydantic", "xmltodict"]:
+        assert heavy_module not in imported_modules
+
+
+def test_samplesheet_does_not_import_pandas():
+    assert "pandas" not in get_imported_modules("v2_samplesheet_maker.classes.samplesheet")
+
+
+def test_import_does_not_configure_root_logger():
+    assert subprocess.run(
+        [
+            sys.executable, "-c",
+            "import logging, v2_samplesheet_maker.run.v2_samplesheet_writer; "
+            "assert not logging.getLogger().handlers"
+        ],
+        capture_output=True
+    ).returncode == 0
@@ -0,0 +1,88 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import StringIO
+from pathlib import Path
+
+import pytest
+
+from v2_samplesheet_maker.classes.samplesheet import SampleSheet
+from v2_samplesheet_maker.functions.v2_samplesheet_reader import v2_samplesheet_reader
+from v2_samplesheet_maker.functions.v2_samplesheet_to_run_info import samplesheet_csv_to_run_info_xml
+from v2_samplesheet_maker.utils.cache import (
+    CACHE_DIR_ENV_VAR,
+    SampleSheetCache,
+    get_samplesheet_cache,
+)
+
+INPUT_CSV = Path("examples/outputs/novaseq_x_demo.csv").absolute()
+
+
+def read_with_cache(cache_dir: str):
+    return v2_samplesheet_reader(INPUT_CSV, cache_dir=Path(cache_dir))
+
+
+def test_cache_is_opt_in(monkeypatch):
+    monkeypatch.delenv(CACHE_DIR_ENV_VAR, raising=False)
+    assert get_samplesheet_cache() is None
+
+
+def test_repeat_reads_skip_parsing(tmp_path, monkeypatch):
+    monkeypatch.setenv(CACHE_DIR_ENV_VAR, str(tmp_path))
+
+    expected_dict = SampleSheet.read_from_samplesheet_csv(INPUT_CSV).to_dict()
+
+    assert v2_samplesheet_reader(INPUT_CSV) == expected_dict
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+    def fail_to_parse(*args, **kwargs):
+        raise AssertionError("Samplesheet should have been read from the cache")
+
+    monkeypatch.setattr(SampleSheet, "read_from_samplesheet_csv", fail_to_parse)
+
+    # Paths and streams of the same bytes share an entry
+    assert v2_samplesheet_reader(INPUT_CSV) == expected_dict
+    assert v2_samplesheet_reader(StringIO(INPUT_CSV.read_text())) == expected_dict
+    assert (
+        samplesheet_csv_to_run_info_xml(INPUT_CSV, run_id="240229_A01052_0184_AHNVH5DMXY").getvalue() ==
+        samplesheet_csv_to_run_info_xml(INPUT_CSV, run_id="240229_A01052_0184_AHNVH5DMXY", cache_dir=tmp_path).getvalue()
+    )
+
+
+def test_key_includes_package_version(tmp_path):
+    samplesheet_cache = SampleSheetCache(tmp_path)
+    key = samplesheet_cache.get_key(b"[Header]")
+
+    samplesheet_cache.package_version = "0.0.0"
+    assert not samplesheet_cache.get_key(b"[Header]") == key
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    samplesheet_cache = SampleSheetCache(tmp_path, max_size=1000)
+    entry_dict = {"header": {"run_name": "x" * 300}}
+
+    for entry_index, key in enumerate(["a", "b", "c"]):
+        samplesheet_cache.put(key, entry_dict)
+        os.utime(samplesheet_cache.get_entry_path(key), (entry_index, entry_index))
+
+    # Reading 'a' makes 'b' the least recently used
+    assert samplesheet_cache.get("a") == entry_dict
+    samplesheet_cache.put("d", entry_dict)
+
+    assert samplesheet_cache.get("b") is None
+    assert all(map(lambda key_iter: samplesheet_cache.get(key_iter) == entry_dict, ["a", "c", "d"]))
+    assert samplesheet_cache.get_size() <= 1000
+
+
+def test_shared_between_processes(tmp_path):
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(read_with_cache, [str(tmp_path)] * 16))
+
+    assert all(map(lambda result_iter: result_iter == results[0], results))
+    assert len(list(tmp_path.glob("*.json"))) == 1
+    assert len(list(tmp_path.glob(".*.tmp"))) == 0
+
+
+def test_invalid_max_size(tmp_path, monkeypatch):
+    monkeypatch.setenv("V2_SAMPLESHEET_MAKER_CACHE_MAX_SIZE", "1GB")
+    with pytest.raises(ValueError):
+        get_samplesheet_cache(tmp_path)
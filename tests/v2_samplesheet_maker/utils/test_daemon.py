@@ -0,0 +1,132 @@
+import os
+import stat
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from v2_samplesheet_maker.utils.cache import CACHE_DIR_ENV_VAR
+from v2_samplesheet_maker.utils.daemon import (
+    DAEMON_SOCKET_ENV_VAR,
+    DISABLE_DAEMON_ENV_VAR,
+    connect_to_daemon,
+    forward_to_daemon,
+    get_daemon_socket_path,
+    get_private_socket_dir,
+    make_private_socket_dir,
+    ping_daemon,
+    stop_daemon,
+)
+
+INPUT_JSON = Path("examples/json_inputs/standard-sheet-with-settings.json").absolute()
+
+
+def run_console_script(module_name: str, argv, env) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-c", f"import {module_name} as m; m.main()", *argv],
+        capture_output=True, text=True, env=env
+    )
+
+
+@pytest.fixture
+def daemon_socket(tmp_path):
+    socket_path = tmp_path / "daemon.sock"
+    daemon_process = subprocess.Popen(
+        [sys.executable, "-m", "v2_samplesheet_maker.run.daemon", "start", f"--socket={socket_path}"],
+    )
+
+    # Wait for the daemon to start listening
+    for _ in range(300):
+        if ping_daemon(socket_path) is not None:
+            break
+        time.sleep(0.05)
+    else:
+        daemon_process.kill()
+        pytest.fail("Daemon did not start")
+
+    yield socket_path
+
+    stop_daemon(socket_path)
+    daemon_process.wait(timeout=10)
+
+
+def test_forward_to_daemon_falls_back_when_not_running(tmp_path, monkeypatch):
+    monkeypatch.setenv(DAEMON_SOCKET_ENV_VAR, str(tmp_path / "missing.sock"))
+    assert forward_to_daemon("v2-samplesheet-maker") is False
+
+
+def test_daemon_matches_in_process(daemon_socket, tmp_path):
+    daemon_env = dict(os.environ, **{DAEMON_SOCKET_ENV_VAR: str(daemon_socket)})
+    in_process_env = dict(daemon_env, **{DISABLE_DAEMON_ENV_VAR: "1"})
+
+    daemon_result = run_console_script(
+        "v2_samplesheet_maker.run.v2_samplesheet_writer", [str(INPUT_JSON), "-"], daemon_env
+    )
+    in_process_result = run_console_script(
+        "v2_samplesheet_maker.run.v2_samplesheet_writer", [str(INPUT_JSON), "-"], in_process_env
+    )
+
+    assert daemon_result.returncode == 0
+    assert daemon_result.stdout == in_process_result.stdout
+
+
+def test_daemon_uses_caller_cwd_and_exit_code(daemon_socket, tmp_path):
+    daemon_env = dict(os.environ, **{DAEMON_SOCKET_ENV_VAR: str(daemon_socket)})
+
+    result = subprocess.run(
+        [sys.executable, "-c", "import v2_samplesheet_maker.run.v2_samplesheet_writer as m; m.main()",
+         str(INPUT_JSON), "SampleSheet.csv"],
+        capture_output=True, text=True, env=daemon_env, cwd=tmp_path
+    )
+    assert result.returncode == 0
+    assert (tmp_path / "SampleSheet.csv").read_text().startswith("[Header]")
+
+    failed_result = run_console_script(
+        "v2_samplesheet_maker.run.v2_samplesheet_writer", [str(tmp_path / "missing.json"), "-"], daemon_env
+    )
+    assert failed_result.returncode != 0
+
+
+def test_daemon_uses_caller_env(daemon_socket, tmp_path):
+    daemon_env = dict(
+        os.environ,
+        **{DAEMON_SOCKET_ENV_VAR: str(daemon_socket), CACHE_DIR_ENV_VAR: str(tmp_path / "cache")}
+    )
+
+    result = run_console_script(
+        "v2_samplesheet_maker.run.v2_samplesheet_reader",
+        [str(Path("examples/csv_outputs/standard-sheet-with-settings.csv").absolute()), str(tmp_path / "SampleSheet.json")],
+        daemon_env
+    )
+    assert result.returncode == 0
+
+    # The daemon was started without a cache directory, the request uses the cache directory of the caller
+    assert len(list((tmp_path / "cache").glob("*.json"))) == 1
+
+
+def test_connect_to_daemon_checks_socket_owner(tmp_path, monkeypatch):
+    # Not a socket, nothing is sent
+    (tmp_path / "daemon.sock").write_text("")
+    assert connect_to_daemon(tmp_path / "daemon.sock") is None
+
+    monkeypatch.setenv(DAEMON_SOCKET_ENV_VAR, str(tmp_path / "daemon.sock"))
+    assert forward_to_daemon("v2-samplesheet-maker") is False
+
+
+def test_default_socket_dir_is_private(tmp_path, monkeypatch):
+    monkeypatch.delenv(DAEMON_SOCKET_ENV_VAR, raising=False)
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    monkeypatch.setenv("TMPDIR", str(tmp_path))
+
+    socket_path = get_daemon_socket_path()
+    assert socket_path.parent == get_private_socket_dir() == tmp_path / f"v2-samplesheet-maker-{os.getuid()}"
+
+    make_private_socket_dir(socket_path.parent)
+    assert stat.S_IMODE(os.lstat(socket_path.parent).st_mode) == 0o700
+
+    # A directory that other users can write to is refused
+    socket_path.parent.chmod(0o777)
+    with pytest.raises(PermissionError):
+        make_private_socket_dir(socket_path.parent)
@@ -0,0 +1,159 @@
+import json
+import socket
+import threading
+import time
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+
+from v2_samplesheet_maker.functions.v2_samplesheet_writer import v2_samplesheet_writer
+from v2_samplesheet_maker.utils import http_service as http_service_module
+from v2_samplesheet_maker.utils.http_service import ConversionHTTPServer, ConversionRequestHandler, run_conversion
+
+INPUT_JSON = Path("examples/json_inputs/standard-sheet-with-settings.json")
+
+
+@pytest.fixture
+def http_service():
+    server = ConversionHTTPServer(("127.0.0.1", 0), workers=2, queue_size=2)
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+
+    yield f"http://127.0.0.1:{server.server_address[1]}", server
+
+    server.shutdown()
+    server.server_close()
+
+
+def post(url: str, body: str):
+    with urlopen(Request(url, data=body.encode(), method="POST")) as response:
+        return response.status, response.headers["Content-Type"], response.read().decode()
+
+
+def test_v2_samplesheet_maker_endpoint(http_service):
+    url, _ = http_service
+
+    status, content_type, body = post(f"{url}/v2-samplesheet-maker", INPUT_JSON.read_text())
+
+    assert status == 200
+    assert content_type.startswith("text/csv")
+    assert body == v2_samplesheet_writer(INPUT_JSON).getvalue()
+
+
+def test_round_trip_to_json_and_run_info(http_service):
+    url, _ = http_service
+
+    _, _, samplesheet_csv = post(f"{url}/v2-samplesheet-maker", INPUT_JSON.read_text())
+    _, _, samplesheet_json = post(f"{url}/v2-samplesheet-to-json", samplesheet_csv)
+    assert json.loads(samplesheet_json)["header"]["run_name"] == json.loads(INPUT_JSON.read_text())["header"]["run_name"]
+
+    status, content_type, run_info_xml = post(
+        f"{url}/v2-samplesheet-to-run-info-xml?run_id=240229_A01052_0184_AHNVH5DMXY", samplesheet_csv
+    )
+    assert status == 200
+    assert content_type == "application/xml"
+
+    _, _, run_info_json = post(f"{url}/run-info-xml-reader", run_info_xml)
+    assert json.loads(run_info_json)["RunInfo"]["Run"]["@Id"] == "240229_A01052_0184_AHNVH5DMXY"
+
+
+def test_invalid_input_returns_bad_request(http_service):
+    url, server = http_service
+
+    with pytest.raises(HTTPError) as http_error:
+        post(f"{url}/v2-samplesheet-maker", "not json")
+    assert http_error.value.code == 400
+    assert "error" in json.loads(http_error.value.read())
+
+    with pytest.raises(HTTPError) as http_error:
+        post(f"{url}/v2-samplesheet-to-run-info-xml", "[Header]\n")
+    assert http_error.value.code == 400
+
+    assert server.stats.to_dict()["endpoints"]["/v2-samplesheet-maker"]["errors"] == 1
+
+
+def test_full_queue_is_rejected(http_service):
+    url, server = http_service
+
+    # Fill every worker and queue slot
+    for _ in range(4):
+        assert server.acquire_slot()
+
+    with pytest.raises(HTTPError) as http_error:
+        post(f"{url}/v2-samplesheet-maker", INPUT_JSON.read_text())
+    assert http_error.value.code == 503
+    assert http_error.value.headers["Retry-After"] == "1"
+
+    for _ in range(4):
+        server.release_slot()
+
+    assert post(f"{url}/v2-samplesheet-maker", INPUT_JSON.read_text())[0] == 200
+
+
+def test_health_and_stats(http_service):
+    url, _ = http_service
+
+    post(f"{url}/v2-samplesheet-maker", INPUT_JSON.read_text())
+
+    with urlopen(f"{url}/health") as response:
+        assert json.loads(response.read())["status"] == "ok"
+
+    with urlopen(f"{url}/stats") as response:
+        endpoint_stats = json.loads(response.read())["endpoints"]["/v2-samplesheet-maker"]
+
+    assert endpoint_stats["requests"] == 1
+    assert endpoint_stats["latency_ms"]["count"] == 1
+    assert endpoint_stats["latency_ms"]["p50"] > 0
+
+
+def send_request_head(url: str, content_length: int, body_prefix: bytes = b"") -> socket.socket:
+    host, port = url.removeprefix("http://").split(":")
+    connection = socket.create_connection((host, int(port)))
+    connection.sendall(
+        f"POST /v2-samplesheet-maker HTTP/1.1\r\nHost: {host}\r\nContent-Length: {content_length}\r\n\r\n".encode() +
+        body_prefix
+    )
+    return connection
+
+
+def test_slot_is_reserved_before_the_body_is_read(http_service, monkeypatch):
+    url, server = http_service
+    monkeypatch.setattr(ConversionRequestHandler, "timeout", 0.5)
+
+    # A slow client holds a slot while its body is read, and times out
+    with send_request_head(url, 1000, b"{") as connection:
+        for _ in range(100):
+            if server.get_in_flight() == 1:
+                break
+            time.sleep(0.01)
+        assert server.get_in_flight() == 1
+        assert connection.recv(4096).startswith(b"HTTP/1.0 408")
+
+    # The slot is released once the response has been sent
+    for _ in range(100):
+        if server.get_in_flight() == 0:
+            break
+        time.sleep(0.01)
+    assert server.get_in_flight() == 0
+
+    # Once every slot is taken, requests are rejected without reading the body
+    for _ in range(4):
+        assert server.acquire_slot()
+    with send_request_head(url, 1000) as connection:
+        assert connection.recv(4096).startswith(b"HTTP/1.0 503")
+    for _ in range(4):
+        server.release_slot()
+
+
+def test_conversion_bugs_are_server_errors(monkeypatch):
+    def raise_key_error(body, params):
+        raise KeyError("missing")
+
+    monkeypatch.setitem(http_service_module.HTTP_SERVICE_ENDPOINTS, "/v2-samplesheet-maker", raise_key_error)
+    assert run_conversion("/v2-samplesheet-maker", "{}", {})[0] == 500
+
+    # Malformed input is still a client error
+    assert run_conversion("/run-info-xml-writer", json.dumps({"Run": []}), {})[0] == 400
+    assert run_conversion("/v2-samplesheet-to-run-info-xml", "[Header]\nFileFormatVersion,2\n", {"run_id": ["RUN"]})[0] == 400
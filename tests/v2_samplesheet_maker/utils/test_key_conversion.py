@@ -0,0 +1,59 @@
+from io import StringIO
+
+import pytest
+
+from v2_samplesheet_maker.utils import (
+    convert_pascal_case_to_snake_case,
+    get_key_conversion_maps,
+    pascal_case_to_snake_case,
+    snake_case_to_pascal_case,
+)
+from v2_samplesheet_maker.classes.samplesheet import SampleSheet
+
+
+@pytest.mark.parametrize(
+    "pascal_case_string,snake_case_string",
+    [
+        ("TrimUMI", "trim_umi"),
+        ("Sample_ID", "sample_id"),
+        ("Read1Cycles", "read_1_cycles"),
+        ("BarcodeMismatchesIndex2", "barcode_mismatches_index_2"),
+        ("I7_Index_ID", "i7_index_id"),
+        # Not covered by the fallback converter
+        ("CustomIndex1Primer", "custom_index_1_primer"),
+        # Not a model key, uses the fallback converter
+        ("Cloud_TSO500L_Pipeline", "cloud_tso500l_pipeline"),
+        ("BCLConvert_Settings", "bclconvert_settings"),
+    ]
+)
+def test_pascal_case_to_snake_case(pascal_case_string, snake_case_string):
+    assert pascal_case_to_snake_case(pascal_case_string) == snake_case_string
+
+
+def test_model_keys_round_trip():
+    pascal_to_snake_map, snake_to_pascal_map = get_key_conversion_maps()
+
+    for snake_case_string, pascal_case_string in snake_to_pascal_map.items():
+        assert pascal_to_snake_map[pascal_case_string] == snake_case_string
+        assert snake_case_to_pascal_case(snake_case_string) == pascal_case_string
+
+
+def test_fallback_converter_is_cached():
+    convert_pascal_case_to_snake_case.cache_clear()
+    convert_pascal_case_to_snake_case("SomeNewKey")
+    convert_pascal_case_to_snake_case("SomeNewKey")
+    assert convert_pascal_case_to_snake_case.cache_info().hits == 1
+
+
+def test_sequencing_section_round_trips():
+    samplesheet = SampleSheet(
+        {
+            "header": {"file_format_version": 2},
+            "reads": {"read_1_cycles": 151},
+            "sequencing": {"custom_index_1_primer": True, "custom_read_1_primer": False},
+        }
+    )
+
+    round_tripped = SampleSheet.read_from_samplesheet_csv(StringIO(samplesheet.to_csv_string()))
+
+    assert round_tripped.to_dict()["sequencing"] == samplesheet.to_dict()["sequencing"]
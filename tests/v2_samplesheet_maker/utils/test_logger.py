@@ -0,0 +1,43 @@
+import logging
+import subprocess
+import sys
+
+from v2_samplesheet_maker.utils.logger import get_logger, set_basic_logger, BASIC_HANDLER_NAME
+
+
+def test_get_logger_is_named_after_calling_module():
+    assert get_logger().name == __name__
+    assert get_logger("v2_samplesheet_maker.custom").name == "v2_samplesheet_maker.custom"
+
+
+def test_set_basic_logger_only_adds_one_handler():
+    root_logger = logging.getLogger()
+    try:
+        set_basic_logger()
+        set_basic_logger()
+        assert len(
+            list(filter(lambda handler_iter: handler_iter.get_name() == BASIC_HANDLER_NAME, root_logger.handlers))
+        ) == 1
+    finally:
+        for handler in list(root_logger.handlers):
+            if handler.get_name() == BASIC_HANDLER_NAME:
+                root_logger.removeHandler(handler)
+        logging.captureWarnings(False)
+
+
+def test_import_has_no_logging_side_effects():
+    assert subprocess.run(
+        [
+            sys.executable, "-c",
+            "import logging, warnings\n"
+            "show_warning = warnings.showwarning\n"
+            "import v2_samplesheet_maker.classes.samplesheet, v2_samplesheet_maker.functions.v2_samplesheet_writer\n"
+            "assert warnings.showwarning is show_warning\n"
+            "assert not any(\n"
+            "    logger_iter.handlers for logger_iter in\n"
+            "    [logging.getLogger()] + list(logging.root.manager.loggerDict.values())\n"
+            "    if isinstance(logger_iter, logging.Logger)\n"
+            ")\n"
+        ],
+        capture_output=True
+    ).returncode == 0
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+"""
+Test the conversion profiler
+"""
+
+import json
+import pstats
+import sys
+from io import StringIO
+
+import pytest
+
+from v2_samplesheet_maker.classes.samplesheet import SampleSheet
+from v2_samplesheet_maker.utils.profiler import profile_conversion, profile_stage, get_active_profiler
+from v2_samplesheet_maker.utils.samplesheet_generator import generate_samplesheet_dict
+
+
+def test_profile_stage_without_profiler():
+    assert get_active_profiler() is None
+    with profile_stage("validation", rows=10) as stage_counts:
+        assert stage_counts is None
+
+
+def test_profile_conversion():
+    samplesheet_dict = generate_samplesheet_dict(20, num_lanes=2, tso500s=True, cloud=True)
+
+    with profile_conversion("to-csv") as profiler:
+        samplesheet = SampleSheet(samplesheet_dict)
+        samplesheet.to_csv(StringIO())
+
+    assert get_active_profiler() is None
+
+    report = profiler.get_report()
+    assert report["command"] == "to-csv"
+    assert report["total_seconds"] > 0
+
+    stages = {stage_iter["stage"]: stage_iter for stage_iter in report["stages"]}
+    assert {
+        "section_sorting", "validation", "cloud_data", "dataframe_build", "clean_rows", "order_rows", "render_csv"
+    } <= set(stages.keys())
+
+    sections = {
+        (section_iter["stage"], section_iter["section"]): section_iter
+        for section_iter in report["sections"]
+    }
+    # Each row is validated once, the Cloud_Data rows are generated from the validated rows
+    assert sections[("validation", "BCLConvertDataSection")]["rows"] == 40
+    assert sections[("validation", "HeaderSection")]["rows"] == 1
+    assert sections[("render_csv", "BCLConvertDataSection")]["rows"] == 40
+    assert sections[("dataframe_build", "CloudDataSection")]["calls"] >= 1
+
+    # Totals are the sum of the sections
+    assert stages["render_csv"]["rows"] == sum(
+        map(
+            lambda section_iter: section_iter["rows"],
+            filter(lambda section_iter: section_iter["stage"] == "render_csv", report["sections"])
+        )
+    )
+
+
+def test_profile_conversion_nested():
+    with profile_conversion():
+        with pytest.raises(ValueError):
+            with profile_conversion():
+                pass
+
+
+def test_profile_cli(tmp_path, monkeypatch):
+    from v2_samplesheet_maker.run.v2_samplesheet_reader import read_v2_samplesheet
+
+    monkeypatch.setattr(
+        sys, "argv",
+        [
+            "v2-samplesheet-to-json",
+            "examples/csv_outputs/standard-sheet-with-settings.csv",
+            str(tmp_path / "output.json"),
+            f"--profile={tmp_path / 'profile.json'}",
+            f"--cprofile={tmp_path / 'profile.pstats'}",
+        ]
+    )
+    read_v2_samplesheet()
+
+    with open(tmp_path / "profile.json") as profile_h:
+        report = json.load(profile_h)
+
+    assert report["command"] == "v2-samplesheet-to-json"
+    assert "csv_parse" in map(lambda stage_iter: stage_iter["stage"], report["stages"])
+    assert (tmp_path / "output.json").is_file()
+
+    # The cProfile stats can be loaded
+    pstats.Stats(str(tmp_path / "profile.pstats"))
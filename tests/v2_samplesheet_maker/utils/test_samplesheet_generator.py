@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+"""
+Test the synthetic samplesheet generator
+"""
+
+import json
+import subprocess
+import sys
+from copy import deepcopy
+from io import StringIO
+from pathlib import Path
+
+import pytest
+
+from v2_samplesheet_maker.classes.samplesheet import SampleSheet
+from v2_samplesheet_maker.utils.samplesheet_generator import (
+    MAX_INDEX_HOMOPOLYMER_LENGTH,
+    generate_index_pairs,
+    generate_samplesheet_dict,
+    is_valid_index,
+)
+
+BENCHMARK_SCRIPT = Path(__file__).parents[3] / "benchmarks" / "run_benchmarks.py"
+
+
+def test_generate_index_pairs():
+    index_pairs = generate_index_pairs(500, index_length=8, seed=1)
+
+    assert index_pairs == generate_index_pairs(500, index_length=8, seed=1)
+    assert index_pairs != generate_index_pairs(500, index_length=8, seed=2)
+
+    assert len(set(map(tuple, index_pairs))) == 500
+    assert len(set(map(lambda pair_iter: pair_iter[0], index_pairs))) == 500
+
+    for index, index2 in index_pairs:
+        assert len(index) == len(index2) == 8
+        assert is_valid_index(index) and is_valid_index(index2)
+        assert "A" * (MAX_INDEX_HOMOPOLYMER_LENGTH + 1) not in index
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"tso500s": True},
+        {"tso500l": True, "cloud": True},
+        {"tso500s": True, "tso500l": True, "cloud": True},
+    ]
+)
+def test_generate_samplesheet_dict(options):
+    samplesheet_dict = generate_samplesheet_dict(12, num_lanes=2, **options)
+
+    samplesheet = SampleSheet(deepcopy(samplesheet_dict))
+    assert len(samplesheet_dict["bclconvert_data"]) == 24
+    assert samplesheet.to_dict() == SampleSheet.read_from_samplesheet_csv(
+        StringIO(samplesheet.to_csv_string())
+    ).to_dict()
+
+    if options.get("cloud", False):
+        assert "cloud_data" in samplesheet.to_dict()
+
+
+def test_run_benchmarks(tmp_path):
+    output_path = tmp_path / "benchmark-results.json"
+
+    subprocess.run(
+        [
+            sys.executable, str(BENCHMARK_SCRIPT),
+            "--rows=10", "--repeats=1", f"--output={output_path}",
+        ],
+        check=True,
+        capture_output=True,
+    )
+    subprocess.run(
+        [
+            sys.executable, str(BENCHMARK_SCRIPT),
+            "--rows=10", "--repeats=1", f"--output={tmp_path / 'compare.json'}",
+            f"--compare={output_path}", "--max-slowdown=1000",
+        ],
+        check=True,
+        capture_output=True,
+    )
+
+    with open(tmp_path / "compare.json") as results_h:
+        benchmark_output = json.load(results_h)
+
+    assert benchmark_output["metadata"]["options"] == {"tso500s": False, "tso500l": False, "cloud": False}
+    assert set(map(lambda result_iter: result_iter["stage"], benchmark_output["results"])) == {
+        "samplesheet_init", "to_csv", "read_from_samplesheet_csv", "to_json",
+        "index_collisions", "samplesheet_csv_to_run_info_xml", "run_info_xml_reader",
+    }
+    assert len(benchmark_output["comparison"]) == len(benchmark_output["results"])